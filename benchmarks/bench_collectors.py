@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Benchmark: collector throughput against simulated APIs
+======================================================
+Runs the collectors and the coding-assistant fetchers against the in-process
+fake APIs (tests/fake_apis.py) under several latency/error profiles, and
+writes requests/s, p50/p99 latency, wall time and peak memory per run to a
+JSON file that can be compared between versions.
+
+Requests are paced by the rate limiter with the quotas in config.RATE_LIMITS
+(fresh in-memory state per run), so wall time shows how much of a run is
+spent waiting for quota. --no-rate-limit measures raw throughput instead.
+Transient failures are retried by ResilientTransport as in production; the
+results count retries and what the collectors reported as lost.
+
+Bruk:
+    python benchmarks/bench_collectors.py
+    python benchmarks/bench_collectors.py --profiles ideal flaky --targets hn_firebase github
+    python benchmarks/bench_collectors.py --output ny.json --compare benchmarks/results/forrige.json
+"""
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from statistics import quantiles
+
+import httpx
+
+# Add src to path, and the repo root for the fake APIs in tests/
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(1, str(Path(__file__).parent.parent))
+
+from ai_news_agent.collectors import github, hackernews, reddit, twitter
+from ai_news_agent.coding_assistants.config import CODING_ASSISTANTS
+from ai_news_agent.coding_assistants.fetchers.github import fetch_all_github_stats
+from ai_news_agent.coding_assistants.fetchers.hackernews import fetch_all_hn_mentions
+from ai_news_agent.coding_assistants.fetchers.reddit import fetch_all_reddit_mentions
+from ai_news_agent.utils.http_client import close_client, set_transport_factory
+from ai_news_agent.utils.rate_limit import RateLimitedTransport, RateLimiter
+from ai_news_agent.utils.resilience import ResilientTransport, lost_items, reset_lost
+from tests.fake_apis import FakeAPIs, FakeCorpus, FakeProfile
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+PROFILES = {
+    "ideal": FakeProfile(),
+    "wan": FakeProfile(latency=0.05, jitter=0.05),
+    "flaky": FakeProfile(latency=0.05, jitter=0.1, error_rate=0.05, timeout_rate=0.01),
+    "slow": FakeProfile(latency=0.3, jitter=0.3, error_rate=0.02),
+}
+
+
+def _targets(cache_dir: Path) -> dict:
+    """Navn -> coroutine-fabrikk. Returverdien brukes bare til å telle elementer."""
+    return {
+        "hn_firebase": lambda: hackernews.collect_ai_mentions(days_back=7, max_stories=500, mode="firebase", use_cache=False),
+        "hn_algolia": lambda: hackernews.collect_ai_mentions(days_back=30, mode="algolia", use_cache=False),
+        "github": lambda: github.search_github_repos(days_back=30),
+        "reddit": lambda: reddit.collect_reddit_posts(days_back=7),
+        "twitter": lambda: twitter.collect_twitter_posts(days_back=7),
+        "ca_github": lambda: fetch_all_github_stats(CODING_ASSISTANTS, cache_dir=cache_dir),
+        "ca_hackernews": lambda: fetch_all_hn_mentions(CODING_ASSISTANTS),
+        "ca_reddit": lambda: fetch_all_reddit_mentions(CODING_ASSISTANTS),
+    }
+
+
+class TimingTransport(httpx.AsyncBaseTransport):
+    """Måler latens og feil for hver forespørsel som går gjennom `transport`."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, latencies: list, failures: list):
+        self._transport = transport
+        self.latencies = latencies
+        self.failures = failures
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except httpx.TransportError:
+            self.failures.append(0)
+            raise
+        finally:
+            self.latencies.append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            self.failures.append(response.status_code)
+        return response
+
+
+def _percentiles(latencies: list) -> tuple[float, float]:
+    if len(latencies) < 2:
+        value = latencies[0] * 1000 if latencies else 0.0
+        return value, value
+    cuts = quantiles(latencies, n=100, method="inclusive")
+    return cuts[49] * 1000, cuts[98] * 1000
+
+
+async def run_target(name: str, factory, corpus: FakeCorpus, profile_name: str, rate_limit: bool = True) -> dict:
+    """Kjør én collector mot nye fake-APIer og mål den."""
+    apis = FakeAPIs(corpus, PROFILES[profile_name])
+    latencies, failures = [], []
+    limiter = RateLimiter(None) if rate_limit else RateLimiter(None, policies={})
+    resilient = []
+    await close_client()
+    reset_lost()
+    
+    def make_transport():
+        transport = ResilientTransport(RateLimitedTransport(TimingTransport(apis.transport(), latencies, failures), limiter))
+        resilient.append(transport)
+        return transport
+    
+    set_transport_factory(make_transport)
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    error = None
+    items = 0
+    try:
+        result = await factory()
+        items = len(result)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        wall = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        await close_client()
+        set_transport_factory(None)
+
+    p50, p99 = _percentiles(latencies)
+    retries = sum(stats["retries"] for transport in resilient for stats in transport.stats().values())
+    lost = sum(count for units in lost_items().values() for count in units.values())
+    return {
+        "target": name,
+        "profile": profile_name,
+        "items": items,
+        "requests": len(latencies),
+        "failed_requests": len(failures),
+        "retries": retries,
+        "lost": lost,
+        "wall_s": round(wall, 3),
+        "req_per_s": round(len(latencies) / wall, 1) if wall else 0.0,
+        "p50_ms": round(p50, 2),
+        "p99_ms": round(p99, 2),
+        "peak_mem_mb": round(peak / 1e6, 2),
+        "error": error,
+    }
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current: list, previous_path: Path):
+    """Skriv endring i req/s og veggtid mot en tidligere resultatfil."""
+    previous = {
+        (r["target"], r["profile"]): r
+        for r in json.loads(previous_path.read_text(encoding="utf-8"))["results"]
+    }
+    print(f"\n📈 Sammenligning med {previous_path}")
+    for result in current:
+        before = previous.get((result["target"], result["profile"]))
+        if not before or not before["wall_s"]:
+            continue
+        wall_change = (result["wall_s"] / before["wall_s"] - 1) * 100
+        rps_change = (result["req_per_s"] / before["req_per_s"] - 1) * 100 if before["req_per_s"] else 0.0
+        flag = "⚠️ " if wall_change > 10 else "  "
+        print(f" {flag}{result['target']:<14} {result['profile']:<6} veggtid {wall_change:+6.1f}%  req/s {rps_change:+6.1f}%")
+
+
+async def run(profile_names: list, target_names: list, rate_limit: bool = True) -> list:
+    # Twitter hopper over innsamling uten token; fake-APIet godtar alle tokens
+    twitter.TWITTER_BEARER_TOKEN = twitter.TWITTER_BEARER_TOKEN or "benchmark"
+    corpus = FakeCorpus()
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        targets = _targets(Path(tmp))
+        for profile_name in profile_names:
+            for name in target_names:
+                print(f"▶️  {name} / {profile_name}")
+                result = await run_target(name, targets[name], corpus, profile_name, rate_limit)
+                results.append(result)
+    return results
+
+
+def main():
+    target_names = list(_targets(Path(".")))
+    parser = argparse.ArgumentParser(description="Collector throughput benchmark")
+    parser.add_argument("--profiles", nargs="+", choices=list(PROFILES), default=list(PROFILES), help="Latens/feil-profiler")
+    parser.add_argument("--targets", nargs="+", choices=target_names, default=target_names, help="Collectorer som skal kjøres")
+    parser.add_argument("--output", type=Path, help="Resultatfil (JSON)")
+    parser.add_argument("--compare", type=Path, help="Tidligere resultatfil å sammenligne med")
+    parser.add_argument("--no-rate-limit", action="store_true", help="Mål uten rate limiting")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.profiles, args.targets, rate_limit=not args.no_rate_limit))
+
+    print(f"\n{'Collector':<14} {'Profil':<6} {'Req':>6} {'Feil':>5} {'Retry':>5} {'Tapt':>5} {'Req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'Tid s':>7} {'Mem MB':>7}")
+    for r in results:
+        print(f"{r['target']:<14} {r['profile']:<6} {r['requests']:>6} {r['failed_requests']:>5} {r['retries']:>5} {r['lost']:>5} {r['req_per_s']:>8.1f} "
+              f"{r['p50_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['wall_s']:>7.2f} {r['peak_mem_mb']:>7.1f}"
+              + (f"  ❌ {r['error']}" if r["error"] else ""))
+
+    output = args.output or RESULTS_DIR / f"collectors-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "revision": _git_revision(),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "rate_limit": not args.no_rate_limit,
+        "profiles": {name: vars(PROFILES[name]) for name in args.profiles},
+        "results": results,
+    }, indent=2), encoding="utf-8")
+    print(f"\n💾 Lagret til {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
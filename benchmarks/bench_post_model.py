@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Post model vs dict posts
+===================================
+Decodes synthetic Firebase HN item JSON into the old dict posts and into
+Post records, and measures decode throughput and memory per post.
+
+Bruk:
+    python benchmarks/bench_post_model.py
+    python benchmarks/bench_post_model.py --count 100000
+"""
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ai_news_agent.models import Post
+
+KEYWORDS = ["llm", "gpt", "claude", "openai", "ollama", "rag", "agent", "copilot"]
+WORDS = "show hn a new fast open source tool for running local models in rust python".split()
+
+
+def make_payloads(count: int, seed: int = 42) -> list[bytes]:
+    """Raw item JSON as returned by /v0/item/<id>.json; ~5000 distinct authors."""
+    rng = random.Random(seed)
+    authors = [f"user{i}" for i in range(5000)]
+    payloads = []
+    for i in range(count):
+        item = {
+            "id": 40_000_000 + i,
+            "type": "story",
+            "title": " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 12))),
+            "url": f"https://example.com/posts/{i}",
+            "score": rng.randint(1, 2000),
+            "descendants": rng.randint(0, 500),
+            "by": rng.choice(authors),
+            "time": 1_700_000_000 + i * 7,
+            "kids": [i * 10 + k for k in range(rng.randint(0, 5))],
+        }
+        payloads.append(json.dumps(item).encode())
+    return payloads
+
+
+def keywords_for(i: int) -> list[str]:
+    return [KEYWORDS[i % len(KEYWORDS)]]
+
+
+def old_normalize(raw: dict, keywords: list[str]) -> dict:
+    """The dict normalize_post() built before the Post model."""
+    story_id = raw.get("id", "")
+    created_time = raw.get("time", 0)
+    return {
+        "id": str(story_id),
+        "title": raw.get("title", ""),
+        "url": raw.get("url", ""),
+        "hn_url": f"https://news.ycombinator.com/item?id={story_id}",
+        "points": raw.get("score", 0),
+        "num_comments": raw.get("descendants", 0),
+        "author": raw.get("by", ""),
+        "created_at": datetime.fromtimestamp(created_time).isoformat() if created_time else "",
+        "source": "hackernews",
+        "keywords": keywords,
+    }
+
+
+def decode_dicts(payloads: list[bytes]) -> list:
+    return [old_normalize(json.loads(p), keywords_for(i)) for i, p in enumerate(payloads)]
+
+
+def decode_posts(payloads: list[bytes]) -> list:
+    return [Post.from_hn_item(json.loads(p), keywords_for(i)) for i, p in enumerate(payloads)]
+
+
+def bench(name: str, func, payloads: list[bytes]) -> list:
+    """Time a decode run, then measure retained memory in a second, traced run."""
+    gc.collect()
+    started = time.perf_counter()
+    func(payloads)
+    elapsed = time.perf_counter() - started
+
+    gc.collect()
+    tracemalloc.start()
+    result = func(payloads)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    per_post = retained / len(payloads)
+    print(f"   {name:<22} {elapsed:7.2f}s  {len(payloads) / elapsed:>10,.0f} posts/s  "
+          f"{per_post:6.0f} B/post  ({retained / 1e6:,.0f} MB)")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Post model benchmark")
+    parser.add_argument("--count", type=int, default=1_000_000, help="Antall syntetiske posts")
+    args = parser.parse_args()
+
+    payloads = make_payloads(args.count)
+    print(f"📊 {len(payloads):,} HN-items ({sum(map(len, payloads)) / 1e6:,.0f} MB JSON)")
+
+    dicts = bench("dict (gammel)", decode_dicts, payloads)
+    del dicts
+    posts = bench("Post (slots)", decode_posts, payloads)
+
+    # Tapsfri konvertering tilbake til dict-formatet
+    assert all(Post.from_dict(p.to_dict()) == p for p in posts[:10_000])
+    started = time.perf_counter()
+    as_dicts = [p.to_dict() for p in posts]
+    print(f"   Post.to_dict           {time.perf_counter() - started:7.2f}s  ({len(as_dicts):,} posts)")
+
+
+if __name__ == "__main__":
+    main()
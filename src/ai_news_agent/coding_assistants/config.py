@@ -5,6 +5,13 @@ from typing import Dict, List
 from pathlib import Path
 
 # Tools to track
+# "aliases" are extra names a mention can use (matched on word boundaries)
+# "search_query" replaces the name for names that are common words, where
+# uncapped counts would otherwise count the word (HN counts mode, X counts).
+# Quotes make it an exact phrase. Capped searches (HN hits mode, Reddit
+# search) keep using the name.
+# "match_name": False stops the sweeps from crediting the bare name ("please
+# continue"); only the search_query phrase and aliases are matched.
 CODING_ASSISTANTS = [
     {
         "name": "Cursor",
@@ -12,7 +19,9 @@ CODING_ASSISTANTS = [
         "github_owner": "getcursor",
         "github_repo": "cursor",
         "website": "https://cursor.sh",
-        "github_url": "https://github.com/getcursor/cursor"
+        "github_url": "https://github.com/getcursor/cursor",
+        "search_query": '"cursor ai"',
+        "match_name": False
     },
     {
         "name": "GitHub Copilot",
@@ -20,7 +29,8 @@ CODING_ASSISTANTS = [
         "github_owner": None,  # No public repo
         "github_repo": None,
         "website": "https://github.com/features/copilot",
-        "github_url": None
+        "github_url": None,
+        "aliases": ["Copilot"]
     },
     {
         "name": "Continue",
@@ -28,7 +38,10 @@ CODING_ASSISTANTS = [
         "github_owner": "continuedev",
         "github_repo": "continue",
         "website": "https://continue.dev",
-        "github_url": "https://github.com/continuedev/continue"
+        "github_url": "https://github.com/continuedev/continue",
+        "aliases": ["continue.dev"],
+        "search_query": '"continue.dev"',
+        "match_name": False
     },
     {
         "name": "Cody",
@@ -36,7 +49,8 @@ CODING_ASSISTANTS = [
         "github_owner": "sourcegraph",
         "github_repo": "cody",
         "website": "https://sourcegraph.com/cody",
-        "github_url": "https://github.com/sourcegraph/cody"
+        "github_url": "https://github.com/sourcegraph/cody",
+        "aliases": ["Sourcegraph Cody"]
     },
     {
         "name": "Aider",
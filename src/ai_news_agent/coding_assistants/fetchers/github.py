@@ -1,15 +1,18 @@
 """
 GitHub API Fetcher for Coding Assistants
 """
+import asyncio
 import httpx
 import os
-import asyncio
 import time
 from datetime import datetime, timedelta
 from typing import Dict, Optional, Tuple
 from pathlib import Path
 import json
 
+from ...utils.github_graphql import fetch_repo_stats
+from ...utils.http_client import shared_client
+
 GITHUB_API_BASE = "https://api.github.com"
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 
@@ -21,7 +24,10 @@ async def fetch_github_stats(
     cache_dir: Optional[Path] = None
 ) -> Dict:
     """
-    Fetch GitHub repository statistics.
+    Fetch GitHub repository statistics over REST (two requests per repo).
+    
+    Used without a token, or when a GraphQL batch fails; closed issues are
+    estimated here, while the GraphQL path in fetch_all_github_stats() is exact.
     
     Returns:
         {
@@ -34,14 +40,7 @@ async def fetch_github_stats(
         }
     """
     if not owner or not repo:
-        return {
-            "stars": 0,
-            "forks": 0,
-            "open_issues": 0,
-            "closed_issues": 0,
-            "last_commit_date": None,
-            "stars_30d_ago": None
-        }
+        return _empty_stats()
     
     headers = {
         "Accept": "application/vnd.github.v3+json",
@@ -77,76 +76,70 @@ async def fetch_github_stats(
             if commits and isinstance(commits, list) and len(commits) > 0:
                 last_commit_date = commits[0].get("commit", {}).get("author", {}).get("date")
         
-        # Try to get previous snapshot for stars growth
-        stars_30d_ago = None
-        if cache_dir:
-            snapshot_file = cache_dir / f"{owner}_{repo}_snapshot.json"
-            if snapshot_file.exists():
-                try:
-                    with open(snapshot_file, "r") as f:
-                        snapshot = json.load(f)
-                        if "stars" in snapshot and "date" in snapshot:
-                            snapshot_date = datetime.fromisoformat(snapshot["date"].replace("Z", "+00:00"))
-                            days_ago = (datetime.now(snapshot_date.tzinfo) - snapshot_date).days
-                            if 25 <= days_ago <= 35:  # Approximately 30 days
-                                stars_30d_ago = snapshot["stars"]
-                except Exception:
-                    pass
-        
         result = {
             "stars": repo_data.get("stargazers_count", 0),
             "forks": repo_data.get("forks_count", 0),
             "open_issues": open_issues_count,
             "closed_issues": closed_issues_count,
             "last_commit_date": last_commit_date,
-            "stars_30d_ago": stars_30d_ago
         }
-        
-        # Save current snapshot
-        if cache_dir:
-            snapshot_file = cache_dir / f"{owner}_{repo}_snapshot.json"
-            snapshot_data = {
-                "stars": result["stars"],
-                "date": datetime.utcnow().isoformat() + "Z"
-            }
-            with open(snapshot_file, "w") as f:
-                json.dump(snapshot_data, f)
-        
-        # Rate limit: 30 requests per minute for unauthenticated, 5000 for authenticated
-        await asyncio.sleep(0.5 if GITHUB_TOKEN else 2.0)
-        
-        return result
+        return with_snapshot(result, owner, repo, cache_dir)
         
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 404:
             print(f"  ⚠️  Repository {owner}/{repo} not found")
-            return {
-                "stars": 0,
-                "forks": 0,
-                "open_issues": 0,
-                "closed_issues": 0,
-                "last_commit_date": None,
-                "stars_30d_ago": None
-            }
+            return _empty_stats()
         print(f"  ❌ Error fetching GitHub stats for {owner}/{repo}: {e}")
-        return {
-            "stars": 0,
-            "forks": 0,
-            "open_issues": 0,
-            "closed_issues": 0,
-            "last_commit_date": None,
-            "stars_30d_ago": None
-        }
+        return _empty_stats()
     except Exception as e:
         print(f"  ❌ Unexpected error fetching GitHub stats: {e}")
-        return {
-            "stars": 0,
-            "forks": 0,
-            "open_issues": 0,
-            "closed_issues": 0,
-            "last_commit_date": None,
-            "stars_30d_ago": None
+        return _empty_stats()
+
+
+def with_snapshot(stats: Dict, owner: str, repo: str, cache_dir: Optional[Path] = None) -> Dict:
+    """
+    Add stars_30d_ago from the previous snapshot (if about 30 days old) and save a new one.
+    """
+    # Try to get previous snapshot for stars growth
+    stars_30d_ago = None
+    if cache_dir:
+        snapshot_file = cache_dir / f"{owner}_{repo}_snapshot.json"
+        if snapshot_file.exists():
+            try:
+                with open(snapshot_file, "r") as f:
+                    snapshot = json.load(f)
+                    if "stars" in snapshot and "date" in snapshot:
+                        snapshot_date = datetime.fromisoformat(snapshot["date"].replace("Z", "+00:00"))
+                        days_ago = (datetime.now(snapshot_date.tzinfo) - snapshot_date).days
+                        if 25 <= days_ago <= 35:  # Approximately 30 days
+                            stars_30d_ago = snapshot["stars"]
+            except Exception:
+                pass
+    
+    result = dict(stats, stars_30d_ago=stars_30d_ago)
+    
+    # Save current snapshot
+    if cache_dir:
+        snapshot_file = cache_dir / f"{owner}_{repo}_snapshot.json"
+        snapshot_data = {
+            "stars": result["stars"],
+            "date": datetime.utcnow().isoformat() + "Z"
         }
+        with open(snapshot_file, "w") as f:
+            json.dump(snapshot_data, f)
+    
+    return result
+
+
+def _empty_stats() -> Dict:
+    return {
+        "stars": 0,
+        "forks": 0,
+        "open_issues": 0,
+        "closed_issues": 0,
+        "last_commit_date": None,
+        "stars_30d_ago": None
+    }
 
 
 async def fetch_all_github_stats(
@@ -156,6 +149,10 @@ async def fetch_all_github_stats(
     """
     Fetch GitHub stats for all tools.
     
+    With a token, all repos are fetched in batched GraphQL queries
+    (utils/github_graphql.py); without one, or for repos in a failed batch,
+    each repo is fetched over REST.
+    
     Returns:
         {
             "tool_name": {
@@ -166,21 +163,40 @@ async def fetch_all_github_stats(
         }
     """
     results = {}
+    repos = [(tool["github_owner"], tool["github_repo"]) for tool in tools
+             if tool.get("github_owner") and tool.get("github_repo")]
     
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        for tool in tools:
+    async with shared_client() as client:
+        # One GraphQL query for all repos, with exact issue counts; REST without a token
+        graphql_stats = {}
+        if GITHUB_TOKEN and repos:
+            print(f"📡 Fetching GitHub stats for {len(repos)} repos (GraphQL)...")
+            graphql_stats = await fetch_repo_stats(client, repos, GITHUB_TOKEN)
+        
+        async def fetch(tool: Dict):
             name = tool["name"]
             owner = tool.get("github_owner")
             repo = tool.get("github_repo")
+            key = f"{owner}/{repo}"
             
-            print(f"📡 Fetching GitHub stats for {name}...")
-            stats = await fetch_github_stats(owner, repo, client, cache_dir)
+            if key in graphql_stats:
+                if graphql_stats[key] is None:
+                    print(f"  ⚠️  Repository {key} not found")
+                    stats = _empty_stats()
+                else:
+                    stats = with_snapshot(graphql_stats[key], owner, repo, cache_dir)
+            else:
+                print(f"📡 Fetching GitHub stats for {name}...")
+                stats = await fetch_github_stats(owner, repo, client, cache_dir)
             results[name] = stats
             
             if stats["stars"] > 0:
-                print(f"  ✅ {stats['stars']} stars, {stats['forks']} forks")
+                print(f"  ✅ {name}: {stats['stars']} stars, {stats['forks']} forks")
             else:
-                print(f"  ⚠️  No GitHub data available")
+                print(f"  ⚠️  {name}: No GitHub data available")
+        
+        # REST fallbacks run concurrently under the shared GitHub rate limit
+        await asyncio.gather(*[fetch(tool) for tool in tools])
     
-    return results
+    return {tool["name"]: results[tool["name"]] for tool in tools}
 
@@ -1,36 +1,240 @@
 """
 Hacker News API Fetcher for Coding Assistants
 Uses Algolia API for search
+
+Modes:
+- "hits" (default): counts the first 100 story and 100 comment hits (capped
+  at 200); two requests per tool
+- "counts": exact mention counts per day from nbHits (hitsPerPage=0), plus a
+  stratified sample of comment texts for sentiment; about two requests per
+  day per tool on the first run, then only for days that are not yet cached
+- "sweep" (all tools at once): one any-word query over all tool names per
+  time slice, attributed to tools locally with a ToolMatcher
 """
-import httpx
 import asyncio
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+import httpx
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
 import time
 
+from ...utils.http_client import get_client, shared_client
+from .tool_matcher import ToolMatcher
+
 HN_ALGOLIA_API = "https://hn.algolia.com/api/v1"
 
+HN_MENTION_MODE = "hits"
+
+# Counts mode
+HN_COUNT_CONCURRENCY = 8
+HN_COMMENT_SAMPLE_SIZE = 100  # Comment texts per tool for sentiment
+HN_SAMPLE_STRATUM_DAYS = 7    # The sample is spread over strata of this many days
+DAY_SECONDS = 86400
+# Counts for days that ended this long ago no longer change (Algolia indexes
+# within minutes), so they are cached for a week instead of the endpoint's TTL
+HN_FINAL_AFTER_SECONDS = 3600
+HN_FINISHED_DAY_TTL = 7 * DAY_SECONDS
+
+# Sweep mode: Algolia returns at most 1000 hits per query, so slices with more are split
+HN_SWEEP_SLICE_DAYS = 7
+HN_SWEEP_HITS_PER_PAGE = 500
+HN_SWEEP_MAX_HITS = 1000
+HN_SWEEP_MIN_SLICE_SECONDS = 3600
+HN_SWEEP_ATTRIBUTES = "objectID,title,url,points,created_at,created_at_i,comment_text,story_text,_tags"
+
 
 async def search_hn_mentions(
     tool_name: str,
     days_back: int = 30,
-    client: httpx.AsyncClient = None
+    client: httpx.AsyncClient = None,
+    mode: str = HN_MENTION_MODE,
+    query: Optional[str] = None
 ) -> Dict:
     """
     Search Hacker News for mentions of a tool.
     
+    Args:
+        query: Counts mode only: search query instead of the tool name (the
+            tool's "search_query"; quoted phrases match exactly). Hits mode
+            always searches the name, like the Reddit and X fetchers.
+    
     Returns:
         {
             "mentions_count": int,
             "comments": List[str],  # Comment text for sentiment analysis
-            "stories": List[Dict]   # Story metadata
+            "stories": List[Dict]   # Story metadata (hits mode only)
         }
+        Counts mode adds "story_count", "comment_count" and "daily"
+        ([{"date": str, "stories": int, "comments": int}, ...]).
     """
     if client is None:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            return await _search_hn(tool_name, days_back, client)
-    else:
-        return await _search_hn(tool_name, days_back, client)
+        client = get_client()
+    if mode == "counts":
+        return await _count_hn(tool_name, days_back, client, query)
+    if mode != "hits":
+        raise ValueError(f"Unknown HN mention mode for a single tool: {mode}")
+    return await _search_hn(tool_name, days_back, client)
+
+
+def _query_params(query: str) -> dict:
+    """Algolia query parameters; quoted phrases need advancedSyntax."""
+    params = {"query": query}
+    if '"' in query:
+        params["advancedSyntax"] = "true"
+    return params
+
+
+def day_buckets(days_back: int, now: Optional[float] = None) -> List[Tuple[int, int]]:
+    """
+    [start, end) timestamps for each UTC day in the window.
+    
+    Whole days keep the same boundaries between runs, so once a day has
+    ended its queries are identical and can be cached for long (see
+    HN_FINISHED_DAY_TTL); the first and last buckets are partial.
+    """
+    now = int(now if now is not None else time.time())
+    start = now - days_back * DAY_SECONDS
+    buckets = []
+    while start < now:
+        end = min(now, start - start % DAY_SECONDS + DAY_SECONDS)
+        buckets.append((start, end))
+        start = end
+    return buckets
+
+
+def allocate_sample(counts: List[int], size: int) -> List[int]:
+    """
+    Split a sample of `size` over strata in proportion to their counts.
+    
+    Uses largest remainders, so the allocations sum to min(size, sum(counts))
+    and no stratum gets more than it has.
+    """
+    total = sum(counts)
+    if total <= size:
+        return list(counts)
+    shares = [count * size / total for count in counts]
+    allocation = [int(share) for share in shares]
+    by_remainder = sorted(range(len(counts)), key=lambda i: shares[i] - allocation[i], reverse=True)
+    for i in by_remainder[:size - sum(allocation)]:
+        allocation[i] += 1
+    return allocation
+
+
+async def _algolia_get(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    params: dict,
+    cache_ttl: Optional[float] = None
+) -> dict:
+    extensions = {"cache_ttl": cache_ttl} if cache_ttl is not None else None
+    async with semaphore:
+        response = await client.get(f"{HN_ALGOLIA_API}/search", params=params, extensions=extensions)
+    response.raise_for_status()
+    return response.json()
+
+
+async def _count_hits(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    query: str,
+    tag: str,
+    start: int,
+    end: int,
+    cache_ttl: Optional[float] = None
+) -> int:
+    """Exact number of hits from nbHits, without downloading any."""
+    data = await _algolia_get(client, semaphore, {
+        **_query_params(query),
+        "tags": tag,
+        "numericFilters": f"created_at_i>={start},created_at_i<{end}",
+        "hitsPerPage": 0,
+        "attributesToRetrieve": "",
+        "attributesToHighlight": "",
+    }, cache_ttl)
+    return data.get("nbHits", 0)
+
+
+async def _sample_comments(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    query: str,
+    start: int,
+    end: int,
+    size: int
+) -> List[str]:
+    data = await _algolia_get(client, semaphore, {
+        **_query_params(query),
+        "tags": "comment",
+        "numericFilters": f"created_at_i>={start},created_at_i<{end}",
+        "hitsPerPage": size,
+        "attributesToRetrieve": "comment_text",
+        "attributesToHighlight": "",
+    })
+    return [hit["comment_text"] for hit in data.get("hits", []) if hit.get("comment_text")]
+
+
+async def _count_hn(
+    tool_name: str,
+    days_back: int,
+    client: httpx.AsyncClient,
+    query: Optional[str] = None
+) -> Dict:
+    """Counts mode: exact daily story/comment counts and a stratified comment sample."""
+    query = (query or tool_name).lower()
+    semaphore = asyncio.Semaphore(HN_COUNT_CONCURRENCY)
+    now = time.time()
+    buckets = day_buckets(days_back, now)
+    
+    results = await asyncio.gather(
+        *[
+            _count_hits(
+                client, semaphore, query, tag, start, end,
+                HN_FINISHED_DAY_TTL if end <= now - HN_FINAL_AFTER_SECONDS else None
+            )
+            for start, end in buckets
+            for tag in ("story", "comment")
+        ],
+        return_exceptions=True
+    )
+    failed = [r for r in results if isinstance(r, Exception)]
+    if failed:
+        print(f"  ⚠️  {len(failed)} of {len(results)} HN count queries failed for {tool_name}: {failed[0]}")
+    counts = [0 if isinstance(r, Exception) else r for r in results]
+    
+    daily = [
+        {
+            "date": datetime.fromtimestamp(start, tz=timezone.utc).strftime("%Y-%m-%d"),
+            "stories": counts[2 * i],
+            "comments": counts[2 * i + 1],
+        }
+        for i, (start, _) in enumerate(buckets)
+    ]
+    story_count = sum(day["stories"] for day in daily)
+    comment_count = sum(day["comments"] for day in daily)
+    
+    # Sample comments across strata of several days, in proportion to volume
+    strata = [
+        (buckets[i][0], buckets[min(i + HN_SAMPLE_STRATUM_DAYS, len(buckets)) - 1][1],
+         sum(day["comments"] for day in daily[i:i + HN_SAMPLE_STRATUM_DAYS]))
+        for i in range(0, len(buckets), HN_SAMPLE_STRATUM_DAYS)
+    ]
+    allocation = allocate_sample([count for _, _, count in strata], HN_COMMENT_SAMPLE_SIZE)
+    samples = await asyncio.gather(
+        *[
+            _sample_comments(client, semaphore, query, start, end, size)
+            for (start, end, _), size in zip(strata, allocation) if size
+        ],
+        return_exceptions=True
+    )
+    comments = [text for sample in samples if not isinstance(sample, Exception) for text in sample]
+    
+    return {
+        "mentions_count": story_count + comment_count,
+        "story_count": story_count,
+        "comment_count": comment_count,
+        "daily": daily,
+        "comments": comments,
+        "stories": []
+    }
 
 
 async def _search_hn(
@@ -99,9 +303,6 @@ async def _search_hn(
                 if comment_text:
                     comments.append(comment_text)
         
-        # Rate limiting
-        await asyncio.sleep(0.5)
-        
         return {
             "mentions_count": mentions_count,
             "comments": comments,
@@ -124,12 +325,149 @@ async def _search_hn(
         }
 
 
+async def _sweep_search(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    words: List[str],
+    start: int,
+    end: int,
+    page: int = 0
+) -> dict:
+    query = " ".join(words)
+    return await _algolia_get(client, semaphore, {
+        "query": query,
+        "optionalWords": query,  # Any word matches
+        "tags": "(story,comment)",
+        "numericFilters": f"created_at_i>={start},created_at_i<{end}",
+        "hitsPerPage": HN_SWEEP_HITS_PER_PAGE,
+        "page": page,
+        "attributesToRetrieve": HN_SWEEP_ATTRIBUTES,
+        "attributesToHighlight": "",
+    })
+
+
+async def _sweep_slice(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    words: List[str],
+    start: int,
+    end: int
+) -> List[dict]:
+    """All hits in [start, end), halving the slice while it has more than Algolia returns."""
+    first = await _sweep_search(client, semaphore, words, start, end)
+    if first.get("nbHits", 0) > HN_SWEEP_MAX_HITS and end - start > HN_SWEEP_MIN_SLICE_SECONDS:
+        mid = (start + end) // 2
+        left, right = await asyncio.gather(
+            _sweep_slice(client, semaphore, words, start, mid),
+            _sweep_slice(client, semaphore, words, mid, end),
+        )
+        return left + right
+    
+    hits = list(first.get("hits", []))
+    nb_pages = min(first.get("nbPages", 1), HN_SWEEP_MAX_HITS // HN_SWEEP_HITS_PER_PAGE)
+    pages = await asyncio.gather(*[
+        _sweep_search(client, semaphore, words, start, end, page) for page in range(1, nb_pages)
+    ])
+    for data in pages:
+        hits.extend(data.get("hits", []))
+    return hits
+
+
+def _spread(items: List, size: int) -> List:
+    """Up to `size` items evenly spaced over the list (a sample stratified by position)."""
+    if len(items) <= size:
+        return list(items)
+    return [items[i * len(items) // size] for i in range(size)]
+
+
+async def sweep_hn_mentions(
+    tools: list,
+    days_back: int = 30,
+    client: httpx.AsyncClient = None
+) -> Dict[str, Dict]:
+    """
+    Find HN mentions of all tools in one sweep over the window.
+    
+    The number of requests depends on the mention volume, not the number of
+    tools. Comment texts are sampled evenly over time, up to
+    HN_COMMENT_SAMPLE_SIZE per tool.
+    
+    Returns:
+        Same shape as fetch_all_hn_mentions() in counts mode, plus "stories"
+    """
+    if client is None:
+        client = get_client()
+    matcher = ToolMatcher(tools)
+    words = matcher.query_words()
+    now = int(time.time())
+    start = now - days_back * DAY_SECONDS
+    slice_seconds = HN_SWEEP_SLICE_DAYS * DAY_SECONDS
+    semaphore = asyncio.Semaphore(HN_COUNT_CONCURRENCY)
+    
+    slices = await asyncio.gather(
+        *[_sweep_slice(client, semaphore, words, a, min(a + slice_seconds, now)) for a in range(start, now, slice_seconds)],
+        return_exceptions=True
+    )
+    hits = {}
+    for result in slices:
+        if isinstance(result, Exception):
+            print(f"  ⚠️  HN sweep slice failed: {result}")
+            continue
+        for hit in result:
+            hits[hit.get("objectID")] = hit
+    
+    buckets = day_buckets(days_back, now)
+    days = [datetime.fromtimestamp(a, tz=timezone.utc).strftime("%Y-%m-%d") for a, _ in buckets]
+    found = {
+        tool["name"]: {"daily": {day: {"date": day, "stories": 0, "comments": 0} for day in days}, "comments": [], "stories": []}
+        for tool in tools
+    }
+    for hit in sorted(hits.values(), key=lambda h: h.get("created_at_i") or 0):
+        kind = "comments" if "comment" in hit.get("_tags", []) else "stories"
+        text = " ".join(hit.get(field) or "" for field in ("title", "story_text", "comment_text"))
+        day = datetime.fromtimestamp(hit.get("created_at_i") or start, tz=timezone.utc).strftime("%Y-%m-%d")
+        for name in matcher.tools_in(text):
+            data = found[name]
+            if day in data["daily"]:
+                data["daily"][day][kind] += 1
+            if kind == "comments":
+                data["comments"].append(hit["comment_text"])
+            else:
+                data["stories"].append({
+                    "title": hit.get("title", ""),
+                    "url": hit.get("url", ""),
+                    "points": hit.get("points", 0),
+                    "created_at": hit.get("created_at", ""),
+                    "objectID": hit.get("objectID")
+                })
+    
+    results = {}
+    for name, data in found.items():
+        daily = list(data["daily"].values())
+        story_count = sum(day["stories"] for day in daily)
+        comment_count = sum(day["comments"] for day in daily)
+        results[name] = {
+            "mentions_count": story_count + comment_count,
+            "story_count": story_count,
+            "comment_count": comment_count,
+            "daily": daily,
+            "comments": _spread(data["comments"], HN_COMMENT_SAMPLE_SIZE),
+            "stories": data["stories"]
+        }
+    return results
+
+
 async def fetch_all_hn_mentions(
     tools: list,
-    days_back: int = 30
+    days_back: int = 30,
+    mode: str = HN_MENTION_MODE,
+    on_result: Optional[Callable[[str, Dict], None]] = None
 ) -> Dict[str, Dict]:
     """
-    Fetch HN mentions for all tools.
+    Fetch HN mentions for all tools, searching for the tools concurrently.
+    
+    Args:
+        on_result: Called with (tool_name, data) as soon as a tool's data is ready
     
     Returns:
         {
@@ -142,16 +480,26 @@ async def fetch_all_hn_mentions(
     """
     results = {}
     
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        for tool in tools:
-            name = tool["name"]
-            print(f"📡 Searching Hacker News for {name}...")
-            
-            data = await search_hn_mentions(name, days_back, client)
+    async with shared_client() as client:
+        if mode == "sweep":
+            print(f"📡 Sweeping Hacker News for {len(tools)} tools...")
+            results = await sweep_hn_mentions(tools, days_back, client)
+            for name, data in results.items():
+                print(f"  ✅ {name}: {data['mentions_count']} mentions")
+                if on_result:
+                    on_result(name, data)
+            return results
+        
+        async def search(name: str, query: Optional[str]):
+            data = await search_hn_mentions(name, days_back, client, mode=mode, query=query)
             results[name] = data
-            
-            print(f"  ✅ Found {data['mentions_count']} mentions")
+            print(f"  ✅ HN {name}: {data['mentions_count']} mentions")
+            if on_result:
+                on_result(name, data)
+        
+        print(f"📡 Searching Hacker News for {len(tools)} tools...")
+        await asyncio.gather(*[
+            search(tool["name"], tool.get("search_query") if mode == "counts" else None) for tool in tools
+        ])
     
-    return results
-
-
+    return {tool["name"]: results[tool["name"]] for tool in tools}
@@ -1,16 +1,30 @@
 """
 Reddit API Fetcher for Coding Assistants
-Uses public JSON endpoint (no auth required)
+Uses the public JSON endpoints, or OAuth when REDDIT_CLIENT_ID/REDDIT_CLIENT_SECRET are set
+
+Modes:
+- "search" (default): one search per tool and subreddit
+- "sweep": reads the combined r/a+b+c/new listing once for the window and
+  attributes posts to tools locally with a ToolMatcher; falls back to
+  search when the listing's ~1000 posts do not reach back to the cutoff
 """
-import httpx
 import asyncio
+import httpx
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional
 import time
 
-REDDIT_API_BASE = "https://www.reddit.com"
+from ...collectors import reddit as reddit_collector
+from ...collectors.reddit import fetch_listing
+from ...utils.http_client import get_client, shared_client
+from ...utils.reddit_auth import reddit_get
+from .tool_matcher import ToolMatcher
+
 REDDIT_SUBREDDITS = ["programming", "vscode", "neovim", "coding"]
 
+REDDIT_MENTION_MODE = "search"
+REDDIT_COMMENT_LIMIT = 100  # Post texts per tool for sentiment (sweep mode)
+
 
 async def search_reddit_mentions(
     tool_name: str,
@@ -32,10 +46,8 @@ async def search_reddit_mentions(
         subreddits = REDDIT_SUBREDDITS
     
     if client is None:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            return await _search_reddit(tool_name, subreddits, days_back, client)
-    else:
-        return await _search_reddit(tool_name, subreddits, days_back, client)
+        client = get_client()
+    return await _search_reddit(tool_name, subreddits, days_back, client)
 
 
 async def _search_reddit(
@@ -49,16 +61,12 @@ async def _search_reddit(
     all_posts = []
     total_mentions = 0
     
-    headers = {
-        "User-Agent": "AI-News-Agent/1.0 (by /u/ai-news-agent)"
-    }
-    
     try:
         # Search in each subreddit
         for subreddit in subreddits:
             try:
                 # Search posts
-                url = f"{REDDIT_API_BASE}/r/{subreddit}/search.json"
+                path = f"/r/{subreddit}/search.json"
                 params = {
                     "q": tool_name,
                     "t": "month",  # Last month
@@ -66,7 +74,7 @@ async def _search_reddit(
                     "restrict_sr": "true"
                 }
                 
-                response = await client.get(url, params=params, headers=headers)
+                response = await reddit_get(client, path, params=params)
                 
                 if response.status_code == 200:
                     data = response.json()
@@ -90,16 +98,12 @@ async def _search_reddit(
                             all_comments.append(selftext)
                     
                     total_mentions += len(children)
-                
-                # Rate limiting - Reddit allows 60 requests per minute
-                await asyncio.sleep(1.0)
+                elif response.status_code == 429:
+                    # The shared rate limiter already waited and retried
+                    print(f"  ⚠️  Rate limited on r/{subreddit}, skipping")
                 
             except httpx.HTTPStatusError as e:
-                if e.response.status_code == 429:
-                    print(f"  ⚠️  Rate limited on r/{subreddit}, waiting...")
-                    await asyncio.sleep(5.0)
-                else:
-                    print(f"  ⚠️  Error searching r/{subreddit}: {e}")
+                print(f"  ⚠️  Error searching r/{subreddit}: {e}")
                 continue
             except Exception as e:
                 print(f"  ⚠️  Error searching r/{subreddit}: {e}")
@@ -120,14 +124,78 @@ async def _search_reddit(
         }
 
 
+async def sweep_reddit_mentions(
+    tools: list,
+    subreddits: List[str] = None,
+    days_back: int = 30,
+    client: httpx.AsyncClient = None
+) -> Dict[str, Dict]:
+    """
+    Find Reddit mentions of all tools in one pass over the combined new listing.
+    
+    The number of requests depends on how many posts the subreddits get in
+    the window, not on the number of tools. Reddit serves at most ~1000 posts
+    per listing; if those do not reach back to the cutoff, the counts would
+    be too low, so each tool is searched instead.
+    
+    Returns:
+        Same shape as fetch_all_reddit_mentions()
+    """
+    if subreddits is None:
+        subreddits = REDDIT_SUBREDDITS
+    if client is None:
+        client = get_client()
+    matcher = ToolMatcher(tools)
+    cutoff = time.time() - days_back * 86400
+    results = {tool["name"]: {"mentions_count": 0, "comments": [], "posts": []} for tool in tools}
+    pages = 0
+    oldest = time.time()
+    
+    async for page in fetch_listing(client, subreddits, "new", cutoff):
+        pages += 1
+        if page:
+            oldest = min(oldest, page[-1].get("created_utc", oldest))
+        for post_data in page:
+            if post_data.get("created_utc", 0) < cutoff:
+                continue
+            selftext = post_data.get("selftext", "")
+            for name in matcher.tools_in(f"{post_data.get('title', '')} {selftext}"):
+                data = results[name]
+                data["mentions_count"] += 1
+                data["posts"].append({
+                    "title": post_data.get("title", ""),
+                    "subreddit": post_data.get("subreddit", ""),
+                    "score": post_data.get("score", 0),
+                    "num_comments": post_data.get("num_comments", 0),
+                    "created_utc": post_data.get("created_utc"),
+                    "url": post_data.get("url", "")
+                })
+                if selftext and len(data["comments"]) < REDDIT_COMMENT_LIMIT:
+                    data["comments"].append(selftext)
+    
+    if pages >= reddit_collector.REDDIT_MAX_PAGES and oldest >= cutoff:
+        print(f"  ⚠️  The new listing does not reach back {days_back} days, searching per tool instead")
+        searches = await asyncio.gather(
+            *[search_reddit_mentions(tool["name"], subreddits, days_back, client) for tool in tools]
+        )
+        return {tool["name"]: data for tool, data in zip(tools, searches)}
+    
+    return results
+
+
 async def fetch_all_reddit_mentions(
     tools: list,
     subreddits: List[str] = None,
-    days_back: int = 30
+    days_back: int = 30,
+    mode: str = REDDIT_MENTION_MODE,
+    on_result: Optional[Callable[[str, Dict], None]] = None
 ) -> Dict[str, Dict]:
     """
     Fetch Reddit mentions for all tools.
     
+    Args:
+        on_result: Called with (tool_name, data) as soon as a tool's data is ready
+    
     Returns:
         {
             "tool_name": {
@@ -137,18 +205,28 @@ async def fetch_all_reddit_mentions(
             }
         }
     """
+    if mode not in ("sweep", "search"):
+        raise ValueError(f"Unknown Reddit mention mode: {mode}")
     results = {}
     
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        for tool in tools:
-            name = tool["name"]
-            print(f"📡 Searching Reddit for {name}...")
-            
+    async with shared_client() as client:
+        if mode == "sweep":
+            print(f"📡 Sweeping Reddit for {len(tools)} tools...")
+            results = await sweep_reddit_mentions(tools, subreddits, days_back, client)
+            for name, data in results.items():
+                print(f"  ✅ {name}: {data['mentions_count']} mentions")
+                if on_result:
+                    on_result(name, data)
+            return results
+        
+        async def search(name: str):
             data = await search_reddit_mentions(name, subreddits, days_back, client)
             results[name] = data
-            
-            print(f"  ✅ Found {data['mentions_count']} mentions")
+            print(f"  ✅ Reddit {name}: {data['mentions_count']} mentions")
+            if on_result:
+                on_result(name, data)
+        
+        print(f"📡 Searching Reddit for {len(tools)} tools...")
+        await asyncio.gather(*[search(tool["name"]) for tool in tools])
     
-    return results
-
-
+    return {tool["name"]: results[tool["name"]] for tool in tools}
@@ -0,0 +1,60 @@
+"""
+Attribute texts to coding assistant tools by name and aliases
+
+All names and aliases are compiled into one KeywordMatcher, so a sweep over a
+source scans each text once, however many tools are tracked.
+"""
+import re
+from typing import Dict, Iterable, List
+
+from ...utils.keywords import KeywordMatcher
+
+
+def tool_aliases(tool: Dict) -> List[str]:
+    """
+    The tool's name followed by its aliases.
+
+    Tools with "match_name": False (names that are common words) are matched
+    on their search_query phrase and aliases only, never on the bare name.
+    """
+    if tool.get("match_name", True):
+        names = [tool["name"]]
+    else:
+        names = [tool["search_query"].strip('"')] if tool.get("search_query") else []
+    return names + list(tool.get("aliases", []))
+
+
+class ToolMatcher:
+    """
+    Compiled name/alias matcher for a list of tools.
+
+    Usage:
+        matcher = ToolMatcher(CODING_ASSISTANTS)
+        matcher.tools_in("Switched from Copilot to Cursor")  # ["GitHub Copilot", "Cursor"]
+    """
+
+    def __init__(self, tools: Iterable[Dict]):
+        self._tool_by_alias: Dict[str, str] = {}
+        for tool in tools:
+            for alias in tool_aliases(tool):
+                self._tool_by_alias.setdefault(alias.lower(), tool["name"])
+        self._matcher = KeywordMatcher(self._tool_by_alias, boundaries="word")
+
+    def tools_in(self, text: str) -> List[str]:
+        """Tool names mentioned in the text, in order of first mention."""
+        return list(dict.fromkeys(
+            self._tool_by_alias[alias.lower()] for alias in self._matcher.find_all(text)
+        ))
+
+    def query_words(self) -> List[str]:
+        """
+        Words for an any-word search query that finds every possible mention.
+
+        One word (the longest) per name or alias is enough, since a mention
+        contains all of its words; the rest only widen the search.
+        """
+        words = (
+            max(re.split(r"[^a-z0-9]+", alias), key=len)
+            for alias in self._tool_by_alias
+        )
+        return list(dict.fromkeys(word for word in words if word))
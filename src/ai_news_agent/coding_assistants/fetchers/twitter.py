@@ -0,0 +1,48 @@
+"""
+X/Twitter Mention Volume Fetcher for Coding Assistants
+Uses the tweets/counts/recent endpoint: one request per tool, no tweet payloads
+Note: Requires TWITTER_BEARER_TOKEN; returns nothing without it
+"""
+from typing import Dict, List
+
+from ...collectors.twitter import TWITTER_RECENT_DAYS, fetch_mention_volume
+
+
+def tool_query(tool: Dict) -> str:
+    """
+    Search query for a tool: its search_query if set, else the name
+    (phrases are quoted).
+    """
+    if tool.get("search_query"):
+        return tool["search_query"]
+    name = tool["name"]
+    return name if name.isalnum() else f'"{name}"'
+
+
+async def fetch_all_twitter_mentions(
+    tools: List[Dict],
+    days_back: int = TWITTER_RECENT_DAYS
+) -> Dict[str, Dict]:
+    """
+    Fetch daily X/Twitter mention volume for all tools.
+    
+    Returns:
+        {
+            "tool_name": {
+                "mentions_count": int,
+                "daily": List[Dict]  # [{"start": iso, "count": int}, ...]
+            }
+        }
+    """
+    print(f"📡 Counting X/Twitter mentions for {len(tools)} tools...")
+    volume = await fetch_mention_volume(
+        {tool["name"]: tool_query(tool) for tool in tools},
+        days_back=min(days_back, TWITTER_RECENT_DAYS)
+    )
+    
+    results = {}
+    for name, counts in volume.items():
+        results[name] = {"mentions_count": counts["total"], "daily": counts["series"]}
+        print(f"  ✅ {name}: {counts['total']} mentions")
+    
+    return results
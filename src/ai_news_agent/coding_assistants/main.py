@@ -8,7 +8,7 @@ import argparse
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 from .config import (
     CODING_ASSISTANTS,
@@ -17,9 +17,11 @@ from .config import (
     SCORES_DATA_DIR,
     OUTPUT_DIR
 )
+from ..utils.http_client import close_client
 from .fetchers.github import fetch_all_github_stats
 from .fetchers.hackernews import fetch_all_hn_mentions
 from .fetchers.reddit import fetch_all_reddit_mentions
+from .fetchers.twitter import fetch_all_twitter_mentions
 from .analyzers.sentiment import analyze_sentiment_batch, normalize_sentiment
 from .analyzers.scoring import (
     calculate_buzz_score,
@@ -30,34 +32,51 @@ from .analyzers.scoring import (
 )
 
 
-async def fetch_all_data(tools: List[Dict], days_back: int = 30) -> Dict[str, Dict]:
+async def fetch_all_data(
+    tools: List[Dict],
+    days_back: int = 30,
+    on_comments: Optional[Callable[[str, str, List[str]], None]] = None
+) -> Dict[str, Dict]:
     """
     Fetch all data from all sources.
     
+    The sources run concurrently, and so do the tools within each source, all
+    under the shared client's per-host rate limits; the slowest source bounds
+    the wall time.
+    
+    Args:
+        tools: Tools to fetch data for
+        days_back: Number of days to look back
+        on_comments: Called with (source, tool_name, comments) as soon as a
+            tool's HN or Reddit texts arrive
+    
     Returns:
         {
             "tool_name": {
                 "github": {...},
                 "hn": {...},
-                "reddit": {...}
+                "reddit": {...},
+                "twitter": {...}
             }
         }
     """
     print("=" * 60)
     print("📡 Fetching data from all sources...")
     print("=" * 60)
+    print(f"\n⚡ GitHub, Hacker News, Reddit and X/Twitter in parallel for {len(tools)} tool(s)\n")
     
-    # Fetch GitHub data
-    print("\n1️⃣  GitHub API")
-    github_results = await fetch_all_github_stats(tools, cache_dir=RAW_DATA_DIR)
-    
-    # Fetch HN data
-    print("\n2️⃣  Hacker News API")
-    hn_results = await fetch_all_hn_mentions(tools, days_back=days_back)
+    def comments_from(source: str):
+        if on_comments is None:
+            return None
+        return lambda name, data: on_comments(source, name, data.get("comments", []))
     
-    # Fetch Reddit data
-    print("\n3️⃣  Reddit API")
-    reddit_results = await fetch_all_reddit_mentions(tools, days_back=days_back)
+    github_results, hn_results, reddit_results, twitter_results = await asyncio.gather(
+        fetch_all_github_stats(tools, cache_dir=RAW_DATA_DIR),
+        fetch_all_hn_mentions(tools, days_back=days_back, on_result=comments_from("hn")),
+        fetch_all_reddit_mentions(tools, days_back=days_back, on_result=comments_from("reddit")),
+        # X/Twitter mention volume (counts only, last 7 days)
+        fetch_all_twitter_mentions(tools, days_back=days_back)
+    )
     
     # Combine all data
     all_data = {}
@@ -66,16 +85,25 @@ async def fetch_all_data(tools: List[Dict], days_back: int = 30) -> Dict[str, Di
         all_data[name] = {
             "github": github_results.get(name, {}),
             "hn": hn_results.get(name, {}),
-            "reddit": reddit_results.get(name, {})
+            "reddit": reddit_results.get(name, {}),
+            "twitter": twitter_results.get(name, {})
         }
     
     return all_data
 
 
-def analyze_sentiments(all_data: Dict[str, Dict]) -> Dict[str, Dict]:
+def analyze_sentiments(
+    all_data: Dict[str, Dict],
+    raw_scores: Optional[Dict[Tuple[str, str], float]] = None
+) -> Dict[str, Dict]:
     """
     Analyze sentiments for all tools.
     
+    Args:
+        all_data: Output of fetch_all_data()
+        raw_scores: Average compound scores already computed, keyed by
+            (tool_name, source); missing ones are computed here
+    
     Returns:
         {
             "tool_name": {
@@ -88,19 +116,22 @@ def analyze_sentiments(all_data: Dict[str, Dict]) -> Dict[str, Dict]:
     print("💭 Analyzing sentiments...")
     print("=" * 60)
     
+    raw_scores = raw_scores or {}
     sentiments = {}
     
     for tool_name, data in all_data.items():
         print(f"\n📊 Analyzing {tool_name}...")
         
         # HN sentiment
-        hn_comments = data.get("hn", {}).get("comments", [])
-        hn_sentiment_raw = analyze_sentiment_batch(hn_comments)
+        hn_sentiment_raw = raw_scores.get((tool_name, "hn"))
+        if hn_sentiment_raw is None:
+            hn_sentiment_raw = analyze_sentiment_batch(data.get("hn", {}).get("comments", []))
         hn_sentiment = normalize_sentiment(hn_sentiment_raw)
         
         # Reddit sentiment
-        reddit_comments = data.get("reddit", {}).get("comments", [])
-        reddit_sentiment_raw = analyze_sentiment_batch(reddit_comments)
+        reddit_sentiment_raw = raw_scores.get((tool_name, "reddit"))
+        if reddit_sentiment_raw is None:
+            reddit_sentiment_raw = analyze_sentiment_batch(data.get("reddit", {}).get("comments", []))
         reddit_sentiment = normalize_sentiment(reddit_sentiment_raw)
         
         sentiments[tool_name] = {
@@ -113,6 +144,31 @@ def analyze_sentiments(all_data: Dict[str, Dict]) -> Dict[str, Dict]:
     return sentiments
 
 
+async def fetch_and_analyze(
+    tools: List[Dict],
+    days_back: int = 30
+) -> Tuple[Dict[str, Dict], Dict[str, Dict]]:
+    """
+    Fetch all data and analyze sentiments, overlapping the two.
+    
+    Each tool's HN and Reddit texts are scored in a worker thread as soon as
+    they arrive, while the other sources are still being fetched.
+    
+    Returns:
+        (all_data, sentiments) as from fetch_all_data() and analyze_sentiments()
+    """
+    pending: Dict[Tuple[str, str], asyncio.Task] = {}
+    
+    def start_analysis(source: str, tool_name: str, comments: List[str]):
+        pending[(tool_name, source)] = asyncio.create_task(
+            asyncio.to_thread(analyze_sentiment_batch, comments)
+        )
+    
+    all_data = await fetch_all_data(tools, days_back=days_back, on_comments=start_analysis)
+    raw_scores = dict(zip(pending, await asyncio.gather(*pending.values())))
+    return all_data, analyze_sentiments(all_data, raw_scores)
+
+
 def calculate_scores(
     all_data: Dict[str, Dict],
     sentiments: Dict[str, Dict]
@@ -245,11 +301,9 @@ async def main(tool_name: Optional[str] = None, days_back: int = LOOKBACK_DAYS):
     print(f"📋 Processing {len(tools)} tool(s)")
     print(f"📅 Lookback period: {days_back} days")
     
-    # Fetch all data
-    all_data = await fetch_all_data(tools, days_back=days_back)
-    
-    # Analyze sentiments
-    sentiments = analyze_sentiments(all_data)
+    # Fetch all data, analyzing sentiments as each tool's texts arrive
+    all_data, sentiments = await fetch_and_analyze(tools, days_back=days_back)
+    await close_client()
     
     # Calculate scores
     scores = calculate_scores(all_data, sentiments)
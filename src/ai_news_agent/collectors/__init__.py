@@ -1,11 +1,15 @@
-from .hackernews import collect_ai_mentions
-from .github import collect_github_trending
-from .reddit import collect_reddit_posts
-from .twitter import collect_twitter_posts
+from .hackernews import collect_ai_mentions, stream_ai_mentions
+from .github import collect_github_trending, stream_github_trending
+from .reddit import collect_reddit_posts, stream_reddit_posts
+from .twitter import collect_twitter_posts, stream_twitter_posts
 
 __all__ = [
     "collect_ai_mentions",
     "collect_github_trending",
     "collect_reddit_posts",
     "collect_twitter_posts",
+    "stream_ai_mentions",
+    "stream_github_trending",
+    "stream_reddit_posts",
+    "stream_twitter_posts",
 ]
@@ -3,11 +3,17 @@ GitHub Trending data collector using GitHub Search API
 """
 import httpx
 import asyncio
-from datetime import datetime, timedelta
+from dataclasses import dataclass, replace
+from datetime import date, datetime, timedelta
 from typing import Optional
 import json
 import os
 from ..config import AI_KEYWORDS, LOOKBACK_DAYS
+from ..utils.github_graphql import fetch_repo_stats
+from ..utils.http_client import shared_client
+from ..utils.keywords import get_ai_matcher, match_ai_keywords
+from ..utils.resilience import CircuitOpenError, record_lost
+from ..models import Post
 
 
 # GitHub API base URL
@@ -19,41 +25,182 @@ MIN_GITHUB_STARS = 10
 # Optional: GitHub token for higher rate limit (60 req/hour without, 5000 with)
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN", None)
 
+# GitHub Search: maks 1000 treff per søk, 100 per side, fem operatorer og 256 tegn per søk
+GITHUB_SEARCH_CAP = 1000
+GITHUB_PER_PAGE = 100
+GITHUB_MAX_OR_TERMS = 6
+GITHUB_MAX_TERMS_LENGTH = 200   # Plass til stars:/pushed:-kvalifikatorene innenfor 256 tegn
+GITHUB_SEARCH_CONCURRENCY = 4
+
 
 async def search_github_repos(
     days_back: int = LOOKBACK_DAYS,
     min_stars: int = MIN_GITHUB_STARS,
-    max_results: int = 100
-) -> list[dict]:
+    max_results: Optional[int] = 100
+) -> list[Post]:
     """
     Søk etter AI-relaterte GitHub repositories som har blitt opprettet eller oppdatert nylig.
     
     Args:
         days_back: Antall dager tilbake å søke
         min_stars: Minimum antall stars for å inkludere repo
-        max_results: Maks antall resultater (GitHub API limit er 1000, men vi tar 100 per default)
+        max_results: Maks antall resultater (None = alle som matcher)
     
     Returns:
         Liste med AI-relaterte repositories, sortert etter stars
     """
-    cutoff_date = (datetime.now() - timedelta(days=days_back)).strftime("%Y-%m-%d")
+    ai_repos = [
+        repo async for repo in stream_github_repos(
+            days_back=days_back, min_stars=min_stars, max_results=max_results
+        )
+    ]
+    
+    # Sorter etter stars (points)
+    ai_repos.sort(key=lambda x: x["points"], reverse=True)
+    
+    return ai_repos
+
+
+@dataclass(frozen=True)
+class SearchPartition:
+    """Ett delsøk: en gruppe AI-søkeord innenfor et stjerne- og pushed-intervall."""
+    terms: tuple[str, ...]
+    min_stars: int
+    max_stars: Optional[int]  # None = ingen øvre grense
+    pushed_from: date
+    pushed_to: date
     
-    # Bygg søkequery for GitHub API
-    # Søker etter repos som er opprettet eller oppdatert nylig, sortert etter stars
-    # Vi bruker "pushed" i stedet for "created" for å fange repos som er aktive
-    query_parts = [
-        f"pushed:>{cutoff_date}",   # Oppdatert i løpet av lookback-perioden (mer fleksibelt)
-        f"stars:>={min_stars}",      # Minimum stars
+    def query(self) -> str:
+        """Bygg q-parameteren til GitHub Search API."""
+        stars = f"stars:>={self.min_stars}" if self.max_stars is None else f"stars:{self.min_stars}..{self.max_stars}"
+        return f"{' OR '.join(self.terms)} {stars} pushed:{self.pushed_from}..{self.pushed_to}"
+    
+    def split(self) -> Optional[tuple["SearchPartition", "SearchPartition"]]:
+        """
+        Del i to disjunkte delsøk: først på stars, så på pushed-dato.
+        
+        Returns:
+            To halvdeler, eller None hvis intervallene ikke kan deles mer
+        """
+        if self.max_stars is None:
+            mid = max(self.min_stars * 2, self.min_stars + 1) - 1
+            return replace(self, max_stars=mid), replace(self, min_stars=mid + 1)
+        if self.max_stars > self.min_stars:
+            mid = (self.min_stars + self.max_stars) // 2
+            return replace(self, max_stars=mid), replace(self, min_stars=mid + 1)
+        if self.pushed_to > self.pushed_from:
+            mid = self.pushed_from + (self.pushed_to - self.pushed_from) // 2
+            return replace(self, pushed_to=mid), replace(self, pushed_from=mid + timedelta(days=1))
+        return None
+
+
+def _search_term(keyword: str) -> str:
+    """Sett fraser og ord med tegn i anførselstegn, så de søkes som én term."""
+    return keyword if keyword.isalnum() else f'"{keyword}"'
+
+
+def keyword_groups(keywords: list[str] = AI_KEYWORDS) -> list[tuple[str, ...]]:
+    """
+    Del søkeordene i OR-grupper som holder seg innenfor GitHubs grenser
+    (maks fem operatorer og 256 tegn per søk).
+    """
+    groups = []
+    group = []
+    for term in dict.fromkeys(_search_term(k.lower()) for k in keywords):
+        candidate = group + [term]
+        if group and (len(candidate) > GITHUB_MAX_OR_TERMS or len(" OR ".join(candidate)) > GITHUB_MAX_TERMS_LENGTH):
+            groups.append(tuple(group))
+            candidate = [term]
+        group = candidate
+    if group:
+        groups.append(tuple(group))
+    return groups
+
+
+def plan_github_queries(days_back: int = LOOKBACK_DAYS, min_stars: int = MIN_GITHUB_STARS) -> list[SearchPartition]:
+    """Startplan: ett delsøk per søkeordgruppe over hele stjerne- og datointervallet."""
+    today = datetime.now().date()
+    cutoff = today - timedelta(days=days_back)
+    return [
+        SearchPartition(terms, min_stars, None, cutoff, today)
+        for terms in keyword_groups()
     ]
-    # Note: Vi fjerner "topic:ai" fordi det er for restriktivt.
-    # Vi filtrerer på AI-relevans i is_ai_relevant() i stedet.
+
+
+async def _github_search(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    partition: SearchPartition,
+    page: int,
+    stats: dict
+) -> dict:
+    """Hent én side (sortert etter stars) for et delsøk."""
+    params = {
+        "q": partition.query(),
+        "sort": "stars",
+        "order": "desc",
+        "per_page": GITHUB_PER_PAGE,
+        "page": page
+    }
+    async with semaphore:
+        stats["requests"] += 1
+        response = await client.get(GITHUB_API_BASE, headers=_github_headers(), params=params)
     
-    query = " ".join(query_parts)
+    # Rate limiting håndteres av den delte limiteren; 403 her betyr
+    # at kvoten ikke fornyes innen RATE_LIMIT_MAX_WAIT
+    if response.status_code == 403 and response.headers.get("X-RateLimit-Remaining", "0") == "0":
+        print("⚠️  GitHub API rate limit nådd. Prøv igjen senere.")
+    response.raise_for_status()
+    return response.json()
+
+
+async def fetch_github_partition(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    partition: SearchPartition,
+    limit: Optional[int],
+    stats: dict
+) -> list[dict]:
+    """
+    Hent repos for et delsøk, høyest stars først.
+    
+    GitHub gir maks 1000 treff per søk. Når et delsøk har flere treff enn
+    det og vi trenger alle (`limit` over taket eller None), deles det i to
+    disjunkte delsøk som hentes parallelt. Ellers hentes bare sidene som
+    trengs for de `limit` største; øvrige sider hentes parallelt.
+    """
+    first = await _github_search(client, semaphore, partition, 1, stats)
+    total = first.get("total_count", 0)
     
-    # Debug: print query for troubleshooting
-    print(f"   GitHub query: {query}")
+    if total > GITHUB_SEARCH_CAP and (limit is None or limit > GITHUB_SEARCH_CAP):
+        halves = partition.split()
+        if halves:
+            stats["partitions"] += 1
+            results = await asyncio.gather(
+                *[fetch_github_partition(client, semaphore, half, limit, stats) for half in halves]
+            )
+            return [repo for result in results for repo in result]
+        print(f"   ⚠️  Delsøket kan ikke deles mer; henter bare {GITHUB_SEARCH_CAP} av {total}: {partition.query()}")
     
-    # Headers for GitHub API
+    repos = list(first.get("items", []))
+    wanted = min(total, GITHUB_SEARCH_CAP, limit if limit is not None else total)
+    pages = -(-wanted // GITHUB_PER_PAGE)
+    if pages > 1:
+        results = await asyncio.gather(
+            *[_github_search(client, semaphore, partition, page, stats) for page in range(2, pages + 1)],
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                # Siden er prøvd på nytt av transporten; resten av delsøket er fortsatt gyldig
+                print(f"   ⚠️  Feil ved GitHub-side: {result}")
+                record_lost("github", unit="pages")
+                continue
+            repos.extend(result.get("items", []))
+    return repos
+
+
+def _github_headers() -> dict:
     headers = {
         "Accept": "application/vnd.github.v3+json",
         "User-Agent": "AI-News-Agent/1.0"
@@ -62,136 +209,89 @@ async def search_github_repos(
     # Legg til token hvis tilgjengelig (for høyere rate limit)
     if GITHUB_TOKEN:
         headers["Authorization"] = f"token {GITHUB_TOKEN}"
+    return headers
+
+
+async def stream_github_repos(
+    days_back: int = LOOKBACK_DAYS,
+    min_stars: int = MIN_GITHUB_STARS,
+    max_results: Optional[int] = 100
+):
+    """
+    Gi ut AI-relaterte repos fra et partisjonert søk.
     
-    ai_repos = []
-    page = 1
-    per_page = min(100, max_results)  # GitHub API max er 100 per page
+    Søket deles i disjunkte delsøk per søkeordgruppe (og ved behov stjerne- og
+    datointervaller) som hentes parallelt innenfor rate-budsjettet. Resultatene
+    slås sammen uten duplikater. Med `max_results` gis de største ut sortert
+    etter stars når alle delsøk er ferdige; med None gis alle ut etter hvert.
     
-    print(f"📡 Søker GitHub etter AI-repos (siste {days_back} dager, min {min_stars} stars)...")
+    Samme argumenter som search_github_repos().
+    """
+    plan = plan_github_queries(days_back, min_stars)
+    print(f"📡 Søker GitHub etter AI-repos (siste {days_back} dager, min {min_stars} stars) "
+          f"med {len(plan)} delsøk...")
     
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        while len(ai_repos) < max_results:
-            try:
-                params = {
-                    "q": query,
-                    "sort": "stars",      # Sorter etter stars (separat parameter)
-                    "order": "desc",      # Høyest først (separat parameter)
-                    "per_page": per_page,
-                    "page": page
-                }
-                
-                response = await client.get(
-                    GITHUB_API_BASE,
-                    headers=headers,
-                    params=params
-                )
-                
-                # Håndter rate limiting
-                if response.status_code == 403:
-                    rate_limit_remaining = response.headers.get("X-RateLimit-Remaining", "0")
-                    if rate_limit_remaining == "0":
-                        reset_time = response.headers.get("X-RateLimit-Reset", "0")
-                        print(f"⚠️  GitHub API rate limit nådd. Prøv igjen senere.")
-                        break
-                
-                response.raise_for_status()
-                data = response.json()
-                
-                total_count = data.get("total_count", 0)
-                repos = data.get("items", [])
-                
-                if page == 1:
-                    print(f"   GitHub API fant {total_count} totale repos som matcher query")
-                
-                if not repos:
-                    break  # Ingen flere resultater
-                
-                print(f"   Hentet {len(repos)} repos fra side {page}...")
+    stats = {"requests": 0, "partitions": len(plan)}
+    semaphore = asyncio.Semaphore(GITHUB_SEARCH_CONCURRENCY)
+    seen = set()
+    found = []
+    fetched = 0
+    
+    async with shared_client() as client:
+        tasks = [
+            asyncio.create_task(fetch_github_partition(client, semaphore, partition, max_results, stats))
+            for partition in plan
+        ]
+        try:
+            for task in asyncio.as_completed(tasks):
+                try:
+                    repos = await task
+                except CircuitOpenError as e:
+                    print(f"⚠️  GitHub API svarer ikke: {e}")
+                    record_lost("github", unit="queries")
+                    continue
+                except httpx.HTTPStatusError as e:
+                    print(f"⚠️  HTTP feil ved GitHub API: {e.response.status_code}")
+                    record_lost("github", unit="queries")
+                    continue
+                except Exception as e:
+                    print(f"⚠️  Feil ved GitHub API: {e}")
+                    record_lost("github", unit="queries")
+                    continue
                 
-                # Filtrer og normaliser repos
-                ai_count_before = len(ai_repos)
+                fetched += len(repos)
                 for repo in repos:
-                    if is_ai_relevant(repo):
-                        normalized = normalize_repo(repo)
-                        ai_repos.append(normalized)
-                    
-                    if len(ai_repos) >= max_results:
-                        break
-                
-                # Debug: vis hvor mange som ble filtrert bort
-                if len(repos) > 0:
-                    filtered_out = len(repos) - (len(ai_repos) - ai_count_before)
-                    if filtered_out > 0:
-                        print(f"      Filtrerte bort {filtered_out} repos (ikke AI-relevante)")
-                
-                # Rate limiting: GitHub tillater 60 req/hour uten token, 5000 med token
-                await asyncio.sleep(0.5)  # Vær snill med API
-                
-                page += 1
-                
-                # GitHub API har maks 1000 resultater totalt
-                if page > 10:  # 10 pages * 100 = 1000 max
-                    break
-                    
-            except httpx.HTTPStatusError as e:
-                print(f"⚠️  HTTP feil ved GitHub API: {e.response.status_code}")
-                if e.response.status_code == 403:
-                    print("   Rate limit nådd eller manglende tilgang")
-                break
-            except Exception as e:
-                print(f"⚠️  Feil ved GitHub API: {e}")
-                break
+                    if repo.get("id") in seen:
+                        continue
+                    seen.add(repo.get("id"))
+                    keywords = repo_keywords(repo)
+                    if not keywords:
+                        continue
+                    post = normalize_repo(repo, keywords)
+                    if max_results is None:
+                        yield post
+                    found.append(post)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
     
-    # Sorter etter stars (points)
-    ai_repos.sort(key=lambda x: x["points"], reverse=True)
+    if max_results is not None:
+        found.sort(key=lambda x: x["points"], reverse=True)
+        for post in found[:max_results]:
+            yield post
     
-    print(f"✅ Fant {len(ai_repos)} AI-relaterte GitHub repos")
-    
-    return ai_repos
+    useful = len(found) / stats["requests"] if stats["requests"] else 0.0
+    print(f"   GitHub: {stats['requests']} forespørsler i {stats['partitions']} delsøk, "
+          f"{fetched} repos hentet, {len(found)} unike AI-repos ({useful:.1f} per forespørsel)")
+    print(f"✅ Fant {min(len(found), max_results or len(found))} AI-relaterte GitHub repos")
 
 
-def normalize_repo(raw: dict) -> dict:
+def normalize_repo(raw: dict, keywords: Optional[list[str]] = None) -> Post:
     """
     Normaliser GitHub repo til vårt format (samme som HN-posts).
     """
-    repo_id = raw.get("id", "")
-    created_at = raw.get("created_at", "")
-    updated_at = raw.get("updated_at", "")
-    
-    # Bruk created_at hvis tilgjengelig, ellers updated_at
-    date_str = created_at or updated_at or ""
-    
-    # Parse ISO format til vårt format
-    if date_str:
-        try:
-            dt = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-            date_str = dt.isoformat()
-        except:
-            date_str = ""
-    
-    # Bygg full URL
-    html_url = raw.get("html_url", "")
-    owner = raw.get("owner", {})
-    owner_login = owner.get("login", "")
-    repo_name = raw.get("name", "")
-    
-    if not html_url and owner_login and repo_name:
-        html_url = f"https://github.com/{owner_login}/{repo_name}"
-    
-    return {
-        "id": f"github-{repo_id}",
-        "title": raw.get("name", ""),
-        "url": html_url,
-        "github_url": html_url,  # Samme som url, men eksplisitt
-        "points": raw.get("stargazers_count", 0),  # Stars = "points" i vårt system
-        "num_comments": 0,  # GitHub har ikke "comments" som HN
-        "author": owner_login,
-        "created_at": date_str,
-        "source": "github",
-        "description": raw.get("description", ""),
-        "language": raw.get("language", ""),
-        "topics": raw.get("topics", []),  # GitHub topics/tags
-    }
+    return Post.from_github_repo(raw, keywords)
 
 
 def is_ai_relevant(repo: dict) -> bool:
@@ -199,22 +299,54 @@ def is_ai_relevant(repo: dict) -> bool:
     Sjekk om en repo er AI-relevant basert på keywords.
     Sjekker navn, beskrivelse, topics og language.
     """
-    name = (repo.get("name") or "").lower()
-    description = (repo.get("description") or "").lower()
-    language = (repo.get("language") or "").lower()
-    topics = [t.lower() for t in (repo.get("topics") or [])]
+    return get_ai_matcher().matches(_repo_text(repo))
+
 
-    # Kombiner all tekst for søk
-    text_to_check = f"{name} {description} {language} {' '.join(topics)}"
+def repo_keywords(repo: dict) -> list[str]:
+    """Returner AI-keywords funnet i navn, beskrivelse, topics og language."""
+    return match_ai_keywords(_repo_text(repo))
 
-    # Sjekk mot AI keywords
-    return any(kw.lower() in text_to_check for kw in AI_KEYWORDS)
+
+def _repo_text(repo: dict) -> str:
+    """Kombiner all søkbar tekst for en repo."""
+    name = repo.get("name") or ""
+    description = repo.get("description") or ""
+    language = repo.get("language") or ""
+    topics = repo.get("topics") or []
+    return f"{name} {description} {language} {' '.join(topics)}"
+
+
+async def enrich_with_repo_stats(repos: list[Post]) -> list[Post]:
+    """
+    Legg til forks, eksakte åpne/lukkede issues og siste commit på repos fra søket.
+    
+    Henter alle repos i batchede GraphQL-spørringer (krever GITHUB_TOKEN;
+    uten token returneres repos uendret).
+    
+    Args:
+        repos: Normaliserte GitHub-repos (fra search_github_repos)
+    
+    Returns:
+        Samme liste, med feltene forks, open_issues, closed_issues og last_commit_date
+    """
+    if not GITHUB_TOKEN or not repos:
+        return repos
+    
+    async with shared_client() as client:
+        stats = await fetch_repo_stats(client, [(repo["author"], repo["title"]) for repo in repos], GITHUB_TOKEN)
+    
+    for repo in repos:
+        repo_stats = stats.get(f"{repo['author']}/{repo['title']}")
+        if repo_stats:
+            for field in ("forks", "open_issues", "closed_issues", "last_commit_date"):
+                repo[field] = repo_stats[field]
+    return repos
 
 
 async def collect_github_trending(
     days_back: int = LOOKBACK_DAYS,
     max_results: int = 100
-) -> list[dict]:
+) -> list[Post]:
     """
     Hovedfunksjon for å samle GitHub trending repos.
     Samme interface som collect_ai_mentions() for konsistens.
@@ -233,6 +365,18 @@ async def collect_github_trending(
     )
 
 
+def stream_github_trending(
+    days_back: int = LOOKBACK_DAYS,
+    max_results: int = 100
+):
+    """Streaming-variant av collect_github_trending() (usortert)."""
+    return stream_github_repos(
+        days_back=days_back,
+        min_stars=MIN_GITHUB_STARS,
+        max_results=max_results
+    )
+
+
 # CLI for testing
 if __name__ == "__main__":
     async def main():
@@ -251,7 +395,7 @@ if __name__ == "__main__":
         
         # Lagre rådata
         with open("github_raw_data.json", "w", encoding="utf-8") as f:
-            json.dump(repos, f, indent=2, ensure_ascii=False)
+            json.dump([post.to_dict() for post in repos], f, indent=2, ensure_ascii=False)
         print(f"\nLagret til github_raw_data.json")
     
     asyncio.run(main())
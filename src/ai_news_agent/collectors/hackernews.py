@@ -4,9 +4,35 @@ Hacker News data collector using Firebase API
 import httpx
 import asyncio
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Optional
 import json
-from ..config import HN_API_BASE, AI_KEYWORDS, MIN_HN_POINTS, LOOKBACK_DAYS
+from contextlib import aclosing, nullcontext
+from pathlib import Path
+from ..config import HN_API_BASE, HN_ALGOLIA_API, MIN_HN_POINTS, LOOKBACK_DAYS, HN_COLLECTION_MODE, CACHE_DIR
+from ..utils.http_client import shared_client
+from ..utils.concurrency import AdaptiveLimiter
+from ..utils.keywords import get_ai_matcher, match_ai_keywords
+from ..utils.item_cache import ItemCache
+from ..utils.resilience import record_lost
+from ..models import Post
+
+# Algolia search_by_date: maks 1000 treff per søk (også med paging)
+ALGOLIA_MAX_HITS = 1000
+ALGOLIA_HITS_PER_PAGE = 500
+ALGOLIA_SLICE_DAYS = 7
+ALGOLIA_MIN_SLICE_SECONDS = 3600
+ALGOLIA_CONCURRENCY = 8
+ALGOLIA_ATTRIBUTES = "objectID,title,url,points,num_comments,author,created_at_i"
+
+# Inkrementell modus: lagret maxitem + AI-stories mellom kjøringer
+HN_STATE_FILE = Path(CACHE_DIR) / "hn_incremental_state.json"
+HN_REFRESH_HOURS = 48         # Stories yngre enn dette får oppdatert score hver kjøring
+HN_MAX_NEW_ITEMS = 60000      # Tak på nye item-IDs per kjøring (~4 døgn med HN-trafikk)
+HN_ITEM_CHUNK = 2000          # Item-IDs som hentes samtidig; tilstanden lagres etter hver bit
+STORED_ITEM_FIELDS = ("id", "type", "title", "url", "score", "descendants", "by", "time")
+
+# Item-cache mellom kjøringer; TTL øker med storyens alder (se utils/item_cache.py)
+HN_ITEM_CACHE_FILE = Path(CACHE_DIR) / "hn_items.sqlite"
 
 
 async def fetch_story_ids(endpoint: str = "topstories", limit: int = 500) -> list[int]:
@@ -17,7 +43,7 @@ async def fetch_story_ids(endpoint: str = "topstories", limit: int = 500) -> lis
         endpoint: topstories, newstories, beststories
         limit: Maks antall IDs
     """
-    async with httpx.AsyncClient() as client:
+    async with shared_client() as client:
         response = await client.get(
             f"{HN_API_BASE}/{endpoint}.json",
             timeout=30.0
@@ -27,29 +53,218 @@ async def fetch_story_ids(endpoint: str = "topstories", limit: int = 500) -> lis
         return ids[:limit] if ids else []
 
 
-async def fetch_story(story_id: int, client: httpx.AsyncClient) -> Optional[dict]:
-    """Hent detaljer for én story."""
+async def fetch_story(
+    story_id: int,
+    client: httpx.AsyncClient,
+    limiter: Optional[AdaptiveLimiter] = None,
+    cache: Optional[ItemCache] = None
+) -> Optional[dict]:
+    """
+    Hent detaljer for én story.
+    
+    Med limiter teller 429/5xx og nettverksfeil som feil, slik at samtidigheten skrus ned.
+    Med cache brukes lagrede stories så lenge de er ferske nok, og nye stories lagres.
+    """
+    if cache is not None:
+        cached = cache.get(story_id)
+        if cached is not None:
+            return cached
+    
     try:
-        response = await client.get(
-            f"{HN_API_BASE}/item/{story_id}.json",
-            timeout=10.0
-        )
+        async with (limiter.slot() if limiter else nullcontext()):
+            response = await client.get(
+                f"{HN_API_BASE}/item/{story_id}.json",
+                timeout=10.0
+            )
+            if response.status_code == 429 or response.status_code >= 500:
+                response.raise_for_status()
         if response.status_code == 200:
-            return response.json()
+            item = response.json()
+            if cache is not None and is_cacheable(item):
+                cache.put(story_id, compact_item(item), created_at=item.get("time") or 0)
+            return item
     except Exception:
         pass
+    # Transporten har allerede prøvd på nytt; det som fortsatt feiler er tapt
+    record_lost("hackernews")
     return None
 
 
-async def collect_ai_mentions(days_back: int = LOOKBACK_DAYS, max_stories: int = 500) -> list[dict]:
+async def iter_items(
+    ids: list[int],
+    client: httpx.AsyncClient,
+    cache: Optional[ItemCache] = None,
+    chunk_size: Optional[int] = None,
+    on_chunk: Optional[Callable[[list[int]], None]] = None
+):
+    """
+    Hent items med glidende vindu og gi dem ut etter hvert som de blir ferdige.
+    
+    Adaptiv samtidighet i stedet for faste batcher; items som feiler hoppes over.
+    IDs hentes i biter på chunk_size (standard HN_ITEM_CHUNK), så det finnes
+    aldri flere tasks enn det.
+    on_chunk kalles med bitens IDs når alle items i den er gitt ut og behandlet.
+    """
+    chunk_size = chunk_size or HN_ITEM_CHUNK
+    limiter = AdaptiveLimiter()
+    tasks = []
+    done_count = 0
+    try:
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            tasks = [asyncio.create_task(fetch_story(sid, client, limiter, cache)) for sid in chunk]
+            for next_done in asyncio.as_completed(tasks):
+                item = await next_done
+                done_count += 1
+                
+                # Progress
+                if done_count % 200 == 0:
+                    stats = limiter.stats()
+                    print(f"   Prosessert {done_count}/{len(ids)} items "
+                          f"({stats['throughput']} req/s, samtidighet {stats['limit']})...")
+                
+                if item is not None:
+                    yield item
+            if on_chunk is not None:
+                on_chunk(chunk)
+    finally:
+        # Avbryt gjenstående henting hvis innsamlingen avbrytes (f.eks. global frist)
+        for task in tasks:
+            task.cancel()
+        stats = limiter.stats()
+        print(f"   Hentet {stats['completed']} items med {stats['throughput']} req/s "
+              f"(maks samtidighet {stats['peak_limit']}, {stats['errors']} feil)")
+        if cache is not None:
+            cache_stats = cache.stats()
+            print(f"   Item-cache: {cache_stats['hits']} treff, {cache_stats['misses']} bom, "
+                  f"{cache_stats['expired']} utløpt")
+
+
+def is_cacheable(item: Optional[dict]) -> bool:
+    """Bare levende stories caches; kommentarer og slettede items er ikke verdt plassen."""
+    return bool(item) and item.get("type") == "story" and not item.get("dead") and not item.get("deleted")
+
+
+def open_item_cache(use_cache: bool = True) -> Optional[ItemCache]:
+    """Åpne HN item-cachen, eller None hvis den er slått av eller ikke kan åpnes."""
+    if not use_cache:
+        return None
+    try:
+        return ItemCache(HN_ITEM_CACHE_FILE)
+    except Exception as e:
+        print(f"   ⚠️  Kunne ikke åpne item-cache {HN_ITEM_CACHE_FILE}: {e}")
+        return None
+
+
+def story_keywords(story: dict, cutoff_timestamp: float) -> list[str]:
+    """
+    Returner AI-keywords for en story som passerer tids- og points-filteret.
+    
+    Tom liste betyr at storyen ikke skal være med.
+    """
+    # Filtrer på tid
+    if (story.get("time") or 0) < cutoff_timestamp:
+        return []
+    
+    # Filtrer på points
+    if (story.get("score") or 0) < MIN_HN_POINTS:
+        return []
+    
+    # Filtrer på AI-relevans
+    return match_ai_keywords(story.get("title"), story.get("url"))
+
+
+async def collect_ai_mentions(
+    days_back: int = LOOKBACK_DAYS,
+    max_stories: int = 500,
+    mode: str = HN_COLLECTION_MODE,
+    use_cache: bool = True
+) -> list[Post]:
+    """
+    Samle AI-relaterte posts fra Hacker News.
+    
+    Args:
+        days_back: Antall dager tilbake
+        max_stories: Maks IDs per Firebase-endpoint (kun firebase-modus)
+        mode: "firebase" (top/best/new stories), "algolia" (hele tidsvinduet)
+              eller "incremental" (bare nye/endrede items siden forrige kjøring)
+        use_cache: Bruk item-cachen på disk (firebase- og incremental-modus)
+    
+    Returns:
+        Liste med AI-relaterte posts, sortert etter points
+    """
+    ai_posts = [
+        post async for post in stream_ai_mentions(
+            days_back=days_back, max_stories=max_stories, mode=mode, use_cache=use_cache
+        )
+    ]
+    ai_posts.sort(key=lambda x: x["points"], reverse=True)
+    return ai_posts
+
+
+async def stream_ai_mentions(
+    days_back: int = LOOKBACK_DAYS,
+    max_stories: int = 500,
+    mode: str = HN_COLLECTION_MODE,
+    use_cache: bool = True
+):
+    """
+    Gi ut AI-relaterte HN-posts etter hvert som de er klare (usortert).
+    
+    Samme argumenter som collect_ai_mentions(). Firebase-modus gir ut posts
+    mens items hentes; algolia og incremental gir ut alt når søket er ferdig.
+    """
+    if mode == "algolia":
+        for post in await collect_from_algolia(days_back=days_back):
+            yield post
+        return
+    if mode not in ("firebase", "incremental"):
+        raise ValueError(f"Ukjent HN-modus: {mode}")
+    
+    cache = open_item_cache(use_cache)
+    try:
+        if mode == "incremental":
+            for post in await collect_incremental(days_back=days_back, cache=cache):
+                yield post
+        else:
+            async with aclosing(stream_from_firebase(days_back, max_stories, cache)) as posts:
+                async for post in posts:
+                    yield post
+    finally:
+        if cache is not None:
+            # Stories eldre enn vinduet trengs ikke lenger
+            cache.prune((datetime.now() - timedelta(days=days_back)).timestamp())
+            cache.close()
+
+
+async def collect_from_firebase(
+    days_back: int = LOOKBACK_DAYS,
+    max_stories: int = 500,
+    cache: Optional[ItemCache] = None
+) -> list[Post]:
     """
     Samle AI-relaterte posts fra Hacker News via Firebase API.
     
     Henter top/best/new stories og filtrerer på AI-relevans.
+    Dekker bare det som ligger i listene akkurat nå (maks ~1500 IDs).
     
     Returns:
         Liste med AI-relaterte posts, sortert etter points
     """
+    ai_posts = [post async for post in stream_from_firebase(days_back, max_stories, cache)]
+    
+    # Sorter etter points
+    ai_posts.sort(key=lambda x: x["points"], reverse=True)
+    
+    return ai_posts
+
+
+async def stream_from_firebase(
+    days_back: int = LOOKBACK_DAYS,
+    max_stories: int = 500,
+    cache: Optional[ItemCache] = None
+):
+    """Gi ut AI-relaterte posts fra Firebase-listene etter hvert som items hentes."""
     cutoff_time = datetime.now() - timedelta(days=days_back)
     cutoff_timestamp = cutoff_time.timestamp()
     
@@ -62,84 +277,296 @@ async def collect_ai_mentions(days_back: int = LOOKBACK_DAYS, max_stories: int =
             print(f"   Hentet {len(ids)} fra {endpoint}")
         except Exception as e:
             print(f"   Feil ved {endpoint}: {e}")
+            record_lost("hackernews", unit="lists")
     
     print(f"   Totalt {len(all_ids)} unike story IDs")
     
-    # Hent detaljer for hver story (med batching)
-    ai_posts = []
-    batch_size = 50
-    ids_list = list(all_ids)
-    
-    async with httpx.AsyncClient() as client:
-        for i in range(0, len(ids_list), batch_size):
-            batch = ids_list[i:i+batch_size]
-            tasks = [fetch_story(sid, client) for sid in batch]
-            results = await asyncio.gather(*tasks)
+    async with shared_client() as client:
+        async with aclosing(iter_items(list(all_ids), client, cache)) as stories:
+            async for story in stories:
+                keywords = story_keywords(story, cutoff_timestamp)
+                if keywords:
+                    yield normalize_post(story, keywords)
+
+
+def load_incremental_state(path: Path = None) -> dict:
+    """Last lagret tilstand for inkrementell HN-innsamling."""
+    path = path or HN_STATE_FILE
+    if path.exists():
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"   ⚠️  Kunne ikke lese {path}: {e}")
+    return {"maxitem": 0, "items": {}}
+
+
+def save_incremental_state(state: dict, path: Path = None):
+    """Lagre tilstand for inkrementell HN-innsamling."""
+    path = path or HN_STATE_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    tmp_path.replace(path)
+
+
+def compact_item(item: dict) -> dict:
+    """Behold bare feltene vi bruker (dropper f.eks. 'kids'-listen)."""
+    return {key: item[key] for key in STORED_ITEM_FIELDS if key in item}
+
+
+async def collect_incremental(days_back: int = LOOKBACK_DAYS, cache: Optional[ItemCache] = None) -> list[Post]:
+    """
+    Samle AI-relaterte posts inkrementelt via maxitem/updates.
+    
+    Første kjøring fyller lageret fra Algolia. Senere kjøringer henter bare
+    items med ID over forrige maxitem, items fra /v0/updates.json og ferske
+    stories der score fortsatt endrer seg, og fletter dem inn i lageret.
+    
+    Nye IDs hentes i stigende biter på HN_ITEM_CHUNK. Etter hver ferdig bit
+    lagres lageret med høyeste ferdigbehandlede ID som maxitem, også hvis
+    innsamlingen avbrytes (timeout eller global frist). Et etterslep etter et
+    opphold tas dermed igjen over flere kjøringer.
+    
+    Returns:
+        Liste med AI-relaterte posts, sortert etter points
+    """
+    cutoff_timestamp = (datetime.now() - timedelta(days=days_back)).timestamp()
+    state = load_incremental_state()
+    stored = state.get("items", {})
+    
+    def save_progress(processed_max: int):
+        save_incremental_state({
+            "maxitem": processed_max,
+            "updated_at": datetime.now().isoformat(),
+            # Fjern stories som har falt ut av vinduet
+            "items": {k: v for k, v in stored.items() if (v.get("time") or 0) >= cutoff_timestamp},
+        })
+    
+    async with shared_client() as client:
+        response = await client.get(f"{HN_API_BASE}/maxitem.json", timeout=30.0)
+        response.raise_for_status()
+        maxitem = int(response.json() or 0)
+        
+        last_max = state.get("maxitem") or 0
+        if not last_max:
+            print("   Ingen lagret HN-tilstand, fyller lageret fra Algolia...")
+            for item in await fetch_algolia_items(days_back):
+                if is_ai_relevant(item):
+                    stored[str(item["id"])] = item
+            save_progress(maxitem)
+        else:
+            # Taket telles oppover fra forrige maxitem, så et etterslep tas
+            # igjen over flere kjøringer i stedet for å hoppe over IDs
+            new_ids = list(range(last_max + 1, min(maxitem, last_max + HN_MAX_NEW_ITEMS) + 1))
             
-            for story in results:
-                if story is None:
-                    continue
-                
-                # Filtrer på tid
-                story_time = story.get("time", 0)
-                if story_time < cutoff_timestamp:
-                    continue
-                
-                # Filtrer på points
-                if story.get("score", 0) < MIN_HN_POINTS:
-                    continue
-                
-                # Filtrer på AI-relevans
-                if is_ai_relevant(story):
-                    ai_posts.append(normalize_post(story))
+            updates = {}
+            try:
+                response = await client.get(f"{HN_API_BASE}/updates.json", timeout=30.0)
+                response.raise_for_status()
+                updates = response.json() or {}
+            except Exception as e:
+                print(f"   ⚠️  Feil ved updates.json: {e}")
+                record_lost("hackernews", unit="lists")
+            
+            refresh_after = datetime.now().timestamp() - HN_REFRESH_HOURS * 3600
+            refresh_ids = {int(i) for i in updates.get("items", []) if str(i) in stored}
+            refresh_ids |= {int(k) for k, v in stored.items() if (v.get("time") or 0) >= refresh_after}
+            refresh_ids -= set(new_ids)
             
-            # Progress
-            if (i + batch_size) % 200 == 0:
-                print(f"   Prosessert {i + batch_size}/{len(ids_list)} stories...")
+            print(f"   {len(new_ids)} nye items siden maxitem {last_max}, "
+                  f"{len(refresh_ids)} lagrede stories oppdateres")
+            if new_ids and new_ids[-1] < maxitem:
+                print(f"   {maxitem - new_ids[-1]} items over taket hentes i neste kjøring")
             
-            await asyncio.sleep(0.1)  # Rate limit
+            # Oppdateringer først, så nye IDs i stigende rekkefølge
+            progress = {"maxitem": last_max}
+            
+            def checkpoint(chunk: list[int]):
+                new_in_chunk = [i for i in chunk if i > last_max]
+                if new_in_chunk:
+                    progress["maxitem"] = max(progress["maxitem"], max(new_in_chunk))
+                save_progress(progress["maxitem"])
+            
+            items = iter_items(sorted(refresh_ids) + new_ids, client, cache, on_chunk=checkpoint)
+            try:
+                async with aclosing(items):
+                    async for item in items:
+                        if item.get("type") != "story" or item.get("dead") or item.get("deleted"):
+                            continue
+                        key = str(item["id"])
+                        if key in stored or is_ai_relevant(item):
+                            stored[key] = compact_item(item)
+            finally:
+                # Også ved avbrudd: lagre det som er ferdig, så neste kjøring fortsetter herfra
+                save_progress(progress["maxitem"])
+    
+    stored = {k: v for k, v in stored.items() if (v.get("time") or 0) >= cutoff_timestamp}
+    ai_posts = []
+    for story in stored.values():
+        keywords = story_keywords(story, cutoff_timestamp)
+        if keywords:
+            ai_posts.append(normalize_post(story, keywords))
+    
+    print(f"   {len(stored)} AI-stories i lageret, {len(ai_posts)} med >= {MIN_HN_POINTS} points")
     
-    # Sorter etter points
     ai_posts.sort(key=lambda x: x["points"], reverse=True)
     
     return ai_posts
 
 
-def normalize_post(raw: dict) -> dict:
+async def _algolia_search(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    start_ts: int,
+    end_ts: int,
+    page: int = 0
+) -> dict:
+    """Hent én side fra Algolia search_by_date for tidsrommet [start_ts, end_ts)."""
+    params = {
+        "tags": "story",
+        "numericFilters": f"created_at_i>={start_ts},created_at_i<{end_ts},points>={MIN_HN_POINTS}",
+        "hitsPerPage": ALGOLIA_HITS_PER_PAGE,
+        "page": page,
+        "attributesToRetrieve": ALGOLIA_ATTRIBUTES,
+        "attributesToHighlight": "",
+    }
+    async with semaphore:
+        response = await client.get(f"{HN_ALGOLIA_API}/search_by_date", params=params, timeout=30.0)
+    response.raise_for_status()
+    return response.json()
+
+
+async def fetch_algolia_slice(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    start_ts: int,
+    end_ts: int
+) -> list[dict]:
     """
-    Normaliser HN-post til vårt format.
+    Hent alle stories i et tidsrom fra Algolia.
+    
+    Algolia gir maks 1000 treff per søk, så tidsrom med flere treff deles i to
+    til hver del får plass. Øvrige sider i en del hentes parallelt.
     """
-    story_id = raw.get("id", "")
-    created_time = raw.get("time", 0)
+    first = await _algolia_search(client, semaphore, start_ts, end_ts)
+    nb_hits = first.get("nbHits", 0)
     
-    if created_time:
-        created_date = datetime.fromtimestamp(created_time).isoformat()
-    else:
-        created_date = ""
+    if nb_hits > ALGOLIA_MAX_HITS and end_ts - start_ts > ALGOLIA_MIN_SLICE_SECONDS:
+        mid = (start_ts + end_ts) // 2
+        left, right = await asyncio.gather(
+            fetch_algolia_slice(client, semaphore, start_ts, mid),
+            fetch_algolia_slice(client, semaphore, mid, end_ts),
+        )
+        return left + right
     
+    hits = list(first.get("hits", []))
+    nb_pages = min(first.get("nbPages", 1), ALGOLIA_MAX_HITS // ALGOLIA_HITS_PER_PAGE)
+    if nb_pages > 1:
+        pages = await asyncio.gather(*[
+            _algolia_search(client, semaphore, start_ts, end_ts, page)
+            for page in range(1, nb_pages)
+        ])
+        for data in pages:
+            hits.extend(data.get("hits", []))
+    return hits
+
+
+def algolia_hit_to_item(hit: dict) -> dict:
+    """Konverter Algolia-treff til samme form som en Firebase-item."""
     return {
-        "id": str(story_id),
-        "title": raw.get("title", ""),
-        "url": raw.get("url", ""),
-        "hn_url": f"https://news.ycombinator.com/item?id={story_id}",
-        "points": raw.get("score", 0),
-        "num_comments": raw.get("descendants", 0),
-        "author": raw.get("by", ""),
-        "created_at": created_date,
-        "source": "hackernews",
+        "id": int(hit.get("objectID") or 0),
+        "title": hit.get("title") or "",
+        "url": hit.get("url") or "",
+        "score": hit.get("points") or 0,
+        "descendants": hit.get("num_comments") or 0,
+        "by": hit.get("author") or "",
+        "time": hit.get("created_at_i") or 0,
     }
 
 
+async def fetch_algolia_items(days_back: int = LOOKBACK_DAYS) -> list[dict]:
+    """
+    Hent alle stories med nok points i tidsvinduet fra Algolia search_by_date.
+    
+    Deler vinduet i tidsskiver som hentes parallelt, med points-filteret på
+    serversiden. Returnerer items på Firebase-form, uten duplikater.
+    """
+    end_ts = int(datetime.now().timestamp())
+    start_ts = int((datetime.now() - timedelta(days=days_back)).timestamp())
+    slice_seconds = ALGOLIA_SLICE_DAYS * 86400
+    slices = [
+        (ts, min(ts + slice_seconds, end_ts))
+        for ts in range(start_ts, end_ts, slice_seconds)
+    ]
+    
+    print(f"   Henter {days_back} dager fra Algolia i {len(slices)} tidsskiver...")
+    
+    semaphore = asyncio.Semaphore(ALGOLIA_CONCURRENCY)
+    async with shared_client() as client:
+        results = await asyncio.gather(
+            *[fetch_algolia_slice(client, semaphore, a, b) for a, b in slices],
+            return_exceptions=True
+        )
+    
+    items = {}
+    for result in results:
+        if isinstance(result, Exception):
+            print(f"   Feil ved Algolia-skive: {result}")
+            record_lost("hackernews", unit="slices")
+            continue
+        for hit in result:
+            item = algolia_hit_to_item(hit)
+            items[item["id"]] = item
+    
+    print(f"   Algolia: {len(items)} stories med >= {MIN_HN_POINTS} points")
+    return list(items.values())
+
+
+async def collect_from_algolia(days_back: int = LOOKBACK_DAYS) -> list[Post]:
+    """
+    Samle AI-relaterte posts fra hele tidsvinduet via Algolia search_by_date.
+    
+    Gir full dekning med noen titalls kall i stedet for tusenvis av item-kall.
+    
+    Returns:
+        Liste med AI-relaterte posts, sortert etter points
+    """
+    cutoff_timestamp = (datetime.now() - timedelta(days=days_back)).timestamp()
+    
+    ai_posts = []
+    for story in await fetch_algolia_items(days_back):
+        keywords = story_keywords(story, cutoff_timestamp)
+        if keywords:
+            ai_posts.append(normalize_post(story, keywords))
+    
+    print(f"   {len(ai_posts)} AI-relevante stories fra Algolia")
+    
+    ai_posts.sort(key=lambda x: x["points"], reverse=True)
+    
+    return ai_posts
+
+
+def normalize_post(raw: dict, keywords: Optional[list[str]] = None) -> Post:
+    """
+    Normaliser HN-post til vårt format.
+    
+    Args:
+        raw: Story fra Firebase API
+        keywords: AI-keywords som allerede er funnet i posten
+    """
+    return Post.from_hn_item(raw, keywords)
+
+
 def is_ai_relevant(story: dict) -> bool:
     """
     Sjekk om en story er AI-relevant basert på keywords.
     """
-    title = (story.get("title") or "").lower()
-    url = (story.get("url") or "").lower()
-    
-    text_to_check = f"{title} {url}"
+    title = story.get("title") or ""
+    url = story.get("url") or ""
     
-    return any(kw.lower() in text_to_check for kw in AI_KEYWORDS)
+    return get_ai_matcher().matches(f"{title} {url}")
 
 
 # CLI for testing
@@ -155,7 +582,7 @@ if __name__ == "__main__":
         
         # Lagre rådata
         with open("hn_raw_data.json", "w") as f:
-            json.dump(posts, f, indent=2, ensure_ascii=False)
+            json.dump([post.to_dict() for post in posts], f, indent=2, ensure_ascii=False)
         print(f"\nLagret til hn_raw_data.json")
     
     asyncio.run(main())
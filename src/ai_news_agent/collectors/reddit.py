@@ -1,15 +1,20 @@
 """
-Reddit data collector using Reddit JSON API (no auth required)
+Reddit data collector using the Reddit JSON API
+(public endpoints, or OAuth when REDDIT_CLIENT_ID/REDDIT_CLIENT_SECRET are set)
 """
 import httpx
 import asyncio
+from collections import Counter
+from contextlib import aclosing
 from datetime import datetime, timedelta
 from typing import Optional, List
 import json
-from ..config import AI_KEYWORDS, LOOKBACK_DAYS
-
-# Reddit API base URL (public JSON endpoint, no auth required)
-REDDIT_API_BASE = "https://www.reddit.com"
+from ..config import LOOKBACK_DAYS
+from ..utils.http_client import shared_client
+from ..utils.keywords import match_ai_keywords
+from ..utils.reddit_auth import reddit_get
+from ..utils.resilience import record_lost
+from ..models import Post
 
 # Subreddits to search for AI-related content
 AI_SUBREDDITS = [
@@ -36,160 +41,197 @@ AI_SUBREDDITS = [
 # Minimum score for a post to be included
 MIN_REDDIT_SCORE = 5
 
+# Listings: maks 100 posts per side og ~1000 per listing (10 sider)
+REDDIT_PAGE_LIMIT = 100
+REDDIT_MAX_PAGES = 10
 
-async def fetch_subreddit_posts(
-    subreddit: str,
-    days_back: int = LOOKBACK_DAYS,
-    limit: int = 100,
-    client: httpx.AsyncClient = None
-) -> List[dict]:
+# Subreddits per kombinert listing (r/a+b+c), holder URL-en kort
+REDDIT_MAX_MULTI = 50
+
+# Minste top.json-vindu (t=) som dekker days_back
+TOP_WINDOWS = [(1, "day"), (7, "week"), (30, "month"), (365, "year")]
+
+
+def top_window(days_back: int) -> str:
+    """Minste t=-verdi for top.json som dekker days_back."""
+    for days, window in TOP_WINDOWS:
+        if days_back <= days:
+            return window
+    return "all"
+
+
+async def iter_listing_pages(
+    client: httpx.AsyncClient,
+    subreddits: List[str],
+    listing: str,
+    cutoff_timestamp: float,
+    window: Optional[str] = None
+):
     """
-    Fetch recent posts from a subreddit.
+    Yield pages (lists of post data) from a combined r/a+b+c listing.
+    
+    Pages with the `after` cursor and stops early: "new" once posts are older
+    than the cutoff, "top" once scores fall below MIN_REDDIT_SCORE. A "new"
+    listing that runs out of pages (REDDIT_MAX_PAGES, ~1000 posts) before the
+    cutoff is reported and recorded as a truncated listing.
     
     Args:
-        subreddit: Subreddit name (without r/)
-        days_back: How many days back to look
-        limit: Maximum number of posts to fetch
-        client: Optional httpx client (for reuse)
+        client: httpx client
+        subreddits: Subreddit names (without r/)
+        listing: "new" or "top"
+        cutoff_timestamp: Oldest created_utc to collect
+        window: t= for top listings (day/week/month/year/all)
     
-    Returns:
-        List of posts from the subreddit
+    Raises:
+        httpx.HTTPStatusError: For non-200 responses (the caller decides)
     """
-    cutoff_time = datetime.now() - timedelta(days=days_back)
-    cutoff_timestamp = cutoff_time.timestamp()
-    
-    headers = {
-        "User-Agent": "AI-News-Agent/1.0 (by /u/ai-news-agent)"
-    }
-    
-    posts = []
-    
-    try:
-        # Fetch hot posts from subreddit
-        url = f"{REDDIT_API_BASE}/r/{subreddit}/hot.json"
-        params = {
-            "limit": min(limit, 100)  # Reddit API max is 100 per request
-        }
-        
-        response = await client.get(url, params=params, headers=headers, timeout=30.0)
-        
-        if response.status_code == 200:
-            data = response.json()
-            children = data.get("data", {}).get("children", [])
-            
-            for child in children:
-                post_data = child.get("data", {})
-                
-                # Filter by time
-                created_utc = post_data.get("created_utc", 0)
-                if created_utc < cutoff_timestamp:
-                    continue
-                
-                # Filter by score
-                score = post_data.get("score", 0)
-                if score < MIN_REDDIT_SCORE:
-                    continue
-                
-                # Filter by AI relevance
-                title = post_data.get("title", "").lower()
-                selftext = post_data.get("selftext", "").lower()
-                text_to_check = f"{title} {selftext}"
-                
-                if any(kw.lower() in text_to_check for kw in AI_KEYWORDS):
-                    posts.append({
-                        "id": f"reddit-{post_data.get('id', '')}",
-                        "title": post_data.get("title", ""),
-                        "url": post_data.get("url", ""),
-                        "reddit_url": f"https://reddit.com{post_data.get('permalink', '')}",
-                        "points": score,
-                        "num_comments": post_data.get("num_comments", 0),
-                        "author": post_data.get("author", ""),
-                        "created_at": datetime.fromtimestamp(created_utc).isoformat(),
-                        "source": "reddit",
-                        "subreddit": subreddit,
-                        "text": selftext[:500] if selftext else "",  # First 500 chars
-                    })
+    path = f"/r/{'+'.join(subreddits)}/{listing}.json"
+    after = None
+    for _ in range(REDDIT_MAX_PAGES):
+        params = {"limit": REDDIT_PAGE_LIMIT, "raw_json": 1}
+        if window:
+            params["t"] = window
+        if after:
+            params["after"] = after
         
-        # Rate limiting - Reddit allows 60 requests per minute
-        await asyncio.sleep(1.0)
+        response = await reddit_get(client, path, params=params)
+        response.raise_for_status()
+        data = response.json().get("data", {})
+        page = [child.get("data", {}) for child in data.get("children", [])]
+        yield page
         
+        after = data.get("after")
+        if not after or not page:
+            break
+        if listing == "new" and page[-1].get("created_utc", 0) < cutoff_timestamp:
+            break
+        if listing == "top" and page[-1].get("score", 0) < MIN_REDDIT_SCORE:
+            break
+    else:
+        if listing == "new":
+            oldest = datetime.fromtimestamp(page[-1].get("created_utc", 0)).strftime("%Y-%m-%d %H:%M")
+            print(f"  ⚠️  r/{'+'.join(subreddits)}/new stopped at the {REDDIT_MAX_PAGES}-page cap; "
+                  f"posts before {oldest} are not covered")
+            record_lost("reddit", unit="truncated listings")
+
+
+async def fetch_listing(
+    client: httpx.AsyncClient,
+    subreddits: List[str],
+    listing: str,
+    cutoff_timestamp: float,
+    window: Optional[str] = None
+):
+    """
+    Yield pages from a combined listing, falling back to one listing per
+    subreddit if the combined one is refused (a private or banned subreddit
+    makes Reddit reject the whole multi).
+    
+    Same arguments as iter_listing_pages().
+    """
+    started = False
+    try:
+        pages = iter_listing_pages(client, subreddits, listing, cutoff_timestamp, window)
+        async with aclosing(pages):
+            async for page in pages:
+                started = True
+                yield page
     except httpx.HTTPStatusError as e:
-        if e.response.status_code == 429:
-            print(f"  ⚠️  Rate limited on r/{subreddit}, waiting...")
-            await asyncio.sleep(5.0)
-        elif e.response.status_code == 404:
-            print(f"  ⚠️  Subreddit r/{subreddit} not found or private")
-        else:
-            print(f"  ⚠️  Error fetching r/{subreddit}: {e.response.status_code}")
+        status = e.response.status_code
+        if status in (403, 404) and not started:
+            if len(subreddits) == 1:
+                print(f"  ⚠️  Subreddit r/{subreddits[0]} not found or private")
+                return
+            for subreddit in subreddits:
+                async with aclosing(fetch_listing(client, [subreddit], listing, cutoff_timestamp, window)) as pages:
+                    async for page in pages:
+                        yield page
+            return
+        print(f"  ⚠️  Error fetching r/{'+'.join(subreddits)}/{listing}: {status}")
+        record_lost("reddit", unit="pages")
     except Exception as e:
-        print(f"  ⚠️  Error fetching r/{subreddit}: {e}")
-    
-    return posts
+        print(f"  ⚠️  Error fetching r/{'+'.join(subreddits)}/{listing}: {e}")
+        record_lost("reddit", unit="pages")
 
 
 async def collect_reddit_posts(
     days_back: int = LOOKBACK_DAYS,
     max_posts_per_subreddit: int = 50
-) -> List[dict]:
+) -> List[Post]:
     """
     Collect AI-related posts from multiple Reddit subreddits.
     
     Args:
         days_back: How many days back to look
-        max_posts_per_subreddit: Maximum posts to fetch per subreddit
+        max_posts_per_subreddit: Maximum AI-related posts per subreddit
     
     Returns:
         List of AI-related Reddit posts, sorted by score
     """
-    print(f"📡 Samler data fra Reddit (siste {days_back} dager)...")
-    print(f"   Søker i {len(AI_SUBREDDITS)} subreddits...")
+    unique_posts = [
+        post async for post in stream_reddit_posts(
+            days_back=days_back, max_posts_per_subreddit=max_posts_per_subreddit
+        )
+    ]
     
-    all_posts = []
+    # Sort by score
+    unique_posts.sort(key=lambda x: x["points"], reverse=True)
     
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        # Fetch from all subreddits in parallel (with rate limiting)
-        tasks = []
-        for subreddit in AI_SUBREDDITS:
-            tasks.append(
-                fetch_subreddit_posts(
-                    subreddit,
-                    days_back=days_back,
-                    limit=max_posts_per_subreddit,
-                    client=client
-                )
-            )
-        
-        # Execute with some delay between batches to respect rate limits
-        batch_size = 5
-        for i in range(0, len(tasks), batch_size):
-            batch = tasks[i:i+batch_size]
-            results = await asyncio.gather(*batch, return_exceptions=True)
-            
-            for result in results:
-                if isinstance(result, Exception):
-                    print(f"  ⚠️  Error in batch: {result}")
-                    continue
-                all_posts.extend(result)
-            
-            # Rate limiting between batches
-            if i + batch_size < len(tasks):
-                await asyncio.sleep(2.0)
+    return unique_posts
+
+
+async def stream_reddit_posts(
+    days_back: int = LOOKBACK_DAYS,
+    max_posts_per_subreddit: int = 50
+):
+    """
+    Yield AI-related Reddit posts page by page (unsorted, deduplicated).
     
-    # Remove duplicates (same post ID)
-    seen_ids = set()
-    unique_posts = []
-    for post in all_posts:
-        post_id = post.get("id")
-        if post_id and post_id not in seen_ids:
-            seen_ids.add(post_id)
-            unique_posts.append(post)
+    All subreddits are read through combined r/a+b+c listings: top.json for
+    the lookback window first (highest scores), then new.json back to the
+    cutoff. Posts are attributed to their subreddit from the payload.
     
-    # Sort by score
-    unique_posts.sort(key=lambda x: x["points"], reverse=True)
+    Same arguments as collect_reddit_posts().
+    """
+    print(f"📡 Samler data fra Reddit (siste {days_back} dager)...")
+    print(f"   Søker i {len(AI_SUBREDDITS)} subreddits (kombinerte listings)...")
     
-    print(f"✅ Fant {len(unique_posts)} AI-relaterte Reddit posts")
+    cutoff_timestamp = (datetime.now() - timedelta(days=days_back)).timestamp()
+    groups = [AI_SUBREDDITS[i:i + REDDIT_MAX_MULTI] for i in range(0, len(AI_SUBREDDITS), REDDIT_MAX_MULTI)]
+    seen_ids = set()
+    per_subreddit = Counter()
+    pages = 0
     
-    return unique_posts
+    async with shared_client() as client:
+        for listing, window in (("top", top_window(days_back)), ("new", None)):
+            for group in groups:
+                names = {name.lower() for name in group}
+                async with aclosing(fetch_listing(client, group, listing, cutoff_timestamp, window)) as listing_pages:
+                    async for page in listing_pages:
+                        pages += 1
+                        for post_data in page:
+                            post_id = post_data.get("id")
+                            subreddit = post_data.get("subreddit") or ""
+                            if not post_id or post_id in seen_ids:
+                                continue
+                            if post_data.get("created_utc", 0) < cutoff_timestamp:
+                                continue
+                            if post_data.get("score", 0) < MIN_REDDIT_SCORE:
+                                continue
+                            if per_subreddit[subreddit.lower()] >= max_posts_per_subreddit:
+                                continue
+                            
+                            keywords = match_ai_keywords(post_data.get("title", ""), post_data.get("selftext", ""))
+                            if keywords:
+                                seen_ids.add(post_id)
+                                per_subreddit[subreddit.lower()] += 1
+                                yield Post.from_reddit_post(post_data, subreddit, keywords)
+                        
+                        # Alle subreddits i gruppen er fulle: resten av listingen trengs ikke
+                        if all(per_subreddit[name] >= max_posts_per_subreddit for name in names):
+                            break
+    
+    print(f"✅ Fant {len(seen_ids)} AI-relaterte Reddit posts ({pages} sider)")
 
 
 # CLI for testing
@@ -205,7 +247,7 @@ if __name__ == "__main__":
         
         # Lagre rådata
         with open("reddit_raw_data.json", "w", encoding="utf-8") as f:
-            json.dump(posts, f, indent=2, ensure_ascii=False)
+            json.dump([post.to_dict() for post in posts], f, indent=2, ensure_ascii=False)
         print(f"\nLagret til reddit_raw_data.json")
     
     asyncio.run(main())
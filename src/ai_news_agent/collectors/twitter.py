@@ -4,11 +4,18 @@ Note: Requires Twitter API credentials (Bearer Token)
 """
 import httpx
 import asyncio
-from datetime import datetime, timedelta
-from typing import Optional, List
+from contextlib import aclosing
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Optional, List, Tuple
 import json
 import os
-from ..config import AI_KEYWORDS, LOOKBACK_DAYS
+import time
+from ..config import AI_KEYWORDS, CATEGORIES, LOOKBACK_DAYS, CACHE_DIR, TWITTER_COLLECTION_MODE
+from ..utils.http_client import shared_client
+from ..utils.pipeline import dedupe, merge_sources
+from ..utils.resilience import record_lost
+from ..models import Post
 
 # Twitter API v2 base URL
 TWITTER_API_BASE = "https://api.twitter.com/2"
@@ -19,6 +26,63 @@ TWITTER_BEARER_TOKEN = os.getenv("TWITTER_BEARER_TOKEN", None)
 # Minimum engagement (likes + retweets) for a tweet to be included
 MIN_TWITTER_ENGAGEMENT = 10
 
+# Search/recent rejects queries longer than this (512 on the Basic tier)
+TWITTER_MAX_QUERY_LENGTH = 512
+
+# Operators appended to every search query
+TWITTER_QUERY_FILTERS = "-is:retweet lang:en"
+
+# search/recent and counts/recent only reach this far back
+TWITTER_RECENT_DAYS = 7
+
+# Incremental mode: per-query since_id/next_token cursors and a tweet store between runs
+TWITTER_STATE_FILE = Path(CACHE_DIR) / "twitter_incremental_state.json"
+TWITTER_CURSOR_MAX_AGE = 6 * 86400  # since_id older than this is replaced by start_time (7-day limit)
+TWITTER_REFRESH_HOURS = 48          # Stored tweets younger than this get fresh metrics every run
+TWITTER_LOOKUP_BATCH = 100          # IDs per /2/tweets lookup
+TWITTER_INCREMENTAL_MAX_PAGES = 5   # Newest search pages per query per run
+TWITTER_BACKFILL_MAX_PAGES = 5      # Older pages per query per run for ranges the newest pages did not reach
+TWITTER_MAX_REFRESH = 300           # Most engaged stored tweets refreshed per run (3 lookups)
+STORED_TWEET_FIELDS = ("id", "text", "author_id", "created_at", "public_metrics")
+
+
+def _twitter_term(keyword: str) -> str:
+    """Quote phrases and words with punctuation so they are matched as one term."""
+    return keyword if keyword.isalnum() else f'"{keyword}"'
+
+
+def plan_twitter_queries(
+    keywords: List[str] = AI_KEYWORDS,
+    max_length: int = TWITTER_MAX_QUERY_LENGTH
+) -> List[str]:
+    """
+    Pack keywords into as few OR queries as fit the query length limit.
+    
+    Uses first-fit decreasing: longest terms are placed first, each in the
+    first query with room left. Terms keep their keyword order within a query.
+    
+    Args:
+        keywords: Keywords to cover (each appears in exactly one query)
+        max_length: Maximum query length, including TWITTER_QUERY_FILTERS
+    
+    Returns:
+        Queries like '(claude OR "gpt-4" OR ...)'
+    """
+    budget = max_length - len(f"() {TWITTER_QUERY_FILTERS}")
+    terms = list(dict.fromkeys(_twitter_term(k.lower()) for k in keywords))
+    groups: List[List[str]] = []
+    for term in sorted(terms, key=len, reverse=True):
+        for group in groups:
+            if len(" OR ".join(group + [term])) <= budget:
+                group.append(term)
+                break
+        else:
+            groups.append([term])
+    
+    order = {term: i for i, term in enumerate(terms)}
+    groups.sort(key=lambda group: min(order[term] for term in group))
+    return ["(" + " OR ".join(sorted(group, key=order.get)) + ")" for group in groups]
+
 
 async def search_tweets(
     query: str,
@@ -38,174 +102,562 @@ async def search_tweets(
     Returns:
         List of tweets matching the query
     """
-    if not TWITTER_BEARER_TOKEN:
-        print("  ⚠️  TWITTER_BEARER_TOKEN not set, skipping Twitter collection")
-        return []
-    
-    cutoff_time = datetime.now() - timedelta(days=days_back)
-    cutoff_date = cutoff_time.strftime("%Y-%m-%d")
-    
-    headers = {
+    return [
+        tweet async for tweet in iter_tweets(
+            query, days_back=days_back, max_results=max_results, client=client
+        )
+    ]
+
+
+def _start_time(days_back: int) -> str:
+    """start_time for days_back, clamped to the window of the recent endpoints."""
+    now = datetime.now(timezone.utc)
+    start = max(now - timedelta(days=days_back), now - timedelta(days=TWITTER_RECENT_DAYS, minutes=-1))
+    return start.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _twitter_headers() -> dict:
+    return {
         "Authorization": f"Bearer {TWITTER_BEARER_TOKEN}",
         "User-Agent": "AI-News-Agent/1.0"
     }
+
+
+async def iter_search_pages(
+    client: httpx.AsyncClient,
+    query: str,
+    start_time: Optional[str] = None,
+    since_id: Optional[str] = None,
+    until_id: Optional[str] = None,
+    next_token: Optional[str] = None,
+    page_size: int = 100,
+    max_pages: Optional[int] = None
+):
+    """
+    Yield raw search/recent response bodies page by page, newest tweets first.
     
-    tweets = []
-    next_token = None
+    Args:
+        client: httpx client
+        query: Search query (TWITTER_QUERY_FILTERS is appended)
+        start_time: Oldest creation time to include (ISO 8601)
+        since_id: Only tweets with a larger ID than this
+        until_id: Only tweets with a smaller ID than this
+        next_token: Resume paging from this token
+        page_size: Tweets per page (10-100)
+        max_pages: Stop after this many pages (None = until the last page)
+    
+    Errors are printed and recorded as lost pages; paging then stops, so a
+    last page with meta.next_token means the search did not finish.
+    """
+    params = {
+        "query": f"{query} {TWITTER_QUERY_FILTERS}",
+        "max_results": max(10, min(page_size, 100)),  # API limits
+        "tweet.fields": "created_at,public_metrics,author_id,text",
+        "expansions": "author_id",
+        "user.fields": "username",
+    }
+    if start_time:
+        params["start_time"] = start_time
+    if since_id:
+        params["since_id"] = since_id
+    if until_id:
+        params["until_id"] = until_id
     
+    pages = 0
     try:
-        # Build query with date filter
-        # Twitter API v2 query syntax
-        full_query = f"{query} -is:retweet lang:en"
-        
-        params = {
-            "query": full_query,
-            "max_results": min(max_results, 100),  # API limit
-            "tweet.fields": "created_at,public_metrics,author_id,text",
-            "expansions": "author_id",
-            "user.fields": "username",
-            "start_time": f"{cutoff_date}T00:00:00Z",
-        }
-        
-        while len(tweets) < max_results:
+        while max_pages is None or pages < max_pages:
             if next_token:
                 params["next_token"] = next_token
             
             response = await client.get(
                 f"{TWITTER_API_BASE}/tweets/search/recent",
-                headers=headers,
+                headers=_twitter_headers(),
                 params=params,
                 timeout=30.0
             )
             
             if response.status_code == 401:
                 print("  ⚠️  Twitter API authentication failed. Check your bearer token.")
-                break
+                return
             elif response.status_code == 429:
-                print("  ⚠️  Twitter API rate limit reached. Waiting...")
-                await asyncio.sleep(60.0)  # Wait 1 minute
-                continue
+                print("  ⚠️  Twitter API rate limit reached, stopping this query")
+                record_lost("twitter", unit="pages")
+                return
             elif response.status_code != 200:
                 print(f"  ⚠️  Twitter API error: {response.status_code}")
-                break
+                record_lost("twitter", unit="pages")
+                return
             
             data = response.json()
-            
-            # Extract tweets
-            tweet_data = data.get("data", [])
-            users = {u["id"]: u for u in data.get("includes", {}).get("users", [])}
-            
-            for tweet in tweet_data:
-                metrics = tweet.get("public_metrics", {})
-                engagement = (
-                    metrics.get("like_count", 0) +
-                    metrics.get("retweet_count", 0) +
-                    metrics.get("reply_count", 0)
-                )
-                
-                # Filter by engagement
-                if engagement < MIN_TWITTER_ENGAGEMENT:
-                    continue
-                
-                author_id = tweet.get("author_id")
-                author = users.get(author_id, {})
-                username = author.get("username", "unknown")
-                
-                tweets.append({
-                    "id": f"twitter-{tweet.get('id', '')}",
-                    "title": tweet.get("text", "")[:200],  # First 200 chars as "title"
-                    "url": f"https://twitter.com/{username}/status/{tweet.get('id', '')}",
-                    "twitter_url": f"https://twitter.com/{username}/status/{tweet.get('id', '')}",
-                    "points": engagement,  # Use engagement as "points"
-                    "num_comments": metrics.get("reply_count", 0),
-                    "author": username,
-                    "created_at": tweet.get("created_at", ""),
-                    "source": "twitter",
-                    "text": tweet.get("text", ""),
-                    "likes": metrics.get("like_count", 0),
-                    "retweets": metrics.get("retweet_count", 0),
-                })
+            pages += 1
+            yield data
             
             # Check for next page
             next_token = data.get("meta", {}).get("next_token")
             if not next_token:
-                break
-            
-            # Rate limiting - Twitter API v2 allows 300 requests per 15 minutes
-            await asyncio.sleep(3.0)
+                return
     
     except httpx.HTTPStatusError as e:
         print(f"  ⚠️  Twitter API HTTP error: {e.response.status_code}")
+        record_lost("twitter", unit="pages")
     except Exception as e:
         print(f"  ⚠️  Twitter API error: {e}")
+        record_lost("twitter", unit="pages")
+
+
+def _page_tweets(data: dict):
+    """(tweet, username) pairs from one search or lookup response."""
+    users = {u["id"]: u for u in data.get("includes", {}).get("users", [])}
+    for tweet in data.get("data", []):
+        yield tweet, users.get(tweet.get("author_id"), {}).get("username", "unknown")
+
+
+def _engagement(tweet: dict) -> int:
+    metrics = tweet.get("public_metrics", {})
+    return (
+        metrics.get("like_count", 0) +
+        metrics.get("retweet_count", 0) +
+        metrics.get("reply_count", 0)
+    )
+
+
+async def iter_tweets(
+    query: str,
+    days_back: int = LOOKBACK_DAYS,
+    max_results: int = 100,
+    client: httpx.AsyncClient = None
+):
+    """
+    Yield tweets page by page for a search query.
     
-    return tweets
+    Same arguments as search_tweets().
+    """
+    if not TWITTER_BEARER_TOKEN:
+        print("  ⚠️  TWITTER_BEARER_TOKEN not set, skipping Twitter collection")
+        return
+    
+    found = 0
+    pages = iter_search_pages(
+        client, query, start_time=_start_time(days_back), page_size=min(max_results, 100)
+    )
+    async with aclosing(pages):
+        async for data in pages:
+            for tweet, username in _page_tweets(data):
+                # Filter by engagement
+                if _engagement(tweet) < MIN_TWITTER_ENGAGEMENT:
+                    continue
+                
+                found += 1
+                yield Post.from_tweet(tweet, username)
+            
+            if found >= max_results:
+                return
 
 
 async def collect_twitter_posts(
     days_back: int = LOOKBACK_DAYS,
-    max_results: int = 200
-) -> List[dict]:
+    max_results: int = 200,
+    mode: str = TWITTER_COLLECTION_MODE
+) -> List[Post]:
     """
     Collect AI-related tweets from Twitter/X.
     
-    Uses multiple search queries to find AI-related content.
+    Searches for every AI keyword, packed into as few OR queries as possible
+    (see plan_twitter_queries()).
     
     Args:
         days_back: How many days back to search
         max_results: Maximum number of tweets to collect
+        mode: "search" (the whole window every run) or "incremental"
+              (only tweets newer than the last run, merged into a local store)
     
     Returns:
         List of AI-related tweets, sorted by engagement
     """
+    unique_tweets = [
+        tweet async for tweet in stream_twitter_posts(days_back=days_back, max_results=max_results, mode=mode)
+    ]
+    
+    # Sort by engagement (points)
+    unique_tweets.sort(key=lambda x: x["points"], reverse=True)
+    
+    return unique_tweets
+
+
+async def stream_twitter_posts(
+    days_back: int = LOOKBACK_DAYS,
+    max_results: int = 200,
+    mode: str = TWITTER_COLLECTION_MODE
+):
+    """
+    Yield AI-related tweets as pages arrive (unsorted, deduplicated).
+    
+    Same arguments as collect_twitter_posts(). Incremental mode yields the
+    top max_results from the store once it has been updated.
+    """
+    if mode not in ("search", "incremental"):
+        raise ValueError(f"Ukjent Twitter-modus: {mode}")
     if not TWITTER_BEARER_TOKEN:
         print("⚠️  TWITTER_BEARER_TOKEN not set, skipping Twitter collection")
-        return []
+        return
     
     print(f"📡 Samler data fra X/Twitter (siste {days_back} dager)...")
+    if mode == "incremental":
+        for tweet in (await collect_incremental(days_back=days_back))[:max_results]:
+            yield tweet
+        return
     
-    # Build search queries from AI keywords
-    # Twitter API works best with OR queries
-    queries = [
-        # General AI queries
-        "(" + " OR ".join(AI_KEYWORDS[:10]) + ")",
-        # Specific tool queries
-        "(AI tool OR AI model OR LLM OR GPT OR Claude OR Gemini)",
-        # Trending AI topics
-        "(artificial intelligence OR machine learning OR deep learning)",
-    ]
+    # Alle søkeord pakket i så få OR-søk som lengdegrensen tillater.
+    # Søkene kjøres samtidig; delt klient holder oss innenfor rate-budsjettet.
+    queries = plan_twitter_queries()
+    print(f"   {len(queries)} søk dekker {len(AI_KEYWORDS)} søkeord")
+    
+    found = 0
+    
+    async with shared_client() as client:
+        sources = {
+            query: iter_tweets(query, days_back=days_back, max_results=max_results, client=client)
+            for query in queries
+        }
+        stream = dedupe(merge_sources(sources))
+        try:
+            async for tweet in stream:
+                found += 1
+                yield tweet
+                if found >= max_results:
+                    break
+        finally:
+            await stream.aclose()
+    
+    print(f"✅ Fant {found} AI-relaterte tweets")
+
+
+def load_incremental_state(path: Path = None) -> dict:
+    """Load the saved cursors and tweet store for incremental collection."""
+    path = path or TWITTER_STATE_FILE
+    if path.exists():
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"   ⚠️  Kunne ikke lese {path}: {e}")
+    return {"cursors": {}, "tweets": {}}
+
+
+def save_incremental_state(state: dict, path: Path = None):
+    """Save the cursors and tweet store for incremental collection."""
+    path = path or TWITTER_STATE_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    tmp_path.replace(path)
+
+
+def compact_tweet(tweet: dict, username: str) -> dict:
+    """Keep only the fields we use, plus the author's username."""
+    stored = {key: tweet[key] for key in STORED_TWEET_FIELDS if key in tweet}
+    stored["username"] = username
+    return stored
+
+
+def _tweet_timestamp(tweet: dict) -> float:
+    try:
+        return datetime.fromisoformat(tweet.get("created_at", "").replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return 0.0
+
+
+async def _search_segment(
+    client: httpx.AsyncClient,
+    query: str,
+    bounds: dict,
+    max_pages: int
+) -> Tuple[List[dict], Optional[dict]]:
+    """
+    Search one range of a query, newest first, for at most max_pages pages.
+    
+    Returns:
+        (compact tweets, progress) where progress is None if no page arrived,
+        else {"newest_id", "newest_time", "oldest_id", "finished", "pages"}
+    """
+    tweets = []
+    progress = None
+    pages = iter_search_pages(client, query, max_pages=max_pages, **bounds)
+    async with aclosing(pages):
+        async for data in pages:
+            meta = data.get("meta", {})
+            page = data.get("data", [])
+            if progress is None:
+                progress = {
+                    "newest_id": meta.get("newest_id") or (page[0]["id"] if page else None),
+                    "newest_time": _tweet_timestamp(page[0]) if page else None,
+                    "pages": 0,
+                }
+            progress["pages"] += 1
+            progress["oldest_id"] = meta.get("oldest_id") or (page[-1]["id"] if page else progress.get("oldest_id"))
+            progress["finished"] = not meta.get("next_token")
+            tweets.extend(
+                compact_tweet(tweet, username) for tweet, username in _page_tweets(data)
+                if _engagement(tweet) >= MIN_TWITTER_ENGAGEMENT
+            )
+    return tweets, progress
+
+
+def _lower_bound(bound: dict, days_back: int) -> dict:
+    """since_id while it is still within reach of search/recent, else a clamped start_time."""
+    if bound.get("since_id") and time.time() - (bound.get("since_time") or 0) < TWITTER_CURSOR_MAX_AGE:
+        return {"since_id": bound["since_id"]}
+    # Same format as _start_time(), so the later of the two compares as a string
+    return {"start_time": max(_start_time(days_back), bound.get("start_time") or "")}
+
+
+async def fetch_new_tweets(
+    client: httpx.AsyncClient,
+    query: str,
+    cursor: Optional[dict],
+    days_back: int = LOOKBACK_DAYS
+) -> Tuple[List[dict], dict]:
+    """
+    Fetch the tweets for a query that are newer than its cursor, plus backfill.
+    
+    The newest pages always come first: since_id moves to the newest tweet
+    seen on every run, at most TWITTER_INCREMENTAL_MAX_PAGES pages later. When
+    that budget runs out before reaching the previous since_id, the range in
+    between becomes a backfill segment (lower bound, until_id) that later runs
+    page through with TWITTER_BACKFILL_MAX_PAGES of their own. Bounds are
+    rebuilt on every run and start_time is clamped to the 7 days
+    search/recent covers, so a segment whose tweets have aged out simply
+    returns nothing and is dropped.
+    
+    Only tweets with at least MIN_TWITTER_ENGAGEMENT are returned, so the
+    store holds nothing the engagement filter would drop.
+    
+    Args:
+        client: httpx client
+        query: Search query
+        cursor: Saved cursor for the query (since_id, since_time, backfill)
+        days_back: Window for the first search
+    
+    Returns:
+        (compact tweets, updated cursor)
+    """
+    cursor = cursor or {}
+    head = {"since_id": cursor.get("since_id"), "since_time": cursor.get("since_time")}
+    backfill = list(cursor.get("backfill", []))
+    
+    tweets, progress = await _search_segment(
+        client, query, _lower_bound(head, days_back), TWITTER_INCREMENTAL_MAX_PAGES
+    )
+    if progress is not None and progress["newest_id"]:
+        if not progress["finished"]:
+            # The page budget ran out before the previous since_id: fetch the rest later
+            backfill.append({**head, "start_time": _start_time(days_back), "until_id": progress["oldest_id"]})
+        head = {"since_id": progress["newest_id"], "since_time": progress["newest_time"] or time.time()}
+    
+    pages_left = TWITTER_BACKFILL_MAX_PAGES
+    remaining = []
+    for segment in backfill:
+        if pages_left <= 0:
+            remaining.append(segment)
+            continue
+        found, progress = await _search_segment(
+            client, query, {**_lower_bound(segment, days_back), "until_id": segment["until_id"]}, pages_left
+        )
+        tweets.extend(found)
+        if progress is None:
+            # Failed before the first page: try again next run
+            remaining.append(segment)
+            pages_left = 0
+            continue
+        pages_left -= progress["pages"]
+        if progress["finished"]:
+            continue
+        remaining.append({**segment, "until_id": progress["oldest_id"]})
     
-    all_tweets = []
+    return tweets, {**head, "backfill": remaining, "updated_at": time.time()}
+
+
+async def refresh_tweet_metrics(client: httpx.AsyncClient, tweets: Dict[str, dict], ids: List[str]) -> int:
+    """
+    Update public_metrics for stored tweets via the /2/tweets lookup.
     
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        for query in queries:
-            print(f"   Søker: {query[:50]}...")
-            tweets = await search_tweets(
-                query,
-                days_back=days_back,
-                max_results=max_results // len(queries),
-                client=client
+    Tweets the API no longer returns (deleted or protected) are removed from
+    the store.
+    
+    Returns:
+        Number of lookup requests made
+    """
+    requests = 0
+    for i in range(0, len(ids), TWITTER_LOOKUP_BATCH):
+        batch = ids[i:i + TWITTER_LOOKUP_BATCH]
+        requests += 1
+        try:
+            response = await client.get(
+                f"{TWITTER_API_BASE}/tweets",
+                headers=_twitter_headers(),
+                params={"ids": ",".join(batch), "tweet.fields": "public_metrics"},
+                timeout=30.0
             )
-            all_tweets.extend(tweets)
-            
-            if len(all_tweets) >= max_results:
-                break
+            response.raise_for_status()
+        except Exception as e:
+            print(f"  ⚠️  Twitter lookup error: {e}")
+            record_lost("twitter", len(batch), unit="refreshes")
+            continue
+        
+        found = {tweet["id"]: tweet for tweet in response.json().get("data", [])}
+        for tweet_id in batch:
+            if tweet_id in found:
+                tweets[tweet_id]["public_metrics"] = found[tweet_id].get("public_metrics", {})
+            else:
+                tweets.pop(tweet_id, None)
+    return requests
+
+
+async def collect_incremental(days_back: int = LOOKBACK_DAYS) -> List[Post]:
+    """
+    Collect AI-related tweets incrementally with per-query since_id cursors.
     
-    # Remove duplicates
-    seen_ids = set()
-    unique_tweets = []
-    for tweet in all_tweets:
-        tweet_id = tweet.get("id")
-        if tweet_id and tweet_id not in seen_ids:
-            seen_ids.add(tweet_id)
-            unique_tweets.append(tweet)
+    Each planned query only fetches tweets newer than the previous run; they
+    are merged into a local store. Engagement for the TWITTER_MAX_REFRESH
+    most engaged stored tweets younger than TWITTER_REFRESH_HOURS is refreshed
+    with batched ID lookups (100 per request) instead of searching the window
+    again.
     
-    # Sort by engagement (points)
-    unique_tweets.sort(key=lambda x: x["points"], reverse=True)
+    Returns:
+        List of AI-related tweets, sorted by engagement
+    """
+    cutoff_timestamp = (datetime.now() - timedelta(days=days_back)).timestamp()
+    state = load_incremental_state()
+    cursors = state.get("cursors", {})
+    stored = state.get("tweets", {})
+    queries = plan_twitter_queries()
     
-    print(f"✅ Fant {len(unique_tweets)} AI-relaterte tweets")
+    async with shared_client() as client:
+        results = await asyncio.gather(
+            *[fetch_new_tweets(client, query, cursors.get(query), days_back) for query in queries]
+        )
+        
+        new_ids = set()
+        for query, (tweets, cursor) in zip(queries, results):
+            cursors[query] = cursor
+            for tweet in tweets:
+                stored[tweet["id"]] = tweet
+                new_ids.add(tweet["id"])
+        
+        refresh_after = time.time() - TWITTER_REFRESH_HOURS * 3600
+        candidates = sorted(
+            (tweet_id for tweet_id, tweet in stored.items()
+             if tweet_id not in new_ids and _tweet_timestamp(tweet) >= refresh_after),
+            key=lambda tweet_id: _engagement(stored[tweet_id]), reverse=True
+        )
+        refresh_ids = sorted(candidates[:TWITTER_MAX_REFRESH])
+        lookups = await refresh_tweet_metrics(client, stored, refresh_ids)
     
-    return unique_tweets
+    print(f"   {len(new_ids)} nye tweets fra {len(queries)} søk, "
+          f"{len(refresh_ids)} lagrede tweets oppdatert med {lookups} oppslag")
+    
+    # Drop tweets that have left the window, and cursors for queries no longer planned
+    stored = {k: v for k, v in stored.items() if _tweet_timestamp(v) >= cutoff_timestamp}
+    save_incremental_state({
+        "cursors": {query: cursors[query] for query in queries},
+        "updated_at": datetime.now().isoformat(),
+        "tweets": stored,
+    })
+    
+    posts = [
+        Post.from_tweet(tweet, tweet.get("username", "unknown"))
+        for tweet in stored.values()
+        if _engagement(tweet) >= MIN_TWITTER_ENGAGEMENT
+    ]
+    posts.sort(key=lambda x: x["points"], reverse=True)
+    print(f"✅ Fant {len(posts)} AI-relaterte tweets ({len(stored)} i lageret)")
+    return posts
+
+
+async def fetch_tweet_counts(
+    client: httpx.AsyncClient,
+    query: str,
+    days_back: int = TWITTER_RECENT_DAYS,
+    granularity: str = "day"
+) -> Optional[dict]:
+    """
+    Count tweets matching a query with /2/tweets/counts/recent.
+    
+    One request returns the whole time series, without any tweet payloads.
+    
+    Args:
+        client: httpx client
+        query: Search query (TWITTER_QUERY_FILTERS is appended)
+        days_back: How many days back to count (at most TWITTER_RECENT_DAYS)
+        granularity: "minute", "hour" or "day"
+    
+    Returns:
+        {"total": int, "series": [{"start": iso, "count": int}, ...]}, or None on errors
+    """
+    try:
+        response = await client.get(
+            f"{TWITTER_API_BASE}/tweets/counts/recent",
+            headers=_twitter_headers(),
+            params={
+                "query": f"{query} {TWITTER_QUERY_FILTERS}",
+                "start_time": _start_time(days_back),
+                "granularity": granularity,
+            },
+            timeout=30.0
+        )
+        response.raise_for_status()
+    except httpx.HTTPStatusError as e:
+        print(f"  ⚠️  Twitter counts HTTP error: {e.response.status_code}")
+        record_lost("twitter", unit="counts")
+        return None
+    except Exception as e:
+        print(f"  ⚠️  Twitter counts error: {e}")
+        record_lost("twitter", unit="counts")
+        return None
+    
+    data = response.json()
+    series = [
+        {"start": bucket["start"], "count": bucket.get("tweet_count", 0)}
+        for bucket in data.get("data", [])
+    ]
+    total = data.get("meta", {}).get("total_tweet_count", sum(bucket["count"] for bucket in series))
+    return {"total": total, "series": series}
+
+
+def category_volume_queries(categories: List[dict] = CATEGORIES) -> Dict[str, str]:
+    """One OR query per output category, built from its examples."""
+    return {
+        category["slug"]: "(" + " OR ".join(_twitter_term(e.lower()) for e in category["examples"]) + ")"
+        for category in categories
+    }
+
+
+async def fetch_mention_volume(
+    queries: Dict[str, str],
+    days_back: int = TWITTER_RECENT_DAYS,
+    granularity: str = "day"
+) -> Dict[str, dict]:
+    """
+    Mention volume over time for named queries, one counts request each.
+    
+    Args:
+        queries: Name (tool, category slug, ...) -> search query
+        days_back: How many days back to count (at most TWITTER_RECENT_DAYS)
+        granularity: "minute", "hour" or "day"
+    
+    Returns:
+        {name: {"total": int, "series": [...]}}; failed queries are left out
+    """
+    if not TWITTER_BEARER_TOKEN:
+        print("  ⚠️  TWITTER_BEARER_TOKEN not set, skipping Twitter counts")
+        return {}
+    
+    async with shared_client() as client:
+        results = await asyncio.gather(
+            *[fetch_tweet_counts(client, query, days_back, granularity) for query in queries.values()]
+        )
+    return {name: result for name, result in zip(queries, results) if result is not None}
 
 
 # CLI for testing
@@ -221,8 +673,13 @@ if __name__ == "__main__":
         
         # Lagre rådata
         with open("twitter_raw_data.json", "w", encoding="utf-8") as f:
-            json.dump(tweets, f, indent=2, ensure_ascii=False)
+            json.dump([post.to_dict() for post in tweets], f, indent=2, ensure_ascii=False)
         print(f"\nLagret til twitter_raw_data.json")
+        
+        print("\nOmtaler per kategori (siste 7 dager):")
+        volume = await fetch_mention_volume(category_volume_queries())
+        for slug, counts in sorted(volume.items(), key=lambda x: -x[1]["total"]):
+            print(f"  {slug}: {counts['total']} ({', '.join(str(b['count']) for b in counts['series'])})")
     
     asyncio.run(main())
 
@@ -1,6 +1,7 @@
 """
 Configuration for AI News Agent MVP
 """
+import os
 from datetime import datetime, timedelta
 
 # Hacker News API
@@ -84,5 +85,69 @@ CATEGORIES = [
 # Minimum score/points for å inkludere en HN-post
 MIN_HN_POINTS = 10
 
+# HN-innsamling: "firebase" (top/best/new stories), "algolia" (hele lookback-vinduet)
+# eller "incremental" (bare nye/endrede items siden forrige kjøring)
+HN_COLLECTION_MODE = "firebase"
+
+# X/Twitter-innsamling: "search" (hele vinduet hver kjøring) eller "incremental"
+# (bare tweets nyere enn forrige kjøring via since_id, flettet inn i et lokalt lager)
+TWITTER_COLLECTION_MODE = "search"
+
 # Output-konfig
 OUTPUT_DIR = "output"
+
+# Lokal tilstand/cache mellom kjøringer (ikke sjekket inn)
+CACHE_DIR = "data/cache"
+
+# Tidsgrenser for innsamling (sekunder)
+# Hver kilde får sin egen timeout; den globale fristen returnerer det som er ferdig
+SOURCE_TIMEOUTS = {
+    "hackernews": 300.0,
+    "github": 180.0,
+    "reddit": 240.0,
+    "twitter": 300.0,
+}
+COLLECTION_DEADLINE = 420.0
+
+# Maks antall posts i køen mellom collectors og nedstrøms steg;
+# collectors venter (backpressure) når køen er full
+STREAM_QUEUE_SIZE = 500
+
+# Kvoter per API: forespørsler per periode (sekunder) og maks burst.
+# Rate-limit-headerne fra API-ene korrigerer gjenstående budsjett underveis;
+# verter som ikke står her begrenses ikke.
+_GITHUB_AUTHENTICATED = bool(os.getenv("GITHUB_TOKEN"))
+RATE_LIMITS = {
+    "api.github.com": {"requests": 5000 if _GITHUB_AUTHENTICATED else 60, "period": 3600, "burst": 10},
+    "api.github.com/search": {"requests": 30 if _GITHUB_AUTHENTICATED else 10, "period": 60, "burst": 5},
+    # GraphQL krever token; et batch-søk etter repo-statistikk koster ~1 av 5000 poeng i timen
+    "api.github.com/graphql": {"requests": 5000, "period": 3600, "burst": 10},
+    "www.reddit.com": {"requests": 60, "period": 60, "burst": 5},
+    # OAuth (REDDIT_CLIENT_ID/REDDIT_CLIENT_SECRET): 100 forespørsler i minuttet
+    "oauth.reddit.com": {"requests": 100, "period": 60, "burst": 10},
+    "api.twitter.com": {"requests": 300, "period": 900, "burst": 5},
+    "hn.algolia.com": {"requests": 10000, "period": 3600, "burst": 20},
+}
+
+# Delt tilstand for rate limiting (låst fil, deles av alle prosesser)
+RATE_LIMIT_STATE_FILE = f"{CACHE_DIR}/rate_limits.json"
+
+# Lengste ventetid på en ledig plass før forespørselen gis opp (sekunder)
+RATE_LIMIT_MAX_WAIT = 120.0
+
+# Reddit OAuth-token (app-only), gjenbrukes til det utløper.
+# I CI holdes tokenet kun i minnet: data/cache lagres med actions/cache, og
+# et token der ville vært lesbart for alle som kan hente cachen.
+REDDIT_TOKEN_FILE = None if os.getenv("CI") else f"{CACHE_DIR}/reddit_token.json"
+
+# HTTP-cache (RFC 9111) for API-kall som gjentas mellom kjøringer.
+# Nøkkel er "vert/sti-prefiks"; verdien er TTL i sekunder, eller None for å
+# følge Cache-Control fra serveren. Forespørsler uten treff her caches ikke.
+HTTP_CACHE_FILE = f"{CACHE_DIR}/http_cache.sqlite"
+HTTP_CACHE_RULES = {
+    "api.github.com/search/": 3600,
+    "api.github.com/repos/": 6 * 3600,
+    "www.reddit.com/r/": 900,
+    "oauth.reddit.com/r/": 900,
+    "hn.algolia.com/api/v1/": 1800,
+}
@@ -9,9 +9,11 @@ Bruk:
     python main.py --collect-only     # Bare samle data
     python main.py --analyze-only     # Bare analyser (krever eksisterende data)
     python main.py --days 30          # Override antall dager
+    python main.py --hn-mode algolia  # HN fra Algolia (dekker hele perioden)
 """
 import argparse
 import asyncio
+import time
 
 # Load environment variables from .env file
 try:
@@ -21,63 +23,114 @@ except ImportError:
     # python-dotenv not installed, skip (will use system env vars)
     pass
 
-from typing import List, Dict
+from typing import List, Dict, Optional
 from pathlib import Path
 import json
 from datetime import datetime, timedelta
 
-from .collectors.hackernews import collect_ai_mentions
-from .collectors.github import collect_github_trending
-from .collectors.reddit import collect_reddit_posts
-from .collectors.twitter import collect_twitter_posts
+from .collectors.hackernews import stream_ai_mentions
+from .collectors.github import stream_github_trending
+from .collectors.reddit import stream_reddit_posts
+from .collectors.twitter import stream_twitter_posts
 from .analyzer import analyze_with_claude, validate_rankings, add_trends_to_rankings
-from .config import LOOKBACK_DAYS, OUTPUT_DIR
+from .config import LOOKBACK_DAYS, OUTPUT_DIR, SOURCE_TIMEOUTS, COLLECTION_DEADLINE, HN_COLLECTION_MODE, TWITTER_COLLECTION_MODE
 from .utils import get_period_string, save_output, load_cached_posts
+from .utils.http_client import close_client, http_cache_stats, resilience_stats, set_http_cache
+from .utils.resilience import lost_items, reset_lost
+from .utils.pipeline import merge_sources, dedupe
+from .utils.canonical_url import merge_duplicates
+from .models import Post
 
 
 
 
-async def run_collection(days: int = LOOKBACK_DAYS) -> List[Dict]:
-    """Kjør datainnsamling fra alle kilder."""
-    all_posts = []
+def print_timing_table(results: List[Dict]):
+    """Print tidsbruk per kilde."""
+    print(f"\n⏱️  Tidsbruk per kilde:")
+    print(f"   {'Kilde':<12} {'Status':<9} {'Items':>6} {'Sekunder':>9}")
+    for r in sorted(results, key=lambda x: x["seconds"], reverse=True):
+        line = f"   {r['source']:<12} {r['status']:<9} {r['count']:>6} {r['seconds']:>9.1f}"
+        if r["error"]:
+            line += f"  ({r['error']})"
+        print(line)
+
+
+def print_resilience_summary(retry_stats: Optional[Dict[str, dict]], lost: Dict[str, Dict[str, int]]):
+    """Skriv ut nye forsøk, åpne kretsbrytere og hva collectorene ga opp."""
+    for host, stats in sorted((retry_stats or {}).items()):
+        if stats["retries"] or stats["failures"] or stats["times_opened"]:
+            line = f"   {host}: {stats['retries']} nye forsøk, {stats['failures']} feilet"
+            if stats["times_opened"]:
+                line += f", kretsbryter åpnet {stats['times_opened']}x ({stats['short_circuited']} avvist)"
+            print(line)
+    if lost:
+        summary = ", ".join(
+            f"{source} {count} {unit}" for source, units in sorted(lost.items()) for unit, count in units.items()
+        )
+        print(f"   ⚠️  Tapte elementer: {summary}")
+
+
+async def run_collection(
+    days: int = LOOKBACK_DAYS,
+    deadline: float = COLLECTION_DEADLINE,
+    hn_mode: str = HN_COLLECTION_MODE,
+    use_cache: bool = True,
+    twitter_mode: str = TWITTER_COLLECTION_MODE
+) -> List[Post]:
+    """
+    Kjør datainnsamling fra alle kilder samtidig.
     
-    # Hacker News
-    print(f"📡 Samler data fra Hacker News (siste {days} dager)...")
-    try:
-        hn_posts = await collect_ai_mentions(days_back=days)
-        print(f"✅ Fant {len(hn_posts)} AI-relaterte HN posts")
-        all_posts.extend(hn_posts)
-    except Exception as e:
-        print(f"⚠️  Feil ved Hacker News innsamling: {e}")
-    
-    # GitHub
-    print(f"📡 Samler data fra GitHub Trending (siste {days} dager)...")
-    try:
-        github_repos = await collect_github_trending(days_back=days, max_results=100)
-        print(f"✅ Fant {len(github_repos)} AI-relaterte GitHub repos")
-        all_posts.extend(github_repos)
-    except Exception as e:
-        print(f"⚠️  Feil ved GitHub innsamling: {e}")
-    
-    # Reddit
-    print(f"📡 Samler data fra Reddit (siste {days} dager)...")
-    try:
-        reddit_posts = await collect_reddit_posts(days_back=days, max_posts_per_subreddit=50)
-        print(f"✅ Fant {len(reddit_posts)} AI-relaterte Reddit posts")
-        all_posts.extend(reddit_posts)
-    except Exception as e:
-        print(f"⚠️  Feil ved Reddit innsamling: {e}")
-    
-    # Twitter/X
-    print(f"📡 Samler data fra X/Twitter (siste {days} dager)...")
+    Collectorene strømmer posts inn i en felles, begrenset kø som tømmes etter
+    hvert som posts kommer. Hver kilde har sin egen timeout (SOURCE_TIMEOUTS);
+    posts som allerede er levert beholdes. Etter den globale fristen avbrytes
+    kilder som ikke er ferdige, og vi fortsetter med det som er samlet inn.
+    Posts beholdes som Post; save_output() skriver dem i dict-formatet.
+    """
+    print(f"📡 Samler data fra HN, GitHub, Reddit og X/Twitter samtidig (siste {days} dager)...")
+    
+    sources = {
+        "hackernews": stream_ai_mentions(days_back=days, mode=hn_mode, use_cache=use_cache),
+        "github": stream_github_trending(days_back=days, max_results=100),
+        "reddit": stream_reddit_posts(days_back=days, max_posts_per_subreddit=50),
+        "twitter": stream_twitter_posts(days_back=days, max_results=200, mode=twitter_mode),
+    }
+    
+    reset_lost()
+    started = time.perf_counter()
+    results = []
+    all_posts = []
+    source_counts = {}
+    cache_stats = None
+    retry_stats = None
     try:
-        twitter_posts = await collect_twitter_posts(days_back=days, max_results=200)
-        print(f"✅ Fant {len(twitter_posts)} AI-relaterte tweets")
-        all_posts.extend(twitter_posts)
-    except Exception as e:
-        print(f"⚠️  Feil ved Twitter innsamling: {e}")
+        stream = merge_sources(sources, results, timeouts=SOURCE_TIMEOUTS, deadline=deadline)
+        async for post in dedupe(stream):
+            all_posts.append(post)
+            source = post.get("source", "unknown")
+            source_counts[source] = source_counts.get(source, 0) + 1
+    finally:
+        cache_stats = http_cache_stats()
+        retry_stats = resilience_stats()
+        await close_client()
+    
+    for r in results:
+        if r["status"] != "ok":
+            print(f"⚠️  Feil ved {r['source']} innsamling: {r['status']} {r['error']}")
     
-    # Kombiner og sorter
+    print_timing_table(results)
+    print(f"   Total veggklokketid: {time.perf_counter() - started:.1f}s")
+    if cache_stats:
+        print(f"   HTTP-cache: {cache_stats['hits']} treff, {cache_stats['revalidated']} revalidert (304), "
+              f"{cache_stats['misses']} hentet, {cache_stats['bytes_saved'] / 1e6:.1f} MB spart")
+    print_resilience_summary(retry_stats, lost_items())
+    
+    # Slå sammen samme lenke fra flere kilder (HN + Reddit + GitHub) til én post
+    collected = len(all_posts)
+    all_posts = merge_duplicates(all_posts)
+    if len(all_posts) < collected:
+        print(f"   🔗 {collected - len(all_posts)} duplikater slått sammen på tvers av kilder (kanonisk URL)")
+    
+    # Sorter én gang når alle kilder er ferdige
     all_posts.sort(key=lambda x: x["points"], reverse=True)
     
     print(f"\n📊 Totalt {len(all_posts)} AI-relaterte items fra alle kilder")
@@ -85,11 +138,6 @@ async def run_collection(days: int = LOOKBACK_DAYS) -> List[Dict]:
         print(f"   Topp item: [{all_posts[0]['points']} pts] {all_posts[0]['title'][:50]}...")
     
     # Print breakdown by source
-    source_counts = {}
-    for post in all_posts:
-        source = post.get("source", "unknown")
-        source_counts[source] = source_counts.get(source, 0) + 1
-    
     print(f"\n📈 Fordeling per kilde:")
     for source, count in sorted(source_counts.items(), key=lambda x: x[1], reverse=True):
         print(f"   {source}: {count} items")
@@ -172,6 +220,9 @@ async def main():
     parser.add_argument("--analyze-only", action="store_true", help="Bare analyser eksisterende data")
     parser.add_argument("--days", type=int, default=LOOKBACK_DAYS, help="Antall dager tilbake")
     parser.add_argument("--no-cache", action="store_true", help="Ignorer cached data")
+    parser.add_argument("--hn-mode", choices=["firebase", "algolia", "incremental"], default=HN_COLLECTION_MODE, help="Kilde for HN-innsamling")
+    parser.add_argument("--twitter-mode", choices=["search", "incremental"], default=TWITTER_COLLECTION_MODE, help="Twitter-søk i hele vinduet eller bare nye tweets siden forrige kjøring")
+    parser.add_argument("--deadline", type=float, default=COLLECTION_DEADLINE, help="Global frist for innsamling (sekunder)")
     args = parser.parse_args()
     
     period = get_period_string()
@@ -186,7 +237,15 @@ async def main():
             return
         print(f"📂 Lastet {len(posts)} cached posts")
     else:
-        posts = await run_collection(days=args.days)
+        if args.no_cache:
+            set_http_cache(None)
+        posts = await run_collection(
+            days=args.days,
+            deadline=args.deadline,
+            hn_mode=args.hn_mode,
+            use_cache=not args.no_cache,
+            twitter_mode=args.twitter_mode
+        )
         
         # Cache rådata
         raw_file = save_output(posts, f"raw_posts_{period}.json")
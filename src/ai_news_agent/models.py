@@ -0,0 +1,295 @@
+"""
+Kompakt datamodell for innsamlede posts.
+
+Alle kilder bygger posts via Post, slik at feltene er like uansett kilde.
+Post bruker __slots__ og internerte strenger for felter med få unike verdier
+(source, author, subreddit, language, keywords), og kan konverteres tapsfritt
+til og fra dict-formatet som JSON-filene bruker.
+
+Posts går gjennom pipelinen som Post og leses som en dict (post["points"],
+post.get("source")); de gjøres om til dict først når de skrives til fil.
+"""
+import sys
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# Kildespesifikk lenke-nøkkel i dict-formatet (hn_url, github_url, ...)
+SOURCE_URL_KEYS = {
+    "hackernews": "hn_url",
+    "github": "github_url",
+    "reddit": "reddit_url",
+    "twitter": "twitter_url",
+}
+
+CORE_FIELDS = ("id", "title", "url", "points", "num_comments", "author", "created_at", "source")
+
+# Valgfrie felter i samme rekkefølge som collectorene skriver dem
+OPTIONAL_FIELDS = ("description", "language", "topics", "subreddit", "text", "likes", "retweets", "keywords")
+
+_TUPLE_FIELDS = ("topics", "keywords")
+
+_MISSING = object()
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+def _intern_all(values) -> Tuple:
+    return tuple(map(_intern, values))
+
+
+@dataclass(slots=True)
+class Post(Mapping):
+    """
+    Én normalisert post fra en vilkårlig kilde.
+
+    Valgfrie felter som er None finnes ikke i dict-formatet. Ukjente nøkler
+    (og valgfrie felter med verdien None) bevares i `extra`. Bygg poster med
+    from_dict() eller from_*()-konstruktørene, som internerer strengene.
+
+    Posten kan leses som dict-formatet (post["hn_url"], post.get("keywords"),
+    dict(post)), og post[key] = value setter felt eller `extra`.
+    """
+    id: str
+    title: str
+    url: str
+    points: int
+    num_comments: int
+    author: str
+    created_at: str
+    source: str
+    link: Optional[str] = None                  # hn_url/github_url/reddit_url/twitter_url
+    description: Optional[str] = None
+    language: Optional[str] = None
+    topics: Optional[Tuple[str, ...]] = None
+    subreddit: Optional[str] = None
+    text: Optional[str] = None
+    likes: Optional[int] = None
+    retweets: Optional[int] = None
+    keywords: Optional[Tuple[str, ...]] = None
+    extra: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Post":
+        """Bygg en Post fra dict-formatet (tapsfritt, se to_dict)."""
+        fields = {name: data[name] for name in CORE_FIELDS}
+        extra = {}
+        link_key = SOURCE_URL_KEYS.get(data.get("source"))
+        for key, value in data.items():
+            if key in CORE_FIELDS:
+                continue
+            if key == link_key and value is not None:
+                fields["link"] = value
+            elif key in _TUPLE_FIELDS and type(value) is list:
+                fields[key] = value
+            elif key in OPTIONAL_FIELDS and key not in _TUPLE_FIELDS and value is not None:
+                fields[key] = value
+            else:
+                extra[key] = value
+        return cls._interned(fields, extra)
+
+    @classmethod
+    def _interned(cls, fields: dict, extra: dict) -> "Post":
+        """Interner gjentatte strenger og bygg posten."""
+        for name in ("source", "author", "subreddit", "language"):
+            fields[name] = _intern(fields.get(name))
+        # Samme URL to ganger (github_url/twitter_url) deler ett objekt
+        if fields.get("link") is not None and fields["link"] == fields["url"]:
+            fields["link"] = fields["url"]
+        for name in _TUPLE_FIELDS:
+            if fields.get(name) is not None:
+                fields[name] = _intern_all(fields[name])
+        return cls(**fields, extra=extra or None)
+
+    @classmethod
+    def _build(cls, **fields) -> "Post":
+        """Konstruktør for API-data: valgfrie felter som er None havner i `extra`."""
+        extra = {name: fields.pop(name) for name in OPTIONAL_FIELDS if name in fields and fields[name] is None}
+        return cls._interned(fields, extra)
+
+    def to_dict(self) -> dict:
+        """Konverter til dict-formatet collectorene har brukt hele tiden."""
+        data = {"id": self.id, "title": self.title, "url": self.url}
+        if self.link is not None:
+            data[self._link_key()] = self.link
+        data["points"] = self.points
+        data["num_comments"] = self.num_comments
+        data["author"] = self.author
+        data["created_at"] = self.created_at
+        data["source"] = self.source
+        for name in OPTIONAL_FIELDS:
+            value = getattr(self, name)
+            if value is not None:
+                data[name] = list(value) if name in _TUPLE_FIELDS else value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def _link_key(self) -> str:
+        return SOURCE_URL_KEYS.get(self.source, "link")
+
+    def _lookup(self, key: str):
+        """Verdien for en nøkkel i dict-formatet, eller _MISSING."""
+        if key in CORE_FIELDS:
+            return getattr(self, key)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        if key in OPTIONAL_FIELDS:
+            value = getattr(self, key)
+            if value is None:
+                return _MISSING
+            return list(value) if key in _TUPLE_FIELDS else value
+        if key == self._link_key() and self.link is not None:
+            return self.link
+        return _MISSING
+
+    def __getitem__(self, key: str):
+        value = self._lookup(key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default=None):
+        value = self._lookup(key)
+        return default if value is _MISSING else value
+
+    def __contains__(self, key) -> bool:
+        return type(key) is str and self._lookup(key) is not _MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.to_dict())
+
+    def __len__(self) -> int:
+        return len(self.to_dict())
+
+    def __setitem__(self, key: str, value):
+        """Sett et felt (som i dict-formatet); andre nøkler havner i `extra`."""
+        if key in CORE_FIELDS or (key in OPTIONAL_FIELDS and value is not None):
+            if key in _TUPLE_FIELDS:
+                value = _intern_all(value)
+            setattr(self, key, value)
+            if self.extra:
+                self.extra.pop(key, None)
+        elif key == self._link_key() and value is not None:
+            self.link = value
+        else:
+            if key in OPTIONAL_FIELDS:
+                setattr(self, key, None)
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    @classmethod
+    def from_hn_item(cls, raw: dict, keywords: Optional[list[str]] = None) -> "Post":
+        """Bygg en Post direkte fra en HN-item (Firebase- eller Algolia-form)."""
+        story_id = raw.get("id", "")
+        created_time = raw.get("time", 0)
+
+        if created_time:
+            created_date = datetime.fromtimestamp(created_time).isoformat()
+        else:
+            created_date = ""
+
+        return cls(
+            id=str(story_id),
+            title=raw.get("title", ""),
+            url=raw.get("url", ""),
+            link=f"https://news.ycombinator.com/item?id={story_id}",
+            points=raw.get("score", 0),
+            num_comments=raw.get("descendants", 0),
+            author=_intern(raw.get("by", "")),
+            created_at=created_date,
+            source="hackernews",
+            keywords=tuple(keywords) if keywords else (),  # Allerede delte strenger fra keyword-listen
+        )
+
+    @classmethod
+    def from_github_repo(cls, raw: dict, keywords: Optional[list[str]] = None) -> "Post":
+        """Bygg en Post direkte fra et repo i GitHub Search API."""
+        repo_id = raw.get("id", "")
+        created_at = raw.get("created_at", "")
+        updated_at = raw.get("updated_at", "")
+
+        # Bruk created_at hvis tilgjengelig, ellers updated_at
+        date_str = created_at or updated_at or ""
+
+        # Parse ISO format til vårt format
+        if date_str:
+            try:
+                dt = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+                date_str = dt.isoformat()
+            except (ValueError, TypeError, AttributeError):
+                date_str = ""
+
+        # Bygg full URL
+        html_url = raw.get("html_url", "")
+        owner = raw.get("owner", {})
+        owner_login = owner.get("login", "")
+        repo_name = raw.get("name", "")
+
+        if not html_url and owner_login and repo_name:
+            html_url = f"https://github.com/{owner_login}/{repo_name}"
+
+        return cls._build(
+            id=f"github-{repo_id}",
+            title=raw.get("name", ""),
+            url=html_url,
+            link=html_url,
+            points=raw.get("stargazers_count", 0),  # Stars = "points" i vårt system
+            num_comments=0,  # GitHub har ikke "comments" som HN
+            author=owner_login,
+            created_at=date_str,
+            source="github",
+            description=raw.get("description", ""),
+            language=raw.get("language", ""),
+            topics=raw.get("topics", []),  # GitHub topics/tags
+            keywords=keywords or (),
+        )
+
+    @classmethod
+    def from_reddit_post(cls, raw: dict, subreddit: str, keywords: Optional[list[str]] = None) -> "Post":
+        """Bygg en Post direkte fra `data`-feltet i en Reddit listing."""
+        created_utc = raw.get("created_utc", 0)
+        selftext = raw.get("selftext", "")
+        return cls._build(
+            id=f"reddit-{raw.get('id', '')}",
+            title=raw.get("title", ""),
+            url=raw.get("url", ""),
+            link=f"https://reddit.com{raw.get('permalink', '')}",
+            points=raw.get("score", 0),
+            num_comments=raw.get("num_comments", 0),
+            author=raw.get("author", ""),
+            created_at=datetime.fromtimestamp(created_utc).isoformat(),
+            source="reddit",
+            subreddit=subreddit,
+            text=selftext[:500] if selftext else "",  # Første 500 tegn
+            keywords=keywords or (),
+        )
+
+    @classmethod
+    def from_tweet(cls, raw: dict, username: str) -> "Post":
+        """Bygg en Post direkte fra en tweet i Twitter API v2."""
+        metrics = raw.get("public_metrics", {})
+        engagement = (
+            metrics.get("like_count", 0) +
+            metrics.get("retweet_count", 0) +
+            metrics.get("reply_count", 0)
+        )
+        tweet_url = f"https://twitter.com/{username}/status/{raw.get('id', '')}"
+        return cls._build(
+            id=f"twitter-{raw.get('id', '')}",
+            title=raw.get("text", "")[:200],  # Første 200 tegn som "title"
+            url=tweet_url,
+            link=tweet_url,
+            points=engagement,  # Engagement som "points"
+            num_comments=metrics.get("reply_count", 0),
+            author=username,
+            created_at=raw.get("created_at", ""),
+            source="twitter",
+            text=raw.get("text", ""),
+            likes=metrics.get("like_count", 0),
+            retweets=metrics.get("retweet_count", 0),
+        )
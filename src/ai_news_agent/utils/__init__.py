@@ -15,8 +15,15 @@ def get_period_string() -> str:
     return datetime.now().strftime("%Y-%m")
 
 
+def _to_json(value):
+    """json.dump fallback for records with to_dict() (models.Post)."""
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
 def save_output(data: dict, filename: str, output_dir: str = None) -> Path:
-    """Save data to output directory."""
+    """Save data to output directory; Post objects are written in dict format."""
     if output_dir is None:
         output_dir = OUTPUT_DIR
     
@@ -25,7 +32,7 @@ def save_output(data: dict, filename: str, output_dir: str = None) -> Path:
     
     filepath = output_path / filename
     with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+        json.dump(data, f, indent=2, ensure_ascii=False, default=_to_json)
     
     return filepath
 
@@ -0,0 +1,182 @@
+"""
+Cross-source deduplication on canonical URLs.
+
+The same story often shows up as an HN link, a Reddit post and a GitHub repo.
+Each collector only deduplicates its own prefixed ids, so canonical_url()
+reduces every link to one key (no scheme, lowercase host without "www.",
+no tracking parameters or fragment, GitHub links cut to owner/repo, ...) and
+merge_duplicates() groups posts on that key in a dict and merges each group
+into one post with summed engagement and links to every source. Posts can be
+models.Post or dicts; a merged group keeps the type of its leading post.
+
+Usage:
+    posts = merge_duplicates(posts)
+"""
+import re
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from ..models import SOURCE_URL_KEYS, Post
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = frozenset({
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid", "yclid",
+    "ref", "ref_src", "ref_url", "si", "cmpid", "__twitter_impression",
+})
+TRACKING_PREFIXES = ("utm_", "pk_", "mtm_", "hsa_", "_hs")
+
+# Short names that only track on these hosts (elsewhere they may pick the page)
+HOST_TRACKING_PARAMS = {
+    "twitter.com": frozenset({"s", "t"}),
+    "reddit.com": frozenset({"share_id", "context"}),
+}
+
+# Host prefixes that serve the same pages as the bare host
+HOST_PREFIXES = ("www.", "m.", "mobile.", "amp.")
+
+HOST_ALIASES = {
+    "x.com": "twitter.com",
+    "youtu.be": "youtube.com",
+    "redd.it": "reddit.com",
+    "old.reddit.com": "reddit.com",
+    "new.reddit.com": "reddit.com",
+    "np.reddit.com": "reddit.com",
+}
+
+# First path segments on github.com that are not owners
+GITHUB_RESERVED = frozenset({
+    "about", "apps", "collections", "customer-stories", "enterprise", "events", "explore",
+    "features", "login", "marketplace", "notifications", "orgs", "pricing", "search",
+    "settings", "sponsors", "topics", "trending", "users",
+})
+
+_ARXIV_ID = re.compile(r"^/(?:abs|pdf|html)/(\d{4}\.\d{4,5}|[a-z\-]+/\d{7})(?:v\d+)?(?:\.pdf)?/?$")
+
+
+def _strip_host(host: str) -> str:
+    host = host.lower().rstrip(".")
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix) and host.count(".") > 1:
+            host = host[len(prefix):]
+            break
+    return HOST_ALIASES.get(host, host)
+
+
+def _is_tracking(name: str, host: str) -> bool:
+    name = name.lower()
+    return (name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+            or name in HOST_TRACKING_PARAMS.get(host, ()))
+
+
+def canonical_url(url: Optional[str]) -> Optional[str]:
+    """
+    Reduce a URL to a key that is equal for links to the same page.
+
+    Args:
+        url: Any http(s) URL
+
+    Returns:
+        "host/path?query" without scheme, "www.", default port, fragment,
+        trailing slash or tracking parameters; None for empty or non-http URLs
+    """
+    if not url:
+        return None
+    try:
+        parts = urlsplit(url.strip())
+        host = parts.hostname
+        port = parts.port
+    except ValueError:
+        return None
+    if parts.scheme.lower() not in ("http", "https") or not host:
+        return None
+
+    host = _strip_host(host)
+    if port not in (None, 80, 443):
+        host = f"{host}:{port}"
+    path = re.sub(r"/{2,}", "/", parts.path).rstrip("/")
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not _is_tracking(k, host)]
+
+    if host == "github.com":
+        segments = [s for s in path.split("/") if s]
+        if len(segments) >= 2 and segments[0].lower() not in GITHUB_RESERVED:
+            # Repo pages (tree, blob, issues, README, ...) all count as the repo
+            repo = segments[1].lower().removesuffix(".git")
+            return f"github.com/{segments[0].lower()}/{repo}"
+    elif host == "youtube.com":
+        if parts.hostname.lower().endswith("youtu.be") and path:
+            return f"youtube.com/watch?v={path.lstrip('/')}"
+        video = dict(query).get("v")
+        if path == "/watch" and video:
+            return f"youtube.com/watch?v={video}"
+    elif host == "arxiv.org":
+        match = _ARXIV_ID.match(path)
+        if match:
+            return f"arxiv.org/abs/{match.group(1)}"
+    elif host == "reddit.com":
+        match = re.match(r"^(?:/r/[^/]+)?/comments/([a-z0-9]+)", path, re.IGNORECASE)
+        if match:
+            return f"reddit.com/comments/{match.group(1).lower()}"
+        if parts.hostname.lower().endswith("redd.it") and path:
+            return f"reddit.com/comments/{path.lstrip('/').lower()}"
+
+    key = f"{host}{path}"
+    if query:
+        key += "?" + urlencode(sorted(query))
+    return key
+
+
+def post_url_key(post: Mapping) -> Optional[str]:
+    """Canonical key for the page a post is about (None for self posts without a link)."""
+    return canonical_url(post.get("url"))
+
+
+def _merge(group: List[Mapping]) -> Mapping:
+    """Merge posts about the same page; the one with the most points leads."""
+    group = sorted(group, key=lambda p: p.get("points", 0), reverse=True)
+    merged = dict(group[0])
+    merged["points"] = sum(p.get("points", 0) for p in group)
+    merged["num_comments"] = sum(p.get("num_comments", 0) for p in group)
+    merged["sources"] = list(dict.fromkeys(p.get("source", "unknown") for p in group))
+    merged["merged_ids"] = [p["id"] for p in group]
+    merged["links"] = []
+    for post in group:
+        link_key = SOURCE_URL_KEYS.get(post.get("source"))
+        link = post.get(link_key) if link_key else None
+        if link:
+            merged["links"].append(link)
+            merged.setdefault(link_key, link)
+    return Post.from_dict(merged) if isinstance(group[0], Post) else merged
+
+
+def merge_duplicates(
+    posts: List[Mapping],
+    key: Callable[[Mapping], Optional[str]] = post_url_key
+) -> List[Mapping]:
+    """
+    Merge posts that link to the same page, across sources.
+
+    Args:
+        posts: Normalized posts (Post or dict format)
+        key: Function giving a post's canonical key, or None to keep it as is
+
+    Returns:
+        Posts in first-seen order; each duplicate group becomes one post with
+        summed points and num_comments, plus "sources", "merged_ids" and
+        "links" (the HN/Reddit/GitHub/X page of every post in the group)
+    """
+    groups: Dict[str, List[Mapping]] = {}
+    order: List[Tuple[Optional[str], Mapping]] = []
+    for post in posts:
+        post_key = key(post)
+        if post_key is not None and post_key in groups:
+            groups[post_key].append(post)
+            continue
+        if post_key is not None:
+            groups[post_key] = [post]
+        order.append((post_key, post))
+
+    merged = []
+    for post_key, post in order:
+        group = groups.get(post_key) if post_key is not None else None
+        merged.append(_merge(group) if group and len(group) > 1 else post)
+    return merged
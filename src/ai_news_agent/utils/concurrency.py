@@ -0,0 +1,126 @@
+"""
+Adaptive concurrency control for high-volume API fetching.
+"""
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Optional
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit that adjusts itself from observed latency and errors (AIMD).
+
+    Every healthy response grows the limit by roughly one slot per window of
+    in-flight requests (additive increase). An error or a response slower than
+    `target_latency` halves the limit (multiplicative decrease), at most once
+    per observed round trip so a burst of failures only backs off once.
+
+    Usage:
+        limiter = AdaptiveLimiter()
+        async with limiter.slot():
+            await client.get(...)
+    """
+
+    def __init__(
+        self,
+        initial: int = 16,
+        min_limit: int = 2,
+        max_limit: int = 128,
+        target_latency: float = 1.5
+    ):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+
+        self.in_flight = 0
+        self.completed = 0
+        self.errors = 0
+        self.peak_limit = float(initial)
+        self._avg_latency: Optional[float] = None
+        self._last_decrease = 0.0
+        self._started = time.perf_counter()
+        # FIFO of waiting tasks; a release wakes only as many as there are free slots
+        self._waiters: deque = deque()
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one concurrency slot for the duration of a request."""
+        await self._acquire()
+
+        started = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.record(time.perf_counter() - started, ok=ok)
+            self.in_flight -= 1
+            self._wake()
+
+    async def _acquire(self):
+        if not self._waiters and self.in_flight < int(self.limit):
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just before the cancellation: pass it on
+                self.in_flight -= 1
+                self._wake()
+            raise
+
+    def _wake(self):
+        """Hand free slots to the longest-waiting tasks (the slot is taken on their behalf)."""
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def record(self, latency: float, ok: bool = True):
+        """Update the limit from one finished request."""
+        self.completed += 1
+        if self._avg_latency is None:
+            self._avg_latency = latency
+        else:
+            self._avg_latency = 0.8 * self._avg_latency + 0.2 * latency
+
+        now = time.perf_counter()
+        if not ok:
+            self.errors += 1
+
+        if not ok or latency > self.target_latency:
+            if now - self._last_decrease >= (self._avg_latency or 0.0):
+                self.limit = max(float(self.min_limit), self.limit / 2)
+                self._last_decrease = now
+        else:
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+            self.peak_limit = max(self.peak_limit, self.limit)
+
+    @property
+    def throughput(self) -> float:
+        """Completed requests per second since the limiter was created."""
+        elapsed = time.perf_counter() - self._started
+        return self.completed / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.completed if self.completed else 0.0
+
+    def stats(self) -> dict:
+        """Snapshot of progress counters."""
+        return {
+            "completed": self.completed,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "limit": int(self.limit),
+            "peak_limit": int(self.peak_limit),
+            "throughput": round(self.throughput, 1),
+            "avg_latency": round(self._avg_latency or 0.0, 3),
+        }
@@ -0,0 +1,124 @@
+"""
+Batched repository statistics from the GitHub GraphQL API.
+
+One aliased query returns stars, forks, exact open/closed issue counts and the
+last commit on the default branch for up to GRAPHQL_BATCH_SIZE repositories,
+where REST needs two requests per repository and has no closed-issue count.
+
+GraphQL requires a token; callers fall back to REST without one.
+
+Usage:
+    stats = await fetch_repo_stats(client, [("continuedev", "continue")], token)
+    stats["continuedev/continue"]["closed_issues"]
+"""
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+
+# Repositories per query; keeps each query well under GitHub's node and cost limits
+GRAPHQL_BATCH_SIZE = 50
+GRAPHQL_CONCURRENCY = 2
+
+REPO_STATS_FRAGMENT = """
+fragment RepoStats on Repository {
+  stargazerCount
+  forkCount
+  openIssues: issues(states: OPEN) { totalCount }
+  closedIssues: issues(states: CLOSED) { totalCount }
+  defaultBranchRef { target { ... on Commit { committedDate } } }
+}
+"""
+
+
+class GraphQLError(Exception):
+    """Raised when a GraphQL response has errors and no data."""
+
+
+def build_repo_stats_query(repos: List[Tuple[str, str]]) -> dict:
+    """
+    Build one aliased query (r0, r1, ...) for the given (owner, name) pairs.
+
+    Returns:
+        JSON payload with "query" and "variables"
+    """
+    params = []
+    fields = []
+    variables = {}
+    for i, (owner, name) in enumerate(repos):
+        params.append(f"$o{i}: String!, $n{i}: String!")
+        fields.append(f"  r{i}: repository(owner: $o{i}, name: $n{i}) {{ ...RepoStats }}")
+        variables[f"o{i}"] = owner
+        variables[f"n{i}"] = name
+    query = f"query RepoStats({', '.join(params)}) {{\n" + "\n".join(fields) + "\n}\n" + REPO_STATS_FRAGMENT
+    return {"query": query, "variables": variables}
+
+
+def parse_repo_stats(node: Optional[dict]) -> Optional[dict]:
+    """Convert a RepoStats node to the fetchers' stats dict (None if the repo was not found)."""
+    if node is None:
+        return None
+    target = (node.get("defaultBranchRef") or {}).get("target") or {}
+    return {
+        "stars": node.get("stargazerCount", 0),
+        "forks": node.get("forkCount", 0),
+        "open_issues": (node.get("openIssues") or {}).get("totalCount", 0),
+        "closed_issues": (node.get("closedIssues") or {}).get("totalCount", 0),
+        "last_commit_date": target.get("committedDate"),
+    }
+
+
+async def _fetch_batch(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    repos: List[Tuple[str, str]],
+    headers: dict
+) -> Dict[str, Optional[dict]]:
+    async with semaphore:
+        response = await client.post(GITHUB_GRAPHQL_URL, json=build_repo_stats_query(repos), headers=headers)
+    response.raise_for_status()
+    body = response.json()
+    data = body.get("data")
+    if data is None:
+        raise GraphQLError("; ".join(error.get("message", "") for error in body.get("errors", [])))
+    # Missing repositories come back as null with a NOT_FOUND error alongside the data
+    return {f"{owner}/{name}": parse_repo_stats(data.get(f"r{i}")) for i, (owner, name) in enumerate(repos)}
+
+
+async def fetch_repo_stats(
+    client: httpx.AsyncClient,
+    repos: List[Tuple[str, str]],
+    token: str,
+    batch_size: int = GRAPHQL_BATCH_SIZE
+) -> Dict[str, Optional[dict]]:
+    """
+    Fetch stats for many repositories in batched GraphQL queries.
+
+    Args:
+        client: HTTP client
+        repos: (owner, name) pairs
+        token: GitHub token (GraphQL does not allow anonymous requests)
+        batch_size: Repositories per query
+
+    Returns:
+        {"owner/name": stats or None if not found}. Repositories in a batch
+        that failed are left out, so callers can fall back to REST for them.
+    """
+    headers = {"Authorization": f"bearer {token}", "User-Agent": "AI-News-Agent/1.0"}
+    unique = list(dict.fromkeys(repos))
+    batches = [unique[i:i + batch_size] for i in range(0, len(unique), batch_size)]
+    semaphore = asyncio.Semaphore(GRAPHQL_CONCURRENCY)
+    results = await asyncio.gather(
+        *[_fetch_batch(client, semaphore, batch, headers) for batch in batches],
+        return_exceptions=True
+    )
+
+    stats = {}
+    for batch, result in zip(batches, results):
+        if isinstance(result, Exception):
+            print(f"  ⚠️  GraphQL batch of {len(batch)} repos failed: {result}")
+            continue
+        stats.update(result)
+    return stats
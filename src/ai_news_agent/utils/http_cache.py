@@ -0,0 +1,279 @@
+"""
+Disk-backed HTTP cache transport (RFC 9111, private cache).
+
+Responses to GET requests are stored in SQLite. Fresh entries are served
+without a request; stale entries with an ETag or Last-Modified are revalidated
+with If-None-Match/If-Modified-Since, so an unchanged resource costs a 304
+instead of a full body (and GitHub does not count 304s against its quota).
+
+Freshness comes from Cache-Control max-age, Expires or the Last-Modified
+heuristic, unless a per-endpoint TTL in config.HTTP_CACHE_RULES overrides it.
+A request can set its own TTL with extensions={"cache_ttl": seconds}, for
+responses the caller knows are final (e.g. searches over past days).
+Only requests matching a rule are cached; everything else passes through.
+"""
+import hashlib
+import json
+import sqlite3
+import time
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import httpx
+
+from ..config import HTTP_CACHE_RULES
+
+# Statuses that may be stored without explicit freshness (RFC 9110 15.1)
+CACHEABLE_STATUSES = {200, 203, 204, 300, 301, 308, 404, 405, 410, 414, 501}
+
+# Heuristic freshness: 10% of the time since Last-Modified, at most a day
+HEURISTIC_FRACTION = 0.1
+MAX_HEURISTIC_TTL = 86400.0
+
+# Entries are dropped this long after they were last validated
+MAX_ENTRY_AGE = 7 * 86400.0
+
+# Headers updated from a 304 are all but these (RFC 9111 4.3.4)
+_NOT_UPDATED_ON_304 = {"content-length", "content-encoding", "transfer-encoding", "content-range"}
+
+# Request headers a response may vary on that hold credentials
+_SECRET_HEADERS = {"authorization", "cookie", "proxy-authorization"}
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """Parse a Cache-Control header into {directive: argument or None}."""
+    directives = {}
+    for part in (value or "").split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') or None
+    return directives
+
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def freshness_lifetime(headers: httpx.Headers, now: float) -> float:
+    """Seconds a response is fresh for, from its own headers (RFC 9111 4.2.1)."""
+    directives = parse_cache_control(headers.get("cache-control"))
+    if "no-cache" in directives:
+        return 0.0
+    if directives.get("max-age") is not None:
+        try:
+            return max(0.0, float(directives["max-age"]))
+        except ValueError:
+            return 0.0
+
+    date = _http_date(headers.get("date")) or now
+    expires = headers.get("expires")
+    if expires is not None:
+        expires_at = _http_date(expires)
+        return max(0.0, expires_at - date) if expires_at else 0.0
+
+    last_modified = _http_date(headers.get("last-modified"))
+    if last_modified is not None and last_modified < date:
+        return min(MAX_HEURISTIC_TTL, (date - last_modified) * HEURISTIC_FRACTION)
+    return 0.0
+
+
+def _age(headers: httpx.Headers) -> float:
+    try:
+        return max(0.0, float(headers.get("age", 0)))
+    except ValueError:
+        return 0.0
+
+
+class CachingTransport(httpx.AsyncBaseTransport):
+    """
+    Private HTTP cache in front of another transport.
+
+    Args:
+        transport: Transport that performs the real requests
+        path: SQLite file (":memory:" for tests)
+        rules: {"host/path-prefix": ttl seconds or None}; None keeps the
+            server's freshness, a number overrides it. Unmatched requests
+            are not cached. A "cache_ttl" request extension overrides the
+            rule's TTL for that request.
+
+    Usage:
+        transport = CachingTransport(build_transport(), "data/cache/http_cache.sqlite")
+        ...
+        print(transport.stats())
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        path: Union[str, Path],
+        rules: Optional[Dict[str, Optional[float]]] = None
+    ):
+        self._transport = transport
+        self.path = Path(path)
+        # Longest prefix first, so specific rules win
+        self.rules: List[Tuple[str, Optional[float]]] = sorted(
+            (HTTP_CACHE_RULES if rules is None else rules).items(), key=lambda rule: -len(rule[0])
+        )
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.stored = 0
+        self.bytes_saved = 0
+
+        if str(path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " status INTEGER NOT NULL,"
+            " headers TEXT NOT NULL,"
+            " vary TEXT NOT NULL,"
+            " body BLOB NOT NULL,"
+            " stored_at REAL NOT NULL,"
+            " fresh_until REAL NOT NULL)"
+        )
+
+    def _rule(self, request: httpx.Request) -> Tuple[bool, Optional[float]]:
+        target = f"{request.url.host}{request.url.path}"
+        for prefix, ttl in self.rules:
+            if target.startswith(prefix):
+                return True, request.extensions.get("cache_ttl", ttl)
+        return False, None
+
+    @staticmethod
+    def _key(request: httpx.Request) -> str:
+        params = sorted(request.url.params.multi_items())
+        return f"{request.url.copy_with(query=None)}?{httpx.QueryParams(params)}"
+
+    @staticmethod
+    def _vary_values(request: httpx.Request, vary: str) -> Dict[str, str]:
+        names = [name.strip().lower() for name in vary.split(",") if name.strip()]
+        values = {}
+        for name in names:
+            value = request.headers.get(name, "")
+            # Credentials are compared by hash, so tokens never reach the cache file
+            values[name] = hashlib.sha256(value.encode()).hexdigest() if name in _SECRET_HEADERS and value else value
+        return values
+
+    def _lookup(self, key: str, request: httpx.Request):
+        row = self._conn.execute(
+            "SELECT status, headers, vary, body, fresh_until FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        status, headers, vary, body, fresh_until = row
+        headers = httpx.Headers(json.loads(headers))
+        if "*" in headers.get("vary", ""):
+            return None
+        if json.loads(vary) != self._vary_values(request, headers.get("vary", "")):
+            return None
+        return status, headers, body, fresh_until
+
+    def _store(self, key: str, request: httpx.Request, status: int, headers: httpx.Headers, body: bytes,
+               ttl: Optional[float], now: float):
+        lifetime = ttl if ttl is not None else freshness_lifetime(headers, now) - _age(headers)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO responses (key, status, headers, vary, body, stored_at, fresh_until)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, status, json.dumps(headers.multi_items()),
+             json.dumps(self._vary_values(request, headers.get("vary", ""))),
+             body, now, now + max(0.0, lifetime))
+        )
+        self._conn.commit()
+        self.stored += 1
+
+    @staticmethod
+    def _storable(request: httpx.Request, response: httpx.Response) -> bool:
+        if response.status_code not in CACHEABLE_STATUSES:
+            return False
+        if "no-store" in parse_cache_control(request.headers.get("cache-control")):
+            return False
+        return "no-store" not in parse_cache_control(response.headers.get("cache-control"))
+
+    @staticmethod
+    def _cached_response(status: int, headers: httpx.Headers, body: bytes, request: httpx.Request, state: str):
+        headers = httpx.Headers(headers)
+        headers["x-cache"] = state
+        return httpx.Response(status, headers=headers, content=body, request=request)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        cacheable, ttl = self._rule(request)
+        if request.method != "GET" or not cacheable:
+            return await self._transport.handle_async_request(request)
+
+        now = time.time()
+        key = self._key(request)
+        request_directives = parse_cache_control(request.headers.get("cache-control"))
+        cached = None if "no-store" in request_directives else self._lookup(key, request)
+
+        if cached is not None:
+            status, headers, body, fresh_until = cached
+            if now < fresh_until and "no-cache" not in request_directives:
+                self.hits += 1
+                self.bytes_saved += len(body)
+                return self._cached_response(status, headers, body, request, "HIT")
+            if headers.get("etag"):
+                request.headers["If-None-Match"] = headers["etag"]
+            elif headers.get("last-modified"):
+                request.headers["If-Modified-Since"] = headers["last-modified"]
+
+        response = await self._transport.handle_async_request(request)
+
+        if cached is not None and response.status_code == 304:
+            await response.aclose()
+            status, headers, body, _ = cached
+            for name, value in response.headers.items():
+                if name.lower() not in _NOT_UPDATED_ON_304:
+                    headers[name] = value
+            self.revalidated += 1
+            self.bytes_saved += len(body)
+            self._store(key, request, status, headers, body, ttl, now)
+            return self._cached_response(status, headers, body, request, "REVALIDATED")
+
+        self.misses += 1
+        if not self._storable(request, response):
+            return response
+        try:
+            body = b"".join([chunk async for chunk in response.stream])
+        finally:
+            await response.aclose()
+        self._store(key, request, response.status_code, response.headers, body, ttl, now)
+        return httpx.Response(response.status_code, headers=response.headers, content=body, request=request)
+
+    def prune(self, older_than: float) -> int:
+        """Delete entries last validated before the given timestamp. Returns rows removed."""
+        cursor = self._conn.execute("DELETE FROM responses WHERE stored_at < ?", (older_than,))
+        self._conn.commit()
+        return cursor.rowcount
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def stats(self) -> dict:
+        """Hit/miss/revalidation counters for this session."""
+        lookups = self.hits + self.misses + self.revalidated
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "stored": self.stored,
+            "bytes_saved": self.bytes_saved,
+            "hit_rate": round((self.hits + self.revalidated) / lookups, 3) if lookups else 0.0,
+        }
+
+    async def aclose(self):
+        try:
+            if self._conn is not None:
+                self.prune(time.time() - MAX_ENTRY_AGE)
+                self._conn.close()
+                self._conn = None
+        finally:
+            await self._transport.aclose()
@@ -0,0 +1,234 @@
+"""
+Shared HTTP client for collectors, fetchers and the link checker.
+
+All outgoing requests go through one pooled httpx.AsyncClient per event loop,
+so TLS handshakes and DNS lookups are paid once per host instead of once per
+call. HTTP/2 is used when the optional `h2` package is installed. Requests to
+APIs with a quota are paced by the shared limiter in utils/rate_limit.py, and
+repeat API calls are served or revalidated from the disk cache in
+utils/http_cache.py.
+
+Set AI_NEWS_CASSETTE (and AI_NEWS_CASSETTE_MODE=record) to record or replay
+all traffic, or call set_transport_factory() to route it to fake APIs.
+"""
+import asyncio
+import os
+import weakref
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, Optional
+
+import httpx
+
+from ..config import HTTP_CACHE_FILE
+from .http_cache import CachingTransport
+from .rate_limit import RateLimitedTransport
+from .resilience import ResilientTransport
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    # h2 not installed, fall back to HTTP/1.1 keep-alive pooling
+    HTTP2_AVAILABLE = False
+
+# Pool sizing
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 40
+KEEPALIVE_EXPIRY = 90.0
+
+# Max in-flight requests per host (HTTP/2 multiplexes these over one connection)
+MAX_REQUESTS_PER_HOST = 32
+HOST_LIMITS = {
+    "www.reddit.com": 4,
+    "oauth.reddit.com": 8,
+    "api.twitter.com": 4,
+}
+
+DEFAULT_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+
+# Record/replay cassette (see utils/http_replay.py)
+CASSETTE_ENV = "AI_NEWS_CASSETTE"
+CASSETTE_MODE_ENV = "AI_NEWS_CASSETTE_MODE"
+
+TransportFactory = Callable[[], httpx.AsyncBaseTransport]
+_transport_factory: Optional[TransportFactory] = None
+
+# Disk HTTP cache used by build_transport(); None disables it
+_http_cache_path: Optional[str] = HTTP_CACHE_FILE
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_transports: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncBaseTransport]" = weakref.WeakKeyDictionary()
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response stream that frees the host slot once the body is consumed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, semaphore: asyncio.Semaphore):
+        self._stream = stream
+        self._semaphore = semaphore
+        self._released = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._released:
+                self._released = True
+                self._semaphore.release()
+
+
+class HostLimitedTransport(httpx.AsyncBaseTransport):
+    """Caps concurrent requests per host on top of another transport."""
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        default_limit: int = MAX_REQUESTS_PER_HOST,
+        host_limits: Optional[Dict[str, int]] = None
+    ):
+        self._transport = transport
+        self._default_limit = default_limit
+        self._host_limits = host_limits if host_limits is not None else HOST_LIMITS
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _semaphore_for(self, host: str) -> asyncio.Semaphore:
+        if host not in self._semaphores:
+            limit = self._host_limits.get(host, self._default_limit)
+            self._semaphores[host] = asyncio.Semaphore(limit)
+        return self._semaphores[host]
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        semaphore = self._semaphore_for(request.url.host)
+        await semaphore.acquire()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            semaphore.release()
+            raise
+        if isinstance(response.stream, httpx.ByteStream):
+            # Body already in memory (mock/cached responses), nothing left to wait for
+            semaphore.release()
+        else:
+            response.stream = _ReleasingStream(response.stream, semaphore)
+        return response
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+def build_transport(cache_path: Optional[str] = None) -> httpx.AsyncBaseTransport:
+    """
+    Build the pooled transport stack used by the shared client.
+
+    Args:
+        cache_path: SQLite file for the HTTP cache (None = no cache). The cache
+            sits on top, so hits use neither rate-limit quota nor connections.
+
+    Stack: cache -> retries/circuit breakers -> rate limiter -> per-host limits -> pool.
+    Each retry waits for its own rate-limit slot.
+    """
+    limits = httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+    )
+    pool = httpx.AsyncHTTPTransport(http2=HTTP2_AVAILABLE, limits=limits, retries=1)
+    transport = ResilientTransport(RateLimitedTransport(HostLimitedTransport(pool)))
+    if cache_path:
+        transport = CachingTransport(transport, cache_path)
+    return transport
+
+
+def set_http_cache(path: Optional[str]) -> Optional[str]:
+    """
+    Use `path` for the HTTP cache of clients created from now on (None disables it).
+
+    Returns the previous path.
+    """
+    global _http_cache_path
+    previous, _http_cache_path = _http_cache_path, path
+    return previous
+
+
+def _find_layer(layer_type: type) -> Optional[httpx.AsyncBaseTransport]:
+    """Find a layer of the given type in the running loop's transport stack."""
+    transport = _transports.get(asyncio.get_running_loop())
+    while transport is not None:
+        if isinstance(transport, layer_type):
+            return transport
+        transport = getattr(transport, "_transport", None)
+    return None
+
+
+def http_cache_stats() -> Optional[dict]:
+    """HTTP cache counters for the running loop's client, or None without a cache."""
+    cache = _find_layer(CachingTransport)
+    return cache.stats() if cache is not None else None
+
+
+def resilience_stats() -> Optional[Dict[str, dict]]:
+    """Per-host retry and circuit-breaker counters for the running loop's client."""
+    resilient = _find_layer(ResilientTransport)
+    return resilient.stats() if resilient is not None else None
+
+
+def set_transport_factory(factory: Optional[TransportFactory]) -> Optional[TransportFactory]:
+    """
+    Route clients created from now on through `factory()` instead of the network.
+
+    Pass None to restore the default. Returns the previous factory. Call
+    close_client() first if a client is already open on the running loop.
+    """
+    global _transport_factory
+    previous, _transport_factory = _transport_factory, factory
+    return previous
+
+
+def _make_transport() -> httpx.AsyncBaseTransport:
+    if _transport_factory is not None:
+        return _transport_factory()
+    cassette = os.getenv(CASSETTE_ENV)
+    if cassette:
+        from .http_replay import cassette_transport
+        mode = os.getenv(CASSETTE_MODE_ENV, "replay")
+        return cassette_transport(cassette, mode, build_transport() if mode == "record" else None)
+    return build_transport(_http_cache_path)
+
+
+def get_client() -> httpx.AsyncClient:
+    """
+    Get the shared client for the running event loop.
+
+    The client is created on first use and reused until close_client() is called.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        transport = _make_transport()
+        client = httpx.AsyncClient(transport=transport, timeout=DEFAULT_TIMEOUT)
+        _clients[loop] = client
+        _transports[loop] = transport
+    return client
+
+
+@asynccontextmanager
+async def shared_client():
+    """
+    Context manager form of get_client() for `async with` call sites.
+
+    The client is left open on exit so later callers reuse the same pool.
+    """
+    yield get_client()
+
+
+async def close_client():
+    """Close the shared client for the running event loop, if any."""
+    loop = asyncio.get_running_loop()
+    client = _clients.pop(loop, None)
+    _transports.pop(loop, None)
+    if client is not None and not client.is_closed:
+        await client.aclose()
@@ -0,0 +1,166 @@
+"""
+Record/replay transports for httpx.
+
+RecordingTransport passes requests through to a real transport and stores
+every request/response pair in a JSON cassette. ReplayTransport serves those
+responses back without touching the network, so collectors can be tested and
+benchmarked offline and deterministically.
+
+The shared client picks these up from the environment:
+    AI_NEWS_CASSETTE=data/cassettes/hn.json AI_NEWS_CASSETTE_MODE=record python -m src.ai_news_agent.main
+    AI_NEWS_CASSETTE=data/cassettes/hn.json python -m src.ai_news_agent.main   # replay
+"""
+import base64
+import json
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Union
+
+import httpx
+
+CASSETTE_VERSION = 1
+CASSETTE_MODES = ("record", "replay")
+
+# Never written to a cassette
+_DROPPED_RESPONSE_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "set-cookie"}
+
+
+class CassetteMissError(httpx.TransportError):
+    """Raised in replay mode for a request that is not in the cassette."""
+
+
+def request_key(request: httpx.Request) -> str:
+    """Match key for a request: method, URL with sorted query, and body."""
+    params = sorted(request.url.params.multi_items())
+    url = request.url.copy_with(query=None)
+    key = f"{request.method} {url}"
+    if params:
+        key += "?" + str(httpx.QueryParams(params))
+    body = request.content
+    if body:
+        key += " " + body.decode("utf-8", errors="replace")
+    return key
+
+
+def _encode_body(content: bytes) -> dict:
+    try:
+        return {"text": content.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"base64": base64.b64encode(content).decode("ascii")}
+
+
+def _decode_body(body: dict) -> bytes:
+    if "base64" in body:
+        return base64.b64decode(body["base64"])
+    return body.get("text", "").encode("utf-8")
+
+
+def load_cassette(path: Union[str, Path]) -> List[dict]:
+    """Read the interactions stored in a cassette file."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != CASSETTE_VERSION:
+        raise ValueError(f"Unsupported cassette version in {path}: {data.get('version')}")
+    return data.get("interactions", [])
+
+
+def save_cassette(path: Union[str, Path], interactions: List[dict]):
+    """Write interactions to a cassette file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": CASSETTE_VERSION, "interactions": interactions}, f, ensure_ascii=False, indent=1)
+    tmp_path.replace(path)
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Pass requests through and record them; the cassette is written on close."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, path: Union[str, Path]):
+        self._transport = transport
+        self.path = Path(path)
+        self.interactions: List[dict] = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self._transport.handle_async_request(request)
+        try:
+            content = b"".join([chunk async for chunk in response.stream])
+        finally:
+            await response.aclose()
+
+        # Decode the body here so the cassette stores plain JSON/text
+        raw = httpx.Response(response.status_code, headers=response.headers, content=content)
+        body = raw.content
+        headers = [
+            [name, value] for name, value in response.headers.multi_items()
+            if name.lower() not in _DROPPED_RESPONSE_HEADERS
+        ]
+        self.interactions.append({
+            "request": {"key": request_key(request), "method": request.method, "url": str(request.url)},
+            "response": {"status": response.status_code, "headers": headers, "body": _encode_body(body)},
+        })
+        return httpx.Response(response.status_code, headers=headers, content=body, request=request)
+
+    def save(self):
+        save_cassette(self.path, self.interactions)
+
+    async def aclose(self):
+        try:
+            self.save()
+        finally:
+            await self._transport.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    Serve recorded responses.
+
+    Repeated requests are answered in recorded order; once a key's recordings
+    are used up, the last one is repeated.
+    """
+
+    def __init__(self, source: Union[str, Path, List[dict]]):
+        interactions = load_cassette(source) if isinstance(source, (str, Path)) else source
+        self._responses: Dict[str, Deque[dict]] = defaultdict(deque)
+        for interaction in interactions:
+            self._responses[interaction["request"]["key"]].append(interaction["response"])
+        self.hits = 0
+        self.misses: List[str] = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key = request_key(request)
+        queue = self._responses.get(key)
+        if not queue:
+            self.misses.append(key)
+            raise CassetteMissError(f"No recorded response for {key}", request=request)
+        recorded = queue.popleft() if len(queue) > 1 else queue[0]
+        self.hits += 1
+        return httpx.Response(
+            recorded["status"],
+            headers=recorded["headers"],
+            content=_decode_body(recorded["body"]),
+            request=request,
+        )
+
+
+def cassette_transport(
+    path: Union[str, Path],
+    mode: str,
+    transport: Optional[httpx.AsyncBaseTransport] = None
+) -> httpx.AsyncBaseTransport:
+    """
+    Build a record or replay transport for a cassette file.
+
+    Args:
+        path: Cassette file
+        mode: "record" (wraps `transport`) or "replay"
+        transport: Real transport to record from
+    """
+    if mode not in CASSETTE_MODES:
+        raise ValueError(f"Unknown cassette mode: {mode}")
+    if mode == "replay":
+        return ReplayTransport(path)
+    if transport is None:
+        raise ValueError("Recording needs a transport to record from")
+    return RecordingTransport(transport, path)
@@ -0,0 +1,131 @@
+"""
+Persistent on-disk cache for API items keyed by ID.
+
+Backed by SQLite. Each entry remembers when the item was created and when we
+fetched it, so the TTL can grow with the item's age: fresh items are always
+refetched, old items whose numbers have stopped moving are kept almost forever.
+"""
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+# Age-aware TTL defaults (seconds)
+ALWAYS_REFRESH_AGE = 6 * 3600          # Younger than this: always refetch
+FROZEN_AGE = 7 * 86400                 # Older than this: treat as (almost) frozen
+FROZEN_TTL = 30 * 86400
+TTL_AGE_RATIO = 0.25                   # In between: TTL = a quarter of the item's age
+
+# Commit to disk after this many writes
+COMMIT_EVERY = 200
+
+
+def age_aware_ttl(age_seconds: float) -> float:
+    """
+    TTL for an item of the given age.
+
+    A 1-day-old story is reused for 6 hours, a 4-day-old story for a day, and
+    anything older than a week for a month.
+    """
+    if age_seconds < ALWAYS_REFRESH_AGE:
+        return 0.0
+    if age_seconds >= FROZEN_AGE:
+        return float(FROZEN_TTL)
+    return age_seconds * TTL_AGE_RATIO
+
+
+class ItemCache:
+    """
+    SQLite-backed item cache with hit/miss statistics.
+
+    Usage:
+        cache = ItemCache("data/cache/hn_items.sqlite")
+        item = cache.get(123)
+        if item is None:
+            item = fetch(...)
+            cache.put(123, item, created_at=item["time"])
+        cache.close()
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        ttl: Callable[[float], float] = age_aware_ttl
+    ):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.writes = 0
+        self._pending = 0
+
+        if str(path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS items ("
+            " key TEXT PRIMARY KEY,"
+            " data TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " fetched_at REAL NOT NULL)"
+        )
+
+    def get(self, key, now: Optional[float] = None) -> Optional[dict]:
+        """Return the cached item if it is still fresh, else None."""
+        now = now if now is not None else time.time()
+        row = self._conn.execute(
+            "SELECT data, created_at, fetched_at FROM items WHERE key = ?", (str(key),)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        data, created_at, fetched_at = row
+        # TTL is based on the item's age when we last fetched it
+        if now - fetched_at > self.ttl(max(0.0, fetched_at - created_at)):
+            self.expired += 1
+            return None
+
+        self.hits += 1
+        return json.loads(data)
+
+    def put(self, key, item: dict, created_at: float, now: Optional[float] = None):
+        """Store or replace an item."""
+        now = now if now is not None else time.time()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO items (key, data, created_at, fetched_at) VALUES (?, ?, ?, ?)",
+            (str(key), json.dumps(item, ensure_ascii=False), float(created_at or now), now)
+        )
+        self.writes += 1
+        self._pending += 1
+        if self._pending >= COMMIT_EVERY:
+            self._conn.commit()
+            self._pending = 0
+
+    def prune(self, older_than: float) -> int:
+        """Delete items created before the given timestamp. Returns rows removed."""
+        cursor = self._conn.execute("DELETE FROM items WHERE created_at < ?", (older_than,))
+        self._conn.commit()
+        return cursor.rowcount
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    def stats(self) -> dict:
+        """Hit/miss counters for this session."""
+        lookups = self.hits + self.misses + self.expired
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "writes": self.writes,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def close(self):
+        """Commit pending writes and close the database."""
+        self._conn.commit()
+        self._conn.close()
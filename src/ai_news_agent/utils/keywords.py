@@ -0,0 +1,189 @@
+"""
+Multi-pattern keyword matching for AI relevance filters.
+
+All keywords are compiled once into an Aho-Corasick automaton (when the
+optional `pyahocorasick` package is installed) or a trie-shaped regular
+expression, so a text is scanned in one pass instead of once per keyword.
+The matched keywords are returned so later stages don't have to rescan.
+"""
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    # pyahocorasick not installed, use the compiled regex trie
+    AHOCORASICK_AVAILABLE = False
+
+from ..config import AI_KEYWORDS
+
+# Keywords this short get word-boundary rules in "auto" mode, so "rag" no longer
+# matches "storage" while "llms", "qwen2" and "gpt5" still match.
+SHORT_KEYWORD_LENGTH = 4
+
+# Boundary rules:
+#   "none": plain substring match (the old `kw in text` behaviour)
+#   "word": every keyword must start and end at a word boundary
+#   "auto": word boundaries only for short keywords
+BOUNDARY_MODES = ("none", "word", "auto")
+
+# Right boundary for short keywords: optional plural "s", then no letter
+_RIGHT_BOUNDARY = r"s?(?![a-z])"
+_LETTERS = frozenset("abcdefghijklmnopqrstuvwxyz")
+_WORD_CHARS = _LETTERS | frozenset("0123456789")
+
+
+def _left_boundary(length: int) -> str:
+    """
+    Assert that the keyword just matched (`length` chars) is not preceded by a
+    letter or digit. Checked at the end of the match so every branch of the
+    compiled pattern still starts with a literal character.
+    """
+    return r"(?<![a-z0-9]" + "." * length + ")"
+
+
+def _trie_pattern(words: Dict[str, bool]) -> str:
+    """
+    Build one regex matching any of `words`, preferring the longest match.
+
+    `words` maps each keyword to whether it needs word boundaries.
+    """
+    trie: Dict = {}
+    for word, bounded in words.items():
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = _left_boundary(len(word)) + _RIGHT_BOUNDARY if bounded else ""
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if "" in node:
+            # Terminal goes last: a longer keyword wins over its own prefix
+            branches.append(node[""])
+        if len(branches) == 1:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")"
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    Compiled matcher for a fixed keyword list.
+
+    Matching is case-insensitive. find_all() returns the matched keywords in
+    the order they first appear, using the spelling from the keyword list.
+    """
+
+    def __init__(self, keywords: Iterable[str], boundaries: str = "auto"):
+        if boundaries not in BOUNDARY_MODES:
+            raise ValueError(f"Unknown boundary mode: {boundaries}")
+        self.boundaries = boundaries
+
+        self._canonical: Dict[str, str] = {}
+        for kw in keywords:
+            key = kw.lower().strip()
+            if key and key not in self._canonical:
+                self._canonical[key] = kw
+
+        self._bounded = {key: self._needs_boundary(key) for key in self._canonical}
+        self._pattern = re.compile(_trie_pattern(self._bounded)) if self._bounded else None
+        # Zero-width lookahead: finditer tries every position, so matches that
+        # overlap an earlier one ("chatgpt-4o" -> "chatgpt" and "gpt-4") are kept
+        self._overlapping = re.compile(f"(?=({self._pattern.pattern}))") if self._pattern else None
+
+        self._automaton = None
+        if AHOCORASICK_AVAILABLE and self._bounded:
+            self._automaton = ahocorasick.Automaton()
+            for key in self._canonical:
+                self._automaton.add_word(key, key)
+            self._automaton.make_automaton()
+
+        # Keywords that start other keywords ("gpt" in "gpt-4"), since the scan
+        # only reports the longest match at each position
+        self._prefixes: Dict[str, Tuple[str, ...]] = {
+            key: tuple(
+                other for other in self._canonical
+                if other != key and key.startswith(other) and self._scan(key, other)
+            )
+            for key in self._canonical
+        }
+
+    def _needs_boundary(self, key: str) -> bool:
+        if self.boundaries == "word":
+            return True
+        if self.boundaries == "auto":
+            return len(key) <= SHORT_KEYWORD_LENGTH
+        return False
+
+    def _scan(self, text: str, key: str) -> bool:
+        """Check a single keyword against already-lowercased text (used at build time)."""
+        if not self._needs_boundary(key):
+            return key in text
+        return re.search(re.escape(key) + _left_boundary(len(key)) + _RIGHT_BOUNDARY, text) is not None
+
+    def _resolve(self, matched: str) -> Optional[str]:
+        if matched in self._canonical:
+            return matched
+        # Bounded match with plural "s"
+        if matched.endswith("s") and matched[:-1] in self._canonical:
+            return matched[:-1]
+        return None
+
+    def _automaton_hits(self, text: str):
+        """Yield (start, key) for every valid keyword occurrence, via Aho-Corasick."""
+        for end, key in self._automaton.iter(text):
+            start = end - len(key) + 1
+            if self._bounded[key]:
+                if start > 0 and text[start - 1] in _WORD_CHARS:
+                    continue
+                after = text[end + 1:end + 2]
+                if after and after in _LETTERS:
+                    if after != "s" or text[end + 2:end + 3] in _LETTERS:
+                        continue
+            yield start, key
+
+    def matches(self, text: str) -> bool:
+        """Return True if any keyword occurs in the text."""
+        if not text or self._pattern is None:
+            return False
+        if self._automaton is not None:
+            return next(self._automaton_hits(text.lower()), None) is not None
+        return self._pattern.search(text.lower()) is not None
+
+    def find_all(self, text: str) -> List[str]:
+        """Return all keywords found in the text, in order of first appearance."""
+        if not text or self._pattern is None:
+            return []
+        if self._automaton is not None:
+            # Order by position, longest keyword first (same order as the regex path)
+            hits = sorted(self._automaton_hits(text.lower()), key=lambda h: (h[0], -len(h[1])))
+            return [self._canonical[key] for key in dict.fromkeys(key for _, key in hits)]
+        text = text.lower()
+        first = self._pattern.search(text)
+        if first is None:
+            return []
+        hits = []
+        for match in self._overlapping.finditer(text, first.start()):
+            key = self._resolve(match.group(1))
+            if key is None:
+                continue
+            start = match.start()
+            hits.append((start, key))
+            left_ok = start == 0 or text[start - 1] not in _WORD_CHARS
+            hits.extend((start, inner) for inner in self._prefixes[key] if left_ok or not self._bounded[inner])
+        hits.sort(key=lambda h: (h[0], -len(h[1])))
+        return [self._canonical[key] for key in dict.fromkeys(key for _, key in hits)]
+
+
+@lru_cache(maxsize=None)
+def get_ai_matcher(boundaries: str = "auto") -> KeywordMatcher:
+    """Shared matcher built from config.AI_KEYWORDS."""
+    return KeywordMatcher(AI_KEYWORDS, boundaries=boundaries)
+
+
+def match_ai_keywords(*fields: Optional[str]) -> List[str]:
+    """Return the AI keywords found across the given text fields."""
+    return get_ai_matcher().find_all(" ".join(f for f in fields if f))
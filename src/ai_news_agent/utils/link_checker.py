@@ -6,12 +6,14 @@ Runs daily to ensure all links in PROVIDER_INFO are still valid.
 import asyncio
 import httpx
 import json
+import sys
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Tuple
 
 from ..config import OUTPUT_DIR
 from ..generator.generate_html import PROVIDER_INFO
+from .http_client import shared_client, close_client
 
 REPORT_FILE = Path(OUTPUT_DIR) / "link_check_report.json"
 
@@ -61,7 +63,7 @@ async def check_provider_links(provider: str, info: Dict[str, str]) -> Dict:
         "website": {"url": info.get("website", ""), "valid": False, "status": 0, "error": ""}
     }
     
-    async with httpx.AsyncClient() as client:
+    async with shared_client() as client:
         # Check logo
         if info.get("logo"):
             logo_valid, logo_status, logo_error = await check_url(client, info["logo"], "logo")
@@ -204,6 +206,8 @@ async def main():
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        await close_client()
 
 
 if __name__ == "__main__":
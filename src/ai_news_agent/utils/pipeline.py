@@ -0,0 +1,122 @@
+"""
+Streaming building blocks for the collection pipeline.
+
+Collectors expose async generators of normalized posts. merge_sources() runs
+them concurrently and feeds one bounded queue, so downstream stages start on
+the first post instead of waiting for the slowest source, and producers wait
+(backpressure) whenever the consumers fall behind.
+"""
+import asyncio
+import time
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+from ..config import STREAM_QUEUE_SIZE
+
+
+async def merge_sources(
+    sources: Dict[str, AsyncIterator[dict]],
+    results: Optional[List[dict]] = None,
+    timeouts: Optional[Dict[str, float]] = None,
+    deadline: Optional[float] = None,
+    maxsize: int = STREAM_QUEUE_SIZE
+) -> AsyncIterator[dict]:
+    """
+    Yield posts from all sources as they arrive.
+
+    Args:
+        sources: Source name -> async generator of posts
+        results: Optional list that receives one status dict per source
+                 (source, count, status, error, seconds)
+        timeouts: Per-source timeout in seconds; posts yielded before a
+                  timeout are kept
+        deadline: Global deadline in seconds; sources still running are cancelled
+        maxsize: Queue size; producers block when the queue is full
+    """
+    results = results if results is not None else []
+    timeouts = timeouts or {}
+    queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+    started = time.perf_counter()
+
+    async def produce(stream: AsyncIterator[dict], result: dict, timeout: Optional[float]):
+        try:
+            async with asyncio.timeout(timeout):
+                async for post in stream:
+                    await queue.put(post)
+                    result["count"] += 1
+        except TimeoutError:
+            result["status"] = "timeout"
+            result["error"] = f"over {timeout:.0f}s"
+        except asyncio.CancelledError:
+            result["status"] = "deadline"
+            result["error"] = f"global frist {deadline:.0f}s" if deadline else "avbrutt"
+            raise
+        except Exception as e:
+            result["status"] = "error"
+            result["error"] = str(e)
+        finally:
+            result["seconds"] = time.perf_counter() - started
+            aclose = getattr(stream, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    tasks = {}
+    for name, stream in sources.items():
+        result = {"source": name, "count": 0, "status": "ok", "error": "", "seconds": 0.0}
+        results.append(result)
+        tasks[asyncio.create_task(produce(stream, result, timeouts.get(name)))] = (stream, result)
+
+    deadline_at = started + deadline if deadline is not None else None
+    running = set(tasks)
+    getter = None
+    try:
+        while running or not queue.empty():
+            if not queue.empty():
+                yield queue.get_nowait()
+                continue
+
+            remaining = None
+            if deadline_at is not None:
+                remaining = deadline_at - time.perf_counter()
+                if remaining <= 0:
+                    break
+
+            getter = getter or asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait(
+                running | {getter}, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                break
+            running -= done
+            if getter in done:
+                post, getter = getter.result(), None
+                yield post
+    finally:
+        if getter is not None:
+            getter.cancel()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for task, (stream, result) in tasks.items():
+            if task.cancelled() and result["status"] == "ok":
+                # Cancelled before it got to run
+                result["status"] = "deadline"
+                result["error"] = f"global frist {deadline:.0f}s" if deadline else "avbrutt"
+                result["seconds"] = time.perf_counter() - started
+                aclose = getattr(stream, "aclose", None)
+                if aclose is not None:
+                    await aclose()
+
+
+async def dedupe(
+    stream: AsyncIterator[dict],
+    key: Callable[[dict], object] = lambda post: post.get("id")
+) -> AsyncIterator[dict]:
+    """Drop posts whose key has already been seen. Posts without a key pass through."""
+    seen = set()
+    async for post in stream:
+        post_key = key(post)
+        if post_key is not None:
+            if post_key in seen:
+                continue
+            seen.add(post_key)
+        yield post
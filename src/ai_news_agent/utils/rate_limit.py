@@ -0,0 +1,307 @@
+"""
+Header-aware rate limiting shared between processes.
+
+Each API quota (a host, or a host/resource such as GitHub search) gets a token
+bucket sized from config.RATE_LIMITS. Responses update the bucket from the
+API's own headers (X-RateLimit-*, x-rate-limit-*, x-ratelimit-*, Retry-After),
+so requests use the full budget the server reports without overshooting it.
+
+Bucket state lives in a JSON file guarded by an exclusive file lock, so the
+main pipeline, the coding-assistant scorer and the link checker can run at
+the same time and still share one quota per API. The transport does the
+locked file work in a worker thread, so waiting for another process's lock
+never blocks the event loop.
+
+Usage:
+    transport = RateLimitedTransport(inner_transport)
+"""
+import asyncio
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+import httpx
+
+from ..config import RATE_LIMIT_MAX_WAIT, RATE_LIMIT_STATE_FILE, RATE_LIMITS
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Reset headers above this are epoch seconds; below, seconds from now
+_EPOCH_THRESHOLD = 1_000_000_000
+
+# Wait this long after a rate-limited response without any usable header
+DEFAULT_RETRY_AFTER = 60.0
+
+
+class RateLimitExceeded(httpx.TransportError):
+    """Raised when a request would have to wait longer than the allowed maximum."""
+
+
+def bucket_key(request: httpx.Request) -> str:
+    """Quota a request counts against: the host, or host/search and host/graphql on GitHub."""
+    host = request.url.host
+    if host == "api.github.com" and request.url.path.startswith("/search/"):
+        return f"{host}/search"
+    if host == "api.github.com" and request.url.path == "/graphql":
+        return f"{host}/graphql"
+    return host
+
+
+def _header_number(headers: httpx.Headers, *names: str) -> Optional[float]:
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            try:
+                return float(value)
+            except ValueError:
+                pass
+    return None
+
+
+def parse_rate_headers(headers: httpx.Headers, now: float) -> Tuple[Optional[float], Optional[float], Optional[float]]:
+    """
+    Read the rate-limit headers used by GitHub, Twitter and Reddit.
+
+    Returns:
+        (remaining, reset epoch, retry-after epoch); None where not present
+    """
+    remaining = _header_number(headers, "x-ratelimit-remaining", "x-rate-limit-remaining")
+    reset = _header_number(headers, "x-ratelimit-reset", "x-rate-limit-reset")
+    if reset is not None and reset < _EPOCH_THRESHOLD:
+        reset = now + reset
+
+    retry_after = None
+    value = headers.get("retry-after")
+    if value:
+        try:
+            retry_after = now + float(value)
+        except ValueError:
+            try:
+                retry_after = parsedate_to_datetime(value).timestamp()
+            except (TypeError, ValueError):
+                pass
+    return remaining, reset, retry_after
+
+
+def is_rate_limited(response: httpx.Response) -> bool:
+    """429, or GitHub's 403 with no requests remaining."""
+    if response.status_code == 429:
+        return True
+    return response.status_code == 403 and response.headers.get("x-ratelimit-remaining") == "0"
+
+
+class RateLimiter:
+    """
+    Token buckets per quota, optionally persisted to a lock-protected file.
+
+    Args:
+        path: State file shared between processes (None = in memory only)
+        policies: {key: {"requests": n, "period": seconds, "burst": n}}
+    """
+
+    def __init__(self, path: Union[str, Path, None] = None, policies: Optional[Dict[str, dict]] = None):
+        self.path = Path(path) if path else None
+        self.policies = RATE_LIMITS if policies is None else policies
+        self._state: Dict[str, dict] = {}
+        self._thread_lock = threading.Lock()
+
+    @contextmanager
+    def _locked_state(self):
+        """Load, yield and save the bucket state under the file lock."""
+        with self._thread_lock:
+            if self.path is None:
+                yield self._state
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path.with_suffix(".lock"), "a") as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    try:
+                        state = json.loads(self.path.read_text(encoding="utf-8"))
+                    except (OSError, ValueError):
+                        state = {}
+                    yield state
+                    tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+                    tmp_path.write_text(json.dumps(state), encoding="utf-8")
+                    tmp_path.replace(self.path)
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _bucket(self, state: dict, key: str, policy: dict, now: float) -> dict:
+        burst = policy.get("burst", 1)
+        bucket = state.setdefault(key, {"tokens": burst, "updated": now})
+        rate = policy["requests"] / policy["period"]
+        bucket["tokens"] = min(burst, bucket["tokens"] + max(0.0, now - bucket["updated"]) * rate)
+        bucket["updated"] = now
+        if bucket.get("reset") and now >= bucket["reset"]:
+            bucket.pop("remaining", None)
+            bucket.pop("reset", None)
+        return bucket
+
+    def reserve(self, key: str, max_wait: Optional[float] = None, now: Optional[float] = None) -> float:
+        """
+        Reserve the next request slot for `key`.
+
+        Returns:
+            Seconds to wait before sending (0 for keys without a policy)
+
+        Raises:
+            RateLimitExceeded: If the wait would exceed `max_wait`; nothing is reserved
+        """
+        policy = self.policies.get(key)
+        if policy is None:
+            return 0.0
+        now = time.time() if now is None else now
+        rate = policy["requests"] / policy["period"]
+
+        with self._locked_state() as state:
+            bucket = self._bucket(state, key, policy, now)
+            start = max(now, bucket.get("blocked_until", 0.0))
+            remaining = bucket.get("remaining")
+            if remaining is not None and remaining < 1:
+                start = max(start, bucket["reset"])
+            tokens = bucket["tokens"] - 1
+            wait = max(start - now, -tokens / rate if tokens < 0 else 0.0)
+
+            if max_wait is not None and wait > max_wait:
+                raise RateLimitExceeded(f"Rate limit for {key}: next slot in {wait:.0f}s")
+            bucket["tokens"] = tokens
+            if remaining is not None:
+                bucket["remaining"] = remaining - 1
+        return wait
+
+    def refund(self, key: str, now: Optional[float] = None):
+        """Give back a reserved slot, e.g. for a 304 that the API does not count."""
+        policy = self.policies.get(key)
+        if policy is None:
+            return
+        now = time.time() if now is None else now
+        with self._locked_state() as state:
+            bucket = self._bucket(state, key, policy, now)
+            bucket["tokens"] = min(policy.get("burst", 1), bucket["tokens"] + 1)
+            if bucket.get("remaining") is not None:
+                bucket["remaining"] += 1
+
+    def update(self, key: str, response: httpx.Response, now: Optional[float] = None):
+        """Correct the bucket for `key` from a response's rate-limit headers."""
+        policy = self.policies.get(key)
+        if policy is None:
+            return
+        now = time.time() if now is None else now
+        remaining, reset, retry_after = parse_rate_headers(response.headers, now)
+        limited = is_rate_limited(response)
+        if remaining is None and retry_after is None and not limited:
+            return
+
+        with self._locked_state() as state:
+            bucket = self._bucket(state, key, policy, now)
+            if remaining is not None and reset is not None:
+                # Responses can arrive out of order; within one window the lowest count wins
+                same_window = bucket.get("reset") is not None and abs(bucket["reset"] - reset) < 2
+                if same_window and bucket.get("remaining") is not None:
+                    remaining = min(remaining, bucket["remaining"])
+                bucket["remaining"] = remaining
+                bucket["reset"] = reset
+            if retry_after is not None:
+                bucket["blocked_until"] = max(bucket.get("blocked_until", 0.0), retry_after)
+            elif limited and (remaining is None or reset is None):
+                bucket["blocked_until"] = max(bucket.get("blocked_until", 0.0), now + DEFAULT_RETRY_AFTER)
+
+    def stats(self) -> Dict[str, dict]:
+        """Current bucket state per key."""
+        with self._locked_state() as state:
+            return {key: dict(bucket) for key, bucket in state.items()}
+
+
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """The process-wide limiter, backed by config.RATE_LIMIT_STATE_FILE."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter(RATE_LIMIT_STATE_FILE)
+    return _rate_limiter
+
+
+def set_rate_limiter(limiter: Optional[RateLimiter]) -> Optional[RateLimiter]:
+    """Replace the process-wide limiter (None = recreate from config). Returns the previous one."""
+    global _rate_limiter
+    previous, _rate_limiter = _rate_limiter, limiter
+    return previous
+
+
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    """
+    Wait for a rate-limit slot before each request and learn from the response.
+
+    Rate-limited responses (429, or GitHub 403 with nothing remaining) are
+    retried after the server's reset when that is within `max_wait`;
+    otherwise the response is returned to the caller as is.
+
+    Args:
+        transport: Transport that sends the requests
+        limiter: Limiter to use (default: the process-wide one)
+        max_wait: Longest wait for a slot before RateLimitExceeded (seconds)
+        max_retries: Retries for rate-limited responses
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        limiter: Optional[RateLimiter] = None,
+        max_wait: float = RATE_LIMIT_MAX_WAIT,
+        max_retries: int = 1
+    ):
+        self._transport = transport
+        self._limiter = limiter
+        self.max_wait = max_wait
+        self.max_retries = max_retries
+
+    @property
+    def limiter(self) -> RateLimiter:
+        return self._limiter or get_rate_limiter()
+
+    @staticmethod
+    async def _call(limiter: RateLimiter, method, *args):
+        """Run a limiter method; file-backed ones take a blocking lock, so off the event loop."""
+        if limiter.path is None:
+            return method(*args)
+        return await asyncio.to_thread(method, *args)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        limiter = self.limiter
+        key = bucket_key(request)
+        response = None
+        for _ in range(self.max_retries + 1):
+            try:
+                wait = await self._call(limiter, limiter.reserve, key, self.max_wait)
+            except RateLimitExceeded:
+                if response is None:
+                    raise
+                return response  # Too long to wait for a retry; let the caller see it
+            if response is not None:
+                await response.aclose()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            response = await self._transport.handle_async_request(request)
+            if response.status_code == 304:
+                # Conditional requests answered "not modified" are free on GitHub
+                await self._call(limiter, limiter.refund, key)
+            await self._call(limiter, limiter.update, key, response)
+            if not is_rate_limited(response):
+                return response
+        return response
+
+    async def aclose(self):
+        await self._transport.aclose()
@@ -0,0 +1,170 @@
+"""
+Optional app-only OAuth for the Reddit API.
+
+With REDDIT_CLIENT_ID and REDDIT_CLIENT_SECRET set, requests go to
+oauth.reddit.com with a bearer token from the client-credentials grant, which
+has a much larger quota than the public www.reddit.com JSON endpoints. The
+token is cached on disk (in memory only under CI, where data/cache is shared
+through actions/cache) and refreshed shortly before it expires; a 401 forces
+a refresh. Without credentials, the public endpoints are used as before.
+
+Both Reddit fetchers go through reddit_get(), so they share one token and,
+through the shared client, one rate-limit budget that follows Reddit's
+X-Ratelimit-* headers.
+
+Usage:
+    response = await reddit_get(client, "/r/LocalLLaMA+OpenAI/new.json", params={"limit": 100})
+"""
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import httpx
+
+from ..config import REDDIT_TOKEN_FILE
+
+REDDIT_PUBLIC_BASE = "https://www.reddit.com"
+REDDIT_OAUTH_BASE = "https://oauth.reddit.com"
+REDDIT_TOKEN_URL = "https://www.reddit.com/api/v1/access_token"
+REDDIT_USER_AGENT = "AI-News-Agent/1.0 (by /u/ai-news-agent)"
+
+# Refresh this long before the token expires
+TOKEN_REFRESH_MARGIN = 60.0
+
+
+class RedditAuth:
+    """
+    App-only (client credentials) token for oauth.reddit.com.
+
+    Args:
+        client_id: Reddit app id
+        client_secret: Reddit app secret
+        token_path: File the token is cached in between runs (None = memory only)
+    """
+
+    def __init__(self, client_id: str, client_secret: str, token_path: Union[str, Path, None] = REDDIT_TOKEN_FILE):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.token_path = Path(token_path) if token_path else None
+        self._token: Optional[Dict] = None
+        self._locks: Dict[asyncio.AbstractEventLoop, asyncio.Lock] = {}
+        self.refreshes = 0
+
+    def _lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if loop not in self._locks:
+            self._locks[loop] = asyncio.Lock()
+        return self._locks[loop]
+
+    def _valid(self, token: Optional[Dict]) -> bool:
+        return bool(token) and token.get("expires_at", 0) - TOKEN_REFRESH_MARGIN > time.time()
+
+    def _load(self) -> Optional[Dict]:
+        if self.token_path is None:
+            return None
+        try:
+            token = json.loads(self.token_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return token if token.get("client_id") == self.client_id else None
+
+    def _save(self, token: Dict):
+        if self.token_path is None:
+            return
+        self.token_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.token_path.with_suffix(f".{os.getpid()}.tmp")
+        # Created owner-only, so the token is never readable by others
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(token, f)
+        tmp_path.replace(self.token_path)
+
+    async def token(self, client: httpx.AsyncClient) -> str:
+        """A valid access token, from memory, the cache file or a new grant."""
+        if self._valid(self._token):
+            return self._token["access_token"]
+        async with self._lock():
+            if self._valid(self._token):
+                return self._token["access_token"]
+            cached = self._load()
+            if self._valid(cached):
+                self._token = cached
+                return cached["access_token"]
+
+            response = await client.post(
+                REDDIT_TOKEN_URL,
+                data={"grant_type": "client_credentials"},
+                auth=(self.client_id, self.client_secret),
+                headers={"User-Agent": REDDIT_USER_AGENT},
+            )
+            response.raise_for_status()
+            body = response.json()
+            if "access_token" not in body:
+                raise httpx.HTTPStatusError(f"Reddit token grant failed: {body}", request=response.request, response=response)
+            self._token = {
+                "client_id": self.client_id,
+                "access_token": body["access_token"],
+                "expires_at": time.time() + float(body.get("expires_in", 3600)),
+            }
+            self.refreshes += 1
+            self._save(self._token)
+            return self._token["access_token"]
+
+    def invalidate(self):
+        """Drop the current token (after a 401), so the next request gets a new one."""
+        self._token = None
+        if self.token_path is not None:
+            self.token_path.unlink(missing_ok=True)
+
+
+_reddit_auth: Optional[RedditAuth] = None
+_reddit_auth_loaded = False
+
+
+def get_reddit_auth() -> Optional[RedditAuth]:
+    """The process-wide RedditAuth from REDDIT_CLIENT_ID/REDDIT_CLIENT_SECRET, or None."""
+    global _reddit_auth, _reddit_auth_loaded
+    if not _reddit_auth_loaded:
+        client_id = os.getenv("REDDIT_CLIENT_ID")
+        client_secret = os.getenv("REDDIT_CLIENT_SECRET")
+        _reddit_auth = RedditAuth(client_id, client_secret) if client_id and client_secret else None
+        _reddit_auth_loaded = True
+    return _reddit_auth
+
+
+def set_reddit_auth(auth: Optional[RedditAuth]) -> Optional[RedditAuth]:
+    """Replace the process-wide RedditAuth (None = public endpoints). Returns the previous one."""
+    global _reddit_auth, _reddit_auth_loaded
+    previous = _reddit_auth
+    _reddit_auth, _reddit_auth_loaded = auth, True
+    return previous
+
+
+async def reddit_get(
+    client: httpx.AsyncClient,
+    path: str,
+    params: Optional[dict] = None,
+    timeout: float = 30.0
+) -> httpx.Response:
+    """
+    GET a Reddit API path (e.g. "/r/python/new.json") over OAuth when configured.
+
+    Returns:
+        The response; a 401 over OAuth is retried once with a fresh token
+    """
+    auth = get_reddit_auth()
+    headers = {"User-Agent": REDDIT_USER_AGENT}
+    if auth is None:
+        return await client.get(f"{REDDIT_PUBLIC_BASE}{path}", params=params, headers=headers, timeout=timeout)
+
+    for attempt in range(2):
+        headers["Authorization"] = f"bearer {await auth.token(client)}"
+        response = await client.get(f"{REDDIT_OAUTH_BASE}{path}", params=params, headers=headers, timeout=timeout)
+        if response.status_code != 401 or attempt:
+            return response
+        await response.aclose()
+        auth.invalidate()
+    return response
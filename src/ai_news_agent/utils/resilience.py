@@ -0,0 +1,229 @@
+"""
+Retries, retry budgets and circuit breakers for the shared HTTP client.
+
+ResilientTransport retries idempotent requests that fail with a network
+error or a 5xx, sleeping a full-jitter exponential backoff between attempts.
+Each host has a retry budget (retries may add at most a fixed share of extra
+load) and a circuit breaker that fails fast after repeated failures instead
+of hammering a host that is down.
+
+Requests that still fail are the collectors' problem; they report what they
+gave up on through record_lost(), so shrinking datasets are visible.
+"""
+import asyncio
+import random
+import time
+from collections import defaultdict
+from typing import Dict, Optional
+
+import httpx
+
+from .rate_limit import RateLimitExceeded
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+RETRYABLE_STATUSES = {500, 502, 503, 504}
+
+# Transport errors that retrying cannot fix
+_NOT_RETRYABLE = (RateLimitExceeded,)
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised instead of sending a request to a host whose circuit is open."""
+
+
+def full_jitter_backoff(attempt: int, base: float, cap: float, rng: random.Random = random) -> float:
+    """Sleep before retry number `attempt` (0-based): uniform in [0, min(cap, base * 2^attempt)]."""
+    return rng.uniform(0.0, min(cap, base * (2 ** attempt)))
+
+
+class RetryBudget:
+    """
+    Limit retries to a share of recent requests.
+
+    Every request deposits `ratio` tokens and every retry spends one, with
+    `minimum` tokens always available, so a failing host can at most add
+    `ratio` extra load plus a small constant.
+    """
+
+    def __init__(self, ratio: float = 0.2, minimum: int = 10):
+        self.ratio = ratio
+        self.minimum = minimum
+        self.balance = float(minimum)
+
+    def deposit(self):
+        self.balance = min(self.balance + self.ratio, self.minimum + 100 * self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.balance < 1:
+            return False
+        self.balance -= 1
+        return True
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after `failure_threshold` consecutive failures.
+
+    While open, requests fail immediately. After `reset_timeout` seconds one
+    trial request is let through (half-open); success closes the circuit,
+    failure opens it again. A trial abandoned without a verdict (cancelled)
+    is released, so the next request becomes the trial.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return True
+        return False
+
+    def release_trial(self):
+        self.trial_in_flight = False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.trial_in_flight or self.failures >= self.failure_threshold:
+            if self.opened_at is None or self.trial_in_flight:
+                self.times_opened += 1
+            self.opened_at = time.monotonic()
+            self.trial_in_flight = False
+
+
+class ResilientTransport(httpx.AsyncBaseTransport):
+    """
+    Retry transient failures with backoff, within per-host budgets and breakers.
+
+    Args:
+        transport: Transport that sends the requests
+        max_attempts: Attempts per request, including the first
+        backoff_base: Backoff for the first retry (seconds, before jitter)
+        backoff_cap: Longest backoff (seconds)
+        failure_threshold: Consecutive failures that open a host's circuit
+        reset_timeout: Seconds before an open circuit lets a trial through
+        seed: Seed for the jitter (None = random)
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        max_attempts: int = 4,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 10.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        seed: Optional[int] = None
+    ):
+        self._transport = transport
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._rng = random.Random(seed)
+        self._budgets: Dict[str, RetryBudget] = defaultdict(RetryBudget)
+        self._breakers: Dict[str, CircuitBreaker] = defaultdict(
+            lambda: CircuitBreaker(failure_threshold, reset_timeout)
+        )
+        self._counts: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"requests": 0, "retries": 0, "failures": 0, "short_circuited": 0}
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        breaker = self._breakers[host]
+        budget = self._budgets[host]
+        counts = self._counts[host]
+        retryable_method = request.method in IDEMPOTENT_METHODS
+
+        counts["requests"] += 1
+        budget.deposit()
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                counts["short_circuited"] += 1
+                raise CircuitOpenError(f"Circuit open for {host}", request=request)
+
+            # allow() just handed this request the half-open trial, if one is in flight
+            trial = breaker.trial_in_flight
+            try:
+                response = await self._transport.handle_async_request(request)
+            except _NOT_RETRYABLE:
+                if trial:
+                    breaker.release_trial()
+                raise
+            except httpx.TransportError:
+                breaker.record_failure()
+                if not self._retry(attempt, retryable_method, budget, counts):
+                    raise
+            except BaseException:
+                # Cancelled: no verdict on the host, so let the next request try
+                if trial:
+                    breaker.release_trial()
+                raise
+            else:
+                if response.status_code not in RETRYABLE_STATUSES:
+                    breaker.record_success()
+                    return response
+                breaker.record_failure()
+                if not self._retry(attempt, retryable_method, budget, counts):
+                    return response
+                await response.aclose()
+
+            await asyncio.sleep(full_jitter_backoff(attempt, self.backoff_base, self.backoff_cap, self._rng))
+            attempt += 1
+
+    def _retry(self, attempt: int, retryable_method: bool, budget: RetryBudget, counts: dict) -> bool:
+        if retryable_method and attempt + 1 < self.max_attempts and budget.withdraw():
+            counts["retries"] += 1
+            return True
+        counts["failures"] += 1
+        return False
+
+    def stats(self) -> Dict[str, dict]:
+        """Per-host requests, retries, final failures, short-circuits and circuit state."""
+        return {
+            host: dict(counts, circuit=self._breakers[host].state, times_opened=self._breakers[host].times_opened)
+            for host, counts in self._counts.items()
+        }
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+# Items/pages collectors gave up on, per source and unit
+_lost: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+
+def record_lost(source: str, count: int = 1, unit: str = "items"):
+    """Record that `count` items (or pages, subreddits, ...) from `source` were not collected."""
+    _lost[source][unit] += count
+
+
+def lost_items() -> Dict[str, Dict[str, int]]:
+    """Everything recorded by record_lost() since the last reset."""
+    return {source: dict(units) for source, units in _lost.items()}
+
+
+def reset_lost():
+    _lost.clear()
@@ -4,6 +4,67 @@ from datetime import datetime, timedelta
 from pathlib import Path
 import json
 
+import httpx
+from src.ai_news_agent.utils.http_client import close_client, set_http_cache, set_transport_factory
+from src.ai_news_agent.utils.rate_limit import RateLimiter, set_rate_limiter
+from src.ai_news_agent.utils.reddit_auth import set_reddit_auth
+from tests.fake_apis import FakeAPIs
+
+
+@pytest.fixture(autouse=True)
+def no_shared_rate_limits():
+    """Keep tests off the shared rate-limit state file and unthrottled"""
+    previous = set_rate_limiter(RateLimiter(None, policies={}))
+    yield
+    set_rate_limiter(previous)
+
+
+@pytest.fixture(autouse=True)
+def no_http_cache():
+    """Keep tests off the on-disk HTTP cache"""
+    previous = set_http_cache(None)
+    yield
+    set_http_cache(previous)
+
+
+@pytest.fixture(autouse=True)
+def public_reddit_api():
+    """Ignore Reddit OAuth credentials in the environment"""
+    previous = set_reddit_auth(None)
+    yield
+    set_reddit_auth(previous)
+
+
+@pytest.fixture
+async def route_shared_client():
+    """
+    Route the shared client to a request handler for one test.
+
+    Usage:
+        await route_shared_client(handler)  # handler(request) -> httpx.Response
+
+    Routing again replaces the handler; the previous transport is restored
+    afterwards.
+    """
+    await close_client()
+    previous = set_transport_factory(None)
+
+    async def route(handler):
+        await close_client()
+        set_transport_factory(lambda: httpx.MockTransport(handler))
+
+    yield route
+    await close_client()
+    set_transport_factory(previous)
+
+
+@pytest.fixture
+async def fake(corpus, route_shared_client):
+    """Route the shared client to fresh fake APIs over the test module's corpus"""
+    apis = FakeAPIs(corpus)
+    await route_shared_client(apis.handle)
+    return apis
+
 
 @pytest.fixture
 def sample_hn_story():
@@ -0,0 +1,802 @@
+"""
+In-process stand-ins for the APIs the collectors and fetchers call.
+
+FakeAPIs answers requests for HN Firebase, HN Algolia, GitHub (search, repos,
+commits), Reddit listings/search and Twitter search/recent from a seeded
+synthetic corpus, without opening sockets. A FakeProfile adds latency,
+rate-limit headers (403/429 when exhausted) and injected failures, so
+collectors can be tested and benchmarked offline and deterministically.
+
+Usage:
+    fake = FakeAPIs(profile=FakeProfile(latency=0.05, error_rate=0.01))
+    set_transport_factory(fake.transport)   # from utils.http_client
+    posts = await collect_ai_mentions(days_back=30)
+    print(fake.stats())
+"""
+import asyncio
+import json
+import math
+import operator
+import random
+import re
+import time
+import zlib
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+from src.ai_news_agent.config import AI_KEYWORDS
+
+FILLER = (
+    "show hn ask why how we built our open fast simple new tool for database "
+    "storage rust python kubernetes startup release launch review performance "
+    "security browser linux editor team year data web framework api guide "
+    "problem thoughts compiler notes lessons"
+).split()
+
+LANGUAGES = ["Python", "TypeScript", "Rust", "Go", "C++", "Jupyter Notebook", None]
+TOPICS = ["llm", "ai", "machine-learning", "rag", "agents", "web", "cli", "database", "devtools"]
+
+# Reddit and Algolia only page through the first 1000 results
+LISTING_LIMIT = 1000
+GITHUB_SEARCH_LIMIT = 1000
+
+
+class FakeProfile:
+    """
+    Behaviour of the fake APIs.
+
+    Args:
+        latency: Base delay per request (seconds)
+        jitter: Extra random delay, uniform in [0, jitter]
+        error_rate: Share of requests answered with `error_status`
+        timeout_rate: Share of requests that raise httpx.ReadTimeout
+        rate_limit: Requests per host per window before 403/429 (None = unlimited)
+        rate_window: Rate-limit window (seconds)
+        error_status: Status code for injected errors
+        seed: Seed for latency and failure injection
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        timeout_rate: float = 0.0,
+        rate_limit: Optional[int] = None,
+        rate_window: float = 60.0,
+        error_status: int = 503,
+        seed: int = 1
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.error_status = error_status
+        self.seed = seed
+
+
+def _default_tools() -> List[dict]:
+    from src.ai_news_agent.coding_assistants.config import CODING_ASSISTANTS
+    return CODING_ASSISTANTS
+
+
+class FakeCorpus:
+    """
+    Seeded synthetic data shared by all fake APIs.
+
+    Timestamps are spread over the last `days` days before `now`, so the
+    collectors' cutoffs behave as against the live APIs.
+    """
+
+    def __init__(
+        self,
+        seed: int = 7,
+        now: Optional[float] = None,
+        days: int = 90,
+        hn_stories: int = 3000,
+        hn_comments: int = 3000,
+        github_repos: int = 1500,
+        reddit_posts_per_subreddit: int = 150,
+        tweets: int = 2000,
+        relevant_ratio: float = 0.3,
+        tools: Optional[List[dict]] = None
+    ):
+        self.seed = seed
+        self.now = int(now if now is not None else time.time())
+        self.days = days
+        self.relevant_ratio = relevant_ratio
+        self.tools = tools if tools is not None else _default_tools()
+        self.reddit_posts_per_subreddit = reddit_posts_per_subreddit
+        self.missing_subreddits = set()
+        self._rng = random.Random(seed)
+        self._terms = list(AI_KEYWORDS) + [tool["name"] for tool in self.tools]
+        self._reddit: Dict[str, List[dict]] = {}
+        self._algolia_hits: Optional[List[Tuple[dict, str]]] = None
+
+        self.hn_items: Dict[int, dict] = {}
+        self._build_hn(hn_stories, hn_comments)
+        self.repos: List[dict] = []
+        self._build_github(github_repos)
+        self.users: Dict[str, dict] = {}
+        self.tweets: List[dict] = []
+        self._build_tweets(tweets)
+
+    # -- text -------------------------------------------------------------
+
+    def _text(self, rng: random.Random, words: Tuple[int, int], relevant: Optional[bool] = None) -> str:
+        parts = [rng.choice(FILLER) for _ in range(rng.randint(*words))]
+        if relevant if relevant is not None else rng.random() < self.relevant_ratio:
+            parts.insert(rng.randrange(len(parts) + 1), rng.choice(self._terms))
+        return " ".join(parts).capitalize()
+
+    def _timestamp(self, rng: random.Random, days: Optional[float] = None) -> int:
+        return self.now - int(rng.random() * (days or self.days) * 86400)
+
+    @staticmethod
+    def _popularity(rng: random.Random, scale: int) -> int:
+        # Heavy tail, like real vote counts
+        return int(scale * (1 / max(rng.random(), 1e-3) - 1))
+
+    # -- Hacker News ------------------------------------------------------
+
+    def _build_hn(self, stories: int, comments: int):
+        rng = self._rng
+        entries = [("story", self._timestamp(rng)) for _ in range(stories)]
+        entries += [("comment", self._timestamp(rng)) for _ in range(comments)]
+        entries.sort(key=lambda e: e[1])
+
+        story_ids = []
+        for offset, (kind, ts) in enumerate(entries):
+            item_id = 40_000_000 + offset
+            author = f"hnuser{rng.randrange(800)}"
+            if kind == "story":
+                self.hn_items[item_id] = {
+                    "id": item_id,
+                    "type": "story",
+                    "title": self._text(rng, (4, 10)),
+                    "url": f"https://example.com/{item_id}",
+                    "score": self._popularity(rng, 8),
+                    "descendants": rng.randrange(300),
+                    "by": author,
+                    "time": ts,
+                    "kids": [],
+                }
+                story_ids.append(item_id)
+            elif story_ids:
+                parent = rng.choice(story_ids[-200:])
+                self.hn_items[item_id] = {
+                    "id": item_id,
+                    "type": "comment",
+                    "text": self._text(rng, (8, 30)),
+                    "by": author,
+                    "parent": parent,
+                    "time": ts,
+                }
+                self.hn_items[parent]["kids"].append(item_id)
+
+    @property
+    def maxitem(self) -> int:
+        return max(self.hn_items) if self.hn_items else 0
+
+    def hn_stories(self) -> List[dict]:
+        return [item for item in self.hn_items.values() if item["type"] == "story"]
+
+    def algolia_hits(self) -> List[Tuple[dict, str]]:
+        """Algolia hits for all HN items with their lowercased search text (built once)."""
+        if self._algolia_hits is None:
+            self._algolia_hits = []
+            for item in self.hn_items.values():
+                hit = _algolia_hit(item, self)
+                text = f"{hit.get('title') or ''} {hit.get('comment_text') or ''}".lower()
+                self._algolia_hits.append((hit, text))
+        return self._algolia_hits
+
+    # -- GitHub -----------------------------------------------------------
+
+    def _build_github(self, count: int):
+        rng = self._rng
+        for tool in self.tools:
+            if tool.get("github_owner") and tool.get("github_repo"):
+                self._add_repo(rng, tool["github_owner"], tool["github_repo"],
+                               f"{tool['name']} AI coding assistant", stars=5000 + rng.randrange(30000))
+        for i in range(count):
+            self._add_repo(rng, f"dev{rng.randrange(600)}", f"project-{i}", self._text(rng, (4, 12)))
+
+    def _add_repo(self, rng: random.Random, owner: str, name: str, description: str, stars: Optional[int] = None):
+        created = self._timestamp(rng, days=3 * 365)
+        pushed = max(created, self._timestamp(rng, days=120))
+        repo_id = 100_000 + len(self.repos)
+        self.repos.append({
+            "id": repo_id,
+            "name": name,
+            "full_name": f"{owner}/{name}",
+            "owner": {"login": owner},
+            "html_url": f"https://github.com/{owner}/{name}",
+            "description": description,
+            "language": rng.choice(LANGUAGES),
+            "topics": rng.sample(TOPICS, rng.randrange(4)),
+            "stargazers_count": stars if stars is not None else self._popularity(rng, 15),
+            "forks_count": rng.randrange(2000),
+            "open_issues_count": rng.randrange(500),
+            "created_at": _iso(created),
+            "updated_at": _iso(pushed),
+            "pushed_at": _iso(pushed),
+        })
+
+    def repo(self, owner: str, name: str) -> Optional[dict]:
+        full_name = f"{owner}/{name}".lower()
+        return next((r for r in self.repos if r["full_name"].lower() == full_name), None)
+
+    # -- Reddit -----------------------------------------------------------
+
+    def subreddit_posts(self, subreddit: str) -> List[dict]:
+        """Posts for a subreddit, generated on first use (any name exists)."""
+        key = subreddit.lower()
+        if key not in self._reddit:
+            rng = random.Random(self.seed * 1_000_003 + zlib.crc32(key.encode()))
+            posts = []
+            for i in range(self.reddit_posts_per_subreddit):
+                post_id = f"{zlib.crc32(key.encode()) % 100000:05x}{i:04x}"
+                title = self._text(rng, (4, 12))
+                posts.append({
+                    "id": post_id,
+                    "name": f"t3_{post_id}",
+                    "title": title,
+                    "selftext": self._text(rng, (0, 60), relevant=False) if rng.random() < 0.6 else "",
+                    "url": f"https://example.com/r/{subreddit}/{post_id}",
+                    "permalink": f"/r/{subreddit}/comments/{post_id}/",
+                    "score": self._popularity(rng, 20),
+                    "num_comments": rng.randrange(400),
+                    "author": f"redditor{rng.randrange(500)}",
+                    "created_utc": float(self._timestamp(rng)),
+                    "subreddit": subreddit,
+                })
+            self._reddit[key] = posts
+        return self._reddit[key]
+
+    # -- Twitter ----------------------------------------------------------
+
+    def _build_tweets(self, count: int):
+        rng = self._rng
+        for i in range(200):
+            self.users[str(9000 + i)] = {"id": str(9000 + i), "username": f"tweeter{i}"}
+        user_ids = list(self.users)
+        for i in range(count):
+            # Search/recent only covers the last 7 days; spread tweets over 10
+            ts = self._timestamp(rng, days=10)
+            self.tweets.append({
+                "id": str(1_700_000_000_000_000_000 + ts * 1000 + i),
+                "text": self._text(rng, (6, 25)),
+                "author_id": rng.choice(user_ids),
+                "created_at": _iso(ts, millis=True),
+                "public_metrics": {
+                    "like_count": self._popularity(rng, 5),
+                    "retweet_count": self._popularity(rng, 1),
+                    "reply_count": rng.randrange(40),
+                    "quote_count": rng.randrange(10),
+                },
+                "_ts": ts,
+            })
+        self.tweets.sort(key=lambda t: int(t["id"]), reverse=True)
+
+
+def _iso(ts: float, millis: bool = False) -> str:
+    dt = datetime.fromtimestamp(ts, tz=timezone.utc)
+    if millis:
+        return dt.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _parse_date(value: str) -> float:
+    """Parse an ISO date or datetime; naive values are taken as UTC."""
+    dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+_OPERATORS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le, "=": operator.eq}
+
+
+def _compare(value: float, op: str, target: float) -> bool:
+    return _OPERATORS[op](value, target)
+
+
+def _range_filter(spec: str, parse=float):
+    """Parse GitHub-style range qualifiers: >=N, >N, <N, <=N, A..B, N."""
+    if ".." in spec:
+        low, high = spec.split("..", 1)
+        checks = []
+        if low and low != "*":
+            checks.append((">=", parse(low)))
+        if high and high != "*":
+            checks.append(("<=", parse(high) + (86399 if parse is _parse_date else 0)))
+        return checks
+    match = re.match(r"(>=|<=|>|<)?(.+)", spec)
+    op, value = match.group(1) or "=", parse(match.group(2))
+    if op == "=" and parse is _parse_date:
+        return [(">=", value), ("<=", value + 86399)]
+    if op in (">", "<=") and parse is _parse_date:
+        # Dates compare by whole day
+        value += 86399
+    return [(op, value)]
+
+
+def _matches_terms(text: str, words: Iterable[str]) -> bool:
+    text = text.lower()
+    return all(word in text for word in words)
+
+
+class FakeAPIs:
+    """
+    Router for all fake endpoints, with latency, rate limits and failure injection.
+
+    Create one transport per shared client with `fake.transport()`.
+    """
+
+    HOSTS = {
+        "hacker-news.firebaseio.com": "_firebase",
+        "hn.algolia.com": "_algolia",
+        "api.github.com": "_github",
+        "www.reddit.com": "_reddit",
+        "oauth.reddit.com": "_reddit",
+        "api.twitter.com": "_twitter",
+    }
+
+    def __init__(self, corpus: Optional[FakeCorpus] = None, profile: Optional[FakeProfile] = None):
+        self.corpus = corpus or FakeCorpus()
+        self.profile = profile or FakeProfile()
+        self._rng = random.Random(self.profile.seed)
+        self._windows: Dict[str, Tuple[float, int]] = {}
+        self.log: List[Tuple[str, str, int]] = []
+        self.reddit_tokens = 0
+
+    def transport(self) -> "FakeTransport":
+        return FakeTransport(self)
+
+    def stats(self) -> dict:
+        """Request counts per host and per status code."""
+        return {
+            "requests": len(self.log),
+            "by_host": dict(Counter(host for host, _, _ in self.log)),
+            "by_status": dict(Counter(status for _, _, status in self.log)),
+        }
+
+    # -- plumbing ---------------------------------------------------------
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        handler_name = self.HOSTS.get(host)
+        profile = self.profile
+
+        delay = profile.latency + (self._rng.random() * profile.jitter if profile.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if profile.timeout_rate and self._rng.random() < profile.timeout_rate:
+            self.log.append((host, request.url.path, 0))
+            raise httpx.ReadTimeout("Injected timeout", request=request)
+
+        if handler_name is None:
+            response = _json(404, {"message": "Not Found"})
+        else:
+            limited, headers = self._rate_limit(host)
+            if limited:
+                response = self._rate_limited_response(host, headers)
+            elif profile.error_rate and self._rng.random() < profile.error_rate:
+                response = _json(profile.error_status, {"message": "Injected failure"})
+            else:
+                response = getattr(self, handler_name)(request)
+                if host == "api.github.com" and request.method == "GET" and response.status_code == 200:
+                    response = _with_etag(request, response)
+            response.headers.update(headers)
+
+        self.log.append((host, request.url.path, response.status_code))
+        response.request = request
+        return response
+
+    def _rate_limit(self, host: str) -> Tuple[bool, Dict[str, str]]:
+        limit = self.profile.rate_limit
+        if limit is None:
+            return False, {}
+        now = time.monotonic()
+        started, used = self._windows.get(host, (now, 0))
+        if now - started >= self.profile.rate_window:
+            started, used = now, 0
+        used += 1
+        self._windows[host] = (started, used)
+        reset_in = max(0.0, self.profile.rate_window - (now - started))
+        remaining = max(0, limit - used)
+        if host == "api.github.com":
+            headers = {"X-RateLimit-Limit": str(limit), "X-RateLimit-Remaining": str(remaining),
+                       "X-RateLimit-Reset": str(int(time.time() + reset_in) + 1)}
+        elif host == "api.twitter.com":
+            headers = {"x-rate-limit-limit": str(limit), "x-rate-limit-remaining": str(remaining),
+                       "x-rate-limit-reset": str(int(time.time() + reset_in) + 1)}
+        elif host.endswith("reddit.com"):
+            headers = {"x-ratelimit-used": str(used), "x-ratelimit-remaining": str(float(remaining)),
+                       "x-ratelimit-reset": str(int(math.ceil(reset_in)))}
+        else:
+            headers = {}
+        if used > limit:
+            headers["Retry-After"] = str(int(math.ceil(reset_in)))
+            return True, headers
+        return False, headers
+
+    @staticmethod
+    def _rate_limited_response(host: str, headers: Dict[str, str]) -> httpx.Response:
+        if host == "api.github.com":
+            return _json(403, {"message": "API rate limit exceeded"})
+        return _json(429, {"message": "Too Many Requests"})
+
+    # -- Hacker News Firebase ----------------------------------------------
+
+    def _firebase(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        corpus = self.corpus
+        item_match = re.fullmatch(r"/v0/item/(\d+)\.json", path)
+        if item_match:
+            return _json(200, corpus.hn_items.get(int(item_match.group(1))))
+        if path == "/v0/maxitem.json":
+            return _json(200, corpus.maxitem)
+        if path == "/v0/updates.json":
+            recent = [item["id"] for item in corpus.hn_stories() if item["time"] >= corpus.now - 2 * 86400]
+            return _json(200, {"items": recent[-100:], "profiles": []})
+        lists = {
+            "/v0/newstories.json": lambda s: -s["id"],
+            "/v0/beststories.json": lambda s: -s["score"],
+            "/v0/topstories.json": lambda s: -s["score"] / (1 + (corpus.now - s["time"]) / 3600) ** 1.8,
+        }
+        if path in lists:
+            stories = sorted(corpus.hn_stories(), key=lists[path])
+            return _json(200, [s["id"] for s in stories[:500]])
+        return _json(404, {"error": "Permission denied"})
+
+    # -- Hacker News Algolia -----------------------------------------------
+
+    def _algolia(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path not in ("/api/v1/search", "/api/v1/search_by_date"):
+            return _json(404, {"message": "Not Found"})
+        params = request.url.params
+        tags = params.get("tags", "")
+        # "(story,comment)" is an OR group; plain comma-separated tags must all match
+        group = re.search(r"\(([^)]*)\)", tags)
+        kinds = set(group.group(1).split(",")) if group else {t for t in tags.split(",") if t in ("story", "comment")}
+        # A quoted phrase must appear as is; other words may appear anywhere
+        words = [phrase or word for phrase, word in re.findall(r'"([^"]+)"|(\S+)', params.get("query", "").lower())]
+        optional = set(params.get("optionalWords", "").lower().replace(",", " ").split())
+        required = [word for word in words if word not in optional]
+        any_of = [word for word in words if word in optional]
+        hits_per_page = min(int(params.get("hitsPerPage", 20)), 1000)
+        page = int(params.get("page", 0))
+
+        filters = []
+        for condition in filter(None, params.get("numericFilters", "").split(",")):
+            match = re.fullmatch(r"\s*(\w+)\s*(>=|<=|>|<|=)\s*(-?\d+(?:\.\d+)?)\s*", condition)
+            if match:
+                filters.append((match.group(1), match.group(2), float(match.group(3))))
+
+        hits = []
+        for hit, text in self.corpus.algolia_hits():
+            if kinds and hit["_tags"][0] not in kinds:
+                continue
+            if any(not _compare(hit.get(field) or 0, op, value) for field, op, value in filters):
+                continue
+            if required and not all(word in text for word in required):
+                continue
+            if any_of and not any(word in text for word in any_of):
+                continue
+            hits.append(hit)
+
+        if path.endswith("search_by_date"):
+            hits.sort(key=lambda h: -h["created_at_i"])
+        else:
+            hits.sort(key=lambda h: -(h.get("points") or 0))
+
+        reachable = hits[:LISTING_LIMIT]
+        nb_pages = math.ceil(len(reachable) / hits_per_page) if hits_per_page else 0
+        start = page * hits_per_page
+        return _json(200, {
+            "hits": reachable[start:start + hits_per_page],
+            "nbHits": len(hits),
+            "page": page,
+            "nbPages": nb_pages,
+            "hitsPerPage": hits_per_page,
+            "exhaustiveNbHits": True,
+        })
+
+    # -- GitHub -----------------------------------------------------------
+
+    def _github(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/search/repositories":
+            return self._github_search(request)
+        if path == "/graphql" and request.method == "POST":
+            return self._github_graphql(request)
+        match = re.fullmatch(r"/repos/([^/]+)/([^/]+)(/commits)?", path)
+        if match:
+            repo = self.corpus.repo(match.group(1), match.group(2))
+            if repo is None:
+                return _json(404, {"message": "Not Found"})
+            if match.group(3):
+                return _json(200, [{"sha": "0" * 40, "commit": {"author": {"date": repo["pushed_at"]}}}])
+            return _json(200, repo)
+        return _json(404, {"message": "Not Found"})
+
+    def _github_graphql(self, request: httpx.Request) -> httpx.Response:
+        """Aliased `repository(owner:, name:)` lookups with the RepoStats fields."""
+        if not request.headers.get("Authorization"):
+            return _json(401, {"message": "This endpoint requires you to be authenticated."})
+        body = json.loads(request.content or b"{}")
+        variables = body.get("variables") or {}
+        data, errors = {}, []
+        pattern = r"(\w+):\s*repository\(owner:\s*\$(\w+),\s*name:\s*\$(\w+)\)"
+        for alias, owner_var, name_var in re.findall(pattern, body.get("query", "")):
+            owner, name = variables.get(owner_var), variables.get(name_var)
+            repo = self.corpus.repo(owner or "", name or "")
+            if repo is None:
+                data[alias] = None
+                errors.append({"type": "NOT_FOUND", "path": [alias],
+                               "message": f"Could not resolve to a Repository with the name '{owner}/{name}'."})
+                continue
+            data[alias] = {
+                "stargazerCount": repo["stargazers_count"],
+                "forkCount": repo["forks_count"],
+                "openIssues": {"totalCount": repo["open_issues_count"]},
+                "closedIssues": {"totalCount": _closed_issues(repo)},
+                "defaultBranchRef": {"target": {"committedDate": repo["pushed_at"]}},
+            }
+        return _json(200, {"data": data, **({"errors": errors} if errors else {})})
+
+    def _github_search(self, request: httpx.Request) -> httpx.Response:
+        params = request.url.params
+        per_page = min(int(params.get("per_page", 30)), 100)
+        page = int(params.get("page", 1))
+        if page * per_page > GITHUB_SEARCH_LIMIT:
+            return _json(422, {"message": "Only the first 1000 search results are available"})
+
+        checks = []
+        terms = []
+        topics = []
+        for token in re.findall(r'"[^"]*"|\S+', params.get("q", "")):
+            qualifier, _, value = token.partition(":")
+            if token.startswith('"') or not value:
+                terms.append(token)
+            elif qualifier == "stars":
+                checks += [("stargazers_count", op, v) for op, v in _range_filter(value)]
+            elif qualifier in ("pushed", "created"):
+                checks += [(f"{qualifier}_at", op, v) for op, v in _range_filter(value, _parse_date)]
+            elif qualifier == "topic":
+                topics.append(value.lower())
+        alternatives = _parse_search_query(" ".join(terms)) if terms else []
+
+        repos = []
+        for repo in self.corpus.repos:
+            values = {
+                "stargazers_count": repo["stargazers_count"],
+                "pushed_at": _parse_date(repo["pushed_at"]),
+                "created_at": _parse_date(repo["created_at"]),
+            }
+            if any(not _compare(values[field], op, v) for field, op, v in checks):
+                continue
+            if topics and not any(topic in repo["topics"] for topic in topics):
+                continue
+            if alternatives:
+                text = f"{repo['name']} {repo['description'] or ''} {' '.join(repo['topics'])}".lower()
+                if not any(_matches_terms(text, words) for words in alternatives):
+                    continue
+            repos.append(repo)
+
+        if params.get("sort") == "stars":
+            repos.sort(key=lambda r: r["stargazers_count"], reverse=params.get("order", "desc") == "desc")
+        start = (page - 1) * per_page
+        return _json(200, {
+            "total_count": len(repos),
+            "incomplete_results": False,
+            "items": repos[start:start + per_page],
+        })
+
+    # -- Reddit -----------------------------------------------------------
+
+    def _reddit(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/v1/access_token" and request.method == "POST":
+            if not request.headers.get("Authorization", "").startswith("Basic "):
+                return _json(401, {"message": "Unauthorized", "error": 401})
+            self.reddit_tokens += 1
+            return _json(200, {"access_token": f"fake-reddit-{self.reddit_tokens}", "token_type": "bearer",
+                               "expires_in": 86400, "scope": "*"})
+        if request.url.host == "oauth.reddit.com" and not request.headers.get("Authorization", "").startswith("bearer "):
+            return _json(401, {"message": "Unauthorized", "error": 401})
+        match = re.fullmatch(r"/r/([^/]+)/(hot|new|top|search)\.json", request.url.path)
+        if not match:
+            return _json(404, {"message": "Not Found", "error": 404})
+        subreddits = match.group(1).split("+")
+        if any(sub.lower() in self.corpus.missing_subreddits for sub in subreddits):
+            return _json(404, {"message": "Not Found", "error": 404})
+
+        params = request.url.params
+        listing = match.group(2)
+        posts = [post for sub in subreddits for post in self.corpus.subreddit_posts(sub)]
+
+        window = {"hour": 3600, "day": 86400, "week": 7 * 86400, "month": 30 * 86400, "year": 365 * 86400}
+        if listing in ("top", "search") and params.get("t", "all") in window:
+            cutoff = self.corpus.now - window[params.get("t")]
+            posts = [p for p in posts if p["created_utc"] >= cutoff]
+        if listing == "search":
+            words = params.get("q", "").lower().split()
+            posts = [p for p in posts if _matches_terms(f"{p['title']} {p['selftext']}", words)]
+
+        if listing == "new":
+            posts.sort(key=lambda p: -p["created_utc"])
+        elif listing == "hot":
+            posts.sort(key=lambda p: -math.log10(max(p["score"], 1)) - p["created_utc"] / 45000)
+        else:
+            posts.sort(key=lambda p: -p["score"])
+        posts = posts[:LISTING_LIMIT]
+
+        start = 0
+        after = params.get("after")
+        if after:
+            names = [p["name"] for p in posts]
+            start = names.index(after) + 1 if after in names else len(posts)
+        limit = min(int(params.get("limit", 25)), 100)
+        page = posts[start:start + limit]
+        next_after = page[-1]["name"] if page and start + limit < len(posts) else None
+        return _json(200, {
+            "kind": "Listing",
+            "data": {
+                "after": next_after,
+                "dist": len(page),
+                "children": [{"kind": "t3", "data": post} for post in page],
+            },
+        })
+
+    # -- Twitter ----------------------------------------------------------
+
+    def _twitter(self, request: httpx.Request) -> httpx.Response:
+        if not request.headers.get("Authorization", "").startswith("Bearer "):
+            return _json(401, {"title": "Unauthorized", "status": 401})
+        params = request.url.params
+        if request.url.path == "/2/tweets":
+            return self._twitter_lookup(params.get("ids", ""))
+        if request.url.path == "/2/tweets/counts/recent":
+            return self._twitter_counts(params)
+        if request.url.path != "/2/tweets/search/recent":
+            return _json(404, {"title": "Not Found Error", "status": 404})
+
+        alternatives = _parse_search_query(params.get("query", ""))
+        start_ts = _parse_date(params["start_time"]) if params.get("start_time") else 0
+        start_ts = max(start_ts, self.corpus.now - 7 * 86400)
+        since_id = int(params.get("since_id", 0) or 0)
+        until_id = int(params.get("until_id", 0) or 0)
+        max_results = max(10, min(int(params.get("max_results", 10)), 100))
+
+        tweets = [
+            t for t in self.corpus.tweets
+            if t["_ts"] >= start_ts and int(t["id"]) > since_id and (not until_id or int(t["id"]) < until_id)
+            and any(_matches_terms(t["text"], words) for words in alternatives)
+        ]
+        start = int(params.get("next_token", "0") or 0)
+        page = tweets[start:start + max_results]
+
+        meta = {"result_count": len(page)}
+        if page:
+            meta["newest_id"] = page[0]["id"]
+            meta["oldest_id"] = page[-1]["id"]
+        if start + max_results < len(tweets):
+            meta["next_token"] = str(start + max_results)
+
+        body = {"meta": meta}
+        if page:
+            body["data"] = [{k: v for k, v in t.items() if not k.startswith("_")} for t in page]
+            authors = {t["author_id"] for t in page}
+            body["includes"] = {"users": [self.corpus.users[a] for a in sorted(authors)]}
+        return _json(200, body)
+
+    def _twitter_counts(self, params) -> httpx.Response:
+        alternatives = _parse_search_query(params.get("query", ""))
+        start_ts = _parse_date(params["start_time"]) if params.get("start_time") else 0
+        start_ts = max(start_ts, self.corpus.now - 7 * 86400)
+        bucket = {"minute": 60, "hour": 3600, "day": 86400}[params.get("granularity", "hour")]
+        # Buckets are aligned to whole minutes/hours/days (UTC), like the real API
+        first = int(start_ts) - int(start_ts) % bucket
+        counts = {}
+        for t in self.corpus.tweets:
+            if t["_ts"] >= start_ts and any(_matches_terms(t["text"], words) for words in alternatives):
+                key = t["_ts"] - t["_ts"] % bucket
+                counts[key] = counts.get(key, 0) + 1
+        data = [
+            {"start": _iso(b, millis=True), "end": _iso(b + bucket, millis=True), "tweet_count": counts.get(b, 0)}
+            for b in range(first, self.corpus.now + 1, bucket)
+        ]
+        return _json(200, {"data": data, "meta": {"total_tweet_count": sum(counts.values())}})
+
+    def _twitter_lookup(self, ids: str) -> httpx.Response:
+        wanted = [i for i in ids.split(",") if i]
+        if not 1 <= len(wanted) <= 100:
+            return _json(400, {"title": "Invalid Request", "status": 400})
+        by_id = {t["id"]: t for t in self.corpus.tweets}
+        body = {}
+        found = [by_id[i] for i in wanted if i in by_id]
+        if found:
+            body["data"] = [{"id": t["id"], "text": t["text"], "public_metrics": t["public_metrics"]} for t in found]
+        missing = [i for i in wanted if i not in by_id]
+        if missing:
+            body["errors"] = [{"value": i, "resource_id": i, "title": "Not Found Error"} for i in missing]
+        return _json(200, body)
+
+
+def _parse_search_query(query: str) -> List[List[str]]:
+    """Split a Twitter/GitHub search query into OR alternatives of required words (operators ignored)."""
+    query = re.sub(r"-?\b(?:is|lang|has):\S+", " ", query)
+    query = query.replace("(", " ").replace(")", " ")
+    alternatives = []
+    for part in re.split(r"\s+OR\s+", query):
+        phrases = re.findall(r'"([^"]+)"', part)
+        rest = re.sub(r'"[^"]+"', " ", part)
+        words = [p.lower() for p in phrases] + [w.lower() for w in rest.split() if not w.startswith("-")]
+        if words:
+            alternatives.append(words)
+    return alternatives or [[]]
+
+
+def _algolia_hit(item: dict, corpus: FakeCorpus) -> dict:
+    hit = {
+        "objectID": str(item["id"]),
+        "author": item["by"],
+        "created_at": _iso(item["time"]),
+        "created_at_i": item["time"],
+        "_tags": [item["type"], f"author_{item['by']}"],
+    }
+    if item["type"] == "story":
+        hit.update({
+            "title": item["title"],
+            "url": item["url"],
+            "points": item["score"],
+            "num_comments": item["descendants"],
+            "story_id": item["id"],
+        })
+    else:
+        story = corpus.hn_items.get(item["parent"], {})
+        hit.update({
+            "comment_text": item["text"],
+            "story_id": item["parent"],
+            "story_title": story.get("title"),
+            "points": None,
+        })
+    return hit
+
+
+def _closed_issues(repo: dict) -> int:
+    """Stable closed-issue count for a repo (not stored, so the corpus RNG stream is unchanged)."""
+    return zlib.crc32(repo["full_name"].encode()) % (4 * repo["open_issues_count"] + 50)
+
+
+def _with_etag(request: httpx.Request, response: httpx.Response) -> httpx.Response:
+    """Add GitHub-style caching headers; matching If-None-Match gets a bodyless 304."""
+    etag = f'"{zlib.crc32(response.content):08x}"'
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=60, s-maxage=60", "Vary": "Accept, Authorization"}
+    if request.headers.get("If-None-Match") == etag:
+        return httpx.Response(304, headers=headers)
+    response.headers.update(headers)
+    return response
+
+
+def _json(status: int, body) -> httpx.Response:
+    return httpx.Response(status, content=json.dumps(body).encode(), headers={"Content-Type": "application/json"})
+
+
+class FakeTransport(httpx.AsyncBaseTransport):
+    """httpx transport that answers every request from a FakeAPIs instance."""
+
+    def __init__(self, apis: FakeAPIs):
+        self.apis = apis
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self.apis.handle(request)
@@ -0,0 +1,105 @@
+"""
+Unit tests for cross-source URL deduplication
+Tests canonical_url() and merge_duplicates() in src/ai_news_agent/utils/canonical_url.py
+"""
+import pytest
+from src.ai_news_agent.models import Post
+from src.ai_news_agent.utils.canonical_url import canonical_url, merge_duplicates
+
+
+class TestCanonicalUrl:
+    """Test reducing URLs to one key per page"""
+
+    @pytest.mark.parametrize("url", [
+        "https://example.com/blog/post",
+        "http://example.com/blog/post/",
+        "HTTPS://WWW.Example.com/blog/post#comments",
+        "https://example.com:443/blog//post?utm_source=hn&utm_medium=social&fbclid=abc",
+    ])
+    def test_same_page_same_key(self, url):
+        """Scheme, www, default port, fragment, trailing slash and tracking parameters are ignored"""
+        assert canonical_url(url) == "example.com/blog/post"
+
+    def test_meaningful_query_kept_and_sorted(self):
+        """Non-tracking parameters stay, in a stable order"""
+        assert canonical_url("https://example.com/search?q=llm&page=2&ref=hn") == "example.com/search?page=2&q=llm"
+        assert canonical_url("https://example.com/?s=claude") != canonical_url("https://example.com/")
+
+    def test_github_owner_repo(self):
+        """Any page inside a repo maps to owner/repo; site pages do not"""
+        assert canonical_url("https://github.com/Acme/Agent/blob/main/README.md") == "github.com/acme/agent"
+        assert canonical_url("git+https://github.com/acme/agent.git") is None
+        assert canonical_url("https://github.com/acme/agent.git") == "github.com/acme/agent"
+        assert canonical_url("https://github.com/features/copilot") == "github.com/features/copilot"
+
+    def test_site_specific_forms(self):
+        """Short links, mirrors and versions of the same item share a key"""
+        assert canonical_url("https://youtu.be/abc123?si=x") == canonical_url("https://www.youtube.com/watch?v=abc123&t=42")
+        assert canonical_url("https://arxiv.org/pdf/2401.01234v2.pdf") == canonical_url("https://arxiv.org/abs/2401.01234")
+        assert canonical_url("https://x.com/user/status/1?s=20") == canonical_url("https://twitter.com/user/status/1")
+        assert canonical_url("https://old.reddit.com/r/OpenAI/comments/Ab1/title/") == "reddit.com/comments/ab1"
+
+    @pytest.mark.parametrize("url", ["", None, "mailto:a@example.com", "not a url", "https://"])
+    def test_no_key(self, url):
+        """Empty and non-http URLs get no key"""
+        assert canonical_url(url) is None
+
+
+class TestMergeDuplicates:
+    """Test merging posts that link to the same page"""
+
+    def _posts(self):
+        return [
+            {"id": "1", "title": "Acme Agent: an open coding agent", "url": "https://github.com/acme/agent",
+             "points": 120, "num_comments": 40, "source": "hackernews", "hn_url": "https://news.ycombinator.com/item?id=1"},
+            {"id": "reddit-a", "title": "Ask: best local model?", "url": "", "points": 30, "num_comments": 9,
+             "source": "reddit", "reddit_url": "https://reddit.com/r/LocalLLaMA/comments/a/"},
+            {"id": "github-9", "title": "agent", "url": "https://github.com/acme/agent", "points": 900,
+             "num_comments": 0, "source": "github", "github_url": "https://github.com/acme/agent"},
+            {"id": "reddit-b", "title": "Acme Agent released", "url": "https://www.github.com/acme/agent/?ref=reddit",
+             "points": 15, "num_comments": 4, "source": "reddit", "reddit_url": "https://reddit.com/r/OpenAI/comments/b/"},
+        ]
+
+    def test_group_becomes_one_post(self):
+        """Engagement is summed and every source page is linked"""
+        merged = merge_duplicates(self._posts())
+
+        assert [post["id"] for post in merged] == ["github-9", "reddit-a"]
+        repo = merged[0]
+        assert repo["points"] == 1035 and repo["num_comments"] == 44
+        assert repo["sources"] == ["github", "hackernews", "reddit"]
+        assert repo["merged_ids"] == ["github-9", "1", "reddit-b"]
+        assert repo["links"] == [
+            "https://github.com/acme/agent",
+            "https://news.ycombinator.com/item?id=1",
+            "https://reddit.com/r/OpenAI/comments/b/",
+        ]
+        assert repo["hn_url"] == "https://news.ycombinator.com/item?id=1"
+
+    def test_unique_posts_unchanged(self):
+        """Posts without duplicates or without a link are passed through as they are"""
+        posts = self._posts()
+        merged = merge_duplicates(posts)
+
+        assert merged[1] is posts[1]
+        assert "sources" not in posts[0] and posts[2]["points"] == 900
+
+    def test_merged_post_round_trips(self):
+        """The merged fields survive the Post dict conversion"""
+        posts = [{**post, "author": "someone", "created_at": "2025-01-01T00:00:00"} for post in self._posts()]
+        repo = merge_duplicates(posts)[0]
+
+        assert Post.from_dict(repo).to_dict() == repo
+
+    def test_posts_stay_posts(self):
+        """Merging Post records gives Post records, with the merged fields in `extra`"""
+        posts = [
+            Post.from_dict({**post, "author": "someone", "created_at": "2025-01-01T00:00:00"})
+            for post in self._posts()
+        ]
+        merged = merge_duplicates(posts)
+
+        assert all(isinstance(post, Post) for post in merged)
+        assert merged[0]["points"] == 1035
+        assert merged[0].extra["sources"] == ["github", "hackernews", "reddit"]
+        assert merged[0]["hn_url"] == "https://news.ycombinator.com/item?id=1"
@@ -0,0 +1,128 @@
+"""
+Unit tests for adaptive concurrency control
+Tests AdaptiveLimiter in src/ai_news_agent/utils/concurrency.py
+"""
+import asyncio
+import pytest
+from src.ai_news_agent.utils.concurrency import AdaptiveLimiter
+
+
+class TestAdaptiveLimiter:
+    """Test AIMD limit adjustments"""
+
+    def test_additive_increase_on_fast_success(self):
+        """Healthy responses grow the limit slowly"""
+        limiter = AdaptiveLimiter(initial=4, max_limit=64, target_latency=1.0)
+
+        for _ in range(40):
+            limiter.record(0.05, ok=True)
+
+        assert 8 <= limiter.limit <= 12
+
+    def test_multiplicative_decrease_on_error(self):
+        """An error halves the limit"""
+        limiter = AdaptiveLimiter(initial=32, target_latency=1.0)
+
+        limiter.record(0.05, ok=False)
+
+        assert limiter.limit == 16
+        assert limiter.errors == 1
+
+    def test_decrease_once_per_round_trip(self):
+        """A burst of errors only backs off once"""
+        limiter = AdaptiveLimiter(initial=32, target_latency=1.0)
+        limiter.record(0.5, ok=True)
+
+        for _ in range(5):
+            limiter.record(0.5, ok=False)
+
+        assert limiter.limit >= 16
+
+    def test_slow_response_counts_as_congestion(self):
+        """Latency above target shrinks the limit"""
+        limiter = AdaptiveLimiter(initial=16, target_latency=0.2)
+
+        limiter.record(1.0, ok=True)
+
+        assert limiter.limit == 8
+
+    def test_limit_bounds(self):
+        """Limit stays within min and max"""
+        limiter = AdaptiveLimiter(initial=4, min_limit=2, max_limit=5, target_latency=1.0)
+
+        for _ in range(100):
+            limiter.record(0.01, ok=True)
+        assert limiter.limit == 5
+
+        limiter._last_decrease = 0.0
+        for _ in range(10):
+            limiter.record(0.01, ok=False)
+            limiter._last_decrease = 0.0
+        assert limiter.limit == 2
+
+    async def test_slot_enforces_limit(self):
+        """No more than the current limit runs at once"""
+        limiter = AdaptiveLimiter(initial=3, max_limit=3, target_latency=10.0)
+        peak = 0
+
+        async def work():
+            nonlocal peak
+            async with limiter.slot():
+                peak = max(peak, limiter.in_flight)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*[work() for _ in range(20)])
+
+        assert peak == 3
+        assert limiter.completed == 20
+        assert limiter.in_flight == 0
+
+    async def test_slot_records_exceptions_as_errors(self):
+        """Exceptions inside a slot count as errors and free the slot"""
+        limiter = AdaptiveLimiter(initial=4)
+
+        with pytest.raises(RuntimeError):
+            async with limiter.slot():
+                raise RuntimeError("boom")
+
+        assert limiter.errors == 1
+        assert limiter.in_flight == 0
+
+    async def test_cancelled_waiter_frees_nothing(self):
+        """A waiter cancelled before or right after getting a slot does not leak it"""
+        limiter = AdaptiveLimiter(initial=1, max_limit=1, target_latency=10.0)
+        release = asyncio.Event()
+
+        async def hold():
+            async with limiter.slot():
+                await release.wait()
+
+        async def wait_for_slot():
+            async with limiter.slot():
+                pass
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        early, handed = asyncio.create_task(wait_for_slot()), asyncio.create_task(wait_for_slot())
+        await asyncio.sleep(0)
+        early.cancel()
+        release.set()
+        await holder
+        handed.cancel()
+        await asyncio.gather(early, handed, return_exceptions=True)
+
+        assert limiter.in_flight == 0
+        await asyncio.wait_for(wait_for_slot(), timeout=1.0)
+
+    async def test_many_waiters_scale_linearly(self):
+        """Thousands of queued tasks are woken one slot at a time, in order"""
+        limiter = AdaptiveLimiter(initial=4, max_limit=4, target_latency=10.0)
+        order = []
+
+        async def work(i):
+            async with limiter.slot():
+                order.append(i)
+
+        await asyncio.wait_for(asyncio.gather(*[work(i) for i in range(20000)]), timeout=10.0)
+
+        assert order == list(range(20000))
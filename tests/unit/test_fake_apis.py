@@ -0,0 +1,139 @@
+"""
+Unit tests for the fake APIs
+Tests tests/fake_apis.py, alone and with the collectors running against it
+"""
+import httpx
+import pytest
+from tests.fake_apis import FakeAPIs, FakeCorpus, FakeProfile
+from src.ai_news_agent.collectors import github, hackernews, reddit, twitter
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    return FakeCorpus(hn_stories=600, hn_comments=300, github_repos=300, reddit_posts_per_subreddit=60, tweets=400)
+
+
+async def _get(apis, url, **kwargs):
+    async with httpx.AsyncClient(transport=apis.transport()) as client:
+        return await client.get(url, **kwargs)
+
+
+class TestCorpus:
+    """Test the synthetic data"""
+
+    def test_deterministic(self):
+        """The same seed and clock give the same data"""
+        first = FakeCorpus(seed=3, now=1_700_000_000, hn_stories=50, hn_comments=10, github_repos=20, tweets=20)
+        second = FakeCorpus(seed=3, now=1_700_000_000, hn_stories=50, hn_comments=10, github_repos=20, tweets=20)
+
+        assert first.hn_items == second.hn_items
+        assert first.repos == second.repos
+        assert first.subreddit_posts("LocalLLaMA") == second.subreddit_posts("LocalLLaMA")
+
+    def test_coding_assistant_repos_present(self, corpus):
+        """Repos tracked by the coding assistant dashboard exist"""
+        assert corpus.repo("continuedev", "continue") is not None
+
+
+class TestEndpoints:
+    """Test API shapes, paging and limits"""
+
+    async def test_algolia_paging_and_counts(self, corpus):
+        """nbHits counts all matches; hitsPerPage=0 returns only the count"""
+        apis = FakeAPIs(corpus)
+        stories = len(corpus.hn_stories())
+
+        counted = (await _get(apis, "https://hn.algolia.com/api/v1/search", params={"tags": "story", "hitsPerPage": 0})).json()
+        page = (await _get(apis, "https://hn.algolia.com/api/v1/search_by_date", params={
+            "tags": "story", "hitsPerPage": 50, "page": 1, "numericFilters": "points>=0",
+        })).json()
+
+        assert counted["nbHits"] == stories and counted["hits"] == []
+        assert len(page["hits"]) == 50
+        assert page["hits"][0]["created_at_i"] >= page["hits"][-1]["created_at_i"]
+
+    async def test_github_search_limit(self, corpus):
+        """Pages beyond the first 1000 results are rejected"""
+        apis = FakeAPIs(corpus)
+
+        response = await _get(apis, "https://api.github.com/search/repositories", params={"q": "stars:>=0", "per_page": 100, "page": 11})
+        ranged = (await _get(apis, "https://api.github.com/search/repositories", params={"q": "stars:10..20", "per_page": 100})).json()
+
+        assert response.status_code == 422
+        assert all(10 <= repo["stargazers_count"] <= 20 for repo in ranged["items"])
+
+    async def test_reddit_after_cursor(self, corpus):
+        """Combined listings page through all posts without repeats"""
+        apis = FakeAPIs(corpus)
+        seen = []
+        after = None
+        while True:
+            body = (await _get(apis, "https://www.reddit.com/r/a+b/new.json", params={"limit": 25, "after": after or ""})).json()
+            seen += [child["data"]["id"] for child in body["data"]["children"]]
+            after = body["data"]["after"]
+            if not after:
+                break
+
+        assert len(seen) == len(set(seen)) == 120
+
+    async def test_twitter_requires_auth(self, corpus):
+        """Twitter answers 401 without a bearer token"""
+        response = await _get(FakeAPIs(corpus), "https://api.twitter.com/2/tweets/search/recent", params={"query": "llm"})
+
+        assert response.status_code == 401
+
+    async def test_rate_limit_headers(self, corpus):
+        """Exhausted limits answer 429 with reset headers"""
+        apis = FakeAPIs(corpus, FakeProfile(rate_limit=2))
+        responses = [await _get(apis, "https://www.reddit.com/r/a/new.json") for _ in range(3)]
+
+        assert [r.status_code for r in responses] == [200, 200, 429]
+        assert responses[1].headers["x-ratelimit-remaining"] == "0.0"
+        assert "Retry-After" in responses[2].headers
+
+    async def test_failure_injection(self, corpus):
+        """Injected errors and timeouts follow the configured rates"""
+        errors = FakeAPIs(corpus, FakeProfile(error_rate=1.0))
+        timeouts = FakeAPIs(corpus, FakeProfile(timeout_rate=1.0))
+
+        assert (await _get(errors, "https://hacker-news.firebaseio.com/v0/maxitem.json")).status_code == 503
+        with pytest.raises(httpx.ReadTimeout):
+            await _get(timeouts, "https://hacker-news.firebaseio.com/v0/maxitem.json")
+
+
+class TestCollectorsAgainstFakes:
+    """Test the real collectors end to end against the fakes"""
+
+    async def test_hackernews_modes_agree(self, fake):
+        """Firebase and Algolia modes find AI stories from the same corpus"""
+        firebase = await hackernews.collect_ai_mentions(days_back=7, max_stories=100, mode="firebase", use_cache=False)
+        algolia = await hackernews.collect_ai_mentions(days_back=7, mode="algolia", use_cache=False)
+
+        assert firebase and algolia
+        assert all(post["keywords"] for post in firebase + algolia)
+        assert fake.stats()["by_status"] == {200: fake.stats()["requests"]}
+
+    async def test_github(self, fake):
+        """GitHub search returns AI-relevant repos"""
+        repos = await github.search_github_repos(days_back=30, max_results=50)
+
+        assert 0 < len(repos) <= 50
+        assert all(repo["source"] == "github" for repo in repos)
+
+    async def test_reddit(self, fake, monkeypatch):
+        """Reddit collection finds posts in the requested subreddits"""
+        monkeypatch.setattr(reddit, "AI_SUBREDDITS", ["LocalLLaMA", "OpenAI"])
+
+        posts = await reddit.collect_reddit_posts(days_back=30)
+
+        assert posts
+        assert {post["subreddit"] for post in posts} <= {"LocalLLaMA", "OpenAI"}
+
+    async def test_twitter(self, fake, monkeypatch):
+        """Twitter collection pages through search/recent"""
+        monkeypatch.setattr(twitter, "TWITTER_BEARER_TOKEN", "test-token")
+
+        posts = await twitter.collect_twitter_posts(days_back=7, max_results=30)
+
+        assert 0 < len(posts) <= 40
+        assert all(post["source"] == "twitter" for post in posts)
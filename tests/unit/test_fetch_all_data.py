@@ -0,0 +1,112 @@
+"""
+Unit tests for concurrent coding assistant data fetching
+Tests fetch_all_data() and fetch_and_analyze() in src/ai_news_agent/coding_assistants/main.py
+"""
+import asyncio
+import threading
+
+import pytest
+from src.ai_news_agent.coding_assistants import main
+from src.ai_news_agent.coding_assistants.fetchers import hackernews as ca_hackernews
+
+TOOLS = [{"name": "Cursor"}, {"name": "Aider"}, {"name": "Cody"}]
+
+
+class _InFlight:
+    """Counts coroutines running at the same time"""
+
+    def __init__(self):
+        self.current = 0
+        self.peak = 0
+
+    async def run(self, delay=0.02):
+        self.current += 1
+        self.peak = max(self.peak, self.current)
+        await asyncio.sleep(delay)
+        self.current -= 1
+
+
+@pytest.fixture
+def sources(monkeypatch):
+    """Replace the four source fetchers with ones that only wait"""
+    in_flight = _InFlight()
+
+    def fake(source):
+        async def fetch(tools, days_back=30, cache_dir=None, on_result=None):
+            await in_flight.run()
+            results = {tool["name"]: {"mentions_count": 1, "comments": [f"{source} loves {tool['name']}"]} for tool in tools}
+            for name, data in results.items():
+                if on_result:
+                    on_result(name, data)
+            return results
+        return fetch
+
+    monkeypatch.setattr(main, "fetch_all_github_stats", fake("github"))
+    monkeypatch.setattr(main, "fetch_all_hn_mentions", fake("hn"))
+    monkeypatch.setattr(main, "fetch_all_reddit_mentions", fake("reddit"))
+    monkeypatch.setattr(main, "fetch_all_twitter_mentions", fake("twitter"))
+    return in_flight
+
+
+class TestFetchAllData:
+    """Test fetching all sources at once"""
+
+    async def test_sources_run_concurrently(self, sources):
+        """All four sources are in flight together"""
+        all_data = await main.fetch_all_data(TOOLS)
+
+        assert sources.peak == 4
+        assert list(all_data) == ["Cursor", "Aider", "Cody"]
+        assert set(all_data["Cursor"]) == {"github", "hn", "reddit", "twitter"}
+
+    async def test_tools_searched_concurrently(self, monkeypatch):
+        """Per-tool HN searches run together; results keep the tool order"""
+        in_flight = _InFlight()
+        finished = []
+
+        async def search(name, days_back, client, mode, query=None):
+            await in_flight.run(0.02 if name != "Cursor" else 0.05)
+            return {"mentions_count": len(name), "comments": []}
+
+        monkeypatch.setattr(ca_hackernews, "search_hn_mentions", search)
+        results = await ca_hackernews.fetch_all_hn_mentions(
+            TOOLS, mode="counts", on_result=lambda name, data: finished.append(name)
+        )
+
+        assert in_flight.peak == len(TOOLS)
+        assert finished[-1] == "Cursor"
+        assert list(results) == ["Cursor", "Aider", "Cody"]
+
+
+class TestFetchAndAnalyze:
+    """Test sentiment analysis overlapping with fetching"""
+
+    async def test_analysis_starts_before_fetching_ends(self, sources, monkeypatch):
+        """A tool's texts are analyzed while a slower source is still being fetched"""
+        analyzed = threading.Event()
+
+        def analyze(texts):
+            analyzed.set()
+            return 0.5
+
+        async def slow_twitter(tools, days_back=30):
+            # Finishes only once an analysis has run
+            for _ in range(100):
+                if analyzed.is_set():
+                    return {}
+                await asyncio.sleep(0.01)
+            raise AssertionError("sentiment analysis did not start during fetching")
+
+        monkeypatch.setattr(main, "analyze_sentiment_batch", analyze)
+        monkeypatch.setattr(main, "fetch_all_twitter_mentions", slow_twitter)
+        all_data, sentiments = await main.fetch_and_analyze(TOOLS)
+
+        assert set(sentiments) == {"Cursor", "Aider", "Cody"}
+        assert sentiments["Cursor"] == {"hn_sentiment": 0.75, "reddit_sentiment": 0.75}
+
+    async def test_same_sentiments_as_serial_analysis(self, sources, monkeypatch):
+        """Overlapped analysis gives the same scores as analyzing afterwards"""
+        monkeypatch.setattr(main, "analyze_sentiment_batch", lambda texts: len(texts[0]) / 100)
+        all_data, sentiments = await main.fetch_and_analyze(TOOLS)
+
+        assert sentiments == main.analyze_sentiments(all_data)
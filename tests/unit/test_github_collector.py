@@ -0,0 +1,101 @@
+"""
+Unit tests for the partitioned GitHub search
+Tests the query planner and collection in src/ai_news_agent/collectors/github.py
+"""
+from datetime import date, datetime, timedelta
+
+import pytest
+from src.ai_news_agent.collectors import github
+from src.ai_news_agent.collectors.github import SearchPartition, keyword_groups, plan_github_queries
+from src.ai_news_agent.config import AI_KEYWORDS
+from tests.fake_apis import FakeCorpus
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    return FakeCorpus(hn_stories=10, hn_comments=0, github_repos=600, tweets=0)
+
+
+def _expected(corpus, days_back, min_stars=github.MIN_GITHUB_STARS):
+    """Brute force: every AI-relevant repo in the corpus matching the filters"""
+    cutoff = (datetime.now().date() - timedelta(days=days_back)).isoformat()
+    return [
+        repo for repo in corpus.repos
+        if repo["stargazers_count"] >= min_stars and repo["pushed_at"][:10] >= cutoff and github.repo_keywords(repo)
+    ]
+
+
+def _ids(posts):
+    return {int(post["id"].removeprefix("github-")) for post in posts}
+
+
+class TestQueryPlanner:
+    """Test keyword groups and partition splitting"""
+
+    def test_keyword_groups_within_limits(self):
+        """Groups use at most five OR operators, fit the length limit and cover every keyword"""
+        groups = keyword_groups()
+
+        assert all(len(group) <= github.GITHUB_MAX_OR_TERMS for group in groups)
+        assert all(len(" OR ".join(group)) <= github.GITHUB_MAX_TERMS_LENGTH for group in groups)
+        terms = {term.strip('"') for group in groups for term in group}
+        assert terms == {keyword.lower() for keyword in AI_KEYWORDS}
+        assert '"large language model"' in {term for group in groups for term in group}
+
+    def test_query_format(self):
+        """Queries combine the OR group with star and pushed ranges"""
+        partition = SearchPartition(("llm", '"ai agent"'), 10, 49, date(2024, 1, 1), date(2024, 1, 31))
+
+        assert partition.query() == 'llm OR "ai agent" stars:10..49 pushed:2024-01-01..2024-01-31'
+        open_ended = SearchPartition(("llm",), 10, None, date(2024, 1, 1), date(2024, 1, 31))
+        assert open_ended.query() == "llm stars:>=10 pushed:2024-01-01..2024-01-31"
+
+    def test_split_is_disjoint_and_complete(self):
+        """Halves never overlap and together cover the parent"""
+        start, end = date(2024, 1, 1), date(2024, 1, 31)
+        open_ended = SearchPartition(("llm",), 10, None, start, end)
+
+        low, high = open_ended.split()
+        assert (low.min_stars, low.max_stars, high.min_stars, high.max_stars) == (10, 19, 20, None)
+
+        low, high = SearchPartition(("llm",), 10, 19, start, end).split()
+        assert (low.max_stars, high.min_stars) == (14, 15)
+
+        early, late = SearchPartition(("llm",), 10, 10, start, end).split()
+        assert early.max_stars == late.min_stars == 10
+        assert early.pushed_to + timedelta(days=1) == late.pushed_from
+        assert (early.pushed_from, late.pushed_to) == (start, end)
+
+        assert SearchPartition(("llm",), 10, 10, start, start).split() is None
+
+    def test_plan_covers_window(self):
+        """The initial plan has one partition per keyword group over the whole window"""
+        plan = plan_github_queries(days_back=30, min_stars=5)
+
+        assert len(plan) == len(keyword_groups())
+        assert all(p.min_stars == 5 and p.max_stars is None for p in plan)
+        assert all((p.pushed_to - p.pushed_from).days == 30 for p in plan)
+
+
+class TestPartitionedSearch:
+    """Test collection against the fake GitHub API"""
+
+    async def test_top_results_match_brute_force(self, fake, corpus):
+        """With max_results, the most starred AI repos are returned, without duplicates"""
+        repos = await github.search_github_repos(days_back=60, max_results=40)
+
+        expected = sorted(_expected(corpus, 60), key=lambda r: r["stargazers_count"], reverse=True)
+        assert len(repos) == 40
+        assert len(_ids(repos)) == 40
+        assert [r["points"] for r in repos] == [r["stargazers_count"] for r in expected[:40]]
+
+    async def test_full_coverage_past_result_cap(self, fake, corpus, monkeypatch):
+        """Partitions over the per-query cap are split until every repo is reachable"""
+        monkeypatch.setattr(github, "GITHUB_SEARCH_CAP", 40)
+        monkeypatch.setattr(github, "GITHUB_PER_PAGE", 20)
+
+        repos = await github.search_github_repos(days_back=90, max_results=None)
+
+        assert _ids(repos) == {repo["id"] for repo in _expected(corpus, 90)}
+        assert fake.stats()["requests"] > len(keyword_groups())
+        assert [r["points"] for r in repos] == sorted((r["points"] for r in repos), reverse=True)
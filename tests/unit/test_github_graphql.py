@@ -0,0 +1,119 @@
+"""
+Unit tests for batched GitHub GraphQL repository stats
+Tests src/ai_news_agent/utils/github_graphql.py and its use in the GitHub fetchers
+"""
+import httpx
+import pytest
+from src.ai_news_agent.coding_assistants.config import CODING_ASSISTANTS
+from src.ai_news_agent.coding_assistants.fetchers import github as ca_github
+from src.ai_news_agent.collectors import github
+from src.ai_news_agent.utils import http_client
+from tests.fake_apis import FakeCorpus
+from src.ai_news_agent.utils.github_graphql import (
+    build_repo_stats_query,
+    fetch_repo_stats,
+    parse_repo_stats,
+)
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    return FakeCorpus(hn_stories=10, hn_comments=0, github_repos=120, tweets=0)
+
+
+def _graphql_requests(apis):
+    return [path for _, path, _ in apis.log if path == "/graphql"]
+
+
+class TestQuery:
+    """Test query building and parsing"""
+
+    def test_aliases_and_variables(self):
+        """Each repo gets its own alias and variables, never inlined strings"""
+        payload = build_repo_stats_query([("a", "one"), ("b", 'two"')])
+
+        assert 'r0: repository(owner: $o0, name: $n0) { ...RepoStats }' in payload["query"]
+        assert 'r1: repository(owner: $o1, name: $n1)' in payload["query"]
+        assert "fragment RepoStats on Repository" in payload["query"]
+        assert payload["variables"] == {"o0": "a", "n0": "one", "o1": "b", "n1": 'two"'}
+
+    def test_parse_node(self):
+        """Issue counts are exact totals; the last commit comes from the default branch"""
+        node = {
+            "stargazerCount": 10, "forkCount": 2,
+            "openIssues": {"totalCount": 3}, "closedIssues": {"totalCount": 40},
+            "defaultBranchRef": {"target": {"committedDate": "2024-05-01T00:00:00Z"}},
+        }
+
+        assert parse_repo_stats(node) == {
+            "stars": 10, "forks": 2, "open_issues": 3, "closed_issues": 40,
+            "last_commit_date": "2024-05-01T00:00:00Z",
+        }
+        assert parse_repo_stats({"stargazerCount": 1, "defaultBranchRef": None})["last_commit_date"] is None
+        assert parse_repo_stats(None) is None
+
+
+class TestFetchRepoStats:
+    """Test batched fetching against the fake API"""
+
+    async def test_batches_and_not_found(self, fake, corpus):
+        """Repos are fetched batch_size at a time; unknown repos map to None"""
+        repos = [tuple(r["full_name"].split("/")) for r in corpus.repos[:25]] + [("nobody", "nothing")]
+
+        async with http_client.shared_client() as client:
+            stats = await fetch_repo_stats(client, repos, "token", batch_size=10)
+
+        assert len(_graphql_requests(fake)) == 3
+        assert stats["nobody/nothing"] is None
+        first = corpus.repos[0]
+        assert stats[first["full_name"]]["stars"] == first["stargazers_count"]
+        assert stats[first["full_name"]]["open_issues"] == first["open_issues_count"]
+
+    async def test_failed_batch_left_out(self):
+        """Repos in a failed batch are missing from the result, so callers can fall back"""
+        def handler(request):
+            if b"broken" in request.content:
+                return httpx.Response(502)
+            return httpx.Response(200, json={"data": {"r0": {"stargazerCount": 5}}})
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            stats = await fetch_repo_stats(client, [("ok", "repo"), ("broken", "repo")], "token", batch_size=1)
+
+        assert set(stats) == {"ok/repo"}
+
+
+class TestFetchers:
+    """Test the coding assistant fetcher and collector enrichment"""
+
+    async def test_all_tools_in_one_query(self, fake, monkeypatch, tmp_path):
+        """With a token, every tool's repo comes from a single GraphQL request"""
+        monkeypatch.setattr(ca_github, "GITHUB_TOKEN", "token")
+
+        results = await ca_github.fetch_all_github_stats(CODING_ASSISTANTS, cache_dir=tmp_path)
+
+        assert fake.stats()["requests"] == 1
+        tool = next(t for t in CODING_ASSISTANTS if t.get("github_repo"))
+        stats = results[tool["name"]]
+        assert stats["stars"] > 0
+        assert stats["closed_issues"] != stats["open_issues"] * 2
+        assert (tmp_path / f"{tool['github_owner']}_{tool['github_repo']}_snapshot.json").exists()
+
+    async def test_rest_without_token(self, fake, monkeypatch):
+        """Without a token the fetcher keeps using REST"""
+        monkeypatch.setattr(ca_github, "GITHUB_TOKEN", None)
+
+        await ca_github.fetch_all_github_stats(CODING_ASSISTANTS)
+
+        assert not _graphql_requests(fake)
+        assert fake.stats()["requests"] > 1
+
+    async def test_enrich_collector_repos(self, fake, corpus, monkeypatch):
+        """Repos from the search get exact issue counts and the last commit date"""
+        monkeypatch.setattr(github, "GITHUB_TOKEN", "token")
+        repos = [github.normalize_repo(repo) for repo in corpus.repos[:5]]
+
+        enriched = await github.enrich_with_repo_stats(repos)
+
+        assert len(_graphql_requests(fake)) == 1
+        assert all(repo["last_commit_date"] and "closed_issues" in repo for repo in enriched)
+        assert enriched[0]["open_issues"] == corpus.repos[0]["open_issues_count"]
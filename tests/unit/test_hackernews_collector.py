@@ -0,0 +1,292 @@
+"""
+Unit tests for Hacker News collection modes
+Tests Algolia backfill, incremental mode and the item cache in src/ai_news_agent/collectors/hackernews.py
+"""
+import asyncio
+import re
+import time
+import httpx
+import pytest
+import respx
+from src.ai_news_agent.collectors import hackernews
+from src.ai_news_agent.collectors.hackernews import (
+    algolia_hit_to_item,
+    collect_ai_mentions,
+    load_incremental_state,
+    save_incremental_state,
+)
+
+
+@pytest.fixture(autouse=True)
+def item_cache_file(tmp_path, monkeypatch):
+    """Keep the on-disk item cache out of the working tree"""
+    path = tmp_path / "hn_items.sqlite"
+    monkeypatch.setattr(hackernews, "HN_ITEM_CACHE_FILE", path)
+    return path
+
+
+def _algolia_backend(stories):
+    """Fake search_by_date honouring created_at_i filters, points and paging"""
+    calls = []
+
+    def handler(request):
+        params = request.url.params
+        filters = params["numericFilters"]
+        start = int(re.search(r"created_at_i>=(\d+)", filters).group(1))
+        end = int(re.search(r"created_at_i<(\d+)", filters).group(1))
+        min_points = int(re.search(r"points>=(\d+)", filters).group(1))
+        per_page = int(params["hitsPerPage"])
+        page = int(params["page"])
+        calls.append((start, end, page))
+
+        matching = [s for s in stories if start <= s["created_at_i"] < end and s["points"] >= min_points]
+        visible = matching[:1000]
+        return httpx.Response(200, json={
+            "hits": visible[page * per_page:(page + 1) * per_page],
+            "nbHits": len(matching),
+            "nbPages": max(1, -(-len(visible) // per_page)),
+        })
+
+    return handler, calls
+
+
+def _story(i, ts, title="Claude beats GPT-4", points=50):
+    return {
+        "objectID": str(i), "title": title, "url": "", "points": points,
+        "num_comments": 3, "author": "pg", "created_at_i": ts,
+    }
+
+
+class TestAlgoliaBackfill:
+    """Test Algolia search_by_date collection"""
+
+    def test_hit_to_item(self):
+        """Algolia hits map onto Firebase item fields"""
+        item = algolia_hit_to_item(_story(42, 1700000000))
+
+        assert item["id"] == 42
+        assert item["score"] == 50
+        assert item["descendants"] == 3
+        assert item["by"] == "pg"
+        assert item["time"] == 1700000000
+
+    async def test_collects_whole_window_and_filters_relevance(self):
+        """Stories across the window are fetched and filtered locally"""
+        now = int(time.time())
+        stories = [
+            _story(1, now - 3600),
+            _story(2, now - 20 * 86400),
+            _story(3, now - 25 * 86400, title="Rust 2.0 released"),
+            _story(4, now - 40 * 86400),  # outside 30-day window
+        ]
+        handler, calls = _algolia_backend(stories)
+
+        with respx.mock:
+            respx.get(f"{hackernews.HN_ALGOLIA_API}/search_by_date").mock(side_effect=handler)
+            posts = await collect_ai_mentions(days_back=30, mode="algolia")
+
+        assert sorted(p["id"] for p in posts) == ["1", "2"]
+        assert all(p["source"] == "hackernews" for p in posts)
+        assert "claude" in posts[0]["keywords"]
+        assert len(calls) == 5  # one call per 7-day slice
+
+    async def test_splits_slices_over_hit_limit(self, monkeypatch):
+        """Slices with more than 1000 hits are bisected until they fit"""
+        monkeypatch.setattr(hackernews, "ALGOLIA_SLICE_DAYS", 30)
+        now = int(time.time())
+        stories = [_story(i, now - 10 - i * 600) for i in range(2500)]
+        handler, calls = _algolia_backend(stories)
+
+        with respx.mock:
+            respx.get(f"{hackernews.HN_ALGOLIA_API}/search_by_date").mock(side_effect=handler)
+            posts = await collect_ai_mentions(days_back=30, mode="algolia")
+
+        assert len(posts) == 2500
+        assert any(page > 0 for _, _, page in calls)
+
+    async def test_unknown_mode(self):
+        """Unknown collection mode is rejected"""
+        with pytest.raises(ValueError):
+            await collect_ai_mentions(days_back=1, mode="scrape")
+
+
+class TestIncrementalMode:
+    """Test maxitem/updates incremental polling"""
+
+    @pytest.fixture
+    def state_file(self, tmp_path, monkeypatch):
+        path = tmp_path / "hn_state.json"
+        monkeypatch.setattr(hackernews, "HN_STATE_FILE", path)
+        return path
+
+    def _mock_firebase(self, items, maxitem, updates=()):
+        """Serve items, maxitem and updates; return list of fetched item IDs"""
+        fetched = []
+
+        def item_handler(request):
+            item_id = int(request.url.path.rsplit("/", 1)[-1].split(".")[0])
+            fetched.append(item_id)
+            return httpx.Response(200, json=items.get(item_id))
+
+        respx.get(f"{hackernews.HN_API_BASE}/maxitem.json").respond(json=maxitem)
+        respx.get(f"{hackernews.HN_API_BASE}/updates.json").respond(
+            json={"items": list(updates), "profiles": []}
+        )
+        respx.get(url__regex=r".*/item/\d+\.json").mock(side_effect=item_handler)
+        return fetched
+
+    async def test_fetches_only_new_and_changed_items(self, state_file):
+        """Only IDs above the stored maxitem plus updated stories are fetched"""
+        old = int(time.time()) - 5 * 86400
+        now = int(time.time())
+        save_incremental_state({
+            "maxitem": 100,
+            "items": {"50": {"id": 50, "type": "story", "title": "Claude tips", "score": 12, "time": old}},
+        }, state_file)
+        items = {
+            50: {"id": 50, "type": "story", "title": "Claude tips", "score": 80, "time": old},
+            101: {"id": 101, "type": "comment", "text": "LLM comment", "time": now},
+            102: {"id": 102, "type": "story", "title": "Ollama on a Pi", "score": 30, "time": now, "kids": [1, 2]},
+            103: {"id": 103, "type": "story", "title": "Rust news", "score": 99, "time": now},
+        }
+
+        with respx.mock:
+            fetched = self._mock_firebase(items, maxitem=103, updates=[50, 7])
+            posts = await collect_ai_mentions(days_back=30, mode="incremental")
+
+        assert sorted(fetched) == [50, 101, 102, 103]
+        assert {p["id"]: p["points"] for p in posts} == {"50": 80, "102": 30}
+
+        state = load_incremental_state(state_file)
+        assert state["maxitem"] == 103
+        assert set(state["items"]) == {"50", "102"}
+        assert "kids" not in state["items"]["102"]
+
+    async def test_interrupted_run_keeps_progress(self, state_file, monkeypatch):
+        """A run cut off mid-way saves the last finished chunk; the next run starts after it"""
+        monkeypatch.setattr(hackernews, "HN_ITEM_CHUNK", 2)
+        now = int(time.time())
+        save_incremental_state({"maxitem": 100, "items": {}}, state_file)
+        items = {i: {"id": i, "type": "story", "title": f"Claude story {i}", "score": 20, "time": now}
+                 for i in range(101, 107)}
+        fetched = []
+        hang = True
+
+        async def item_handler(request):
+            item_id = int(request.url.path.rsplit("/", 1)[-1].split(".")[0])
+            fetched.append(item_id)
+            if item_id == 105 and hang:
+                await asyncio.sleep(10)
+            return httpx.Response(200, json=items.get(item_id))
+
+        with respx.mock:
+            respx.get(f"{hackernews.HN_API_BASE}/maxitem.json").respond(json=106)
+            respx.get(f"{hackernews.HN_API_BASE}/updates.json").respond(json={"items": [], "profiles": []})
+            respx.get(url__regex=r".*/item/\d+\.json").mock(side_effect=item_handler)
+            with pytest.raises(TimeoutError):
+                await asyncio.wait_for(collect_ai_mentions(days_back=30, mode="incremental"), timeout=0.5)
+
+            state = load_incremental_state(state_file)
+            assert state["maxitem"] == 104
+            assert {"101", "102", "103", "104"} <= set(state["items"])
+
+            fetched.clear()
+            hang = False
+            posts = await collect_ai_mentions(days_back=30, mode="incremental")
+
+        assert sorted(fetched) == [101, 102, 103, 104, 105, 106]  # 105-106 new, 101-104 refreshed
+        assert load_incremental_state(state_file)["maxitem"] == 106
+        assert len(posts) == 6
+
+    async def test_gap_over_cap_caught_up_over_runs(self, state_file, monkeypatch):
+        """A backlog over HN_MAX_NEW_ITEMS is fetched from the oldest ID up, none skipped"""
+        monkeypatch.setattr(hackernews, "HN_MAX_NEW_ITEMS", 4)
+        now = int(time.time())
+        save_incremental_state({"maxitem": 100, "items": {}}, state_file)
+        items = {i: {"id": i, "type": "story", "title": f"Claude story {i}", "score": 20, "time": now}
+                 for i in range(101, 111)}
+
+        with respx.mock:
+            fetched = self._mock_firebase(items, maxitem=110)
+            await collect_ai_mentions(days_back=30, mode="incremental")
+
+            assert sorted(fetched) == [101, 102, 103, 104]
+            assert load_incremental_state(state_file)["maxitem"] == 104
+
+            fetched.clear()
+            await collect_ai_mentions(days_back=30, mode="incremental")
+            fetched.clear()
+            posts = await collect_ai_mentions(days_back=30, mode="incremental")
+
+        assert sorted(fetched) == list(range(101, 111))  # 109-110 new, the rest refreshed
+        assert load_incremental_state(state_file)["maxitem"] == 110
+        assert len(posts) == 10
+
+    async def test_prunes_items_outside_window(self, state_file):
+        """Stored stories older than the lookback window are dropped"""
+        save_incremental_state({
+            "maxitem": 10,
+            "items": {"5": {"id": 5, "type": "story", "title": "GPT-4 paper", "score": 50,
+                            "time": int(time.time()) - 40 * 86400}},
+        }, state_file)
+
+        with respx.mock:
+            self._mock_firebase({}, maxitem=10)
+            posts = await collect_ai_mentions(days_back=30, mode="incremental")
+
+        assert posts == []
+        assert load_incremental_state(state_file)["items"] == {}
+
+    async def test_bootstraps_from_algolia(self, state_file):
+        """Without stored state the window is filled from Algolia"""
+        now = int(time.time())
+        handler, _ = _algolia_backend([_story(1, now - 3600), _story(2, now - 7200, title="Rust")])
+
+        with respx.mock:
+            self._mock_firebase({}, maxitem=500)
+            respx.get(f"{hackernews.HN_ALGOLIA_API}/search_by_date").mock(side_effect=handler)
+            posts = await collect_ai_mentions(days_back=7, mode="incremental")
+
+        assert [p["id"] for p in posts] == ["1"]
+        assert load_incremental_state(state_file)["maxitem"] == 500
+
+
+class TestItemCache:
+    """Test the persistent item cache in Firebase mode"""
+
+    def _mock_lists(self, ids):
+        for endpoint in ("topstories", "beststories", "newstories"):
+            respx.get(f"{hackernews.HN_API_BASE}/{endpoint}.json").respond(json=ids)
+
+    async def test_old_stories_served_from_cache(self, item_cache_file):
+        """A second run refetches fresh stories but reuses week-old ones"""
+        now = int(time.time())
+        items = {
+            1: {"id": 1, "type": "story", "title": "Claude 4 launch", "score": 90, "time": now - 3600},
+            2: {"id": 2, "type": "story", "title": "LLM retrospective", "score": 40, "time": now - 10 * 86400},
+            3: {"id": 3, "type": "comment", "text": "GPT", "time": now - 10 * 86400},
+        }
+        fetched = []
+
+        def item_handler(request):
+            item_id = int(request.url.path.rsplit("/", 1)[-1].split(".")[0])
+            fetched.append(item_id)
+            return httpx.Response(200, json=items[item_id])
+
+        with respx.mock:
+            self._mock_lists([1, 2, 3])
+            respx.get(url__regex=r".*/item/\d+\.json").mock(side_effect=item_handler)
+            first = await collect_ai_mentions(days_back=30, mode="firebase")
+            fetched.clear()
+            second = await collect_ai_mentions(days_back=30, mode="firebase")
+
+        assert sorted(fetched) == [1, 3]
+        assert [p["id"] for p in second] == [p["id"] for p in first] == ["1", "2"]
+
+    async def test_cache_can_be_disabled(self, item_cache_file):
+        """use_cache=False neither reads nor creates the cache file"""
+        with respx.mock:
+            self._mock_lists([])
+            await collect_ai_mentions(days_back=30, mode="firebase", use_cache=False)
+
+        assert not item_cache_file.exists()
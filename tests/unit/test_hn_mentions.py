@@ -0,0 +1,135 @@
+"""
+Unit tests for Hacker News mention counts in the coding assistant fetcher
+Tests counts mode in src/ai_news_agent/coding_assistants/fetchers/hackernews.py
+"""
+import pytest
+from src.ai_news_agent.coding_assistants.fetchers import hackernews as ca_hackernews
+from src.ai_news_agent.utils import http_client
+from tests.fake_apis import FakeCorpus
+
+DAY = 86400
+NOW = 1_700_000_000
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    return FakeCorpus(days=30, relevant_ratio=1.0, hn_stories=2000, hn_comments=8000, github_repos=10, tweets=0)
+
+
+def _expected(corpus, word, tag, days_back):
+    start = int(corpus.now) - days_back * DAY
+    return sum(
+        1 for hit, text in corpus.algolia_hits()
+        if hit["_tags"][0] == tag and hit["created_at_i"] >= start and word in text
+    )
+
+
+class TestBuckets:
+    """Test day buckets and sample allocation"""
+
+    def test_day_buckets_cover_window(self):
+        """Buckets are contiguous, end on UTC midnights and cover the whole window"""
+        buckets = ca_hackernews.day_buckets(3, now=NOW)
+
+        assert buckets[0][0] == NOW - 3 * DAY
+        assert buckets[-1][1] == NOW
+        assert all(end == next_start for (_, end), (next_start, _) in zip(buckets, buckets[1:]))
+        assert all(end % DAY == 0 for _, end in buckets[:-1])
+        assert len(buckets) == 4
+
+    def test_allocation_proportional(self):
+        """The sample follows each stratum's share and never exceeds its size"""
+        assert ca_hackernews.allocate_sample([10, 0, 30, 5], 10) == [2, 0, 7, 1]
+        assert ca_hackernews.allocate_sample([1, 2], 10) == [1, 2]
+        assert sum(ca_hackernews.allocate_sample([7, 7, 7], 10)) == 10
+
+
+class TestCountsMode:
+    """Test exact counts against the fake Algolia API"""
+
+    async def test_exact_counts_beyond_hit_cap(self, fake, corpus):
+        """Counts come from nbHits and are not capped by hitsPerPage"""
+        async with http_client.shared_client() as client:
+            data = await ca_hackernews.search_hn_mentions("LLM", days_back=30, client=client, mode="counts")
+
+        assert data["story_count"] == _expected(corpus, "llm", "story", 30)
+        assert data["comment_count"] == _expected(corpus, "llm", "comment", 30)
+        assert data["mentions_count"] > 200
+        assert sum(day["stories"] + day["comments"] for day in data["daily"]) == data["mentions_count"]
+        assert len(data["daily"]) == 31
+
+    async def test_sample_spread_over_strata(self, fake, monkeypatch):
+        """Comment texts are a bounded sample fetched once per stratum"""
+        monkeypatch.setattr(ca_hackernews, "HN_COMMENT_SAMPLE_SIZE", 20)
+        sample_sizes = []
+        sample_comments = ca_hackernews._sample_comments
+
+        async def recording(client, semaphore, query, start, end, size):
+            sample_sizes.append(size)
+            return await sample_comments(client, semaphore, query, start, end, size)
+
+        monkeypatch.setattr(ca_hackernews, "_sample_comments", recording)
+
+        async with http_client.shared_client() as client:
+            data = await ca_hackernews.search_hn_mentions("LLM", days_back=30, client=client, mode="counts")
+
+        assert len(data["comments"]) == sum(sample_sizes) == 20
+        assert 1 < len(sample_sizes) <= 5
+
+    async def test_finished_days_cached_long(self, fake, monkeypatch):
+        """Only days that have ended get the long cache TTL"""
+        ttls = []
+
+        async def recording(client, semaphore, query, tag, start, end, cache_ttl=None):
+            ttls.append((end, cache_ttl))
+            return 0
+
+        monkeypatch.setattr(ca_hackernews, "_count_hits", recording)
+        async with http_client.shared_client() as client:
+            await ca_hackernews.search_hn_mentions("LLM", days_back=3, client=client, mode="counts")
+
+        *finished, (_, current) = sorted(ttls)[::2]
+        assert current is None
+        assert all(ttl == ca_hackernews.HN_FINISHED_DAY_TTL for _, ttl in finished[:-1])
+
+    async def test_search_query_phrase(self, fake, corpus, monkeypatch):
+        """A quoted search_query is sent with advancedSyntax and counts the phrase only"""
+        requests = []
+        algolia_get = ca_hackernews._algolia_get
+
+        async def recording(client, semaphore, params, cache_ttl=None):
+            requests.append(params)
+            return await algolia_get(client, semaphore, params, cache_ttl)
+
+        monkeypatch.setattr(ca_hackernews, "_algolia_get", recording)
+        async with http_client.shared_client() as client:
+            data = await ca_hackernews.search_hn_mentions(
+                "Model", days_back=30, client=client, mode="counts", query='"foundation model"'
+            )
+
+        assert all(params["advancedSyntax"] == "true" for params in requests)
+        assert 0 < data["story_count"] == _expected(corpus, "foundation model", "story", 30)
+        assert data["story_count"] < _expected(corpus, "model", "story", 30)
+
+    async def test_search_query_only_in_counts_mode(self, fake, monkeypatch):
+        """fetch_all_hn_mentions passes search_query in counts mode and the bare name in hits mode"""
+        queries = []
+
+        async def search(name, days_back, client, mode, query=None):
+            queries.append((mode, query))
+            return {"mentions_count": 0, "comments": []}
+
+        monkeypatch.setattr(ca_hackernews, "search_hn_mentions", search)
+        tools = [{"name": "Continue", "search_query": '"continue.dev"'}]
+        await ca_hackernews.fetch_all_hn_mentions(tools, mode="hits")
+        await ca_hackernews.fetch_all_hn_mentions(tools, mode="counts")
+
+        assert queries == [("hits", None), ("counts", '"continue.dev"')]
+
+    async def test_hits_mode_unchanged(self, fake):
+        """Hits mode still counts the hits it downloads"""
+        async with http_client.shared_client() as client:
+            data = await ca_hackernews.search_hn_mentions("LLM", days_back=30, client=client, mode="hits")
+
+        assert data["mentions_count"] <= 200
+        assert data["stories"]
@@ -0,0 +1,151 @@
+"""
+Unit tests for the HTTP cache transport
+Tests src/ai_news_agent/utils/http_cache.py
+"""
+from email.utils import formatdate
+
+import httpx
+import pytest
+from src.ai_news_agent.utils.http_cache import CachingTransport, freshness_lifetime
+
+RULES = {"api.test/": None, "api.test/ttl/": 3600}
+
+
+class _Server:
+    """Mock API that counts requests and answers conditional requests with 304"""
+
+    def __init__(self, headers=None, etag='"v1"'):
+        self.headers = headers or {}
+        self.etag = etag
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        if self.etag and request.headers.get("If-None-Match") == self.etag:
+            return httpx.Response(304, headers={"ETag": self.etag, **self.headers})
+        headers = dict(self.headers)
+        if self.etag:
+            headers["ETag"] = self.etag
+        return httpx.Response(200, json={"n": len(self.requests)}, headers=headers)
+
+
+async def _get_twice(client, url):
+    return await client.get(url), await client.get(url)
+
+
+class TestFreshness:
+    """Test freshness lifetime calculation"""
+
+    def test_max_age(self):
+        """max-age wins over Expires"""
+        headers = httpx.Headers({"Cache-Control": "public, max-age=60", "Expires": formatdate(0, usegmt=True)})
+
+        assert freshness_lifetime(headers, now=1000.0) == 60
+
+    def test_no_cache_is_stale(self):
+        """no-cache responses must always be revalidated"""
+        assert freshness_lifetime(httpx.Headers({"Cache-Control": "no-cache, max-age=60"}), now=0) == 0
+
+    def test_last_modified_heuristic(self):
+        """Without explicit freshness, 10% of the Last-Modified age is used"""
+        now = 1_700_000_000.0
+        headers = httpx.Headers({
+            "Date": formatdate(now, usegmt=True),
+            "Last-Modified": formatdate(now - 10_000, usegmt=True),
+        })
+
+        assert freshness_lifetime(headers, now) == pytest.approx(1000)
+
+
+class TestCachingTransport:
+    """Test serving, revalidating and bypassing the cache"""
+
+    async def test_fresh_response_served_from_cache(self):
+        """A response with max-age is reused without a request"""
+        server = _Server({"Cache-Control": "max-age=60"})
+        transport = CachingTransport(httpx.MockTransport(server), ":memory:", RULES)
+
+        async with httpx.AsyncClient(transport=transport) as client:
+            first, second = await _get_twice(client, "https://api.test/x?b=1&a=2")
+
+        assert len(server.requests) == 1
+        assert first.json() == second.json() == {"n": 1}
+        assert second.headers["x-cache"] == "HIT"
+        assert transport.stats()["hits"] == 1
+
+    async def test_stale_response_revalidated(self):
+        """A stale entry with an ETag costs a 304, and the cached body is returned"""
+        server = _Server({"Cache-Control": "max-age=0"})
+        transport = CachingTransport(httpx.MockTransport(server), ":memory:", RULES)
+
+        async with httpx.AsyncClient(transport=transport) as client:
+            first, second = await _get_twice(client, "https://api.test/x")
+
+        assert server.requests[1].headers["If-None-Match"] == '"v1"'
+        assert second.status_code == 200
+        assert second.json() == {"n": 1}
+        assert second.headers["x-cache"] == "REVALIDATED"
+        assert transport.stats()["revalidated"] == 1
+
+    async def test_ttl_override(self):
+        """Per-endpoint TTLs make responses without cache headers reusable"""
+        server = _Server(etag=None)
+        transport = CachingTransport(httpx.MockTransport(server), ":memory:", RULES)
+
+        async with httpx.AsyncClient(transport=transport) as client:
+            await _get_twice(client, "https://api.test/ttl/x")
+            await _get_twice(client, "https://api.test/plain")
+
+        assert [r.url.path for r in server.requests] == ["/ttl/x", "/plain", "/plain"]
+
+    async def test_request_ttl_override(self):
+        """A cache_ttl request extension overrides the endpoint's TTL"""
+        server = _Server(etag=None)
+        transport = CachingTransport(httpx.MockTransport(server), ":memory:", RULES)
+
+        async with httpx.AsyncClient(transport=transport) as client:
+            for _ in range(2):
+                await client.get("https://api.test/final", extensions={"cache_ttl": 86400})
+                await client.get("https://other.test/final", extensions={"cache_ttl": 86400})
+
+        assert [r.url.host for r in server.requests] == ["api.test", "other.test", "other.test"]
+
+    async def test_no_store_and_unmatched_bypass(self):
+        """no-store responses and hosts without a rule are never stored"""
+        server = _Server({"Cache-Control": "no-store, max-age=60"})
+        transport = CachingTransport(httpx.MockTransport(server), ":memory:", RULES)
+
+        async with httpx.AsyncClient(transport=transport) as client:
+            await _get_twice(client, "https://api.test/x")
+            await _get_twice(client, "https://other.test/x")
+
+            assert len(server.requests) == 4
+            assert len(transport) == 0
+
+    async def test_vary_mismatch_is_a_miss(self):
+        """Entries are only reused for requests with the same Vary headers"""
+        server = _Server({"Cache-Control": "max-age=60", "Vary": "Authorization"})
+        transport = CachingTransport(httpx.MockTransport(server), ":memory:", RULES)
+
+        async with httpx.AsyncClient(transport=transport) as client:
+            await client.get("https://api.test/x", headers={"Authorization": "token a"})
+            await client.get("https://api.test/x", headers={"Authorization": "token b"})
+            await client.get("https://api.test/x", headers={"Authorization": "token b"})
+
+            stored = transport._conn.execute("SELECT vary FROM responses").fetchone()[0]
+
+        assert len(server.requests) == 2
+        assert "token" not in stored
+
+    async def test_persisted_between_runs(self, tmp_path):
+        """A new transport on the same file sees earlier responses"""
+        path = tmp_path / "http.sqlite"
+        server = _Server({"Cache-Control": "max-age=60"})
+
+        for _ in range(2):
+            transport = CachingTransport(httpx.MockTransport(server), path, RULES)
+            async with httpx.AsyncClient(transport=transport) as client:
+                response = await client.get("https://api.test/x")
+
+        assert len(server.requests) == 1
+        assert response.headers["x-cache"] == "HIT"
@@ -0,0 +1,89 @@
+"""
+Unit tests for the shared HTTP client
+Tests src/ai_news_agent/utils/http_client.py
+"""
+import asyncio
+import httpx
+import pytest
+from src.ai_news_agent.utils.http_client import (
+    HostLimitedTransport,
+    get_client,
+    close_client,
+)
+
+
+class _SlowTransport(httpx.AsyncBaseTransport):
+    """Mock transport that records peak concurrency per host"""
+
+    def __init__(self):
+        self.in_flight = {}
+        self.peak = {}
+
+    async def handle_async_request(self, request):
+        host = request.url.host
+        self.in_flight[host] = self.in_flight.get(host, 0) + 1
+        self.peak[host] = max(self.peak.get(host, 0), self.in_flight[host])
+        await asyncio.sleep(0.01)
+        self.in_flight[host] -= 1
+        return httpx.Response(200, json={"ok": True})
+
+
+class TestHostLimitedTransport:
+    """Test per-host concurrency limits"""
+
+    async def test_limits_concurrency_per_host(self):
+        """Requests to one host never exceed its limit"""
+        inner = _SlowTransport()
+        transport = HostLimitedTransport(inner, default_limit=8, host_limits={"slow.test": 2})
+
+        async with httpx.AsyncClient(transport=transport) as client:
+            await asyncio.gather(
+                *[client.get("https://slow.test/x") for _ in range(10)],
+                *[client.get("https://fast.test/x") for _ in range(10)],
+            )
+
+        assert inner.peak["slow.test"] <= 2
+        assert 2 < inner.peak["fast.test"] <= 8
+
+    async def test_slot_released_after_body_read(self):
+        """Sequential requests beyond the limit do not deadlock"""
+        transport = HostLimitedTransport(_SlowTransport(), default_limit=1)
+
+        async with httpx.AsyncClient(transport=transport) as client:
+            for _ in range(3):
+                response = await client.get("https://one.test/x")
+                assert response.json() == {"ok": True}
+
+    async def test_streamed_body_releases_slot(self):
+        """Streaming responses free their slot when the body is closed"""
+        class _Chunks(httpx.AsyncByteStream):
+            async def __aiter__(self):
+                yield b'{"ok": '
+                yield b'true}'
+
+        class _StreamingTransport(httpx.AsyncBaseTransport):
+            async def handle_async_request(self, request):
+                return httpx.Response(200, stream=_Chunks())
+
+        transport = HostLimitedTransport(_StreamingTransport(), default_limit=1)
+
+        async with httpx.AsyncClient(transport=transport) as client:
+            for _ in range(3):
+                response = await asyncio.wait_for(client.get("https://one.test/x"), 1.0)
+                assert response.json() == {"ok": True}
+
+
+class TestSharedClient:
+    """Test shared client lifecycle"""
+
+    async def test_get_client_reuses_instance(self):
+        """Same loop gets the same client until closed"""
+        first = get_client()
+        assert get_client() is first
+
+        await close_client()
+        assert first.is_closed
+
+        second = get_client()
+        assert second is not first
+        await close_client()
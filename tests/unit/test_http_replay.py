@@ -0,0 +1,125 @@
+"""
+Unit tests for record/replay transports
+Tests src/ai_news_agent/utils/http_replay.py and the cassette hooks in http_client.py
+"""
+import httpx
+import pytest
+from src.ai_news_agent.utils import http_client
+from src.ai_news_agent.utils.http_replay import (
+    CassetteMissError,
+    RecordingTransport,
+    ReplayTransport,
+    cassette_transport,
+    load_cassette,
+    request_key,
+)
+
+
+def _counting_handler():
+    calls = []
+
+    def handler(request):
+        calls.append(str(request.url))
+        return httpx.Response(200, json={"n": len(calls)}, headers={"Set-Cookie": "secret=1", "X-Test": "yes"})
+
+    return handler, calls
+
+
+class TestRequestKey:
+    """Test request matching keys"""
+
+    def test_query_order_ignored(self):
+        """Requests that differ only in query order share a key"""
+        first = httpx.Request("GET", "https://api.test/x?b=2&a=1")
+        second = httpx.Request("GET", "https://api.test/x?a=1&b=2")
+
+        assert request_key(first) == request_key(second)
+
+    def test_method_and_body_included(self):
+        """Method and body are part of the key"""
+        get = httpx.Request("GET", "https://api.test/x")
+        post = httpx.Request("POST", "https://api.test/x", content=b'{"q": 1}')
+
+        assert request_key(get) != request_key(post)
+        assert request_key(post).endswith('{"q": 1}')
+
+
+class TestRecordReplay:
+    """Test recording a session and replaying it offline"""
+
+    async def test_round_trip(self, tmp_path):
+        """Replayed responses match what was recorded, in order"""
+        path = tmp_path / "cassette.json"
+        handler, calls = _counting_handler()
+
+        recorder = RecordingTransport(httpx.MockTransport(handler), path)
+        async with httpx.AsyncClient(transport=recorder) as client:
+            recorded = [(await client.get("https://api.test/item", params={"id": 1})).json() for _ in range(2)]
+
+        async with httpx.AsyncClient(transport=ReplayTransport(path)) as client:
+            replayed = [(await client.get("https://api.test/item?id=1")).json() for _ in range(3)]
+
+        assert recorded == [{"n": 1}, {"n": 2}]
+        assert replayed == [{"n": 1}, {"n": 2}, {"n": 2}]  # Last recording repeats
+        assert len(calls) == 2
+
+    async def test_cookies_not_stored(self, tmp_path):
+        """Set-Cookie headers never reach the cassette"""
+        path = tmp_path / "cassette.json"
+        handler, _ = _counting_handler()
+
+        async with httpx.AsyncClient(transport=RecordingTransport(httpx.MockTransport(handler), path)) as client:
+            await client.get("https://api.test/x")
+
+        headers = dict(load_cassette(path)[0]["response"]["headers"])
+        assert "set-cookie" not in {name.lower() for name in headers}
+        assert headers["x-test"] == "yes"
+
+    async def test_miss_raises(self):
+        """Unknown requests raise a transport error instead of hitting the network"""
+        transport = ReplayTransport([])
+
+        async with httpx.AsyncClient(transport=transport) as client:
+            with pytest.raises(CassetteMissError):
+                await client.get("https://api.test/unknown")
+
+        assert transport.misses == ["GET https://api.test/unknown"]
+
+    def test_unknown_mode_rejected(self, tmp_path):
+        """Only record and replay are valid modes"""
+        with pytest.raises(ValueError):
+            cassette_transport(tmp_path / "c.json", "rewind")
+
+
+class TestClientHooks:
+    """Test routing the shared client through other transports"""
+
+    async def test_transport_factory(self):
+        """The shared client uses the configured transport factory"""
+        handler, calls = _counting_handler()
+        await http_client.close_client()
+        previous = http_client.set_transport_factory(lambda: httpx.MockTransport(handler))
+        try:
+            response = await http_client.get_client().get("https://api.test/x")
+        finally:
+            await http_client.close_client()
+            http_client.set_transport_factory(previous)
+
+        assert response.json() == {"n": 1}
+        assert calls == ["https://api.test/x"]
+
+    async def test_cassette_from_env(self, tmp_path, monkeypatch):
+        """AI_NEWS_CASSETTE replays a cassette through the shared client"""
+        path = tmp_path / "cassette.json"
+        handler, _ = _counting_handler()
+        async with httpx.AsyncClient(transport=RecordingTransport(httpx.MockTransport(handler), path)) as client:
+            await client.get("https://api.test/x")
+
+        monkeypatch.setenv(http_client.CASSETTE_ENV, str(path))
+        await http_client.close_client()
+        try:
+            response = await http_client.get_client().get("https://api.test/x")
+        finally:
+            await http_client.close_client()
+
+        assert response.json() == {"n": 1}
@@ -0,0 +1,101 @@
+"""
+Unit tests for the persistent item cache
+Tests src/ai_news_agent/utils/item_cache.py
+"""
+import pytest
+from src.ai_news_agent.utils.item_cache import (
+    FROZEN_TTL,
+    ItemCache,
+    age_aware_ttl,
+)
+
+HOUR = 3600
+DAY = 86400
+NOW = 1_700_000_000
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ItemCache(tmp_path / "items.sqlite")
+    yield cache
+    cache.close()
+
+
+class TestAgeAwareTTL:
+    """Test TTL growth with item age"""
+
+    def test_fresh_items_always_refetched(self):
+        """Items younger than a few hours are never reused"""
+        assert age_aware_ttl(0) == 0
+        assert age_aware_ttl(5 * HOUR) == 0
+
+    def test_ttl_grows_with_age(self):
+        """Older items stay valid longer"""
+        assert age_aware_ttl(1 * DAY) == 6 * HOUR
+        assert age_aware_ttl(4 * DAY) == 1 * DAY
+        assert age_aware_ttl(1 * DAY) < age_aware_ttl(3 * DAY) < age_aware_ttl(6 * DAY)
+
+    def test_week_old_items_frozen(self):
+        """Items older than a week are kept for a month"""
+        assert age_aware_ttl(7 * DAY) == FROZEN_TTL
+        assert age_aware_ttl(90 * DAY) == FROZEN_TTL
+
+
+class TestItemCache:
+    """Test SQLite-backed cache lookups and stats"""
+
+    def test_miss_then_hit(self, cache):
+        """Stored items are returned while fresh"""
+        assert cache.get(1, now=NOW) is None
+
+        cache.put(1, {"id": 1, "score": 10}, created_at=NOW - 2 * DAY, now=NOW)
+
+        assert cache.get(1, now=NOW + HOUR) == {"id": 1, "score": 10}
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_fresh_item_expires_immediately(self, cache):
+        """An item fetched minutes after creation is refetched next time"""
+        cache.put(1, {"id": 1}, created_at=NOW - 600, now=NOW)
+
+        assert cache.get(1, now=NOW + 60) is None
+        assert cache.stats()["expired"] == 1
+
+    def test_ttl_based_on_age_at_fetch(self, cache):
+        """A 2-day-old item is reused for 12 hours"""
+        cache.put(1, {"id": 1}, created_at=NOW - 2 * DAY, now=NOW)
+
+        assert cache.get(1, now=NOW + 11 * HOUR) is not None
+        assert cache.get(1, now=NOW + 13 * HOUR) is None
+
+    def test_persists_across_instances(self, tmp_path):
+        """Items survive closing and reopening the database"""
+        path = tmp_path / "items.sqlite"
+        first = ItemCache(path)
+        first.put("abc", {"title": "Claude"}, created_at=NOW - 30 * DAY, now=NOW)
+        first.close()
+
+        second = ItemCache(path)
+        try:
+            assert second.get("abc", now=NOW + DAY) == {"title": "Claude"}
+            assert len(second) == 1
+        finally:
+            second.close()
+
+    def test_prune(self, cache):
+        """Items created before the cutoff are deleted"""
+        cache.put(1, {}, created_at=NOW - 40 * DAY, now=NOW)
+        cache.put(2, {}, created_at=NOW - DAY, now=NOW)
+
+        assert cache.prune(NOW - 30 * DAY) == 1
+        assert len(cache) == 1
+
+    def test_custom_ttl(self, tmp_path):
+        """A fixed TTL function can replace the age-aware default"""
+        cache = ItemCache(tmp_path / "items.sqlite", ttl=lambda age: 60)
+        try:
+            cache.put(1, {}, created_at=NOW, now=NOW)
+            assert cache.get(1, now=NOW + 30) == {}
+            assert cache.get(1, now=NOW + 90) is None
+        finally:
+            cache.close()
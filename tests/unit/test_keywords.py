@@ -0,0 +1,129 @@
+"""
+Unit tests for keyword matching
+Tests KeywordMatcher in src/ai_news_agent/utils/keywords.py
+"""
+import random
+
+import pytest
+from src.ai_news_agent.config import AI_KEYWORDS
+from src.ai_news_agent.utils import keywords
+from src.ai_news_agent.utils.keywords import (
+    KeywordMatcher,
+    get_ai_matcher,
+    match_ai_keywords
+)
+
+
+@pytest.fixture(params=["automaton", "regex"])
+def engine(request, monkeypatch):
+    """Run matcher tests against both the Aho-Corasick and regex engines"""
+    if request.param == "automaton" and not keywords.AHOCORASICK_AVAILABLE:
+        pytest.skip("pyahocorasick not installed")
+    if request.param == "regex":
+        monkeypatch.setattr(keywords, "AHOCORASICK_AVAILABLE", False)
+    return request.param
+
+
+@pytest.mark.usefixtures("engine")
+class TestKeywordMatcher:
+    """Test single-pass multi-keyword matching"""
+
+    def test_finds_all_keywords_in_order(self):
+        """All matched keywords are returned in order of appearance"""
+        matcher = KeywordMatcher(["claude", "gpt-4", "llama"])
+        assert matcher.find_all("GPT-4 vs Claude vs Llama") == ["gpt-4", "claude", "llama"]
+
+    def test_case_insensitive_returns_config_spelling(self):
+        """Matching ignores case but returns the configured keyword"""
+        matcher = KeywordMatcher(["OpenAI"])
+        assert matcher.find_all("openai ships something") == ["OpenAI"]
+
+    def test_duplicates_reported_once(self):
+        """A keyword appearing twice is only reported once"""
+        matcher = KeywordMatcher(["claude"])
+        assert matcher.find_all("Claude and claude again") == ["claude"]
+
+    def test_longest_match_and_contained_keywords(self):
+        """Keywords nested in a longer match are also reported"""
+        matcher = KeywordMatcher(["copilot", "github copilot"])
+        assert matcher.find_all("GitHub Copilot review") == ["github copilot", "copilot"]
+
+    def test_short_keyword_needs_word_boundary(self):
+        """Short keywords do not match inside other words in auto mode"""
+        matcher = KeywordMatcher(["rag", "llm"])
+        assert matcher.find_all("Cloud storage pricing") == []
+        assert matcher.find_all("A fragment of text") == []
+        assert matcher.find_all("RAG with LLMs") == ["rag", "llm"]
+
+    def test_short_keyword_allows_trailing_digits(self):
+        """Version suffixes like qwen2 still match"""
+        matcher = KeywordMatcher(["qwen"])
+        assert matcher.find_all("Qwen2.5 released") == ["qwen"]
+
+    def test_plural_and_longer_keyword_order(self):
+        """Longest keyword comes first at the same position"""
+        matcher = KeywordMatcher(["ai agent", "ai agents"])
+        assert matcher.find_all("Building AI agents") == ["ai agents", "ai agent"]
+
+    def test_long_keyword_matches_as_substring_in_auto_mode(self):
+        """Long keywords keep substring semantics"""
+        matcher = KeywordMatcher(["gpt-4"])
+        assert matcher.find_all("gpt-4o is here") == ["gpt-4"]
+
+    def test_none_mode_is_plain_substring(self):
+        """Boundary mode 'none' matches like `kw in text`"""
+        matcher = KeywordMatcher(["rag"], boundaries="none")
+        assert matcher.matches("storage") is True
+
+    def test_word_mode_applies_to_all_keywords(self):
+        """Boundary mode 'word' applies boundaries to long keywords too"""
+        matcher = KeywordMatcher(["mistral"], boundaries="word")
+        assert matcher.matches("mistralai") is False
+        assert matcher.matches("Mistral 7B") is True
+
+    def test_overlapping_keywords(self):
+        """Keywords overlapping an earlier match without being inside it are still found"""
+        matcher = KeywordMatcher(["chatgpt", "gpt-4", "ai agent", "agentic"])
+
+        assert matcher.find_all("New ChatGPT-4o model") == ["chatgpt", "gpt-4"]
+        assert matcher.find_all("Building AI agentic workflows") == ["ai agent", "agentic"]
+
+    def test_invalid_mode(self):
+        """Unknown boundary mode raises ValueError"""
+        with pytest.raises(ValueError):
+            KeywordMatcher(["x"], boundaries="fuzzy")
+
+    def test_empty_inputs(self):
+        """Empty text or keyword list never matches"""
+        assert KeywordMatcher([]).find_all("claude") == []
+        assert KeywordMatcher(["claude"]).find_all("") == []
+        assert KeywordMatcher(["claude"]).matches(None) is False
+
+
+class TestAIMatcher:
+    """Test the shared matcher built from AI_KEYWORDS"""
+
+    def test_shared_matcher_is_cached(self):
+        """get_ai_matcher returns the same compiled instance"""
+        assert get_ai_matcher() is get_ai_matcher()
+
+    def test_match_ai_keywords_skips_empty_fields(self):
+        """None and empty fields are ignored"""
+        assert match_ai_keywords(None, "", "Anthropic releases Claude") == ["anthropic", "claude"]
+
+    @pytest.mark.skipif(not keywords.AHOCORASICK_AVAILABLE, reason="pyahocorasick not installed")
+    def test_backends_agree_on_overlapping_text(self, monkeypatch):
+        """The regex fallback finds the same keywords as the automaton on overlapping input"""
+        automaton = KeywordMatcher(AI_KEYWORDS)
+        monkeypatch.setattr(keywords, "AHOCORASICK_AVAILABLE", False)
+        regex = KeywordMatcher(AI_KEYWORDS)
+        terms = [keyword.lower() for keyword in AI_KEYWORDS]
+        rng = random.Random(7)
+
+        for _ in range(3000):
+            # Keywords and keyword tails glued together so matches overlap
+            text = "".join(
+                rng.choice(["", " ", "-", "s", "x"]) + rng.choice(terms)[rng.choice([0, 0, 1, 2, 3]):]
+                for _ in range(rng.randint(1, 4))
+            )
+            assert regex.find_all(text) == automaton.find_all(text), text
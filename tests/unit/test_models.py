@@ -0,0 +1,154 @@
+"""
+Unit tests for the Post model
+Tests src/ai_news_agent/models.py and lossless conversion of collector output
+"""
+import json
+
+import pytest
+from src.ai_news_agent.models import Post
+from src.ai_news_agent.utils import save_output
+from src.ai_news_agent.collectors.hackernews import normalize_post
+from src.ai_news_agent.collectors.github import normalize_repo
+
+
+@pytest.fixture
+def reddit_post():
+    return {
+        "id": "abc123",
+        "title": "Running Llama 3 locally",
+        "url": "https://example.com/llama",
+        "permalink": "/r/LocalLLaMA/comments/abc123/",
+        "score": 42,
+        "num_comments": 7,
+        "author": "someone",
+        "created_utc": 1700000000,
+        "selftext": "x" * 800,
+    }
+
+
+@pytest.fixture
+def tweet():
+    return {
+        "id": "555",
+        "text": "Claude is great at refactoring",
+        "created_at": "2024-01-01T00:00:00.000Z",
+        "public_metrics": {"like_count": 10, "retweet_count": 3, "reply_count": 2},
+    }
+
+
+class TestPostConstruction:
+    """Test building posts directly from API payloads"""
+
+    def test_hn_item(self, sample_hn_story):
+        """HN items keep the discussion link and keywords"""
+        post = Post.from_hn_item(sample_hn_story, ["GPT-4"])
+
+        assert post.id == "123456"
+        assert post.link == "https://news.ycombinator.com/item?id=123456"
+        assert post.keywords == ("GPT-4",)
+
+    def test_reddit_post(self, reddit_post):
+        """Reddit posts truncate selftext and keep the subreddit"""
+        data = Post.from_reddit_post(reddit_post, "LocalLLaMA", ["llama"]).to_dict()
+
+        assert data["reddit_url"] == "https://reddit.com/r/LocalLLaMA/comments/abc123/"
+        assert data["subreddit"] == "LocalLLaMA"
+        assert len(data["text"]) == 500
+        assert data["keywords"] == ["llama"]
+
+    def test_tweet(self, tweet):
+        """Tweets use engagement as points and have no keywords field"""
+        data = Post.from_tweet(tweet, "dev").to_dict()
+
+        assert data["points"] == 15
+        assert data["url"] == data["twitter_url"] == "https://twitter.com/dev/status/555"
+        assert data["likes"] == 10
+        assert "keywords" not in data
+
+    def test_github_null_description_kept(self, sample_github_repo):
+        """A null description from the API stays null in the dict"""
+        repo = dict(sample_github_repo, description=None)
+
+        assert normalize_repo(repo)["description"] is None
+
+    def test_slots_and_interning(self, sample_hn_story):
+        """Posts have no per-instance __dict__ and share repeated strings"""
+        first = Post.from_hn_item(dict(sample_hn_story, by="".join(["test", "user"])))
+        second = Post.from_hn_item(dict(sample_hn_story, by="".join(["test", "user"])))
+
+        assert not hasattr(first, "__dict__")
+        assert first.author is second.author
+        assert first.source is second.source
+
+
+class TestLosslessConversion:
+    """Test dict -> Post -> dict round trips"""
+
+    def test_collector_dicts_round_trip(self, sample_hn_story, sample_github_repo, reddit_post, tweet):
+        """Every collector's output survives a round trip unchanged"""
+        dicts = [
+            normalize_post(sample_hn_story, ["GPT-4", "OpenAI"]).to_dict(),
+            normalize_repo(sample_github_repo, ["llm"]).to_dict(),
+            normalize_repo(dict(sample_github_repo, description=None, topics=None)).to_dict(),
+            Post.from_reddit_post(reddit_post, "LocalLLaMA", ["llama"]).to_dict(),
+            Post.from_tweet(tweet, "dev").to_dict(),
+        ]
+
+        for data in dicts:
+            assert Post.from_dict(data).to_dict() == data
+
+    def test_unknown_keys_preserved(self):
+        """Keys added by later stages are kept in `extra`"""
+        data = {
+            "id": "1", "title": "t", "url": "", "points": 1, "num_comments": 0,
+            "author": "a", "created_at": "", "source": "hackernews",
+            "hn_url": "https://news.ycombinator.com/item?id=1",
+            "sentiment": 0.4, "text": None,
+        }
+
+        post = Post.from_dict(data)
+
+        assert post.extra == {"sentiment": 0.4, "text": None}
+        assert post.to_dict() == data
+
+    def test_missing_core_field_raises(self):
+        """Dicts without the core fields are not valid posts"""
+        with pytest.raises(KeyError):
+            Post.from_dict({"id": "1", "title": "t"})
+
+
+class TestDictAccess:
+    """Test reading and updating a Post as the dict format"""
+
+    def test_reads_like_dict(self, sample_hn_story):
+        """Keys, values and missing keys behave as in to_dict()"""
+        post = normalize_post(sample_hn_story, ["GPT-4"])
+
+        assert post["points"] == sample_hn_story["score"]
+        assert post["hn_url"] == post.link
+        assert post.get("keywords") == ["GPT-4"]
+        assert post.get("subreddit", "none") == "none"
+        assert "github_url" not in post
+        assert dict(post) == post.to_dict()
+        with pytest.raises(KeyError):
+            post["likes"]
+
+    def test_setitem_updates_fields_and_extra(self, sample_github_repo):
+        """Assigned keys land in fields or `extra` and survive to_dict()"""
+        post = normalize_repo(sample_github_repo, ["llm"])
+
+        post["points"] = 7
+        post["forks"] = 3
+        post["description"] = None
+
+        assert post.points == 7
+        assert post.extra == {"forks": 3, "description": None}
+        assert Post.from_dict(post.to_dict()) == post
+
+    def test_save_output_writes_dict_format(self, sample_hn_story, tmp_path):
+        """Posts are converted only when written to JSON"""
+        post = normalize_post(sample_hn_story, ["GPT-4"])
+
+        path = save_output([post], "raw_posts.json", output_dir=str(tmp_path))
+
+        assert json.loads(path.read_text(encoding="utf-8")) == [post.to_dict()]
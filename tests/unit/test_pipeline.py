@@ -0,0 +1,100 @@
+"""
+Unit tests for the streaming collection pipeline
+Tests src/ai_news_agent/utils/pipeline.py
+"""
+import asyncio
+import time
+from src.ai_news_agent.utils.pipeline import dedupe, merge_sources
+
+
+async def _gen(items, delay=0.0):
+    for item in items:
+        await asyncio.sleep(delay)
+        yield item
+
+
+class TestMergeSources:
+    """Test merging of concurrent post streams"""
+
+    async def test_yields_posts_as_they_arrive(self):
+        """A fast source is consumed before a slow one finishes"""
+        sources = {"slow": _gen([{"id": "s"}], delay=0.2), "fast": _gen([{"id": "f1"}, {"id": "f2"}])}
+
+        started = time.perf_counter()
+        arrivals = []
+        async for post in merge_sources(sources):
+            arrivals.append((post["id"], time.perf_counter() - started))
+
+        assert [post_id for post_id, _ in arrivals] == ["f1", "f2", "s"]
+        assert arrivals[0][1] < 0.1
+
+    async def test_backpressure(self):
+        """A producer runs at most `maxsize` posts ahead of the consumer"""
+        produced = []
+
+        async def counting():
+            for i in range(50):
+                produced.append(i)
+                yield {"id": i}
+
+        consumed = 0
+        async for _ in merge_sources({"a": counting()}, maxsize=5):
+            consumed += 1
+            await asyncio.sleep(0)
+            assert len(produced) - consumed <= 5 + 1
+        assert consumed == 50
+
+    async def test_results_report_status(self):
+        """Each source gets a status dict with count, status and error"""
+        async def failing():
+            yield {"id": 1}
+            raise RuntimeError("boom")
+
+        results = []
+        posts = [p async for p in merge_sources({"ok": _gen([{"id": 2}]), "bad": failing()}, results)]
+
+        by_source = {r["source"]: r for r in results}
+        assert len(posts) == 2
+        assert by_source["ok"]["status"] == "ok"
+        assert by_source["bad"]["status"] == "error"
+        assert by_source["bad"]["count"] == 1
+        assert "boom" in by_source["bad"]["error"]
+
+    async def test_deadline_cancels_and_closes_streams(self):
+        """Sources still running at the deadline are cancelled and closed"""
+        closed = []
+
+        async def endless():
+            try:
+                while True:
+                    await asyncio.sleep(0.01)
+                    yield {"id": time.perf_counter()}
+            finally:
+                closed.append(True)
+
+        results = []
+        started = time.perf_counter()
+        posts = [p async for p in merge_sources({"endless": endless()}, results, deadline=0.1)]
+
+        assert time.perf_counter() - started < 0.5
+        assert posts
+        assert results[0]["status"] == "deadline"
+        assert closed == [True]
+
+    async def test_consumer_can_stop_early(self):
+        """Closing the merged stream cancels the producers"""
+        stream = merge_sources({"a": _gen(range(1000), delay=0.001)})
+        first = await stream.__anext__()
+        await stream.aclose()
+
+        assert first == 0
+
+
+class TestDedupe:
+    """Test the dedupe stage"""
+
+    async def test_drops_repeated_ids(self):
+        """Only the first post per ID is kept"""
+        posts = [p async for p in dedupe(_gen([{"id": 1}, {"id": 2}, {"id": 1}, {"id": None}, {"id": None}]))]
+
+        assert [p["id"] for p in posts] == [1, 2, None, None]
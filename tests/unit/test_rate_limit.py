@@ -0,0 +1,195 @@
+"""
+Unit tests for the shared rate limiter
+Tests src/ai_news_agent/utils/rate_limit.py
+"""
+import asyncio
+import multiprocessing
+import threading
+
+import httpx
+import pytest
+from src.ai_news_agent.utils.rate_limit import (
+    RateLimitedTransport,
+    RateLimiter,
+    RateLimitExceeded,
+    bucket_key,
+    parse_rate_headers,
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+NOW = 1_700_000_000.0
+POLICY = {"api.test": {"requests": 60, "period": 60, "burst": 2}}
+
+
+def _reserve_many(path, count, queue):
+    limiter = RateLimiter(path, POLICY)
+    queue.put([limiter.reserve("api.test", now=NOW) for _ in range(count)])
+
+
+class TestHeaders:
+    """Test parsing of the different APIs' rate-limit headers"""
+
+    def test_github_epoch_reset(self):
+        """GitHub/Twitter send an epoch reset time"""
+        headers = httpx.Headers({"X-RateLimit-Remaining": "4", "X-RateLimit-Reset": str(int(NOW) + 30)})
+
+        assert parse_rate_headers(headers, NOW) == (4.0, NOW + 30, None)
+
+    def test_reddit_relative_reset(self):
+        """Reddit sends seconds until reset and a float remaining count"""
+        headers = httpx.Headers({"x-ratelimit-remaining": "12.0", "x-ratelimit-reset": "45"})
+
+        assert parse_rate_headers(headers, NOW) == (12.0, NOW + 45, None)
+
+    def test_retry_after(self):
+        """Retry-After in seconds becomes an absolute time"""
+        assert parse_rate_headers(httpx.Headers({"Retry-After": "7"}), NOW) == (None, None, NOW + 7)
+
+    def test_github_search_has_own_bucket(self):
+        """GitHub search and core quotas are tracked separately"""
+        assert bucket_key(httpx.Request("GET", "https://api.github.com/search/repositories")) == "api.github.com/search"
+        assert bucket_key(httpx.Request("GET", "https://api.github.com/repos/a/b")) == "api.github.com"
+        assert bucket_key(httpx.Request("POST", "https://api.github.com/graphql")) == "api.github.com/graphql"
+
+
+class TestRateLimiter:
+    """Test token bucket scheduling"""
+
+    def test_burst_then_paced(self):
+        """The burst goes out at once, then one slot per 1/rate seconds"""
+        limiter = RateLimiter(None, POLICY)
+
+        waits = [limiter.reserve("api.test", now=NOW) for _ in range(4)]
+
+        assert waits == [0.0, 0.0, pytest.approx(1.0), pytest.approx(2.0)]
+
+    def test_unknown_host_unlimited(self):
+        """Hosts without a policy are never delayed"""
+        limiter = RateLimiter(None, POLICY)
+
+        assert all(limiter.reserve("other.test", now=NOW) == 0.0 for _ in range(100))
+
+    def test_server_remaining_respected(self):
+        """When the server reports nothing left, the next slot is at its reset"""
+        limiter = RateLimiter(None, {"api.test": {"requests": 1000, "period": 1, "burst": 100}})
+        response = httpx.Response(200, headers={"x-ratelimit-remaining": "1", "x-ratelimit-reset": "30"})
+
+        limiter.update("api.test", response, now=NOW)
+
+        assert limiter.reserve("api.test", now=NOW) == 0.0
+        assert limiter.reserve("api.test", now=NOW) == pytest.approx(30.0)
+
+    def test_stale_response_does_not_raise_budget(self):
+        """An out-of-order response cannot increase the remaining count in a window"""
+        limiter = RateLimiter(None, POLICY)
+        reset = str(int(NOW) + 60)
+
+        limiter.update("api.test", httpx.Response(200, headers={"X-RateLimit-Remaining": "3", "X-RateLimit-Reset": reset}), now=NOW)
+        limiter.update("api.test", httpx.Response(200, headers={"X-RateLimit-Remaining": "9", "X-RateLimit-Reset": reset}), now=NOW)
+
+        assert limiter.stats()["api.test"]["remaining"] == 3
+
+    def test_max_wait_raises_without_reserving(self):
+        """Waits beyond max_wait raise and leave the bucket untouched"""
+        limiter = RateLimiter(None, POLICY)
+        limiter.update("api.test", httpx.Response(429, headers={"Retry-After": "600"}), now=NOW)
+        before = limiter.stats()["api.test"]["tokens"]
+
+        with pytest.raises(RateLimitExceeded):
+            limiter.reserve("api.test", max_wait=60, now=NOW)
+
+        assert limiter.stats()["api.test"]["tokens"] == before
+
+    def test_state_shared_between_processes(self, tmp_path):
+        """Two processes using one state file share the same budget"""
+        path = tmp_path / "limits.json"
+        queue = multiprocessing.get_context("spawn").Queue()
+        workers = [
+            multiprocessing.get_context("spawn").Process(target=_reserve_many, args=(path, 3, queue))
+            for _ in range(2)
+        ]
+        for worker in workers:
+            worker.start()
+        waits = sorted(queue.get(timeout=30) + queue.get(timeout=30))
+        for worker in workers:
+            worker.join()
+
+        # Six requests at burst 2 and 1/s: nobody reuses a slot
+        assert waits == pytest.approx([0.0, 0.0, 1.0, 2.0, 3.0, 4.0])
+
+
+class TestRateLimitedTransport:
+    """Test the transport wrapper"""
+
+    async def test_retries_after_retry_after(self, monkeypatch):
+        """A 429 with a short Retry-After is retried transparently"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(429, headers={"Retry-After": "0"})
+            return httpx.Response(200, json={"ok": True})
+
+        transport = RateLimitedTransport(httpx.MockTransport(handler), RateLimiter(None, POLICY))
+        async with httpx.AsyncClient(transport=transport) as client:
+            response = await client.get("https://api.test/x")
+
+        assert response.status_code == 200
+        assert len(calls) == 2
+
+    async def test_long_block_returns_response(self):
+        """A 429 with a reset beyond max_wait is returned to the caller"""
+        transport = RateLimitedTransport(
+            httpx.MockTransport(lambda request: httpx.Response(429, headers={"Retry-After": "3600"})),
+            RateLimiter(None, POLICY),
+            max_wait=5,
+        )
+        async with httpx.AsyncClient(transport=transport) as client:
+            response = await client.get("https://api.test/x")
+
+            assert response.status_code == 429
+            with pytest.raises(RateLimitExceeded):
+                await client.get("https://api.test/x")
+
+    async def test_not_modified_refunded(self):
+        """304 responses give their slot back"""
+        limiter = RateLimiter(None, POLICY)
+        transport = RateLimitedTransport(httpx.MockTransport(lambda request: httpx.Response(304)), limiter)
+
+        async with httpx.AsyncClient(transport=transport) as client:
+            for _ in range(5):
+                await client.get("https://api.test/x")
+
+        assert limiter.stats()["api.test"]["tokens"] == pytest.approx(2, abs=0.1)
+
+    @pytest.mark.skipif(fcntl is None, reason="file locks need fcntl")
+    async def test_file_lock_does_not_block_loop(self, tmp_path):
+        """Waiting for another process's state lock leaves the event loop free"""
+        path = tmp_path / "rate_limits.json"
+        transport = RateLimitedTransport(
+            httpx.MockTransport(lambda request: httpx.Response(200)), RateLimiter(path, POLICY)
+        )
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        with open(path.with_suffix(".lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            # Released from a thread, so a blocked loop cannot hang the test
+            threading.Timer(0.3, fcntl.flock, (lock_file, fcntl.LOCK_UN)).start()
+            ticking = asyncio.create_task(ticker())
+            async with httpx.AsyncClient(transport=transport) as client:
+                response = await client.get("https://api.test/x")
+            ticking.cancel()
+
+        assert response.status_code == 200
+        assert ticks > 10
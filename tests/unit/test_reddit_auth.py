@@ -0,0 +1,133 @@
+"""
+Unit tests for the Reddit OAuth client
+Tests src/ai_news_agent/utils/reddit_auth.py and its use by both Reddit fetchers
+"""
+import json
+
+import httpx
+import pytest
+from src.ai_news_agent.coding_assistants.fetchers.reddit import fetch_all_reddit_mentions
+from src.ai_news_agent.collectors import reddit
+from tests.fake_apis import FakeCorpus
+from src.ai_news_agent.utils.reddit_auth import RedditAuth, reddit_get, set_reddit_auth
+
+
+class _TokenServer:
+    """Mock Reddit: token grants and one listing endpoint that checks the bearer token"""
+
+    def __init__(self, expires_in=3600, revoked=()):
+        self.expires_in = expires_in
+        self.revoked = set(revoked)
+        self.grants = 0
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        if request.url.path == "/api/v1/access_token":
+            self.grants += 1
+            return httpx.Response(200, json={"access_token": f"t{self.grants}", "expires_in": self.expires_in})
+        token = request.headers.get("Authorization", "").removeprefix("bearer ")
+        if request.url.host != "oauth.reddit.com" or token in self.revoked:
+            return httpx.Response(401)
+        return httpx.Response(200, json={"data": {"children": []}, "token": token})
+
+
+def _client(server):
+    return httpx.AsyncClient(transport=httpx.MockTransport(server))
+
+
+class TestRedditAuth:
+    """Test token caching and refresh"""
+
+    async def test_token_reused(self, tmp_path):
+        """One grant serves many requests"""
+        server = _TokenServer()
+        set_reddit_auth(RedditAuth("id", "secret", tmp_path / "token.json"))
+
+        async with _client(server) as client:
+            for _ in range(3):
+                response = await reddit_get(client, "/r/python/new.json")
+
+        assert response.json()["token"] == "t1"
+        assert server.grants == 1
+        assert all(r.url.host == "oauth.reddit.com" for r in server.requests[1:])
+
+    async def test_token_cached_between_runs(self, tmp_path):
+        """A new process picks the still-valid token up from the cache file"""
+        server = _TokenServer()
+        path = tmp_path / "token.json"
+
+        async with _client(server) as client:
+            await RedditAuth("id", "secret", path).token(client)
+            token = await RedditAuth("id", "secret", path).token(client)
+
+        assert token == "t1"
+        assert server.grants == 1
+        assert json.loads(path.read_text())["client_id"] == "id"
+        assert path.stat().st_mode & 0o077 == 0
+
+    async def test_cache_ignored_for_other_app(self, tmp_path):
+        """A token cached for another client id is not used"""
+        server = _TokenServer()
+        path = tmp_path / "token.json"
+
+        async with _client(server) as client:
+            await RedditAuth("one", "secret", path).token(client)
+            token = await RedditAuth("two", "secret", path).token(client)
+
+        assert token == "t2"
+
+    async def test_refresh_before_expiry(self, tmp_path):
+        """Tokens inside the refresh margin are replaced"""
+        server = _TokenServer(expires_in=30)
+        auth = RedditAuth("id", "secret", None)
+
+        async with _client(server) as client:
+            await auth.token(client)
+            token = await auth.token(client)
+
+        assert token == "t2"
+        assert auth.refreshes == 2
+
+    async def test_unauthorized_refreshes_once(self):
+        """A revoked token gets one retry with a fresh token"""
+        server = _TokenServer(revoked={"t1"})
+        set_reddit_auth(RedditAuth("id", "secret", None))
+
+        async with _client(server) as client:
+            response = await reddit_get(client, "/r/python/new.json")
+
+        assert response.status_code == 200
+        assert response.json()["token"] == "t2"
+
+    async def test_public_without_credentials(self):
+        """Without credentials no token is requested and www.reddit.com is used"""
+        server = _TokenServer()
+        set_reddit_auth(None)
+
+        async with _client(server) as client:
+            await reddit_get(client, "/r/python/new.json")
+
+        assert server.grants == 0
+        assert server.requests[0].url.host == "www.reddit.com"
+
+
+class TestSharedClient:
+    """Test both Reddit fetchers over OAuth against the fake APIs"""
+
+    @pytest.fixture
+    def corpus(self):
+        return FakeCorpus(hn_stories=10, hn_comments=0, github_repos=10, reddit_posts_per_subreddit=40, tweets=0)
+
+    async def test_fetchers_share_one_token(self, fake):
+        """The collector and the coding assistant fetcher use oauth.reddit.com with one grant"""
+        set_reddit_auth(RedditAuth("id", "secret", None))
+
+        posts = await reddit.collect_reddit_posts(days_back=30)
+        mentions = await fetch_all_reddit_mentions([{"name": "Cursor"}])
+
+        hosts = {host for host, path, _ in fake.log if path != "/api/v1/access_token"}
+        assert hosts == {"oauth.reddit.com"}
+        assert fake.reddit_tokens == 1
+        assert posts
+        assert "Cursor" in mentions
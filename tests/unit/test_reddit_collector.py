@@ -0,0 +1,130 @@
+"""
+Unit tests for combined Reddit listings
+Tests cursor paging, early cutoff and subreddit attribution in src/ai_news_agent/collectors/reddit.py
+"""
+import time
+
+import httpx
+import pytest
+from src.ai_news_agent.collectors import reddit
+from src.ai_news_agent.utils.resilience import lost_items, reset_lost
+
+SUBREDDITS = ["LocalLLaMA", "OpenAI", "MachineLearning"]
+
+
+def _post(i, subreddit, age_days, score=50, title="Claude vs GPT-4 for coding"):
+    return {
+        "id": f"p{i}", "name": f"t3_p{i}", "title": title, "selftext": "", "url": "",
+        "permalink": f"/r/{subreddit}/comments/p{i}/", "score": score, "num_comments": 1,
+        "author": "someone", "created_utc": time.time() - age_days * 86400, "subreddit": subreddit,
+    }
+
+
+class _Listings:
+    """Fake combined listings: new sorted by time, top by score, 404 for banned subreddits"""
+
+    def __init__(self, posts, banned=()):
+        self.posts = posts
+        self.banned = {name.lower() for name in banned}
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        multi, listing = request.url.path.split("/")[2], request.url.path.split("/")[3].removesuffix(".json")
+        names = {name.lower() for name in multi.split("+")}
+        if names & self.banned:
+            return httpx.Response(404, json={"error": 404})
+        posts = [p for p in self.posts if p["subreddit"].lower() in names]
+        posts.sort(key=lambda p: -(p["created_utc"] if listing == "new" else p["score"]))
+        after = request.url.params.get("after")
+        start = next((i + 1 for i, p in enumerate(posts) if p["name"] == after), 0)
+        limit = int(request.url.params["limit"])
+        page = posts[start:start + limit]
+        next_after = page[-1]["name"] if start + limit < len(posts) else None
+        return httpx.Response(200, json={"data": {"after": next_after, "children": [{"data": p} for p in page]}})
+
+
+@pytest.fixture
+async def listings(monkeypatch, route_shared_client):
+    """Route the shared client to a fake listing server over three subreddits"""
+    monkeypatch.setattr(reddit, "AI_SUBREDDITS", SUBREDDITS)
+    monkeypatch.setattr(reddit, "REDDIT_PAGE_LIMIT", 10)
+    server = _Listings([])
+    await route_shared_client(server)
+    return server
+
+
+class TestTopWindow:
+    """Test the t= window for top listings"""
+
+    def test_smallest_covering_window(self):
+        """The narrowest window that still covers days_back is used"""
+        assert reddit.top_window(1) == "day"
+        assert reddit.top_window(7) == "week"
+        assert reddit.top_window(8) == "month"
+        assert reddit.top_window(90) == "year"
+        assert reddit.top_window(400) == "all"
+
+
+class TestCombinedListings:
+    """Test collection through r/a+b+c listings"""
+
+    async def test_one_listing_for_all_subreddits(self, listings):
+        """All subreddits share one top and one new listing, attributed from the payload"""
+        listings.posts = [_post(i, SUBREDDITS[i % 3], age_days=i * 0.1) for i in range(6)]
+
+        posts = await reddit.collect_reddit_posts(days_back=7)
+
+        paths = {request.url.path for request in listings.requests}
+        assert paths == {"/r/LocalLLaMA+OpenAI+MachineLearning/top.json", "/r/LocalLLaMA+OpenAI+MachineLearning/new.json"}
+        assert listings.requests[0].url.params["t"] == "week"
+        assert len(posts) == 6
+        assert {post["subreddit"] for post in posts} == set(SUBREDDITS)
+
+    async def test_new_listing_stops_at_cutoff(self, listings):
+        """Paging through new.json stops at the first page older than days_back"""
+        listings.posts = [_post(i, "OpenAI", age_days=i * 0.5, score=1) for i in range(100)]
+
+        await reddit.collect_reddit_posts(days_back=7)
+
+        new_pages = [r for r in listings.requests if r.url.path.endswith("/new.json")]
+        assert len(new_pages) == 2  # 20 posts reach back 10 days
+        assert new_pages[1].url.params["after"] == "t3_p9"
+
+    async def test_top_listing_stops_below_min_score(self, listings):
+        """Paging through top.json stops once scores fall below MIN_REDDIT_SCORE"""
+        listings.posts = [_post(i, "OpenAI", age_days=1, score=100 - i * 11) for i in range(40)]
+
+        await reddit.collect_reddit_posts(days_back=7)
+
+        top_pages = [r for r in listings.requests if r.url.path.endswith("/top.json")]
+        assert len(top_pages) == 1
+
+    async def test_per_subreddit_cap(self, listings):
+        """At most max_posts_per_subreddit posts per subreddit, highest scores first"""
+        listings.posts = [_post(i, "OpenAI", age_days=1, score=100 + i) for i in range(30)]
+
+        posts = await reddit.collect_reddit_posts(days_back=7, max_posts_per_subreddit=5)
+
+        assert [post["points"] for post in posts] == [129, 128, 127, 126, 125]
+
+    async def test_banned_subreddit_falls_back_to_single_listings(self, listings):
+        """A subreddit that breaks the combined listing is skipped, the rest still collected"""
+        listings.posts = [_post(i, SUBREDDITS[i % 3], age_days=1) for i in range(6)]
+        listings.banned = {"openai"}
+
+        posts = await reddit.collect_reddit_posts(days_back=7)
+
+        assert {post["subreddit"] for post in posts} == {"LocalLLaMA", "MachineLearning"}
+        assert len(posts) == 4
+
+    async def test_page_cap_before_cutoff_reported(self, listings, monkeypatch, capsys):
+        """A new listing that hits the page cap before days_back is reported as truncated"""
+        monkeypatch.setattr(reddit, "REDDIT_MAX_PAGES", 2)
+        listings.posts = [_post(i, "OpenAI", age_days=i * 0.01) for i in range(50)]
+        reset_lost()
+
+        await reddit.collect_reddit_posts(days_back=7)
+
+        assert lost_items()["reddit"] == {"truncated listings": 1}
+        assert "page cap" in capsys.readouterr().out
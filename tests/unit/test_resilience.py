@@ -0,0 +1,265 @@
+"""
+Unit tests for retries, retry budgets and circuit breakers
+Tests src/ai_news_agent/utils/resilience.py
+"""
+import asyncio
+import random
+import time
+
+import httpx
+import pytest
+from src.ai_news_agent.collectors.github import search_github_repos
+from src.ai_news_agent.utils.http_client import close_client, set_transport_factory
+from src.ai_news_agent.utils.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    ResilientTransport,
+    RetryBudget,
+    full_jitter_backoff,
+    lost_items,
+    record_lost,
+    reset_lost,
+)
+
+
+class _Flaky:
+    """Mock API that answers with the given statuses in order, then 200"""
+
+    def __init__(self, *statuses):
+        self.statuses = list(statuses)
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        status = self.statuses.pop(0) if self.statuses else 200
+        if status == 0:
+            raise httpx.ConnectError("connection refused", request=request)
+        return httpx.Response(status, json={"ok": status == 200})
+
+
+def _client(handler, **kwargs):
+    kwargs.setdefault("backoff_base", 0.0)
+    transport = ResilientTransport(httpx.MockTransport(handler), **kwargs)
+    return httpx.AsyncClient(transport=transport), transport
+
+
+class TestBackoff:
+    """Test full-jitter backoff and the retry budget"""
+
+    def test_full_jitter_bounds(self):
+        """Backoff is uniform in [0, min(cap, base * 2^attempt)]"""
+        rng = random.Random(1)
+
+        for attempt in range(8):
+            delays = [full_jitter_backoff(attempt, 0.5, 4.0, rng) for _ in range(200)]
+            assert 0.0 <= min(delays)
+            assert max(delays) <= min(4.0, 0.5 * 2 ** attempt)
+
+    def test_budget_limits_retries(self):
+        """Only the minimum reserve is available without new requests"""
+        budget = RetryBudget(ratio=0.1, minimum=3)
+
+        assert [budget.withdraw() for _ in range(4)] == [True, True, True, False]
+        for _ in range(20):
+            budget.deposit()
+        assert budget.withdraw() is True
+
+
+class TestCircuitBreaker:
+    """Test breaker state transitions"""
+
+    def test_opens_after_threshold(self):
+        """Consecutive failures open the circuit; a success resets the count"""
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state == "closed"
+
+        breaker.record_failure()
+        assert breaker.state == "open"
+        assert breaker.allow() is False
+        assert breaker.times_opened == 1
+
+    def test_half_open_allows_one_trial(self):
+        """After the reset timeout exactly one trial request goes through"""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+
+        assert breaker.state == "half-open"
+        assert breaker.allow() is True
+        assert breaker.allow() is False
+
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+    def test_failed_trial_reopens(self):
+        """A failing trial request opens the circuit again"""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        breaker.allow()
+
+        breaker.record_failure()
+
+        assert breaker.state == "open"
+        assert breaker.times_opened == 2
+
+
+class TestResilientTransport:
+    """Test retries through the transport"""
+
+    async def test_retries_server_error(self):
+        """A 503 followed by a 200 is retried transparently"""
+        server = _Flaky(503)
+        client, transport = _client(server)
+
+        async with client:
+            response = await client.get("https://api.test/x")
+
+        assert response.status_code == 200
+        assert len(server.requests) == 2
+        assert transport.stats()["api.test"]["retries"] == 1
+
+    async def test_retries_connection_error(self):
+        """Network errors are retried like 5xx"""
+        server = _Flaky(0, 0)
+        client, _ = _client(server)
+
+        async with client:
+            response = await client.get("https://api.test/x")
+
+        assert response.status_code == 200
+        assert len(server.requests) == 3
+
+    async def test_gives_up_after_max_attempts(self):
+        """The last failed response is returned once attempts run out"""
+        server = _Flaky(503, 503, 503, 503)
+        client, transport = _client(server, max_attempts=3)
+
+        async with client:
+            response = await client.get("https://api.test/x")
+
+        assert response.status_code == 503
+        assert len(server.requests) == 3
+        assert transport.stats()["api.test"]["failures"] == 1
+
+    async def test_post_not_retried(self):
+        """Non-idempotent requests are sent once"""
+        server = _Flaky(503)
+        client, _ = _client(server)
+
+        async with client:
+            response = await client.post("https://api.test/x", json={})
+
+        assert response.status_code == 503
+        assert len(server.requests) == 1
+
+    async def test_client_errors_not_retried(self):
+        """4xx responses are the caller's business"""
+        server = _Flaky(404)
+        client, _ = _client(server)
+
+        async with client:
+            response = await client.get("https://api.test/x")
+
+        assert response.status_code == 404
+        assert len(server.requests) == 1
+
+    async def test_open_circuit_fails_fast(self):
+        """Once a host's circuit is open, requests fail without reaching it"""
+        server = _Flaky(*[503] * 10)
+        client, transport = _client(server, max_attempts=1, failure_threshold=2, reset_timeout=60)
+
+        async with client:
+            await client.get("https://api.test/x")
+            await client.get("https://api.test/x")
+            with pytest.raises(CircuitOpenError):
+                await client.get("https://api.test/x")
+
+        assert len(server.requests) == 2
+        stats = transport.stats()["api.test"]
+        assert stats["circuit"] == "open"
+        assert stats["short_circuited"] == 1
+
+    async def test_cancelled_trial_released(self):
+        """A half-open trial that is cancelled lets the next request be the trial"""
+        hang = True
+
+        async def handler(request):
+            if hang:
+                await asyncio.sleep(10)
+            return httpx.Response(200)
+
+        client, transport = _client(handler, max_attempts=1, failure_threshold=1, reset_timeout=0.01)
+        transport._breakers["api.test"].record_failure()
+        time.sleep(0.02)
+
+        async with client:
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(client.get("https://api.test/x"), timeout=0.05)
+            hang = False
+            response = await client.get("https://api.test/x")
+
+        assert response.status_code == 200
+        assert transport.stats()["api.test"]["circuit"] == "closed"
+
+    async def test_circuits_are_per_host(self):
+        """An open circuit for one host does not affect others"""
+        def handler(request):
+            return httpx.Response(503 if request.url.host == "down.test" else 200)
+
+        client, _ = _client(handler, max_attempts=1, failure_threshold=1, reset_timeout=60)
+
+        async with client:
+            await client.get("https://down.test/x")
+            response = await client.get("https://up.test/x")
+
+        assert response.status_code == 200
+
+
+class TestLostItems:
+    """Test reporting of items the collectors gave up on"""
+
+    def test_record_and_reset(self):
+        """Losses are summed per source and unit until reset"""
+        reset_lost()
+        record_lost("hackernews")
+        record_lost("hackernews", 2)
+        record_lost("reddit", unit="subreddits")
+
+        assert lost_items() == {"hackernews": {"items": 3}, "reddit": {"subreddits": 1}}
+
+        reset_lost()
+        assert lost_items() == {}
+
+    async def test_github_skips_failed_page(self):
+        """A page that keeps failing is counted as lost and the search continues"""
+        def handler(request):
+            if "chatgpt" not in request.url.params["q"]:
+                return httpx.Response(200, json={"total_count": 0, "items": []})
+            page = int(request.url.params["page"])
+            if page == 2:
+                return httpx.Response(503)
+            repo = {
+                "id": page, "name": f"llm-agent-{page}", "description": "LLM agent",
+                "html_url": f"https://github.com/a/llm-agent-{page}", "stargazers_count": 50,
+                "owner": {"login": "a"}, "topics": [],
+            }
+            return httpx.Response(200, json={"total_count": 250, "items": [repo]})
+
+        reset_lost()
+        set_transport_factory(lambda: ResilientTransport(httpx.MockTransport(handler), backoff_base=0.0))
+        try:
+            repos = await search_github_repos(days_back=7, max_results=250)
+        finally:
+            await close_client()
+            set_transport_factory(None)
+
+        assert {repo["title"] for repo in repos} == {"llm-agent-1", "llm-agent-3"}
+        assert lost_items() == {"github": {"pages": 1}}
+        reset_lost()
@@ -0,0 +1,121 @@
+"""
+Unit tests for concurrent collection
+Tests run_collection in src/ai_news_agent/main.py with stubbed collector streams
+"""
+import asyncio
+import time
+import pytest
+from unittest.mock import patch
+from src.ai_news_agent import main as agent_main
+
+
+def _stub(posts, delay=0.0, error=None):
+    async def collector(*args, **kwargs):
+        await asyncio.sleep(delay)
+        if error:
+            raise error
+        for post in posts:
+            yield post
+    return collector
+
+
+def _post(source, points):
+    return {"id": f"{source}-{points}", "title": f"{source} post", "points": points, "source": source}
+
+
+class TestRunCollection:
+    """Test concurrent source collection with timeouts and deadline"""
+
+    async def test_sources_run_concurrently(self):
+        """Wall time should follow the slowest source, not the sum"""
+        with patch.object(agent_main, "stream_ai_mentions", _stub([_post("hackernews", 5)], 0.2)), \
+             patch.object(agent_main, "stream_github_trending", _stub([_post("github", 10)], 0.2)), \
+             patch.object(agent_main, "stream_reddit_posts", _stub([_post("reddit", 1)], 0.2)), \
+             patch.object(agent_main, "stream_twitter_posts", _stub([], 0.2)):
+            started = time.perf_counter()
+            posts = await agent_main.run_collection(days=7)
+            elapsed = time.perf_counter() - started
+
+        assert elapsed < 0.6
+        assert [p["points"] for p in posts] == [10, 5, 1]
+
+    async def test_failing_source_is_skipped(self):
+        """A source that raises should not drop the others"""
+        with patch.object(agent_main, "stream_ai_mentions", _stub([_post("hackernews", 5)])), \
+             patch.object(agent_main, "stream_github_trending", _stub([], error=RuntimeError("boom"))), \
+             patch.object(agent_main, "stream_reddit_posts", _stub([_post("reddit", 1)])), \
+             patch.object(agent_main, "stream_twitter_posts", _stub([])):
+            posts = await agent_main.run_collection(days=7)
+
+        assert {p["source"] for p in posts} == {"hackernews", "reddit"}
+
+    async def test_source_timeout_returns_partial_results(self):
+        """A source exceeding its own timeout contributes nothing after the timeout"""
+        timeouts = {"hackernews": 5.0, "github": 5.0, "reddit": 5.0, "twitter": 0.05}
+        with patch.object(agent_main, "SOURCE_TIMEOUTS", timeouts), \
+             patch.object(agent_main, "stream_ai_mentions", _stub([_post("hackernews", 5)])), \
+             patch.object(agent_main, "stream_github_trending", _stub([_post("github", 3)])), \
+             patch.object(agent_main, "stream_reddit_posts", _stub([])), \
+             patch.object(agent_main, "stream_twitter_posts", _stub([_post("twitter", 9)], 1.0)):
+            posts = await agent_main.run_collection(days=7)
+
+        assert {p["source"] for p in posts} == {"hackernews", "github"}
+
+    async def test_global_deadline_cancels_pending_sources(self):
+        """Sources still running at the global deadline are cancelled"""
+        with patch.object(agent_main, "stream_ai_mentions", _stub([_post("hackernews", 5)])), \
+             patch.object(agent_main, "stream_github_trending", _stub([_post("github", 3)], 5.0)), \
+             patch.object(agent_main, "stream_reddit_posts", _stub([_post("reddit", 2)], 5.0)), \
+             patch.object(agent_main, "stream_twitter_posts", _stub([])):
+            started = time.perf_counter()
+            posts = await agent_main.run_collection(days=7, deadline=0.1)
+            elapsed = time.perf_counter() - started
+
+        assert elapsed < 1.0
+        assert [p["source"] for p in posts] == ["hackernews"]
+
+    async def test_posts_before_timeout_are_kept(self):
+        """Posts streamed before a source times out are not thrown away"""
+        async def slow_tail(*args, **kwargs):
+            yield _post("twitter", 9)
+            await asyncio.sleep(1.0)
+            yield _post("twitter", 8)
+
+        timeouts = {"hackernews": 5.0, "github": 5.0, "reddit": 5.0, "twitter": 0.05}
+        with patch.object(agent_main, "SOURCE_TIMEOUTS", timeouts), \
+             patch.object(agent_main, "stream_ai_mentions", _stub([])), \
+             patch.object(agent_main, "stream_github_trending", _stub([])), \
+             patch.object(agent_main, "stream_reddit_posts", _stub([])), \
+             patch.object(agent_main, "stream_twitter_posts", slow_tail):
+            posts = await agent_main.run_collection(days=7)
+
+        assert [p["points"] for p in posts] == [9]
+
+    async def test_duplicates_are_dropped(self):
+        """The same post ID is only kept once"""
+        with patch.object(agent_main, "stream_ai_mentions", _stub([_post("hackernews", 5), _post("hackernews", 5)])), \
+             patch.object(agent_main, "stream_github_trending", _stub([])), \
+             patch.object(agent_main, "stream_reddit_posts", _stub([])), \
+             patch.object(agent_main, "stream_twitter_posts", _stub([])):
+            posts = await agent_main.run_collection(days=7)
+
+        assert len(posts) == 1
+
+    async def test_same_link_merged_across_sources(self):
+        """An HN link, a Reddit post and a GitHub repo for the same repo become one post"""
+        hn = {**_post("hackernews", 5), "url": "https://github.com/acme/agent?utm_source=hn", "num_comments": 2,
+              "hn_url": "https://news.ycombinator.com/item?id=1"}
+        reddit = {**_post("reddit", 1), "url": "http://www.github.com/acme/agent/", "num_comments": 3,
+                  "reddit_url": "https://reddit.com/r/LocalLLaMA/comments/x/"}
+        github = {**_post("github", 10), "url": "https://github.com/acme/agent", "num_comments": 0,
+                  "github_url": "https://github.com/acme/agent"}
+        with patch.object(agent_main, "stream_ai_mentions", _stub([hn])), \
+             patch.object(agent_main, "stream_github_trending", _stub([github])), \
+             patch.object(agent_main, "stream_reddit_posts", _stub([reddit])), \
+             patch.object(agent_main, "stream_twitter_posts", _stub([])):
+            posts = await agent_main.run_collection(days=7)
+
+        assert len(posts) == 1
+        assert posts[0]["points"] == 16 and posts[0]["num_comments"] == 5
+        assert sorted(posts[0]["sources"]) == ["github", "hackernews", "reddit"]
+        assert posts[0]["hn_url"] == "https://news.ycombinator.com/item?id=1"
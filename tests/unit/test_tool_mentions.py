@@ -0,0 +1,118 @@
+"""
+Unit tests for single-sweep tool mention attribution
+Tests ToolMatcher and the sweep modes of the coding assistant HN and Reddit fetchers
+"""
+import time
+
+import pytest
+from src.ai_news_agent.coding_assistants.config import CODING_ASSISTANTS
+from src.ai_news_agent.coding_assistants.fetchers import hackernews as ca_hackernews
+from src.ai_news_agent.coding_assistants.fetchers import reddit as ca_reddit
+from src.ai_news_agent.coding_assistants.fetchers.tool_matcher import ToolMatcher
+from src.ai_news_agent.collectors import reddit as reddit_collector
+from tests.fake_apis import FakeCorpus
+
+TOOLS = [
+    {"name": "GitHub Copilot", "aliases": ["Copilot"]},
+    {"name": "Cursor"},
+    {"name": "Cody", "aliases": ["Sourcegraph Cody"]},
+]
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    return FakeCorpus(
+        days=30, relevant_ratio=1.0, hn_stories=600, hn_comments=1200,
+        github_repos=10, reddit_posts_per_subreddit=80, tweets=0
+    )
+
+
+class TestToolMatcher:
+    """Test attributing texts to tools"""
+
+    def test_names_and_aliases(self):
+        """Names and aliases map to the tool name, in order of first mention"""
+        matcher = ToolMatcher(TOOLS)
+
+        assert matcher.tools_in("Moved from copilot to Cursor, then GitHub Copilot again") == ["GitHub Copilot", "Cursor"]
+        assert matcher.tools_in("Sourcegraph Cody is nice") == ["Cody"]
+
+    def test_word_boundaries(self):
+        """Tool names inside other words are not mentions"""
+        matcher = ToolMatcher(TOOLS)
+
+        assert matcher.tools_in("a cursory look at copilots") == ["GitHub Copilot"]
+        assert matcher.tools_in("precursor") == []
+
+    def test_bare_name_opt_out(self):
+        """Tools with match_name False are only credited for their phrase and aliases"""
+        matcher = ToolMatcher(CODING_ASSISTANTS)
+
+        assert matcher.tools_in("please continue") == []
+        assert matcher.tools_in("move the cursor down") == []
+        assert matcher.tools_in("Tried continue.dev after Cursor AI") == ["Continue", "Cursor"]
+
+    def test_query_words(self):
+        """One word per name or alias is enough to find every mention"""
+        assert ToolMatcher(TOOLS).query_words() == ["copilot", "cursor", "cody", "sourcegraph"]
+
+
+class TestHackerNewsSweep:
+    """Test the HN sweep against the fake Algolia API"""
+
+    async def test_matches_local_attribution(self, fake, corpus):
+        """Sweep counts equal attributing every hit in the window locally"""
+        results = await ca_hackernews.fetch_all_hn_mentions(CODING_ASSISTANTS, days_back=30, mode="sweep")
+
+        matcher = ToolMatcher(CODING_ASSISTANTS)
+        start = time.time() - 30 * 86400
+        expected = {tool["name"]: 0 for tool in CODING_ASSISTANTS}
+        for hit, _ in corpus.algolia_hits():
+            if hit["created_at_i"] >= start:
+                for name in matcher.tools_in(f"{hit.get('title') or ''} {hit.get('comment_text') or ''}"):
+                    expected[name] += 1
+        assert {name: data["mentions_count"] for name, data in results.items()} == expected
+        assert any(expected.values())
+
+    async def test_requests_independent_of_tool_count(self, fake):
+        """One request per time slice, whether one tool or all are tracked"""
+        await ca_hackernews.fetch_all_hn_mentions(CODING_ASSISTANTS, days_back=30, mode="sweep")
+        sweep_requests = fake.stats()["requests"]
+        fake.log.clear()
+        await ca_hackernews.fetch_all_hn_mentions(CODING_ASSISTANTS[:1], days_back=30, mode="sweep")
+
+        assert sweep_requests == fake.stats()["requests"] == 5
+
+
+class TestRedditSweep:
+    """Test the Reddit sweep against the fake Reddit API"""
+
+    async def test_one_listing_for_all_tools(self, fake, corpus):
+        """The combined new listing is read once and attributed locally"""
+        results = await ca_reddit.fetch_all_reddit_mentions(CODING_ASSISTANTS, days_back=30, mode="sweep")
+
+        paths = {path for _, path, _ in fake.log}
+        assert paths == {"/r/programming+vscode+neovim+coding/new.json"}
+        assert fake.stats()["requests"] < len(CODING_ASSISTANTS) * len(ca_reddit.REDDIT_SUBREDDITS)
+
+        matcher = ToolMatcher(CODING_ASSISTANTS)
+        cutoff = time.time() - 30 * 86400
+        expected = {tool["name"]: 0 for tool in CODING_ASSISTANTS}
+        for subreddit in ca_reddit.REDDIT_SUBREDDITS:
+            for post in corpus.subreddit_posts(subreddit):
+                if post["created_utc"] >= cutoff:
+                    for name in matcher.tools_in(f"{post['title']} {post['selftext']}"):
+                        expected[name] += 1
+        assert {name: data["mentions_count"] for name, data in results.items()} == expected
+        assert all(len(data["comments"]) <= ca_reddit.REDDIT_COMMENT_LIMIT for data in results.values())
+
+    async def test_truncated_listing_falls_back_to_search(self, fake, monkeypatch):
+        """If the listing's page cap is hit before the cutoff, each tool is searched instead"""
+        monkeypatch.setattr(reddit_collector, "REDDIT_MAX_PAGES", 1)
+        monkeypatch.setattr(reddit_collector, "REDDIT_PAGE_LIMIT", 10)
+
+        results = await ca_reddit.fetch_all_reddit_mentions(CODING_ASSISTANTS[:2], days_back=30, mode="sweep")
+
+        searches = [path for _, path, _ in fake.log if path.endswith("/search.json")]
+        assert len(searches) == 2 * len(ca_reddit.REDDIT_SUBREDDITS)
+        assert set(results) == {tool["name"] for tool in CODING_ASSISTANTS[:2]}
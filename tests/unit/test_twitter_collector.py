@@ -0,0 +1,344 @@
+"""
+Unit tests for the Twitter/X collector
+Tests query planning and concurrent, deduplicated search in src/ai_news_agent/collectors/twitter.py
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from src.ai_news_agent.coding_assistants.config import CODING_ASSISTANTS
+from src.ai_news_agent.coding_assistants.fetchers.twitter import fetch_all_twitter_mentions
+from src.ai_news_agent.collectors import twitter
+from src.ai_news_agent.config import AI_KEYWORDS, CATEGORIES
+from tests.fake_apis import FakeAPIs, FakeCorpus, _parse_search_query
+
+
+def _tweet(i, text="claude"):
+    return {
+        "id": str(1000 + i), "text": text, "author_id": "1",
+        "created_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+        "public_metrics": {"like_count": 50, "retweet_count": 0, "reply_count": 0, "quote_count": 0},
+    }
+
+
+def _lookup(request):
+    """/2/tweets answer that still finds every requested tweet"""
+    ids = request.url.params["ids"].split(",")
+    return httpx.Response(200, json={"data": [{"id": i, "public_metrics": _tweet(0)["public_metrics"]} for i in ids]})
+
+
+@pytest.fixture
+def client_for(monkeypatch, route_shared_client):
+    """Route the shared client to a handler, with a bearer token set"""
+    monkeypatch.setattr(twitter, "TWITTER_BEARER_TOKEN", "test-token")
+    return route_shared_client
+
+
+class TestPlanQueries:
+    """Test packing keywords into OR queries"""
+
+    def test_covers_every_keyword_once(self):
+        """Every keyword is in exactly one query"""
+        queries = twitter.plan_twitter_queries()
+
+        terms = [words for query in queries for words in _parse_search_query(query)]
+        expected = {keyword.lower() for keyword in AI_KEYWORDS}
+        assert sorted(" ".join(words) for words in terms) == sorted(expected)
+
+    def test_queries_fit_length_limit(self):
+        """Each query with its filters fits the API limit"""
+        for max_length in (128, 256, twitter.TWITTER_MAX_QUERY_LENGTH):
+            for query in twitter.plan_twitter_queries(max_length=max_length):
+                assert len(f"{query} {twitter.TWITTER_QUERY_FILTERS}") <= max_length
+
+    def test_minimal_number_of_queries(self):
+        """The keyword list needs no more queries than its total length requires"""
+        queries = twitter.plan_twitter_queries()
+        total = len(" OR ".join(twitter._twitter_term(k.lower()) for k in dict.fromkeys(AI_KEYWORDS)))
+        budget = twitter.TWITTER_MAX_QUERY_LENGTH - len(f"() {twitter.TWITTER_QUERY_FILTERS}")
+
+        assert len(queries) == -(-total // budget)
+
+    def test_terms_quoted(self):
+        """Phrases and words with punctuation are quoted, plain words are not"""
+        assert twitter.plan_twitter_queries(["Claude", "gpt-4", "ai agent", "claude"]) == [
+            '(claude OR "gpt-4" OR "ai agent")'
+        ]
+
+
+class TestStreamTweets:
+    """Test concurrent search over the planned queries"""
+
+    async def test_queries_run_concurrently_and_dedupe(self, client_for, monkeypatch):
+        """All queries are in flight together; a tweet found by two queries is kept once"""
+        monkeypatch.setattr(twitter, "plan_twitter_queries", lambda: ["(claude)", "(gemini)"])
+        in_flight = 0
+        peak = 0
+
+        async def handler(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.02)
+            in_flight -= 1
+            offset = 0 if "claude" in request.url.params["query"] else 2
+            return httpx.Response(200, json={"data": [_tweet(offset + i) for i in range(3)], "meta": {}})
+
+        await client_for(handler)
+        tweets = await twitter.collect_twitter_posts(days_back=7, max_results=100)
+
+        assert peak == 2
+        assert sorted(tweet["id"] for tweet in tweets) == [f"twitter-{1000 + i}" for i in range(5)]
+
+    async def test_stops_at_max_results(self, client_for, monkeypatch):
+        """Collection stops once max_results unique tweets have been found"""
+        monkeypatch.setattr(twitter, "plan_twitter_queries", lambda: ["(claude)"])
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            start = int(request.url.params.get("next_token", 0))
+            return httpx.Response(200, json={
+                "data": [_tweet(start + i) for i in range(10)], "meta": {"next_token": str(start + 10)}
+            })
+
+        await client_for(handler)
+        tweets = await twitter.collect_twitter_posts(days_back=7, max_results=15)
+
+        assert len(tweets) == 15
+        assert len(requests) == 2
+
+    async def test_full_keyword_coverage(self, client_for):
+        """Against the fake API, the planned queries find every matching tweet in the window"""
+        corpus = FakeCorpus(hn_stories=10, hn_comments=0, github_repos=10, tweets=300)
+        apis = FakeAPIs(corpus)
+        await client_for(apis.handle)
+
+        tweets = await twitter.collect_twitter_posts(days_back=7, max_results=1000)
+
+        def engagement(tweet):
+            metrics = tweet["public_metrics"]
+            return metrics["like_count"] + metrics["retweet_count"] + metrics["reply_count"]
+
+        keywords = [keyword.lower() for keyword in AI_KEYWORDS]
+        expected = {
+            f"twitter-{t['id']}" for t in corpus.tweets
+            if t["_ts"] >= corpus.now - 7 * 86400
+            and engagement(t) >= twitter.MIN_TWITTER_ENGAGEMENT
+            and any(keyword in t["text"].lower() for keyword in keywords)
+        }
+        assert expected
+        assert {tweet["id"] for tweet in tweets} == expected
+
+
+class TestIncremental:
+    """Test since_id cursors and the local tweet store"""
+
+    @pytest.fixture
+    async def fake(self, client_for, monkeypatch, tmp_path):
+        """Fake APIs with the state file in a temporary directory"""
+        monkeypatch.setattr(twitter, "TWITTER_STATE_FILE", tmp_path / "twitter_state.json")
+        apis = FakeAPIs(FakeCorpus(hn_stories=10, hn_comments=0, github_repos=10, tweets=300))
+        await client_for(apis.handle)
+        return apis
+
+    @staticmethod
+    def _searches(apis):
+        return [path for _, path, _ in apis.log if path == "/2/tweets/search/recent"]
+
+    async def test_second_run_fetches_only_new_tweets(self, fake):
+        """The second run searches with since_id and refreshes recent tweets by ID lookup"""
+        first = await twitter.collect_twitter_posts(days_back=7, max_results=1000, mode="incremental")
+        first_searches = len(self._searches(fake))
+        state = twitter.load_incremental_state()
+        newest = max(int(t["id"]) for t in fake.corpus.tweets)
+        fake.corpus.tweets.insert(0, {**fake.corpus.tweets[0], "id": str(newest + 1), "text": "claude is great"})
+        fake.log.clear()
+
+        second = await twitter.collect_twitter_posts(days_back=7, max_results=1000, mode="incremental")
+
+        assert first_searches >= len(twitter.plan_twitter_queries())
+        assert all(cursor["since_id"] and not cursor["backfill"] for cursor in state["cursors"].values())
+        assert len(self._searches(fake)) == len(twitter.plan_twitter_queries())
+        lookups = [path for _, path, _ in fake.log if path == "/2/tweets"]
+        assert 0 < len(lookups) < first_searches
+        assert {post["id"] for post in second} == {post["id"] for post in first} | {f"twitter-{newest + 1}"}
+
+    async def test_interrupted_search_resumes(self, client_for, monkeypatch, tmp_path):
+        """A search cut off by an error keeps the rest as backfill below the oldest tweet seen"""
+        monkeypatch.setattr(twitter, "TWITTER_STATE_FILE", tmp_path / "twitter_state.json")
+        monkeypatch.setattr(twitter, "plan_twitter_queries", lambda: ["(claude)"])
+        requests = []
+        fail = True
+
+        def handler(request):
+            if request.url.path == "/2/tweets":
+                return _lookup(request)
+            requests.append(request)
+            params = request.url.params
+            if params.get("next_token") == "2" or params.get("until_id"):
+                if fail:
+                    return httpx.Response(429)
+                return httpx.Response(200, json={"data": [_tweet(2)], "meta": {}})
+            if params.get("since_id"):
+                return httpx.Response(200, json={"meta": {"result_count": 0}})
+            return httpx.Response(200, json={"data": [_tweet(3)], "meta": {"newest_id": "1003", "next_token": "2"}})
+
+        await client_for(handler)
+        await twitter.collect_twitter_posts(days_back=7, mode="incremental")
+        cursor = twitter.load_incremental_state()["cursors"]["(claude)"]
+        fail = False
+        requests.clear()
+        posts = await twitter.collect_twitter_posts(days_back=7, mode="incremental")
+
+        assert cursor["since_id"] == "1003"
+        assert [segment["until_id"] for segment in cursor["backfill"]] == ["1003"]
+        assert requests[0].url.params["since_id"] == "1003"
+        assert requests[1].url.params["until_id"] == "1003"
+        assert twitter.load_incremental_state()["cursors"]["(claude)"]["backfill"] == []
+        assert {post["id"] for post in posts} == {"twitter-1002", "twitter-1003"}
+
+    async def test_window_larger_than_page_budget(self, client_for, monkeypatch, tmp_path):
+        """New tweets come first on every run; the rest of the window is backfilled within 7 days"""
+        monkeypatch.setattr(twitter, "TWITTER_STATE_FILE", tmp_path / "twitter_state.json")
+        monkeypatch.setattr(twitter, "TWITTER_INCREMENTAL_MAX_PAGES", 2)
+        monkeypatch.setattr(twitter, "TWITTER_BACKFILL_MAX_PAGES", 2)
+        monkeypatch.setattr(twitter, "plan_twitter_queries", lambda: ["(claude)"])
+        tweets = [_tweet(i) for i in range(100, 0, -1)]
+        requests = []
+
+        def handler(request):
+            if request.url.path == "/2/tweets":
+                return _lookup(request)
+            requests.append(request.url.params)
+            params = request.url.params
+            since_id = int(params.get("since_id", 0))
+            until_id = int(params.get("until_id", 10**9))
+            matching = [t for t in tweets if since_id < int(t["id"]) < until_id]
+            start = int(params.get("next_token", 0))
+            page = matching[start:start + 10]
+            meta = {"result_count": len(page)}
+            if page:
+                meta.update(newest_id=page[0]["id"], oldest_id=page[-1]["id"])
+            if start + 10 < len(matching):
+                meta["next_token"] = str(start + 10)
+            return httpx.Response(200, json={"data": page, "meta": meta})
+
+        await client_for(handler)
+        first = await twitter.collect_twitter_posts(days_back=30, max_results=1000, mode="incremental")
+        tweets[:0] = [_tweet(i) for i in range(130, 100, -1)]
+        requests.clear()
+        second = await twitter.collect_twitter_posts(days_back=30, max_results=1000, mode="incremental")
+        runs = 2
+        while twitter.load_incremental_state()["cursors"]["(claude)"]["backfill"] and runs < 20:
+            posts = await twitter.collect_twitter_posts(days_back=30, max_results=1000, mode="incremental")
+            runs += 1
+
+        assert len(first) == 40
+        assert "twitter-1130" in {post["id"] for post in second}
+        assert requests[0]["since_id"] == "1100"
+        limit = (datetime.now(timezone.utc) - timedelta(days=twitter.TWITTER_RECENT_DAYS)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        assert all(params.get("start_time", limit) >= limit for params in requests)
+        assert {post["id"] for post in posts} == {f"twitter-{t['id']}" for t in tweets}
+
+    async def test_low_engagement_not_stored(self, client_for, monkeypatch, tmp_path):
+        """Tweets below MIN_TWITTER_ENGAGEMENT never enter the store"""
+        monkeypatch.setattr(twitter, "TWITTER_STATE_FILE", tmp_path / "twitter_state.json")
+        monkeypatch.setattr(twitter, "plan_twitter_queries", lambda: ["(claude)"])
+        quiet = {**_tweet(1), "public_metrics": {"like_count": 1, "retweet_count": 0, "reply_count": 0}}
+
+        await client_for(lambda request: httpx.Response(200, json={"data": [_tweet(0), quiet], "meta": {}}))
+        await twitter.collect_twitter_posts(days_back=7, mode="incremental")
+
+        assert list(twitter.load_incremental_state()["tweets"]) == ["1000"]
+
+    async def test_refresh_capped(self, fake, monkeypatch):
+        """Only the TWITTER_MAX_REFRESH most engaged recent tweets are looked up"""
+        monkeypatch.setattr(twitter, "TWITTER_MAX_REFRESH", 150)
+        await twitter.collect_twitter_posts(days_back=7, max_results=1000, mode="incremental")
+        fake.log.clear()
+
+        await twitter.collect_twitter_posts(days_back=7, max_results=1000, mode="incremental")
+
+        assert len([path for _, path, _ in fake.log if path == "/2/tweets"]) <= 2
+
+    async def test_deleted_tweets_dropped_on_refresh(self, fake):
+        """Tweets the lookup no longer returns are removed from the store"""
+        await twitter.collect_twitter_posts(days_back=7, max_results=1000, mode="incremental")
+        stored = twitter.load_incremental_state()["tweets"]
+        recent = max(stored.values(), key=lambda t: t["created_at"])
+        fake.corpus.tweets.remove(next(t for t in fake.corpus.tweets if t["id"] == recent["id"]))
+
+        await twitter.collect_twitter_posts(days_back=7, max_results=1000, mode="incremental")
+
+        assert recent["id"] not in twitter.load_incremental_state()["tweets"]
+
+
+class TestMentionVolume:
+    """Test counts-only mention volume"""
+
+    @pytest.fixture
+    async def fake(self, client_for):
+        """Fake APIs behind the shared client"""
+        apis = FakeAPIs(FakeCorpus(hn_stories=10, hn_comments=0, github_repos=10, tweets=500))
+        await client_for(apis.handle)
+        return apis
+
+    def test_category_queries(self):
+        """Each category gets one OR query over its examples"""
+        queries = twitter.category_volume_queries()
+
+        assert set(queries) == {category["slug"] for category in CATEGORIES}
+        assert queries["core-llms"] == '("gpt-4" OR claude OR gemini OR llama OR mistral)'
+
+    async def test_one_request_per_query(self, fake):
+        """Daily series for each query from a single counts request, without tweet payloads"""
+        volume = await twitter.fetch_mention_volume({"claude": "claude", "llm": "(llm OR rag)"})
+
+        assert [path for _, path, _ in fake.log] == ["/2/tweets/counts/recent"] * 2
+        claude = volume["claude"]
+        assert 7 <= len(claude["series"]) <= 8
+        assert sum(bucket["count"] for bucket in claude["series"]) == claude["total"]
+        expected = sum(
+            1 for t in fake.corpus.tweets
+            if t["_ts"] >= fake.corpus.now - 7 * 86400 and "claude" in t["text"].lower()
+        )
+        assert claude["total"] == expected
+
+    async def test_failed_query_left_out(self, client_for):
+        """A failing counts request is left out of the result"""
+        def handler(request):
+            if "broken" in request.url.params["query"]:
+                return httpx.Response(400)
+            return httpx.Response(200, json={
+                "data": [{"start": "2024-01-01T00:00:00.000Z", "tweet_count": 4}],
+                "meta": {"total_tweet_count": 4},
+            })
+
+        await client_for(handler)
+        volume = await twitter.fetch_mention_volume({"ok": "claude", "bad": "broken"})
+
+        assert volume == {"ok": {"total": 4, "series": [{"start": "2024-01-01T00:00:00.000Z", "count": 4}]}}
+
+    async def test_coding_assistant_mentions(self, fake):
+        """Tool mention counts cost one request per tool"""
+        results = await fetch_all_twitter_mentions(CODING_ASSISTANTS)
+
+        assert len(fake.log) == len(CODING_ASSISTANTS)
+        assert set(results) == {tool["name"] for tool in CODING_ASSISTANTS}
+        assert all("mentions_count" in data and data["daily"] for data in results.values())
+
+    async def test_coding_assistant_search_query(self, client_for):
+        """Tools with a search_query are counted by it, not by the bare name"""
+        queries = set()
+
+        def handler(request):
+            queries.add(request.url.params["query"].replace(f" {twitter.TWITTER_QUERY_FILTERS}", ""))
+            return httpx.Response(200, json={"data": [], "meta": {"total_tweet_count": 0}})
+
+        await client_for(handler)
+        await fetch_all_twitter_mentions(CODING_ASSISTANTS)
+
+        assert '"cursor ai"' in queries and '"continue.dev"' in queries
+        assert not queries & {"Cursor", "Continue"}